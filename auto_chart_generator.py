@@ -6,6 +6,9 @@ import re
 import os
 import json
 from typing import Dict, List, Tuple, Any
+from capture_engine import add_ready_signal
+from md_document import SEPARATOR_ROW_PATTERN, MarkdownDocument, Table, load_markdown
+from md_tokenizer import Token
 
 class AutoChartGenerator:
     """마크다운 분석 기반 자동 차트 생성기"""
@@ -18,8 +21,8 @@ class AutoChartGenerator:
         """마크다운 내용을 분석해서 필요한 차트들을 생성"""
         charts = []
         
-        # 1. 표 데이터에서 차트 생성
-        table_charts = self._extract_charts_from_tables(md_content)
+        # 1. 표 데이터에서 차트 생성 (DOCX 변환과 같은 파싱 결과 사용)
+        table_charts = self._extract_charts_from_tables(load_markdown(md_content))
         charts.extend(table_charts)
         
         # 2. ```chart 블록에서 차트 생성  
@@ -32,49 +35,25 @@ class AutoChartGenerator:
         
         return charts
     
-    def _extract_charts_from_tables(self, content: str) -> List[Dict]:
-        """표 데이터에서 차트를 자동 생성"""
+    def _extract_charts_from_tables(self, document: MarkdownDocument) -> List[Dict]:
+        """표 데이터에서 차트를 자동 생성 (파싱된 표 노드의 행/셀 사용)"""
         charts = []
         
-        # 마크다운 표 패턴 찾기 (단순화된 패턴)
-        # 헤더 + 구분선 + 데이터 행들 패턴
-        lines = content.split('\n')
-        tables_found = []
-        
-        for i, line in enumerate(lines):
-            if line.strip().startswith('|') and line.strip().endswith('|'):
-                # 다음 줄이 구분선인지 확인
-                if i + 1 < len(lines) and re.match(r'^\|[\s\-:]+\|', lines[i + 1]):
-                    # 표 시작점 발견, 데이터 행들 수집
-                    table_lines = [line, lines[i + 1]]  # 헤더 + 구분선
-                    j = i + 2
-                    while j < len(lines) and lines[j].strip().startswith('|') and lines[j].strip().endswith('|'):
-                        table_lines.append(lines[j])
-                        j += 1
-                    
-                    if len(table_lines) >= 3:  # 헤더 + 구분선 + 최소 1개 데이터
-                        table_text = '\n'.join(table_lines)
-                        tables_found.append((i, table_text))
-        
-        # 발견된 표들을 처리
-        for line_num, full_table in tables_found:
-            lines = [line.strip() for line in full_table.split('\n') if line.strip()]
-            
-            if len(lines) < 3:
+        for table in document.select(Table):
+            # 헤더 + 구분선 + 최소 1개 데이터 행인 표만 사용 (rows에는 구분선이 빠져 있음)
+            if len(table.row_tokens) < 3 or not SEPARATOR_ROW_PATTERN.match(table.row_tokens[1].text):
                 continue
-                
-            # 헤더와 데이터 분리
-            header = [cell.strip() for cell in lines[0].split('|')[1:-1]]
-            data_lines = lines[2:]  # 구분선 제외
+            header = table.rows[0]
+            data_rows = table.rows[1:]
             
             # 숫자 컬럼 찾기
-            numeric_columns = self._find_numeric_columns(header, data_lines)
+            numeric_columns = self._find_numeric_columns(header, data_rows)
             
             if len(numeric_columns) >= 2:  # x축, y축 최소 2개 필요
-                chart_data = self._parse_table_data(header, data_lines, numeric_columns)
+                chart_data = self._parse_table_data(header, data_rows, numeric_columns)
                 
                 # 표 제목 또는 캡션 찾기
-                title = self._find_table_title(content, line_num)
+                title = self._find_table_title(document.tokens, table.line)
                 
                 chart = self._create_chart_from_table_data(chart_data, title)
                 if chart:
@@ -131,14 +110,14 @@ class AutoChartGenerator:
         
         return charts
     
-    def _find_numeric_columns(self, headers: List[str], data_lines: List[str]) -> List[int]:
+    def _find_numeric_columns(self, headers: List[str], data_rows: List[List[str]]) -> List[int]:
         """숫자 데이터를 포함한 컬럼 인덱스 찾기"""
         numeric_cols = []
         
-        if not data_lines:
+        if not data_rows:
             return numeric_cols
             
-        sample_row = [cell.strip() for cell in data_lines[0].split('|')[1:-1]]
+        sample_row = data_rows[0]
         
         for i, cell in enumerate(sample_row):
             # 숫자 패턴 확인 (쉼표, 소수점, 단위 포함)
@@ -147,7 +126,7 @@ class AutoChartGenerator:
                 
         return numeric_cols
     
-    def _parse_table_data(self, headers: List[str], data_lines: List[str], numeric_columns: List[int]) -> Dict:
+    def _parse_table_data(self, headers: List[str], data_rows: List[List[str]], numeric_columns: List[int]) -> Dict:
         """표 데이터를 차트 데이터 형태로 파싱"""
         data = {
             'categories': [],
@@ -155,8 +134,7 @@ class AutoChartGenerator:
             'headers': headers
         }
         
-        for line in data_lines:
-            cells = [cell.strip() for cell in line.split('|')[1:-1]]
+        for cells in data_rows:
             if len(cells) < len(headers):
                 continue
                 
@@ -202,21 +180,19 @@ class AutoChartGenerator:
             return float(num_match.group(1)) * multiplier
         return 0
     
-    def _find_table_title(self, content: str, line_num: int) -> str:
-        """표의 제목이나 캡션 찾기"""
-        lines = content.split('\n')
-        
+    def _find_table_title(self, tokens: List[Token], line_num: int) -> str:
+        """표의 제목이나 캡션 찾기 (tokens: 문서의 라인별 토큰)"""
         # 표 이전 몇 줄에서 제목 찾기
         for i in range(max(0, line_num - 3), line_num):
-            if i < len(lines):
-                line = lines[i].strip()
+            if i < len(tokens):
+                line = tokens[i].raw.strip()
                 if line and not line.startswith('|') and not line.startswith('#') and not line.startswith('□'):
                     return line
         
         # 표 이후 캡션 찾기 
-        for i in range(line_num + 3, min(len(lines), line_num + 6)):
-            if i < len(lines):
-                line = lines[i].strip()
+        for i in range(line_num + 3, min(len(tokens), line_num + 6)):
+            if i < len(tokens):
+                line = tokens[i].raw.strip()
                 if line.startswith('<표') or line.startswith('<그림'):
                     return line
                 
@@ -269,17 +245,18 @@ class AutoChartGenerator:
         return 'bar' if series_count > 1 else 'pie'
     
     def _generate_chart_html(self, config: Dict) -> str:
-        """차트 설정에 따라 HTML 생성"""
+        """차트 설정에 따라 HTML 생성 (캡처 엔진용 렌더링 완료 신호 포함)"""
         chart_type = config['type']
         data = config['data']
         title = config['title']
         
         if chart_type == 'line':
-            return self._generate_line_chart_html(data, title)
+            html = self._generate_line_chart_html(data, title)
         elif chart_type == 'pie':
-            return self._generate_pie_chart_html(data, title)
+            html = self._generate_pie_chart_html(data, title)
         else:  # bar
-            return self._generate_bar_chart_html(data, title)
+            html = self._generate_bar_chart_html(data, title)
+        return add_ready_signal(html)
     
     def _generate_line_chart_html(self, data: Dict, title: str) -> str:
         """라인 차트 HTML 생성"""
@@ -5,14 +5,17 @@ MD 파일명을 기반으로 chart_[프로젝트명]_[번호].png 형식으로 
 """
 import json
 import os
-import subprocess
 import re
 from pathlib import Path
+from capture_engine import add_ready_signal
+from capture_scheduler import CaptureScheduler
+from render_cache import cached_capture, get_default_cache
 
 class AutoUniqueChartGenerator:
     def __init__(self, md_filename):
         # MD 파일명에서 프로젝트 식별자 추출
         self.project_id = self._extract_project_id(md_filename)
+        self.render_cache = get_default_cache()
         print(f"🎯 프로젝트 ID: {self.project_id}")
         
     def _extract_project_id(self, md_filename):
@@ -169,8 +172,8 @@ class AutoUniqueChartGenerator:
         }
     
     def create_html_template(self, chart_config):
-        """Chart.js HTML 템플릿 생성"""
-        return f"""<!DOCTYPE html>
+        """Chart.js HTML 템플릿 생성 (캡처 엔진용 렌더링 완료 신호 포함)"""
+        return add_ready_signal(f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
@@ -204,27 +207,14 @@ class AutoUniqueChartGenerator:
         }});
     </script>
 </body>
-</html>"""
+</html>""")
     
     def generate_png(self, html_file, png_file):
-        """HTML을 PNG로 변환"""
-        try:
-            chrome_cmd = [
-                "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-                "--headless",
-                "--disable-gpu",
-                "--hide-scrollbars", 
-                "--force-device-scale-factor=1",
-                "--window-size=900,600",
-                f"--screenshot={png_file}",
-                html_file
-            ]
-            
-            subprocess.run(chrome_cmd, check=True, capture_output=True)
-            return True
-        except Exception as e:
-            print(f"❌ PNG 생성 실패: {e}")
-            return False
+        """HTML을 PNG로 변환 (내용이 같으면 렌더 캐시 사용)"""
+        result = cached_capture(html_file, png_file, (900, 600), cache=self.render_cache)
+        if not result["success"]:
+            print(f"❌ PNG 생성 실패: {result['error']}")
+        return result["success"]
     
     def update_md_file(self, md_filename, chart_configs):
         """MD 파일의 이미지 경로를 새로 생성된 차트로 업데이트"""
@@ -269,7 +259,8 @@ class AutoUniqueChartGenerator:
         # 간단한 기본 차트들 생성 (테이블 분석 대신)
         chart_configs = self._generate_default_charts()
         
-        # 각 차트 생성
+        # 각 차트 HTML 생성 후 PNG는 한 번에 병렬 캡처
+        scheduler = CaptureScheduler(cache=self.render_cache)
         for i, chart_config in enumerate(chart_configs):
             # HTML 파일 생성
             html_content = self.create_html_template(chart_config)
@@ -279,10 +270,15 @@ class AutoUniqueChartGenerator:
                 f.write(html_content)
             print(f"✅ HTML 생성: {html_file}")
             
-            # PNG 이미지 생성
             png_file = f"{images_dir}/{chart_config['filename']}.png"
-            if self.generate_png(html_file, png_file):
-                print(f"✅ PNG 생성: {png_file}")
+            scheduler.add(html_file, png_file, (900, 600))
+        
+        # PNG 이미지 생성 (변경 없는 차트는 캐시에서 복사)
+        for result in scheduler.run():
+            if result["success"]:
+                print(f"✅ PNG 생성: {result['png']}")
+            else:
+                print(f"❌ PNG 생성 실패: {result['error']}")
         
         # MD 파일 업데이트
         self.update_md_file(md_filename, chart_configs)
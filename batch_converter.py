@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+MD → DOCX 일괄 변환기
+디렉토리나 glob 패턴으로 찾은 .md 파일들을 워커 프로세스에 나눠 병렬 변환
+워커는 python-docx와 변환기 모듈을 미리 import해 두고 재사용 (파일마다 인터프리터를 다시 띄우지 않음)
+파일별 소요 시간과 실패 내역을 요약(JSON)으로 저장
+"""
+
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+
+DEFAULT_OUTPUT_DIR = "output"
+SUMMARY_FILENAME = "batch_summary.json"
+
+
+def default_worker_count():
+    """기본 워커 수 - CPU 수 (환경변수 CONVERT_WORKERS로 조정 가능)"""
+    env_workers = os.environ.get("CONVERT_WORKERS")
+    if env_workers:
+        return max(1, int(env_workers))
+    return os.cpu_count() or 2
+
+
+def find_markdown_files(targets) -> list:
+    """디렉토리(하위 포함)/glob 패턴/파일 경로 목록에서 .md 파일 찾기 (중복 제거, 정렬)"""
+    found = []
+    for target in targets:
+        path = Path(target)
+        if path.is_dir():
+            matches = path.rglob("*.md")
+        elif path.is_file():
+            matches = [path]
+        else:
+            matches = (Path(m) for m in glob.glob(target, recursive=True))
+        found.extend(str(m) for m in matches if m.suffix.lower() == ".md" and not m.name.startswith("temp_"))
+    return sorted(set(found))
+
+
+_worker_converter = None  # 워커 프로세스마다 하나씩 만들어 파일마다 재사용하는 변환기
+
+
+def _init_worker():
+    """워커 프로세스 시작 시 변환기 모듈을 한 번만 import하고 스타일 설정까지 데워 둠"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        _get_converter()
+
+
+def _get_converter():
+    """이 프로세스의 변환기 (변환할 때마다 문서별 상태는 변환기가 스스로 초기화)"""
+    global _worker_converter
+    if _worker_converter is None:
+        from md_to_docx_converter import DocxConverter
+        _worker_converter = DocxConverter()
+    return _worker_converter
+
+
+def convert_one(md_file: str, output_path: str) -> dict:
+    """워커에서 파일 1개 변환 (변환기 출력은 모아 두었다가 실패 시에만 결과에 포함)"""
+    started = time.perf_counter()
+    log = io.StringIO()
+    result = {
+        "md": md_file,
+        "docx": output_path,
+        "success": False,
+        "elapsed": 0.0,
+        "error": None,
+        "pid": os.getpid(),
+    }
+    try:
+        with contextlib.redirect_stdout(log):
+            _get_converter().convert_markdown_to_docx(md_file, output_path)
+        result["success"] = True
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc()
+        result["log"] = log.getvalue()[-4000:]
+    result["elapsed"] = time.perf_counter() - started
+    return result
+
+
+class BatchConverter:
+    """여러 MD 파일을 프로세스 풀로 병렬 변환"""
+
+    def __init__(self, output_dir: str = DEFAULT_OUTPUT_DIR, workers: int = None, summary_path: str = None):
+        self.output_dir = Path(output_dir)
+        self.workers = workers or default_worker_count()
+        self.summary_path = summary_path or str(self.output_dir / SUMMARY_FILENAME)
+        self.jobs = []
+
+    def add(self, md_file: str, output_path: str = None):
+        """변환 작업 추가 (출력 경로 생략 시 output_dir/<파일명>.docx)"""
+        self.jobs.append({"md": str(md_file), "docx": output_path})
+
+    def add_targets(self, targets):
+        """디렉토리/glob 패턴/파일 경로의 .md 파일들을 작업으로 추가"""
+        for md_file in find_markdown_files(targets):
+            self.add(md_file)
+
+    def _assign_output_paths(self):
+        """출력 경로가 없는 작업에 경로 지정 (파일명이 겹치면 상위 폴더 이름을 앞에 붙임)"""
+        stems = {}
+        for job in self.jobs:
+            stems.setdefault(Path(job["md"]).stem, []).append(job)
+
+        for stem, jobs in stems.items():
+            for job in jobs:
+                if job["docx"]:
+                    continue
+                name = stem if len(jobs) == 1 else f"{Path(job['md']).resolve().parent.name}_{stem}"
+                job["docx"] = str(self.output_dir / f"{name}.docx")
+
+    def run(self) -> list:
+        """등록된 모든 작업을 병렬 실행하고 결과 목록 반환 (등록 순서 유지)"""
+        if not self.jobs:
+            print("⚠️ 변환할 MD 파일이 없습니다.")
+            return []
+
+        self._assign_output_paths()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        started_at = datetime.now()
+        started = time.perf_counter()
+        worker_count = min(self.workers, len(self.jobs))
+        print(f"🎯 변환 작업 {len(self.jobs)}개, 워커 {worker_count}개로 병렬 실행")
+
+        results = [None] * len(self.jobs)
+        with ProcessPoolExecutor(max_workers=worker_count, initializer=_init_worker) as executor:
+            futures = [executor.submit(convert_one, job["md"], job["docx"]) for job in self.jobs]
+            for index, future in enumerate(futures):
+                job = self.jobs[index]
+                try:
+                    result = future.result()
+                except Exception as e:  # 워커 프로세스 자체가 죽은 경우
+                    result = {"md": job["md"], "docx": job["docx"], "success": False,
+                              "elapsed": 0.0, "error": f"{type(e).__name__}: {e}", "pid": None}
+                results[index] = result
+                status = "✅" if result["success"] else "❌"
+                print(f"{status} {Path(job['md']).name} ({result['elapsed']:.2f}s)")
+                if not result["success"]:
+                    print(f"   {result['error']}")
+
+        total_elapsed = time.perf_counter() - started
+        self.print_summary(results, total_elapsed)
+        self.write_summary(results, started_at, total_elapsed, worker_count)
+        return results
+
+    def print_summary(self, results, total_elapsed):
+        """소요 시간이 긴 파일과 실패 목록 출력"""
+        succeeded = sum(1 for r in results if r["success"])
+        busy = sum(r["elapsed"] for r in results)
+        print(f"\n🎉 변환 완료: {succeeded}/{len(results)}개 성공, 총 {total_elapsed:.2f}s (파일별 합계 {busy:.2f}s)")
+
+        slowest = sorted(results, key=lambda r: r["elapsed"], reverse=True)[:5]
+        print("⏱️ 오래 걸린 파일:")
+        for r in slowest:
+            print(f"   {r['elapsed']:7.2f}s  {r['md']}")
+
+        failed = [r for r in results if not r["success"]]
+        if failed:
+            print(f"❌ 실패 {len(failed)}개:")
+            for r in failed:
+                print(f"   {r['md']}: {r['error']}")
+
+    def write_summary(self, results, started_at, total_elapsed, worker_count):
+        """요약을 JSON으로 저장"""
+        summary = {
+            "started_at": started_at.isoformat(timespec='seconds'),
+            "total_elapsed": round(total_elapsed, 3),
+            "workers": worker_count,
+            "succeeded": sum(1 for r in results if r["success"]),
+            "failed": sum(1 for r in results if not r["success"]),
+            "files": [
+                {
+                    "md": r["md"],
+                    "docx": r["docx"],
+                    "success": r["success"],
+                    "elapsed": round(r["elapsed"], 3),
+                    "error": r["error"],
+                    "traceback": r.get("traceback"),
+                }
+                for r in results
+            ],
+        }
+        Path(self.summary_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(self.summary_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        print(f"📋 변환 요약 저장: {self.summary_path}")
+
+
+def convert_all(targets, output_dir: str = DEFAULT_OUTPUT_DIR, workers: int = None,
+                summary_path: str = None) -> list:
+    """디렉토리/glob 패턴 목록을 한 번에 병렬 변환하는 간편 함수"""
+    batch = BatchConverter(output_dir=output_dir, workers=workers, summary_path=summary_path)
+    batch.add_targets(targets)
+    return batch.run()
+
+
+def main(args=None):
+    """사용법: python batch_converter.py <디렉토리|glob> [...] [-o 출력폴더] [-j 워커수]"""
+    args = list(sys.argv[1:] if args is None else args)
+    output_dir = DEFAULT_OUTPUT_DIR
+    workers = None
+    targets = []
+
+    while args:
+        arg = args.pop(0)
+        if arg in ("-o", "--output") and args:
+            output_dir = args.pop(0)
+        elif arg in ("-j", "--workers") and args:
+            workers = int(args.pop(0))
+        else:
+            targets.append(arg)
+
+    if not targets:
+        print("사용법: python batch_converter.py <디렉토리|glob 패턴> [...] [-o 출력폴더] [-j 워커수]")
+        print("예시: python batch_converter.py 사업계획서/ -o output/batch -j 4")
+        sys.exit(1)
+
+    results = convert_all(targets, output_dir=output_dir, workers=workers)
+    if not results or not all(r["success"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+MD → DOCX 전체 파이프라인 벤치마크
+함께 들어 있는 사업계획서 MD(실제 문서)와 본문을 10배/100배로 늘린 합성 문서로
+파싱 → 차트 HTML 생성 → 차트 캡처 → DOCX 조립 → 저장 단계별 소요 시간, 최대 메모리(RSS), 결과 크기를 측정
+측정 결과를 JSON으로 남기고 기준값(baseline)과 비교해서 느려지거나 커진 항목을 표시
+이미지가 많은 문서는 이미지 전처리를 끈 경우(기본) / 켜고 처음 / 켜고 다시(저장된 처리 결과 사용)의 변환 시간도 측정
+(다시 변환할 때는 처리 결과를 재사용하므로 끈 경우와 비슷해야 함 - 기준값이 없어도 확인)
+경우마다 새 프로세스에서 측정 (앞 경우의 메모리 최대치나 이미지 캐시가 섞이지 않도록)
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows에는 resource 모듈이 없음 (메모리 측정만 생략)
+    resource = None
+
+
+# 측정 대상 기본 문서 (저장소에 함께 들어 있는 실제 사업계획서)
+BENCH_CORPUS = [
+    "RWSL_항공시스템_사업계획서.md",
+    "첨단_민군_혁신_지원_시스템_사업계획서.md",
+    "attack_drone_defense_system.md",
+    "대드론_방어_시스템_사업계획서.md",
+    "drone_fire_response_plan.md",
+    "thermal_drone_detection.md",
+]
+DEFAULT_SCALES = (1, 10, 100)
+BENCH_DIR = "benchmarks"
+BASELINE_FILENAME = "baseline.json"
+LATEST_FILENAME = "latest.json"
+STAGES = ("parse", "charts", "capture", "assemble", "save")
+IMAGE_BENCH_FILE = "RWSL_항공시스템_사업계획서.md"  # 이미지 전처리 측정 문서 (차트 PNG 18개)
+IMAGE_MODES = (("off", "0"), ("cold", "1"), ("warm", "1"))  # (측정 이름, DOCX_IMAGE_PREPROCESS)
+
+DEFAULT_THRESHOLD = 0.2  # 기준값보다 20% 넘게 나빠지면 회귀로 표시
+MIN_SECONDS_DELTA = 0.05  # 이보다 작은 시간 차이는 측정 잡음으로 보고 무시
+MIN_RSS_DELTA_MB = 5.0
+
+
+def peak_rss_mb():
+    """이 프로세스의 지금까지 최대 메모리 사용량(MB), 측정할 수 없으면 None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    divisor = 1024 * 1024 if platform.system() == "Darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def scale_markdown(md_content: str, scale: int) -> str:
+    """본문을 scale번 반복한 합성 문서 (제목 추출, 이미지 공유 등은 원본 문서와 같은 조건)"""
+    if scale <= 1:
+        return md_content
+    return '\n'.join([md_content] * scale)
+
+
+def case_name(md_file: str, scale: int) -> str:
+    return f"{Path(md_file).stem}@{scale}x"
+
+
+class StageTimer:
+    """단계별 소요 시간과 단계가 끝난 시점의 최대 RSS 기록"""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = {"seconds": round(time.perf_counter() - started, 4), "peak_rss_mb": peak_rss_mb()}
+
+
+def run_case(md_file: str, scale: int, capture: bool = True) -> dict:
+    """워커 프로세스에서 문서 1개를 한 배율로 측정 (변환기 출력은 숨김)"""
+    from auto_unique_chart_generator import AutoUniqueChartGenerator
+    from complete_capture import capture_charts
+    from md_to_docx_converter import DocxConverter
+    from md_tokenizer import split_sections, tokenize
+
+    with open(md_file, 'r', encoding='utf-8') as f:
+        md_content = scale_markdown(f.read(), scale)
+    lines = md_content.split('\n')
+
+    result = {"case": case_name(md_file, scale), "file": md_file, "scale": scale, "lines": len(lines)}
+    timer = StageTimer()
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log), tempfile.TemporaryDirectory() as temp_dir:
+        converter = DocxConverter(incremental=False)
+
+        with timer.stage("parse"):
+            result["tokens"] = sum(1 for _ in tokenize(lines))
+            result["sections"] = len(split_sections(lines))
+
+        # 차트 개수는 본문 배율과 무관하므로 차트 생성/캡처는 원본(1배)에서만 측정
+        if capture and scale == 1:
+            charts = []
+            with timer.stage("charts"):
+                generator = AutoUniqueChartGenerator(md_file)
+                for chart_config in generator._generate_default_charts():
+                    html_file = os.path.join(temp_dir, f"{chart_config['filename']}.html")
+                    with open(html_file, 'w', encoding='utf-8') as f:
+                        f.write(generator.create_html_template(chart_config))
+                    charts.append((html_file, os.path.splitext(html_file)[0] + ".png"))
+            result["charts"] = len(charts)
+
+            with timer.stage("capture"):
+                captures = capture_charts(charts)
+            result["captured"] = sum(1 for capture_result in captures if capture_result["success"])
+
+        # convert_markdown_text의 진행 알림('assemble', 'save') 시점으로 조립/저장 구간 나누기
+        marks = {}
+
+        def mark(step, **detail):
+            marks[step] = (time.perf_counter(), peak_rss_mb())
+
+        data = converter.convert_markdown_text(md_content, progress=mark)
+        mark("done")
+
+    for name, start, end in (("assemble", "assemble", "save"), ("save", "save", "done")):
+        timer.stages[name] = {"seconds": round(marks[end][0] - marks[start][0], 4), "peak_rss_mb": marks[end][1]}
+
+    result["stages"] = {name: timer.stages[name] for name in STAGES if name in timer.stages}
+    result["total_seconds"] = round(sum(stage["seconds"] for stage in result["stages"].values()), 4)
+    result["peak_rss_mb"] = peak_rss_mb()
+    result["output_bytes"] = len(data)
+    result["missing_images"] = len(converter.missing_images)
+    return result
+
+
+def run_image_case(md_file: str) -> dict:
+    """워커 프로세스에서 이미지 전처리 끔 / 켜고 처음 / 켜고 다시의 변환 시간과 결과 크기 측정"""
+    from md_to_docx_converter import DocxConverter
+
+    with open(md_file, 'r', encoding='utf-8') as f:
+        md_content = f.read()
+
+    result = {"case": f"{Path(md_file).stem}@images", "file": md_file, "scale": 1,
+              "lines": md_content.count('\n') + 1}
+    stages = {}
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log), tempfile.TemporaryDirectory() as cache_dir:
+        # 처리 결과 저장소는 빈 임시 디렉토리에서 시작 (cold), 같은 저장소로 한 번 더 (warm)
+        os.environ["DOCX_IMAGE_CACHE_DIR"] = cache_dir
+        os.environ["DOCX_IMAGE_PREPROCESS"] = "0"
+        DocxConverter(incremental=False).convert_markdown_text(md_content)  # 스타일 템플릿, 모듈 로드 등 준비
+        for mode, preprocess in IMAGE_MODES:
+            os.environ["DOCX_IMAGE_PREPROCESS"] = preprocess
+            converter = DocxConverter(incremental=False)
+            started = time.perf_counter()
+            data = converter.convert_markdown_text(md_content)
+            stages[f"images_{mode}"] = {"seconds": round(time.perf_counter() - started, 4),
+                                        "peak_rss_mb": peak_rss_mb()}
+            result[f"output_bytes_{mode}"] = len(data)
+
+    result["stages"] = stages
+    result["total_seconds"] = round(sum(stage["seconds"] for stage in stages.values()), 4)
+    result["peak_rss_mb"] = peak_rss_mb()
+    result["output_bytes"] = result["output_bytes_off"]
+    result["missing_images"] = len(converter.missing_images)
+    return result
+
+
+def check_image_case(result: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """저장된 처리 결과로 다시 변환할 때(warm)가 전처리를 끈 경우보다 threshold 비율 넘게 느리면 회귀"""
+    stages = result["stages"]
+    off, warm = stages["images_off"]["seconds"], stages["images_warm"]["seconds"]
+    if warm > off * (1 + threshold) and warm - off > MIN_SECONDS_DELTA:
+        return [f"{result['case']}: 전처리 결과 재사용 변환 {warm}s > 전처리 끔 {off}s "
+                f"(+{(warm - off) / off * 100:.0f}%)"]
+    return []
+
+
+def print_image_results(results: list):
+    for result in results:
+        if not result["case"].endswith("@images"):
+            continue
+        stages = result["stages"]
+        print(f"🖼️ {result['case']}: 전처리 끔 {stages['images_off']['seconds']:.3f}s "
+              f"({result['output_bytes_off'] / 1024:.0f}KB), "
+              f"켜고 처음 {stages['images_cold']['seconds']:.3f}s "
+              f"({result['output_bytes_cold'] / 1024:.0f}KB), "
+              f"켜고 다시 {stages['images_warm']['seconds']:.3f}s")
+
+
+def run_isolated(md_file: str, scale: int, capture: bool = True) -> dict:
+    """새 프로세스에서 측정 (최대 RSS는 프로세스 단위라 경우마다 프로세스를 새로 띄움)"""
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run_case, md_file, scale, capture).result()
+
+
+def run_image_isolated(md_file: str) -> dict:
+    """이미지 전처리 측정도 새 프로세스에서 (환경변수를 바꾸고, 이미지 처리 결과 메모리 캐시가 섞이지 않도록)"""
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run_image_case, md_file).result()
+
+
+def compare_results(results: list, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """기준값보다 threshold 비율 넘게 나빠진 항목 목록 ("경우: 항목 기준값 → 측정값")"""
+    baseline_cases = {case["case"]: case for case in baseline.get("results", [])}
+    regressions = []
+
+    def check(case, label, old, new, min_delta):
+        if old is None or new is None:
+            return
+        if new > old * (1 + threshold) and new - old > min_delta:
+            change = f"+{(new - old) / old * 100:.0f}%" if old else "새로 증가"
+            regressions.append(f"{case}: {label} {old} → {new} ({change})")
+
+    for result in results:
+        old_result = baseline_cases.get(result["case"])
+        if old_result is None:
+            continue
+        case = result["case"]
+        for name, stage in result["stages"].items():
+            old_stage = old_result.get("stages", {}).get(name)
+            if old_stage:
+                check(case, f"{name} 시간(s)", old_stage["seconds"], stage["seconds"], MIN_SECONDS_DELTA)
+        check(case, "최대 RSS(MB)", old_result.get("peak_rss_mb"), result["peak_rss_mb"], MIN_RSS_DELTA_MB)
+        check(case, "결과 크기(bytes)", old_result.get("output_bytes"), result["output_bytes"], 0)
+    return regressions
+
+
+def print_results(results: list, baseline: dict = None):
+    """경우별 단계 시간 표 (기준값이 있으면 전체 시간 변화율 함께 표시)"""
+    baseline_cases = {case["case"]: case for case in (baseline or {}).get("results", [])}
+    header = f"{'경우':<40}" + "".join(f"{name:>10}" for name in STAGES) + f"{'합계':>10}{'RSS(MB)':>10}{'크기(KB)':>10}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        if result["case"].endswith("@images"):  # print_image_results에서 따로 출력
+            continue
+        stages = result["stages"]
+        row = f"{result['case']:<40}"
+        row += "".join(f"{stages[name]['seconds']:>10.3f}" if name in stages else f"{'-':>10}" for name in STAGES)
+        rss = result["peak_rss_mb"]
+        row += f"{result['total_seconds']:>10.3f}{rss if rss is not None else '-':>10}{result['output_bytes'] / 1024:>10.0f}"
+        old_result = baseline_cases.get(result["case"])
+        if old_result and old_result.get("total_seconds"):
+            row += f"  ({(result['total_seconds'] - old_result['total_seconds']) / old_result['total_seconds'] * 100:+.0f}%)"
+        print(row)
+
+
+def load_baseline(path: str) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_report(path: str, results: list):
+    """측정 환경 정보와 함께 결과 저장"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def run_benchmark(md_files: list, scales=DEFAULT_SCALES, capture: bool = True, images: bool = True) -> list:
+    results = []
+    for md_file in md_files:
+        for scale in scales:
+            print(f"⏱️ 측정 중: {case_name(md_file, scale)}")
+            try:
+                results.append(run_isolated(md_file, scale, capture))
+            except Exception as e:
+                print(f"❌ {case_name(md_file, scale)} 측정 실패: {e}")
+        if images and Path(md_file).name == IMAGE_BENCH_FILE:
+            print(f"⏱️ 측정 중: {Path(md_file).stem}@images")
+            try:
+                results.append(run_image_isolated(md_file))
+            except Exception as e:
+                print(f"❌ {Path(md_file).stem}@images 측정 실패: {e}")
+    return results
+
+
+def main(args=None):
+    """사용법: python benchmark.py [문서.md ...] [--scale 1,10,100] [--no-capture] [--no-images] [--threshold 0.2]
+                       [--baseline 경로] [--save-baseline]"""
+    args = list(sys.argv[1:] if args is None else args)
+    md_files = []
+    scales = DEFAULT_SCALES
+    capture = True
+    images = True
+    threshold = float(os.environ.get("BENCH_THRESHOLD", DEFAULT_THRESHOLD))
+    baseline_path = os.path.join(BENCH_DIR, BASELINE_FILENAME)
+    save_baseline = False
+
+    while args:
+        arg = args.pop(0)
+        if arg == "--scale" and args:
+            scales = tuple(int(value) for value in args.pop(0).split(",") if value)
+        elif arg == "--no-capture":
+            capture = False
+        elif arg == "--no-images":
+            images = False
+        elif arg == "--threshold" and args:
+            threshold = float(args.pop(0))
+        elif arg == "--baseline" and args:
+            baseline_path = args.pop(0)
+        elif arg == "--save-baseline":
+            save_baseline = True
+        elif not arg.startswith("-") and os.path.exists(arg):
+            md_files.append(arg)
+        else:
+            print(main.__doc__)
+            sys.exit(1)
+
+    if not md_files:
+        md_files = [md_file for md_file in BENCH_CORPUS if os.path.exists(md_file)]
+    if not md_files:
+        print("❌ 측정할 MD 파일이 없습니다")
+        sys.exit(1)
+
+    # 캡처는 렌더 캐시 없이 실제 시간을 측정 (RENDER_CACHE=1로 캐시 사용 가능)
+    os.environ.setdefault("RENDER_CACHE", "0")
+    # 배율을 바꾼 문서로 파싱 캐시를 채우지 않도록 파싱 캐시도 끔 (PARSE_CACHE=1로 사용 가능)
+    os.environ.setdefault("PARSE_CACHE", "0")
+
+    print(f"🚀 벤치마크 시작: 문서 {len(md_files)}개 × 배율 {', '.join(f'{scale}x' for scale in scales)}")
+    started = time.perf_counter()
+    results = run_benchmark(md_files, scales, capture, images)
+    if not results:
+        print("❌ 측정 결과가 없습니다")
+        sys.exit(1)
+
+    baseline = None if save_baseline else load_baseline(baseline_path)
+    print()
+    print_results(results, baseline)
+    print_image_results(results)
+
+    latest_path = os.path.join(BENCH_DIR, LATEST_FILENAME)
+    save_report(latest_path, results)
+    print(f"\n📄 측정 결과 저장: {latest_path} ({time.perf_counter() - started:.1f}s)")
+
+    # 이미지 전처리 재사용 확인은 기준값 없이도 (같은 실행 안의 전처리 끔 측정과 비교)
+    image_regressions = [regression for result in results if result["case"].endswith("@images")
+                         for regression in check_image_case(result, threshold)]
+    if image_regressions:
+        print(f"\n⚠️ 이미지 전처리 결과 재사용이 느린 항목 {len(image_regressions)}개:")
+        for regression in image_regressions:
+            print(f"   - {regression}")
+
+    if save_baseline:
+        save_report(baseline_path, results)
+        print(f"📌 기준값 저장: {baseline_path}")
+        if image_regressions:
+            sys.exit(1)
+        return
+
+    if baseline is None:
+        print(f"ℹ️ 기준값이 없습니다 - --save-baseline으로 {baseline_path}를 만들어 두면 다음부터 비교합니다")
+        if image_regressions:
+            sys.exit(1)
+        return
+
+    regressions = compare_results(results, baseline, threshold)
+    if regressions:
+        print(f"\n⚠️ 기준값 대비 {threshold * 100:.0f}% 넘게 나빠진 항목 {len(regressions)}개:")
+        for regression in regressions:
+            print(f"   - {regression}")
+    if regressions or image_regressions:
+        sys.exit(1)
+    print(f"\n✅ 기준값({baseline.get('created', baseline_path)}) 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,723 @@
+#!/usr/bin/env python3
+"""
+Chrome DevTools 프로토콜 기반 캡처 엔진
+헤드리스 Chrome을 미리 띄워두고 탭을 재사용하여 HTML을 PNG로 캡처
+(차트마다 Chrome을 새로 실행하던 방식의 브라우저 시작 비용 제거)
+"""
+
+import atexit
+import base64
+import json
+import os
+import platform
+import queue
+import shutil
+import socket
+import struct
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from conversion_log import get_logger
+
+logger = get_logger("capture")
+
+# 운영체제별 Chrome 경로 후보
+CHROME_PATHS = {
+    "Windows": [
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    ],
+    "Darwin": [
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+        "/Applications/Chrome.app/Contents/MacOS/Chrome",
+    ],
+    "Linux": [
+        "/usr/bin/google-chrome",
+        "/usr/bin/google-chrome-stable",
+        "/usr/bin/chromium-browser",
+        "/usr/bin/chromium",
+    ],
+}
+
+DEFAULT_WINDOW_SIZE = (900, 600)
+
+# 차트 HTML 템플릿에 넣는 렌더링 완료 신호 (폰트 로딩 + Chart.js 애니메이션 종료 후 window.__chartsReady = true)
+READY_SIGNAL_SCRIPT = """<script>
+    window.__chartsReady = false;
+    window.addEventListener('load', function () {
+        var fontsReady = (document.fonts && document.fonts.ready) ? document.fonts.ready : Promise.resolve();
+        fontsReady.then(function () {
+            function chartsBusy() {
+                var Chart = window.Chart;
+                if (!Chart) return false;
+                var charts = Chart.instances ? Object.keys(Chart.instances).map(function (key) { return Chart.instances[key]; }) : [];
+                if (Chart.animator && Chart.animator._running) {
+                    return charts.some(function (chart) { return Chart.animator._running(chart); });
+                }
+                if (Chart.animationService) {
+                    return Chart.animationService.animations.length > 0;
+                }
+                return false;
+            }
+            (function check() {
+                if (chartsBusy()) {
+                    requestAnimationFrame(check);
+                    return;
+                }
+                requestAnimationFrame(function () { window.__chartsReady = true; });
+            })();
+        });
+    });
+</script>
+"""
+
+# 신호를 넣은 페이지면 완료될 때까지 대기 (신호가 없는 예전 HTML이면 null 반환)
+WAIT_READY_JS = """
+(async (timeoutMs) => {
+    if (!('__chartsReady' in window)) return null;
+    const deadline = Date.now() + timeoutMs;
+    while (!window.__chartsReady && Date.now() < deadline) {
+        await new Promise(resolve => requestAnimationFrame(() => resolve()));
+    }
+    return window.__chartsReady === true;
+})
+"""
+
+# 폰트 로딩과 Chart.js 애니메이션이 끝날 때까지 기다린 뒤 요소의 영역(페이지 좌표) 측정
+MEASURE_JS = """
+(async (selector, timeoutMs) => {
+    const deadline = Date.now() + timeoutMs;
+    const nextFrame = () => new Promise(resolve => requestAnimationFrame(() => resolve()));
+    const chartsBusy = () => {
+        const Chart = window.Chart;
+        if (!Chart) return false;
+        const charts = Chart.instances ? Object.values(Chart.instances) : [];
+        if (Chart.animator && Chart.animator._running) {
+            return charts.some(chart => Chart.animator._running(chart));
+        }
+        if (Chart.animationService) {
+            return Chart.animationService.animations.length > 0;
+        }
+        return false;
+    };
+
+    if (document.fonts && document.fonts.ready) await document.fonts.ready;
+    await nextFrame();
+    while (chartsBusy() && Date.now() < deadline) await nextFrame();
+    await nextFrame();
+
+    const element = document.querySelector(selector) || document.body;
+    const rect = element.getBoundingClientRect();
+    return {
+        x: rect.left + window.scrollX,
+        y: rect.top + window.scrollY,
+        width: Math.max(rect.width, element.scrollWidth),
+        height: Math.max(rect.height, element.scrollHeight)
+    };
+})
+"""
+
+
+def add_ready_signal(html_content: str) -> str:
+    """차트 HTML에 렌더링 완료 신호 스크립트 삽입 (</body> 직전)"""
+    if "window.__chartsReady" in html_content:
+        return html_content
+    index = html_content.rfind("</body>")
+    if index == -1:
+        return html_content + READY_SIGNAL_SCRIPT
+    return html_content[:index] + READY_SIGNAL_SCRIPT + html_content[index:]
+
+
+def find_chrome():
+    """현재 운영체제에서 Chrome 실행 파일 경로 찾기"""
+    env_path = os.environ.get("CHROME_PATH")
+    if env_path and os.path.exists(env_path):
+        return env_path
+
+    for path in CHROME_PATHS.get(platform.system(), CHROME_PATHS["Linux"]):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def parse_window_size(window_size):
+    """"900,600" 문자열 또는 (900, 600) 튜플을 (너비, 높이)로 변환"""
+    if window_size is None:
+        return DEFAULT_WINDOW_SIZE
+    if isinstance(window_size, str):
+        width, height = window_size.replace('x', ',').split(',')
+        return int(width), int(height)
+    width, height = window_size
+    return int(width), int(height)
+
+
+class DevToolsError(Exception):
+    """DevTools 프로토콜 통신 오류"""
+
+
+class DevToolsConnection:
+    """DevTools 웹소켓 연결 (표준 라이브러리만 사용하는 최소 구현)"""
+
+    def __init__(self, ws_url: str, timeout: float = 30):
+        parsed = urlparse(ws_url)
+        self.timeout = timeout
+        self.sock = socket.create_connection((parsed.hostname, parsed.port), timeout=timeout)
+        self._buffer = bytearray()
+        self._next_id = 0
+        self._events = []  # 명령 응답을 기다리는 동안 도착한 이벤트
+        self._handshake(parsed.hostname, parsed.port, parsed.path)
+
+    def _handshake(self, host, port, path):
+        """HTTP Upgrade 요청으로 웹소켓 연결 수립"""
+        key = base64.b64encode(os.urandom(16)).decode('ascii')
+        request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        )
+        self.sock.sendall(request.encode('ascii'))
+
+        while b"\r\n\r\n" not in self._buffer:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise DevToolsError("웹소켓 핸드셰이크 중 연결이 끊어졌습니다")
+            self._buffer.extend(chunk)
+
+        header_end = self._buffer.index(b"\r\n\r\n") + 4
+        header = bytes(self._buffer[:header_end])
+        del self._buffer[:header_end]
+        status_line = header.split(b"\r\n", 1)[0]
+        if b" 101 " not in status_line:
+            raise DevToolsError(f"웹소켓 핸드셰이크 실패: {status_line.decode('latin-1')}")
+
+    def _send_frame(self, payload: bytes, opcode: int = 0x1):
+        """클라이언트 프레임 전송 (클라이언트 → 서버는 마스킹 필수)"""
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([0x80 | length])
+        elif length < 65536:
+            header += bytes([0x80 | 126]) + struct.pack('>H', length)
+        else:
+            header += bytes([0x80 | 127]) + struct.pack('>Q', length)
+
+        mask = os.urandom(4)
+        repeated = (mask * (length // 4 + 1))[:length]
+        masked = (int.from_bytes(payload, 'big') ^ int.from_bytes(repeated, 'big')).to_bytes(length, 'big')
+        self.sock.sendall(header + mask + masked)
+
+    def _recv_exact(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            chunk = self.sock.recv(max(65536, size - len(self._buffer)))
+            if not chunk:
+                raise DevToolsError("DevTools 연결이 끊어졌습니다")
+            self._buffer.extend(chunk)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def _recv_message(self) -> dict:
+        """서버 메시지 하나 수신 (조각난 프레임 결합, ping 응답 포함)"""
+        fragments = []
+        while True:
+            first, second = self._recv_exact(2)
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                length = struct.unpack('>H', self._recv_exact(2))[0]
+            elif length == 127:
+                length = struct.unpack('>Q', self._recv_exact(8))[0]
+            if second & 0x80:
+                mask = self._recv_exact(4)
+                raw = self._recv_exact(length)
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(raw))
+            else:
+                payload = self._recv_exact(length)
+
+            if opcode == 0x8:
+                raise DevToolsError("DevTools 연결이 서버에 의해 종료되었습니다")
+            if opcode == 0x9:
+                self._send_frame(payload, opcode=0xA)
+                continue
+            if opcode == 0xA:
+                continue
+
+            fragments.append(payload)
+            if first & 0x80:
+                return json.loads(b"".join(fragments).decode('utf-8'))
+
+    def _set_deadline(self, timeout):
+        self.sock.settimeout(timeout if timeout is not None else self.timeout)
+
+    def call(self, method: str, params: dict = None, session_id: str = None, timeout: float = None) -> dict:
+        """DevTools 명령 실행 후 결과 반환"""
+        self._next_id += 1
+        message = {"id": self._next_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        self._send_frame(json.dumps(message).encode('utf-8'))
+
+        deadline = time.monotonic() + (timeout or self.timeout)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise DevToolsError(f"{method} 응답 시간 초과")
+            self._set_deadline(remaining)
+            try:
+                response = self._recv_message()
+            except socket.timeout:
+                raise DevToolsError(f"{method} 응답 시간 초과")
+
+            if response.get("id") == message["id"]:
+                if "error" in response:
+                    raise DevToolsError(f"{method} 실패: {response['error'].get('message')}")
+                return response.get("result", {})
+            if "method" in response:
+                self._events.append(response)
+
+    def wait_event(self, method: str, session_id: str = None, timeout: float = None) -> dict:
+        """지정한 이벤트가 도착할 때까지 대기"""
+        for index, event in enumerate(self._events):
+            if event["method"] == method and (session_id is None or event.get("sessionId") == session_id):
+                return self._events.pop(index)
+
+        deadline = time.monotonic() + (timeout or self.timeout)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise DevToolsError(f"{method} 이벤트 대기 시간 초과")
+            self._set_deadline(remaining)
+            try:
+                event = self._recv_message()
+            except socket.timeout:
+                raise DevToolsError(f"{method} 이벤트 대기 시간 초과")
+
+            if event.get("method") == method and (session_id is None or event.get("sessionId") == session_id):
+                return event
+            if "method" in event:
+                self._events.append(event)
+
+    def discard_events(self, method: str = None):
+        """쌓여 있는 이벤트 버리기"""
+        if method is None:
+            self._events.clear()
+        else:
+            self._events = [event for event in self._events if event["method"] != method]
+
+    def close(self):
+        try:
+            self._send_frame(b"", opcode=0x8)
+        except OSError:
+            pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class ChromeBrowser:
+    """미리 띄워둔 헤드리스 Chrome 1개와 재사용하는 캡처용 탭"""
+
+    def __init__(self, chrome_path: str, startup_timeout: float = 15):
+        self.chrome_path = chrome_path
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.connection = None
+        self.session_id = None
+        self.user_data_dir = None
+        self.version = None
+
+    def start(self):
+        """Chrome 실행 후 DevTools 연결 및 캡처용 탭 생성"""
+        self.user_data_dir = tempfile.mkdtemp(prefix="chrome_capture_")
+        cmd = [
+            self.chrome_path,
+            "--headless",
+            "--disable-gpu",
+            "--hide-scrollbars",
+            "--disable-web-security",
+            "--allow-file-access-from-files",
+            "--disable-extensions",
+            "--disable-background-networking",
+            "--disable-background-timer-throttling",
+            "--disable-renderer-backgrounding",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--remote-debugging-port=0",
+            f"--user-data-dir={self.user_data_dir}",
+            "about:blank",
+        ]
+        self.process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        ws_url = self._wait_for_devtools_url()
+        self.connection = DevToolsConnection(ws_url)
+        self.version = self.connection.call("Browser.getVersion").get("product")
+
+        target_id = self.connection.call("Target.createTarget", {"url": "about:blank"})["targetId"]
+        self.session_id = self.connection.call(
+            "Target.attachToTarget", {"targetId": target_id, "flatten": True}
+        )["sessionId"]
+        self.connection.call("Page.enable", session_id=self.session_id)
+        return self
+
+    def _wait_for_devtools_url(self) -> str:
+        """Chrome이 기록하는 DevToolsActivePort 파일에서 접속 주소 읽기"""
+        port_file = Path(self.user_data_dir) / "DevToolsActivePort"
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise DevToolsError(f"Chrome이 시작 직후 종료되었습니다 (코드: {self.process.returncode})")
+            if port_file.exists():
+                lines = port_file.read_text().split('\n')
+                if len(lines) >= 2 and lines[0].strip() and lines[1].strip():
+                    return f"ws://127.0.0.1:{lines[0].strip()}{lines[1].strip()}"
+            time.sleep(0.05)
+        raise DevToolsError("Chrome DevTools 시작 시간 초과")
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def capture(self, html_file, png_file, window_size=DEFAULT_WINDOW_SIZE, scale=1,
+                virtual_time_budget=None, timeout=30, fit_selector=None, margin=0):
+        """HTML 파일을 열어 현재 탭에서 스크린샷 저장
+
+        virtual_time_budget은 렌더링 완료 신호(READY_SIGNAL_SCRIPT)가 없는 HTML에만 적용
+        fit_selector를 주면 같은 탭에서 렌더링 완료를 기다려 요소 영역을 측정하고
+        그 영역만 잘라서 저장 (크기 감지용 Chrome을 따로 띄우지 않음). 잘라낸 크기 반환
+        """
+        width, height = parse_window_size(window_size)
+        session = self.session_id
+        conn = self.connection
+
+        self._set_viewport(width, height, scale)
+
+        conn.discard_events()
+        file_url = Path(html_file).absolute().as_uri()
+        conn.call("Page.navigate", {"url": file_url}, session_id=session, timeout=timeout)
+        conn.wait_event("Page.loadEventFired", session_id=session, timeout=timeout)
+
+        # 렌더링 완료 신호가 있는 페이지는 신호만 기다리고,
+        # 신호가 없는 예전 HTML만 --virtual-time-budget과 같은 방식으로 고정 시간 진행
+        ready = self._wait_ready(timeout)
+        if ready is False:
+            raise DevToolsError("렌더링 완료 신호 대기 시간 초과")
+        if ready is None and virtual_time_budget:
+            conn.discard_events("Emulation.virtualTimeBudgetExpired")
+            conn.call("Emulation.setVirtualTimePolicy", {
+                "policy": "pauseIfNetworkFetchesPending",
+                "budget": virtual_time_budget,
+            }, session_id=session)
+            conn.wait_event("Emulation.virtualTimeBudgetExpired", session_id=session, timeout=timeout)
+            # 예산이 끝나면 가상 시간이 멈춘 채로 남으므로 다시 흐르게 함 - 재사용하는 탭의 다음 캡처에서
+            # 타이머/requestAnimationFrame이 멈춰 완료 신호를 못 받는 문제 방지 (실패하면 풀이 Chrome을 재시작)
+            conn.call("Emulation.setVirtualTimePolicy", {"policy": "advance"}, session_id=session)
+
+        params = {"format": "png"}
+        clip_size = None
+        if fit_selector:
+            box = self._measure(fit_selector, timeout)
+            right = int(box["x"] + box["width"] + margin + 0.999)
+            bottom = int(box["y"] + box["height"] + margin + 0.999)
+
+            # 요소가 창보다 크면 창을 키운 뒤 다시 측정 (잘림 방지)
+            if right > width or bottom > height:
+                width, height = max(width, right), max(height, bottom)
+                self._set_viewport(width, height, scale)
+                box = self._measure(fit_selector, timeout)
+                right = int(box["x"] + box["width"] + margin + 0.999)
+                bottom = int(box["y"] + box["height"] + margin + 0.999)
+
+            left = max(0, int(box["x"] - margin))
+            top = max(0, int(box["y"] - margin))
+            clip_size = (right - left, bottom - top)
+            params["clip"] = {"x": left, "y": top, "width": clip_size[0], "height": clip_size[1], "scale": 1}
+
+        result = conn.call("Page.captureScreenshot", params, session_id=session, timeout=timeout)
+
+        Path(png_file).parent.mkdir(parents=True, exist_ok=True)
+        with open(png_file, 'wb') as f:
+            f.write(base64.b64decode(result["data"]))
+        return clip_size
+
+    def _set_viewport(self, width, height, scale):
+        self.connection.call("Emulation.setDeviceMetricsOverride", {
+            "width": width,
+            "height": height,
+            "deviceScaleFactor": scale,
+            "mobile": False,
+        }, session_id=self.session_id)
+
+    def _evaluate(self, expression, timeout):
+        """페이지에서 JavaScript 실행 (Promise는 완료까지 대기) 후 값 반환"""
+        response = self.connection.call("Runtime.evaluate", {
+            "expression": expression,
+            "awaitPromise": True,
+            "returnByValue": True,
+        }, session_id=self.session_id, timeout=timeout)
+        if "exceptionDetails" in response:
+            raise DevToolsError(f"스크립트 실행 실패: {response['exceptionDetails'].get('text')}")
+        return response["result"].get("value")
+
+    def _wait_ready(self, timeout):
+        """렌더링 완료 신호 대기 - 완료 True, 시간 초과 False, 신호 없는 페이지 None"""
+        return self._evaluate(f"({WAIT_READY_JS})({int(timeout * 1000 * 0.8)})", timeout)
+
+    def _measure(self, selector, timeout) -> dict:
+        """렌더링 완료 후 요소 영역 측정 (페이지 좌표, CSS 픽셀)"""
+        return self._evaluate(f"({MEASURE_JS})({json.dumps(selector)}, {int(timeout * 1000 * 0.8)})", timeout)
+
+    def close(self):
+        """이 엔진이 띄운 Chrome만 종료 (다른 Chrome 프로세스는 건드리지 않음)"""
+        if self.connection:
+            try:
+                self.connection.call("Browser.close", timeout=3)
+            except (DevToolsError, OSError):
+                pass
+            self.connection.close()
+            self.connection = None
+
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+
+        if self.user_data_dir:
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+            self.user_data_dir = None
+
+
+class CapturePool:
+    """워밍된 헤드리스 Chrome N개를 유지하는 캡처 풀"""
+
+    def __init__(self, size: int = 2, chrome_path: str = None, startup_timeout: float = 15):
+        self.size = max(1, size)
+        self.chrome_path = chrome_path or find_chrome()
+        self.startup_timeout = startup_timeout
+        self._idle = queue.Queue()
+        self._browsers = []
+        self._lock = threading.Lock()
+        self._started = False
+        self.latencies = []  # (파일명, 소요 시간(초), 성공 여부)
+
+    def start(self):
+        """브라우저들을 병렬로 미리 실행"""
+        with self._lock:
+            if self._started:
+                return self
+            if not self.chrome_path:
+                raise DevToolsError("Chrome을 찾을 수 없습니다")
+
+            browsers = [ChromeBrowser(self.chrome_path, self.startup_timeout) for _ in range(self.size)]
+            errors = []
+
+            def launch(browser):
+                try:
+                    browser.start()
+                except Exception as e:
+                    errors.append(e)
+                    browser.close()
+
+            threads = [threading.Thread(target=launch, args=(b,)) for b in browsers]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            for browser in browsers:
+                if browser.is_alive() and browser.session_id:
+                    self._browsers.append(browser)
+                    self._idle.put(browser)
+
+            if not self._browsers:
+                raise DevToolsError(f"Chrome 캡처 풀 시작 실패: {errors[0] if errors else '알 수 없는 오류'}")
+
+            self._started = True
+            logger.info("🚀 Chrome 캡처 풀 준비 완료: %d개 브라우저 (%s)", len(self._browsers), self.chrome_version)
+        return self
+
+    @property
+    def chrome_version(self):
+        for browser in self._browsers:
+            if browser.version:
+                return browser.version
+        return None
+
+    def _restart(self, browser: ChromeBrowser) -> ChromeBrowser:
+        """문제가 생긴 브라우저 하나만 재시작"""
+        browser.close()
+        replacement = ChromeBrowser(self.chrome_path, self.startup_timeout).start()
+        with self._lock:
+            index = self._browsers.index(browser)
+            self._browsers[index] = replacement
+        return replacement
+
+    def capture(self, html_file, png_file, window_size=DEFAULT_WINDOW_SIZE, scale=1,
+                virtual_time_budget=None, timeout=30, fit_selector=None, margin=0) -> dict:
+        """HTML을 PNG로 캡처하고 결과(소요 시간, 측정 크기 포함) 반환"""
+        self.start()
+        browser = self._idle.get()
+        started = time.perf_counter()
+        error = None
+        size = None
+
+        try:
+            size = browser.capture(html_file, png_file, window_size, scale, virtual_time_budget, timeout,
+                                   fit_selector, margin)
+        except Exception as e:
+            error = str(e)
+            # 탭이 멈췄거나 연결이 끊긴 브라우저는 교체
+            try:
+                browser = self._restart(browser)
+            except Exception as restart_error:
+                logger.warning("⚠️ Chrome 재시작 실패: %s", restart_error)
+        finally:
+            self._idle.put(browser)
+
+        elapsed = time.perf_counter() - started
+        success = error is None and os.path.exists(png_file)
+        self.latencies.append((Path(html_file).name, elapsed, success))
+
+        return {
+            "html": str(html_file),
+            "png": str(png_file),
+            "success": success,
+            "elapsed": elapsed,
+            "error": error,
+            "size": list(size) if size else None,
+        }
+
+    def log_latency_report(self):
+        """캡처별 소요 시간 기록 (요약은 INFO, 캡처별 시간은 DEBUG)"""
+        if not self.latencies:
+            return
+        times = sorted(elapsed for _, elapsed, _ in self.latencies)
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+        logger.info("⏱️ 캡처 소요 시간 (%d건) - 평균: %.2fs  최소: %.2fs  최대: %.2fs  p95: %.2fs",
+                    len(times), sum(times) / len(times), times[0], times[-1], p95)
+        for name, elapsed, success in self.latencies:
+            logger.debug("   %s %s: %.2fs", '✅' if success else '❌', name, elapsed)
+
+    def close(self):
+        with self._lock:
+            for browser in self._browsers:
+                browser.close()
+            self._browsers = []
+            self._idle = queue.Queue()
+            self._started = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_shared_pool(size: int = None) -> CapturePool:
+    """프로세스 전체에서 공유하는 캡처 풀 (종료 시 자동 정리)"""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            pool_size = size or int(os.environ.get("CAPTURE_POOL_SIZE", "2"))
+            _shared_pool = CapturePool(size=pool_size)
+            atexit.register(close_shared_pool)
+        return _shared_pool
+
+
+def close_shared_pool():
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is not None:
+            _shared_pool.close()
+            _shared_pool = None
+
+
+def capture_with_cli(html_file, png_file, window_size=DEFAULT_WINDOW_SIZE, scale=1,
+                     virtual_time_budget=None, timeout=30, chrome_path=None) -> dict:
+    """DevTools 연결이 불가능할 때 쓰는 기존 방식 (캡처마다 Chrome 1회 실행)"""
+    chrome_path = chrome_path or find_chrome()
+    width, height = parse_window_size(window_size)
+    started = time.perf_counter()
+
+    if not chrome_path:
+        return {"html": str(html_file), "png": str(png_file), "success": False,
+                "elapsed": 0.0, "error": "Chrome을 찾을 수 없습니다"}
+
+    cmd = [
+        chrome_path,
+        "--headless",
+        "--disable-gpu",
+        "--disable-web-security",
+        "--hide-scrollbars",
+        f"--force-device-scale-factor={scale}",
+        f"--window-size={width},{height}",
+        "--run-all-compositor-stages-before-draw",
+    ]
+    if virtual_time_budget:
+        cmd.append(f"--virtual-time-budget={virtual_time_budget}")
+    cmd += [f"--screenshot={png_file}", Path(html_file).absolute().as_uri()]
+
+    # 이전 실행의 PNG가 남아 있으면 실패를 성공으로 오인하므로 먼저 삭제
+    if os.path.exists(png_file):
+        os.remove(png_file)
+
+    error = None
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        if not os.path.exists(png_file):
+            error = result.stderr.strip() or f"Chrome 종료 코드: {result.returncode}"
+    except subprocess.TimeoutExpired:
+        error = "Chrome 스크린샷 타임아웃"
+
+    return {
+        "html": str(html_file),
+        "png": str(png_file),
+        "success": error is None,
+        "elapsed": time.perf_counter() - started,
+        "error": error,
+        "size": None,
+    }
+
+
+def capture_html_to_png(html_file, png_file, window_size=DEFAULT_WINDOW_SIZE, scale=1,
+                        virtual_time_budget=None, timeout=30, fit_selector=None, margin=0) -> dict:
+    """공유 캡처 풀로 HTML을 PNG로 변환 (풀을 쓸 수 없으면 기존 CLI 방식으로 대체)
+
+    fit_selector를 주면 한 번 로드한 페이지에서 요소 크기를 측정해 그 영역만 캡처
+    (CLI 대체 시에는 측정 없이 window_size 그대로 캡처)
+    """
+    pool = get_shared_pool()
+    try:
+        pool.start()
+    except Exception as e:
+        logger.warning("⚠️ DevTools 캡처 풀 사용 불가, 단일 실행 방식으로 대체: %s", e)
+        return capture_with_cli(html_file, png_file, window_size, scale, virtual_time_budget, timeout)
+    return pool.capture(html_file, png_file, window_size, scale, virtual_time_budget, timeout,
+                        fit_selector, margin)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("사용법: python capture_engine.py <html파일> [html파일 ...]")
+        sys.exit(1)
+
+    with CapturePool(size=int(os.environ.get("CAPTURE_POOL_SIZE", "2"))) as pool:
+        for html in sys.argv[1:]:
+            result = pool.capture(html, str(Path(html).with_suffix('.png')))
+            print(f"{'✅' if result['success'] else '❌'} {result['png']} ({result['elapsed']:.2f}s)")
+        pool.log_latency_report()
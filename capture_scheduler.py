@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+병렬 차트 캡처 스케줄러
+HTML→PNG 작업들을 CPU 수만큼의 Chrome 워커에 분배하고
+작업별 타임아웃, 백오프 재시도, 결과 매니페스트(JSON)를 제공
+"""
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from capture_engine import CapturePool, DEFAULT_WINDOW_SIZE, capture_with_cli
+from render_cache import get_default_cache
+from conversion_log import get_logger
+from tracing import flush_trace, span
+
+logger = get_logger("capture")
+
+
+def default_worker_count():
+    """기본 워커 수 - CPU 수 (환경변수 CAPTURE_WORKERS로 조정 가능)"""
+    env_workers = os.environ.get("CAPTURE_WORKERS")
+    if env_workers:
+        return max(1, int(env_workers))
+    return os.cpu_count() or 2
+
+
+class CaptureScheduler:
+    """HTML→PNG 캡처 작업을 병렬로 실행하는 스케줄러"""
+
+    def __init__(self, workers: int = None, timeout: float = 30, max_retries: int = 2,
+                 backoff: float = 1.0, manifest_path: str = None, cache=None):
+        self.workers = workers or default_worker_count()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.manifest_path = manifest_path
+        self.cache = cache
+        self.jobs = []
+
+    def add(self, html_file, png_file, window_size=DEFAULT_WINDOW_SIZE, scale=1,
+            virtual_time_budget=None, name: str = None, fit_selector: str = None, margin: int = 0):
+        """캡처 작업 추가 (fit_selector 지정 시 해당 요소 크기에 맞춰 잘라서 캡처)"""
+        self.jobs.append({
+            "name": name or Path(html_file).stem,
+            "html": str(html_file),
+            "png": str(png_file),
+            "window_size": window_size,
+            "scale": scale,
+            "virtual_time_budget": virtual_time_budget,
+            "fit_selector": fit_selector,
+            "margin": margin,
+        })
+
+    def _run_job(self, pool, job) -> dict:
+        """작업 1개 실행 (추적 구간 "capture")"""
+        with span("capture", name=job["name"]) as capture_span:
+            result = self._capture_with_retry(pool, job)
+            capture_span.set(success=result["success"], attempts=result["attempts"])
+        return result
+
+    def _capture_with_retry(self, pool, job) -> dict:
+        """작업 1개 실행 - 실패하면 지수 백오프 후 재시도"""
+        attempts = 0
+        started = time.perf_counter()
+        result = None
+
+        while attempts <= self.max_retries:
+            attempts += 1
+            if pool is not None:
+                result = pool.capture(job["html"], job["png"], job["window_size"], job["scale"],
+                                      job["virtual_time_budget"], self.timeout,
+                                      job["fit_selector"], job["margin"])
+            else:
+                result = capture_with_cli(job["html"], job["png"], job["window_size"], job["scale"],
+                                          job["virtual_time_budget"], self.timeout)
+            if result["success"]:
+                break
+            if attempts <= self.max_retries:
+                delay = self.backoff * (2 ** (attempts - 1))
+                logger.warning("   ↻ %s 재시도 대기 %.1fs (%d/%d): %s", job['name'], delay, attempts,
+                               self.max_retries + 1, result['error'])
+                time.sleep(delay)
+
+        if result["success"] and self.cache is not None and job.get("cache_key"):
+            self.cache.put(job["cache_key"], job["png"])
+
+        result.update({
+            "name": job["name"],
+            "cached": False,
+            "attempts": attempts,
+            "elapsed": time.perf_counter() - started,
+            "window_size": list(job["window_size"]) if not isinstance(job["window_size"], str) else job["window_size"],
+        })
+        logger.log(logging.INFO if result["success"] else logging.WARNING, "%s %s (%.2fs, 시도 %d회)",
+                   "✅" if result["success"] else "❌", job['name'], result['elapsed'], attempts)
+        return result
+
+    def _lookup_cache(self, job):
+        """렌더 캐시에 있으면 PNG를 복사하고 결과 반환 (없으면 None)"""
+        started = time.perf_counter()
+        job["cache_key"] = self.cache.key_for(job["html"], job["window_size"], job["scale"],
+                                              job["virtual_time_budget"], job["fit_selector"], job["margin"])
+        if not self.cache.get(job["cache_key"], job["png"]):
+            return None
+
+        logger.info("💾 %s (캐시 사용)", job['name'])
+        return {
+            "html": job["html"],
+            "png": job["png"],
+            "success": True,
+            "elapsed": time.perf_counter() - started,
+            "error": None,
+            "size": None,
+            "name": job["name"],
+            "cached": True,
+            "attempts": 0,
+            "window_size": list(job["window_size"]) if not isinstance(job["window_size"], str) else job["window_size"],
+        }
+
+    def run(self) -> list:
+        """등록된 모든 작업을 병렬 실행하고 결과 목록 반환 (등록 순서 유지)"""
+        if not self.jobs:
+            return []
+
+        started_at = datetime.now()
+        started = time.perf_counter()
+
+        results = [None] * len(self.jobs)
+        if self.cache is not None:
+            for index, job in enumerate(self.jobs):
+                results[index] = self._lookup_cache(job)
+        pending = [index for index, result in enumerate(results) if result is None]
+
+        worker_count = min(self.workers, len(pending))
+        if pending:
+            logger.info("🎯 캡처 작업 %d개, 워커 %d개로 병렬 실행", len(pending), worker_count)
+
+            pool = CapturePool(size=worker_count)
+            try:
+                pool.start()
+            except Exception as e:
+                logger.warning("⚠️ DevTools 캡처 풀 사용 불가, 단일 실행 방식으로 대체: %s", e)
+                pool = None
+
+            try:
+                with ThreadPoolExecutor(max_workers=worker_count) as executor:
+                    captured = list(executor.map(lambda index: self._run_job(pool, self.jobs[index]), pending))
+            finally:
+                if pool is not None:
+                    pool.close()
+
+            for index, result in zip(pending, captured):
+                results[index] = result
+
+        if self.cache is not None:
+            self.cache.log_stats()
+
+        total_elapsed = time.perf_counter() - started
+        succeeded = sum(1 for r in results if r["success"])
+        logger.info("🎉 캡처 완료: %d/%d개 성공, 총 %.2fs", succeeded, len(results), total_elapsed)
+
+        if self.manifest_path:
+            self.write_manifest(results, started_at, total_elapsed, worker_count)
+        flush_trace()
+        return results
+
+    def write_manifest(self, results, started_at, total_elapsed, worker_count):
+        """결과 매니페스트를 JSON으로 저장"""
+        manifest = {
+            "started_at": started_at.isoformat(timespec='seconds'),
+            "total_elapsed": round(total_elapsed, 3),
+            "workers": worker_count,
+            "succeeded": sum(1 for r in results if r["success"]),
+            "failed": sum(1 for r in results if not r["success"]),
+            "cached": sum(1 for r in results if r.get("cached")),
+            "jobs": [
+                {
+                    "name": r["name"],
+                    "html": r["html"],
+                    "png": r["png"],
+                    "success": r["success"],
+                    "cached": r.get("cached", False),
+                    "attempts": r["attempts"],
+                    "elapsed": round(r["elapsed"], 3),
+                    "window_size": r["window_size"],
+                    "size": r.get("size"),
+                    "error": r["error"],
+                }
+                for r in results
+            ],
+        }
+        Path(self.manifest_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        logger.info("📋 캡처 매니페스트 저장: %s", self.manifest_path)
+
+
+def capture_all(jobs, workers: int = None, timeout: float = 30, max_retries: int = 2,
+                manifest_path: str = None, cache=None) -> list:
+    """(html, png, window_size) 목록을 한 번에 병렬 캡처하는 간편 함수"""
+    scheduler = CaptureScheduler(workers=workers, timeout=timeout, max_retries=max_retries,
+                                 manifest_path=manifest_path, cache=cache)
+    for job in jobs:
+        scheduler.add(*job)
+    return scheduler.run()
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("사용법: python capture_scheduler.py <html파일> [html파일 ...]")
+        sys.exit(1)
+
+    scheduler = CaptureScheduler(manifest_path="capture_manifest.json", cache=get_default_cache())
+    for html in sys.argv[1:]:
+        scheduler.add(html, str(Path(html).with_suffix('.png')))
+    scheduler.run()
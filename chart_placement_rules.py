@@ -6,6 +6,8 @@ import re
 from typing import List, Dict, Tuple, Optional
 from pathlib import Path
 
+from md_document import Heading, MarkdownDocument, PageMarker, load_markdown
+
 
 class ChartPlacementRules:
     """사업계획서 섹션별 차트 배치 규칙을 관리하는 클래스"""
@@ -189,8 +191,8 @@ class ImagePlacementProcessor:
         # HTML 파일들에서 PNG 생성 (실제 캡처는 GUI에서 처리)
         image_files = self._prepare_image_files(html_files)
         
-        # MD 내용을 섹션별로 분석하고 이미지 삽입
-        new_content = self._insert_images_by_sections(md_content, image_files)
+        # MD 내용을 섹션별로 분석하고 이미지 삽입 (DOCX 변환과 같은 파싱 결과의 제목 노드로 섹션 구분)
+        new_content = self._insert_images_by_sections(load_markdown(md_content), image_files)
         
         return new_content
     
@@ -235,64 +237,76 @@ class ImagePlacementProcessor:
         else:
             return 'growth_chart'  # 기본값
     
-    def _insert_images_by_sections(self, md_content: str, image_files: List[Dict]) -> str:
+    @staticmethod
+    def _section_title(node) -> Optional[str]:
+        """섹션을 시작하는 노드면 섹션 제목, 아니면 None
+
+        0열에서 시작하는 # ~ ### 제목과 ### Page 구분자가 섹션 시작 (#### 이하와 들여쓴 제목은 섹션 안의 내용)
+        """
+        raw = node.token.raw
+        if not raw.startswith('#') or raw.startswith('####'):
+            return None
+        if isinstance(node, Heading):
+            return node.text
+        if isinstance(node, PageMarker):
+            return f"Page {node.page}"
+        return None
+    
+    def _insert_images_by_sections(self, document: MarkdownDocument, image_files: List[Dict]) -> str:
         """섹션별로 이미지를 삽입합니다."""
-        lines = md_content.split('\n')
-        new_lines = []
+        lines = document.lines()
         used_images = set()
         
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            new_lines.append(line)
+        # 헤더 섹션 감지 (섹션 시작 라인 번호, 제목)
+        sections = []
+        for node in document.select(Heading, PageMarker):
+            section_title = self._section_title(node)
+            if section_title is not None:
+                sections.append((node.line, section_title))
+        
+        # 첫 섹션 앞의 내용은 그대로
+        new_lines = lines[:sections[0][0]] if sections else list(lines)
+        
+        for index, (start, section_title) in enumerate(sections):
+            new_lines.append(lines[start])
             
-            # 헤더 섹션 감지
-            if line.startswith('#') and not line.startswith('####'):
-                section_title = line.lstrip('#').strip()
-                
-                # 다음 헤더까지의 내용 수집
-                section_content = []
-                j = i + 1
-                while j < len(lines) and not (lines[j].startswith('#') and not lines[j].startswith('####')):
-                    section_content.append(lines[j])
-                    j += 1
-                
-                section_text = '\n'.join(section_content)
-                
-                # 섹션 분석
-                analysis = self.placement_rules.analyze_section(section_title, section_text)
+            # 다음 헤더까지의 내용 수집
+            end = sections[index + 1][0] if index + 1 < len(sections) else len(lines)
+            section_content = lines[start + 1:end]
+            
+            section_text = '\n'.join(section_content)
+            
+            # 섹션 분석
+            analysis = self.placement_rules.analyze_section(section_title, section_text)
+            
+            if analysis.get("requires_chart"):
+                # 적합한 이미지 찾기
+                suitable_image = self._find_suitable_image(
+                    image_files, analysis["chart_types"], used_images
+                )
                 
-                if analysis.get("requires_chart"):
-                    # 적합한 이미지 찾기
-                    suitable_image = self._find_suitable_image(
-                        image_files, analysis["chart_types"], used_images
+                if suitable_image:
+                    used_images.add(suitable_image["filename"])
+                    
+                    # 삽입 위치 계산
+                    insertion_pos = analysis["insertion_position"]
+                    
+                    # 이미지와 캡션 생성
+                    image_line, caption_line = self._create_image_markdown(
+                        suitable_image, section_title, analysis
                     )
                     
-                    if suitable_image:
-                        used_images.add(suitable_image["filename"])
-                        
-                        # 삽입 위치 계산
-                        insertion_pos = analysis["insertion_position"]
-                        
-                        # 이미지와 캡션 생성
-                        image_line, caption_line = self._create_image_markdown(
-                            suitable_image, section_title, analysis
-                        )
-                        
-                        # 섹션 내용에 이미지 삽입
-                        if insertion_pos < len(section_content):
-                            section_content.insert(insertion_pos, '')
-                            section_content.insert(insertion_pos + 1, image_line)
-                            section_content.insert(insertion_pos + 2, caption_line)
-                            section_content.insert(insertion_pos + 3, '')
-                        else:
-                            section_content.extend(['', image_line, caption_line, ''])
-                
-                # 수정된 섹션 내용 추가
-                new_lines.extend(section_content)
-                i = j - 1  # 이미 처리한 라인들 건너뛰기
+                    # 섹션 내용에 이미지 삽입
+                    if insertion_pos < len(section_content):
+                        section_content.insert(insertion_pos, '')
+                        section_content.insert(insertion_pos + 1, image_line)
+                        section_content.insert(insertion_pos + 2, caption_line)
+                        section_content.insert(insertion_pos + 3, '')
+                    else:
+                        section_content.extend(['', image_line, caption_line, ''])
             
-            i += 1
+            # 수정된 섹션 내용 추가
+            new_lines.extend(section_content)
         
         return '\n'.join(new_lines)
     
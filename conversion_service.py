@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+MD → DOCX 변환 서비스 (asyncio HTTP / Unix 소켓)
+업로드된 마크다운을 작업 큐에 넣고 워커가 변환기 모듈로 직접 변환 (Tk GUI를 거치지 않음)
+작업마다 진행 단계(parse → charts → capture → assemble → save)를 이벤트로 기록해 스트리밍하고,
+큐가 가득 차면 503으로 거절해서 처리량 이상으로 작업이 쌓이지 않게 함
+
+엔드포인트
+  POST /convert            본문(마크다운 또는 multipart 파일)을 변환하고 끝나면 DOCX 응답
+  POST /jobs               작업만 등록하고 작업 정보 응답 (202)
+  GET  /jobs/<id>          작업 상태
+  GET  /jobs/<id>/events   진행 이벤트 스트림 (한 줄에 JSON 1개, 작업이 끝나면 종료)
+  GET  /jobs/<id>/result   결과 DOCX
+  GET  /health             큐/워커 상태
+
+이미지는 작업마다 만드는 업로드 디렉토리 기준으로만 찾는다 (multipart로 마크다운과 함께 올린 이미지 파일)
+절대 경로나 업로드 디렉토리 밖(..)을 가리키는 이미지 참조는 400으로 거절해서 서버의 파일을 읽지 못하게 함
+차트 HTML은 받지 않음 (캡처용 Chrome이 로컬 파일 접근을 허용한 채로 실행되므로)
+"""
+
+import asyncio
+import email.parser
+import email.policy
+import functools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlsplit
+
+from complete_capture import capture_charts, find_chart_sources
+from conversion_log import get_logger
+from md_to_docx_converter import DocxConverter
+from md_tokenizer import iter_image_refs
+
+logger = get_logger("service")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE_SIZE = 16
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+MAX_HEADER_LINES = 100
+# 마크다운과 함께 올릴 수 있는 첨부 파일 (DOCX에 넣을 이미지만)
+UPLOAD_IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tif', '.tiff')
+MARKDOWN_SUFFIXES = ('.md', '.markdown', '.txt')
+MAX_FINISHED_JOBS = 100  # 결과를 보관할 완료 작업 수 (오래된 것부터 제거)
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+STATUS_TEXT = {
+    200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    409: "Conflict", 413: "Payload Too Large", 431: "Request Header Fields Too Large",
+    500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+def default_worker_count():
+    """기본 워커 수 - CPU 수 (환경변수 CONVERT_SERVICE_WORKERS로 조정 가능)"""
+    env_workers = os.environ.get("CONVERT_SERVICE_WORKERS")
+    if env_workers:
+        return max(1, int(env_workers))
+    return os.cpu_count() or 2
+
+
+class ServiceBusy(Exception):
+    """작업 큐가 가득 참"""
+
+
+class HTTPError(Exception):
+    """요청 처리 중 응답할 HTTP 오류"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def upload_relative_path(path: str) -> str:
+    """업로드 디렉토리 기준 상대 경로로 정규화 (절대 경로이거나 디렉토리 밖을 가리키면 HTTPError 400)"""
+    normalized = os.path.normpath(path.replace('\\', '/')) if path else ''
+    if (not normalized or normalized == os.curdir or os.path.isabs(normalized)
+            or os.path.splitdrive(normalized)[0]
+            or normalized == os.pardir or normalized.startswith(os.pardir + os.sep)):
+        raise HTTPError(400, f"업로드 디렉토리 밖의 파일은 사용할 수 없습니다: {path[:80]}")
+    return normalized
+
+
+def check_image_refs(markdown: str):
+    """마크다운의 이미지 참조가 모두 업로드 디렉토리 안을 가리키는지 확인 (아니면 HTTPError 400)"""
+    for _, image_path in iter_image_refs(markdown.split('\n')):
+        upload_relative_path(image_path)
+
+
+class ConversionJob:
+    """변환 작업 1개 - 진행 이벤트 기록과 결과 보관
+
+    upload_dir: 작업의 업로드 디렉토리 (첨부 이미지를 두고 상대 이미지 경로의 기준으로 사용, 작업이 끝나면 삭제)
+    """
+
+    def __init__(self, name: str, markdown: str, upload_dir: str = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.markdown = markdown
+        self.upload_dir = upload_dir
+        self.status = "queued"  # queued → running → done / failed
+        self.events = []
+        self.result: Optional[bytes] = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self._changed = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def add_event(self, stage: str, **detail):
+        """진행 이벤트 기록하고 기다리는 스트림 깨우기 (이벤트 루프 스레드에서만 호출)"""
+        self.events.append({"job": self.id, "stage": stage,
+                            "elapsed": round(time.time() - self.created, 3), **detail})
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_for_event(self, seen: int):
+        """seen개 이후 이벤트가 생기거나 작업이 끝날 때까지 대기"""
+        while len(self.events) <= seen and not self.done:
+            await self._changed.wait()
+
+    async def wait_done(self):
+        while not self.done:
+            await self._changed.wait()
+
+    def to_dict(self) -> dict:
+        return {
+            "job": self.id,
+            "name": self.name,
+            "status": self.status,
+            "stage": self.events[-1]["stage"] if self.events else None,
+            "error": self.error,
+            "bytes": len(self.result) if self.result is not None else None,
+            "created": self.created,
+            "finished": self.finished,
+        }
+
+
+class ConversionService:
+    """작업 큐와 변환 워커 (워커 스레드마다 DocxConverter 1개를 재사용)"""
+
+    def __init__(self, workers: int = None, queue_size: int = None, capture_charts: bool = True):
+        self.workers = workers or default_worker_count()
+        self.queue_size = queue_size or int(os.environ.get("CONVERT_QUEUE_SIZE", DEFAULT_QUEUE_SIZE))
+        self.capture_charts = capture_charts
+        self.jobs: "OrderedDict[str, ConversionJob]" = OrderedDict()
+        self.running = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks = []
+        self._local = threading.local()
+        self._capture_lock = threading.Lock()  # 같은 차트 PNG를 여러 작업이 동시에 쓰지 않도록
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="convert")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False)
+
+    def submit(self, markdown: str, name: str = "document", attachments: dict = None) -> ConversionJob:
+        """작업 등록 - 업로드 디렉토리를 만들고 첨부 파일({상대 경로: 바이트})을 저장 (큐가 가득 차면 ServiceBusy)"""
+        if self._queue.full():
+            raise ServiceBusy(f"변환 대기열이 가득 찼습니다 ({self.queue_size}개)")
+        upload_dir = tempfile.mkdtemp(prefix="md_to_docx_job_")
+        try:
+            for relative_path, data in (attachments or {}).items():
+                target = os.path.join(upload_dir, upload_relative_path(relative_path))
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with open(target, 'wb') as f:
+                    f.write(data)
+        except BaseException:
+            shutil.rmtree(upload_dir, ignore_errors=True)
+            raise
+        job = ConversionJob(name, markdown, upload_dir)
+        self._queue.put_nowait(job)
+        self.jobs[job.id] = job
+        job.add_event("queued", position=self._queue.qsize())
+        self._prune_jobs()
+        return job
+
+    def _prune_jobs(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def health(self) -> dict:
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "queued": self._queue.qsize(),
+            "queue_size": self.queue_size,
+            "jobs": len(self.jobs),
+        }
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            self.running += 1
+
+            def emit(stage, **detail):
+                loop.call_soon_threadsafe(functools.partial(job.add_event, stage, **detail))
+
+            started = time.perf_counter()
+            try:
+                job.result = await loop.run_in_executor(self._executor, self._convert, job, emit)
+                job.status = "done"
+                job.add_event("done", bytes=len(job.result), seconds=round(time.perf_counter() - started, 3))
+                logger.info("✅ %s 변환 완료 (%.2fs)", job.name, time.perf_counter() - started)
+            except Exception as e:
+                job.status = "failed"
+                job.error = f"{type(e).__name__}: {e}"
+                job.add_event("error", message=job.error)
+                logger.exception("❌ %s 변환 실패: %s", job.name, job.error)
+            finally:
+                job.markdown = None
+                shutil.rmtree(job.upload_dir, ignore_errors=True)
+                job.finished = time.time()
+                self.running -= 1
+                self._queue.task_done()
+
+    def _converter(self) -> DocxConverter:
+        """워커 스레드의 변환기 (문서별 상태는 변환할 때마다 초기화됨)"""
+        converter = getattr(self._local, "converter", None)
+        if converter is None:
+            converter = self._local.converter = DocxConverter()
+        return converter
+
+    def _convert(self, job: ConversionJob, emit: Callable) -> bytes:
+        """워커 스레드에서 실행 - 차트 캡처 후 DOCX 조립 (이미지는 작업의 업로드 디렉토리에서 찾음)"""
+        converter = self._converter()
+        converter.image_dir = job.upload_dir
+
+        emit("parse")
+        image_paths = [converter.resolve_image_path(path) for _, path in iter_image_refs(job.markdown.split('\n'))]
+
+        emit("charts", images=len(image_paths))
+        charts = find_chart_sources(image_paths) if self.capture_charts else []
+
+        emit("capture", count=len(charts))
+        if charts:
+            self._capture(charts, emit)
+
+        return converter.convert_markdown_text(job.markdown, progress=emit)
+
+    def _capture(self, charts: List[Tuple[str, str]], emit: Callable):
+        """차트 HTML을 PNG로 캡처 (실패한 차트는 경고 이벤트만 남기고 변환 계속)"""
+        with self._capture_lock:
+            # 잠금을 기다리는 동안 다른 작업이 같은 차트를 캡처했을 수 있으므로 다시 확인
+            charts = find_chart_sources([png_file for _, png_file in charts])
+            for result in capture_charts(charts):
+                if not result["success"]:
+                    emit("warning", message=f"차트 캡처 실패: {Path(result['html']).name}: {result['error']}")
+
+
+async def read_line(reader: asyncio.StreamReader, status: int, message: str) -> bytes:
+    """한 줄 읽기 (StreamReader 한도(기본 64KB)를 넘는 줄이면 HTTPError)"""
+    try:
+        return await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        raise HTTPError(status, message)
+
+
+async def read_request(reader: asyncio.StreamReader, max_body: int):
+    """HTTP 요청 1개 읽기 → (method, path, query, headers, body), 연결이 닫혔으면 None"""
+    request_line = await read_line(reader, 400, "요청 줄이 너무 깁니다")
+    if not request_line.strip():
+        return None
+    try:
+        method, target, _ = request_line.decode('latin-1').split(' ', 2)
+    except ValueError:
+        raise HTTPError(400, "잘못된 요청 줄")
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES + 1):
+        line = await read_line(reader, 431, "헤더 줄이 너무 깁니다")
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HTTPError(431, f"헤더가 너무 많습니다 (최대 {MAX_HEADER_LINES}줄)")
+
+    content_length = headers.get('content-length') or '0'
+    # 숫자만 허용 (int()는 '-1', '+5', '1_000'도 받아들이므로 직접 확인)
+    if not (content_length.isascii() and content_length.isdigit()):
+        raise HTTPError(400, f"잘못된 Content-Length: {content_length[:40]}")
+    length = int(content_length)
+    if length > max_body:
+        raise HTTPError(413, f"업로드 크기 제한({max_body // (1024 * 1024)}MB)을 넘었습니다")
+    body = await reader.readexactly(length) if length else b''
+
+    url = urlsplit(target)
+    query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+    return method.upper(), url.path.rstrip('/') or '/', query, headers, body
+
+
+def extract_markdown(headers: dict, body: bytes, query: dict) -> Tuple[str, str, dict]:
+    """요청 본문에서 (문서 이름, 마크다운, 첨부 이미지) 추출 - 본문 그대로 또는 multipart/form-data
+
+    multipart면 확장자가 .md/.markdown/.txt인 첫 파일(없으면 첫 부분)이 마크다운이고,
+    나머지 파일은 {파일 이름(상대 경로 가능): 바이트}의 첨부 이미지 (이미지가 아니면 400)
+    """
+    content_type = headers.get('content-type', '')
+    name = query.get('name')
+    attachments = {}
+    if content_type.startswith('multipart/form-data'):
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode('latin-1') + body)
+        parts = [part for part in message.iter_parts() if part.get_filename()] or list(message.iter_parts())
+        if not parts:
+            raise HTTPError(400, "업로드된 파일이 없습니다")
+        markdown_part = next((part for part in parts
+                              if (part.get_filename() or '').lower().endswith(MARKDOWN_SUFFIXES)), parts[0])
+        for part in parts:
+            if part is markdown_part:
+                continue
+            filename = part.get_filename()
+            if not filename or not filename.lower().endswith(UPLOAD_IMAGE_SUFFIXES):
+                raise HTTPError(400, f"이미지 파일만 함께 올릴 수 있습니다: {(filename or '')[:80]}")
+            attachments[upload_relative_path(filename)] = part.get_payload(decode=True) or b''
+        body = markdown_part.get_payload(decode=True) or b''
+        name = name or markdown_part.get_filename()
+    if not body.strip():
+        raise HTTPError(400, "마크다운 내용이 비어 있습니다")
+    try:
+        markdown = body.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise HTTPError(400, "마크다운은 UTF-8이어야 합니다")
+    check_image_refs(markdown)
+    return Path(name or "document").stem, markdown, attachments
+
+
+class ConversionServer:
+    """HTTP 요청을 ConversionService 작업으로 연결"""
+
+    def __init__(self, service: ConversionService, max_upload_bytes: int = MAX_UPLOAD_BYTES):
+        self.service = service
+        self.max_upload_bytes = max_upload_bytes
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            try:
+                request = await read_request(reader, self.max_upload_bytes)
+                if request is not None:
+                    await self.dispatch(writer, *request)
+            except HTTPError as e:
+                await self.send_json(writer, e.status, {"error": e.message})
+            except ServiceBusy as e:
+                await self.send_json(writer, 503, {"error": str(e)}, {"Retry-After": "5"})
+            except (asyncio.IncompleteReadError, ConnectionError):
+                pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, writer, method, path, query, headers, body):
+        parts = path.strip('/').split('/')
+
+        if path == '/health':
+            return await self.send_json(writer, 200, self.service.health())
+
+        if path in ('/convert', '/jobs'):
+            if method != 'POST':
+                raise HTTPError(405, "POST만 지원합니다")
+            name, markdown, attachments = extract_markdown(headers, body, query)
+            job = self.service.submit(markdown, name, attachments)
+            if path == '/jobs':
+                return await self.send_json(writer, 202, job.to_dict(), {"Location": f"/jobs/{job.id}"})
+            await job.wait_done()
+            return await self.send_result(writer, job)
+
+        if parts[0] == 'jobs' and len(parts) in (2, 3):
+            job = self.service.jobs.get(parts[1])
+            if job is None:
+                raise HTTPError(404, "작업을 찾을 수 없습니다")
+            action = parts[2] if len(parts) == 3 else None
+            if action is None:
+                return await self.send_json(writer, 200, job.to_dict())
+            if action == 'events':
+                return await self.stream_events(writer, job)
+            if action == 'result':
+                return await self.send_result(writer, job)
+
+        raise HTTPError(404, "알 수 없는 경로입니다")
+
+    async def send(self, writer, status: int, body: bytes, content_type: str, headers: dict = None):
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+                 f"Content-Type: {content_type}",
+                 f"Content-Length: {len(body)}",
+                 "Connection: close"]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    async def send_json(self, writer, status: int, data: dict, headers: dict = None):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        await self.send(writer, status, body, "application/json; charset=utf-8", headers)
+
+    async def send_result(self, writer, job: ConversionJob):
+        if job.status == "failed":
+            return await self.send_json(writer, 500, job.to_dict())
+        if job.status != "done":
+            return await self.send_json(writer, 409, job.to_dict())
+        filename = f"{job.name}.docx"
+        disposition = f"attachment; filename=\"document.docx\"; filename*=UTF-8''{quote(filename)}"
+        await self.send(writer, 200, job.result, DOCX_CONTENT_TYPE, {"Content-Disposition": disposition})
+
+    async def stream_events(self, writer, job: ConversionJob):
+        """지금까지의 이벤트를 보내고 작업이 끝날 때까지 새 이벤트를 이어서 전송 (chunked)"""
+        writer.write(("HTTP/1.1 200 OK\r\n"
+                      "Content-Type: application/x-ndjson; charset=utf-8\r\n"
+                      "Transfer-Encoding: chunked\r\n"
+                      "Cache-Control: no-cache\r\n"
+                      "Connection: close\r\n\r\n").encode('latin-1'))
+        sent = 0
+        while True:
+            await job.wait_for_event(sent)
+            for event in job.events[sent:]:
+                line = (json.dumps(event, ensure_ascii=False) + '\n').encode('utf-8')
+                writer.write(f"{len(line):X}\r\n".encode('latin-1') + line + b'\r\n')
+            sent = len(job.events)
+            await writer.drain()
+            if job.done and sent == len(job.events):
+                break
+        writer.write(b'0\r\n\r\n')
+        await writer.drain()
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: str = None,
+                workers: int = None, queue_size: int = None):
+    """변환 서비스 실행 (unix_path를 주면 TCP 대신 Unix 소켓에서 대기)"""
+    service = ConversionService(workers=workers, queue_size=queue_size)
+    await service.start()
+    server = ConversionServer(service)
+
+    if unix_path:
+        listener = await asyncio.start_unix_server(server.handle, path=unix_path)
+        address = f"unix:{unix_path}"
+    else:
+        listener = await asyncio.start_server(server.handle, host=host, port=port)
+        address = f"http://{host}:{port}"
+    print(f"🚀 MD → DOCX 변환 서비스 시작: {address} (워커 {service.workers}개, 대기열 {service.queue_size}개)")
+
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(args=None):
+    """사용법: python conversion_service.py [--host 주소] [--port 포트] [--unix 소켓경로] [-j 워커수] [-q 대기열크기]"""
+    args = list(sys.argv[1:] if args is None else args)
+    options = {"host": DEFAULT_HOST, "port": DEFAULT_PORT, "unix_path": None, "workers": None, "queue_size": None}
+
+    while args:
+        arg = args.pop(0)
+        if arg == "--host" and args:
+            options["host"] = args.pop(0)
+        elif arg == "--port" and args:
+            options["port"] = int(args.pop(0))
+        elif arg == "--unix" and args:
+            options["unix_path"] = args.pop(0)
+        elif arg in ("-j", "--workers") and args:
+            options["workers"] = int(args.pop(0))
+        elif arg in ("-q", "--queue-size") and args:
+            options["queue_size"] = int(args.pop(0))
+        else:
+            print(main.__doc__)
+            sys.exit(1)
+
+    try:
+        asyncio.run(serve(**options))
+    except KeyboardInterrupt:
+        print("\n👋 변환 서비스 종료")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,20 @@
 
 # MD to DOCX 변환 스크립트
 # 사용법: ./convert.sh input.md [output.docx]
+#         ./convert.sh 폴더/ [출력폴더]   (폴더 안의 .md 파일 일괄 병렬 변환)
+#         ./convert.sh --watch input.md [output.docx]   (MD/차트가 바뀔 때마다 자동으로 다시 변환)
+
+WATCH=""
+if [ "$1" = "--watch" ]; then
+    WATCH=1
+    shift
+fi
 
 if [ $# -lt 1 ]; then
     echo "사용법: $0 <input.md> [output.docx]"
     echo "예시: $0 document.md"
     echo "예시: $0 document.md custom_output.docx"
+    echo "예시: $0 --watch document.md"
     exit 1
 fi
 
@@ -14,7 +23,7 @@ INPUT_FILE="$1"
 OUTPUT_FILE="$2"
 
 # 입력 파일 존재 확인
-if [ ! -f "$INPUT_FILE" ]; then
+if [ ! -f "$INPUT_FILE" ] && [ ! -d "$INPUT_FILE" ]; then
     echo "오류: 입력 파일을 찾을 수 없습니다: $INPUT_FILE"
     exit 1
 fi
@@ -37,7 +46,14 @@ fi
 mkdir -p output
 
 # 변환 실행
-if [ -n "$OUTPUT_FILE" ]; then
+if [ -n "$WATCH" ]; then
+    # 감시 모드 (Ctrl+C로 종료) - 처음 변환 후 결과 문서를 열어 둠
+    python watch_converter.py "$INPUT_FILE" ${OUTPUT_FILE:+"output/$OUTPUT_FILE"} --open
+    exit 0
+elif [ -d "$INPUT_FILE" ]; then
+    # 폴더가 주어지면 일괄 변환 (요약은 출력폴더/batch_summary.json)
+    python batch_converter.py "$INPUT_FILE" -o "${OUTPUT_FILE:-output}"
+elif [ -n "$OUTPUT_FILE" ]; then
     # 출력 파일이 지정된 경우, output 폴더에 저장
     OUTPUT_PATH="output/$OUTPUT_FILE"
     python md_to_docx_converter.py "$INPUT_FILE" "$OUTPUT_PATH"
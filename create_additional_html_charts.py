@@ -3,7 +3,8 @@
 
 import os
 from pathlib import Path
-import subprocess
+from capture_engine import add_ready_signal
+from render_cache import cached_capture, get_default_cache
 
 class AdditionalHTMLChartGenerator:
     """
@@ -14,6 +15,7 @@ class AdditionalHTMLChartGenerator:
     def __init__(self):
         self.output_dir = Path("/Users/dykim/dev/make-docs/images")
         self.output_dir.mkdir(exist_ok=True)
+        self.render_cache = get_default_cache()
         
         # 최적화된 차트별 캡처 사이즈 매핑 (표준 설정) 
         self.optimal_sizes = {
@@ -269,7 +271,7 @@ class AdditionalHTMLChartGenerator:
         
         html_file = self.output_dir / "trl_roadmap.html"
         with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(add_ready_signal(html_content))
         
         return str(html_file)
     
@@ -450,7 +452,7 @@ class AdditionalHTMLChartGenerator:
         
         html_file = self.output_dir / "organization_chart.html"
         with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(add_ready_signal(html_content))
         
         return str(html_file)
     
@@ -690,7 +692,7 @@ class AdditionalHTMLChartGenerator:
         
         html_file = self.output_dir / "risk_matrix.html"
         with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(add_ready_signal(html_content))
         
         return str(html_file)
     
@@ -949,7 +951,7 @@ class AdditionalHTMLChartGenerator:
         
         html_file = self.output_dir / "swot_analysis.html"
         with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(add_ready_signal(html_content))
         
         return str(html_file)
     
@@ -961,46 +963,22 @@ class AdditionalHTMLChartGenerator:
         return "1000,600"  # 기본값
     
     def capture_html_to_png(self, html_file_path, output_png_path):
-        """HTML 파일을 PNG로 캡처"""
+        """HTML 파일을 PNG로 캡처 - 렌더링 완료 신호까지 대기 (변경 없으면 렌더 캐시 사용)"""
         try:
-            chrome_paths = [
-                "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-                "/Applications/Chrome.app/Contents/MacOS/Chrome"
-            ]
-            
-            chrome_path = None
-            for path in chrome_paths:
-                if os.path.exists(path):
-                    chrome_path = path
-                    break
-            
-            if not chrome_path:
-                print("Chrome을 찾을 수 없어 PNG 변환을 건너뜁니다.")
-                return False
-            
             # 표준 최적화된 캡처 사이즈 자동 선택
             window_size = self.get_optimal_window_size(html_file_path)
             
-            cmd = [
-                chrome_path,
-                "--headless",
-                "--disable-gpu",
-                "--disable-web-security",
-                "--hide-scrollbars",
-                "--force-device-scale-factor=1",
-                "--window-size=" + window_size,
-                "--virtual-time-budget=5000",
-                "--run-all-compositor-stages-before-draw",
-                "--screenshot=" + output_png_path,
-                "file://" + html_file_path
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = cached_capture(
+                html_file_path, output_png_path,
+                window_size=window_size,
+                virtual_time_budget=5000,  # 완료 신호가 없는 HTML용
+                cache=self.render_cache
+            )
             
-            if result.returncode == 0 and os.path.exists(output_png_path):
+            if result["success"]:
                 return True
             else:
-                print(f"Chrome 스크린샷 실패: {result.stderr}")
+                print(f"Chrome 스크린샷 실패: {result['error']}")
                 return False
                 
         except Exception as e:
@@ -4,8 +4,8 @@
 import os
 from pathlib import Path
 import base64
-import subprocess
-import time
+from capture_engine import add_ready_signal, close_shared_pool, get_shared_pool
+from render_cache import cached_capture, get_default_cache
 
 class HTMLChartGenerator:
     """
@@ -16,6 +16,7 @@ class HTMLChartGenerator:
     def __init__(self):
         self.output_dir = Path("/Users/dykim/dev/make-docs/images")
         self.output_dir.mkdir(exist_ok=True)
+        self.render_cache = get_default_cache()
         
         # 최적화된 차트별 캡처 사이즈 매핑 (표준 설정)
         self.optimal_sizes = {
@@ -217,7 +218,7 @@ class HTMLChartGenerator:
         
         html_file = self.output_dir / "system_architecture.html"
         with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(add_ready_signal(html_content))
         
         return str(html_file)
     
@@ -443,7 +444,7 @@ class HTMLChartGenerator:
         
         html_file = self.output_dir / "market_growth_trends.html"
         with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(add_ready_signal(html_content))
         
         return str(html_file)
     
@@ -667,7 +668,7 @@ class HTMLChartGenerator:
         
         html_file = self.output_dir / "budget_distribution.html"
         with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(add_ready_signal(html_content))
         
         return str(html_file)
     
@@ -821,7 +822,7 @@ class HTMLChartGenerator:
         
         html_file = self.output_dir / "market_growth_line.html"
         with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(add_ready_signal(html_content))
         
         return str(html_file)
     
@@ -923,7 +924,7 @@ class HTMLChartGenerator:
         
         html_file = self.output_dir / "market_growth_regional.html"
         with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(add_ready_signal(html_content))
         
         return str(html_file)
     
@@ -1043,7 +1044,7 @@ class HTMLChartGenerator:
         
         html_file = self.output_dir / "budget_pie.html"
         with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(add_ready_signal(html_content))
         
         return str(html_file)
     
@@ -1178,7 +1179,7 @@ class HTMLChartGenerator:
         
         html_file = self.output_dir / "budget_trend.html"
         with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(add_ready_signal(html_content))
         
         return str(html_file)
     
@@ -1190,52 +1191,26 @@ class HTMLChartGenerator:
         return "1000,600"  # 기본값
     
     def capture_html_to_png(self, html_file_path, output_png_path):
-        """HTML 파일을 PNG로 캡처 - macOS 스크린샷 사용"""
+        """HTML 파일을 PNG로 캡처 - 워밍된 Chrome 캡처 풀 재사용 (변경 없으면 렌더 캐시 사용)"""
         try:
-            # macOS의 Chrome을 사용하여 HTML을 PNG로 변환
-            chrome_paths = [
-                "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-                "/Applications/Chrome.app/Contents/MacOS/Chrome"
-            ]
-            
-            chrome_path = None
-            for path in chrome_paths:
-                if os.path.exists(path):
-                    chrome_path = path
-                    break
-            
-            if not chrome_path:
-                print("Chrome을 찾을 수 없어 PNG 변환을 건너뜁니다.")
-                return False
-            
             # 표준 최적화된 캡처 사이즈 자동 선택
             window_size = self.get_optimal_window_size(html_file_path)
             
-            cmd = [
-                chrome_path,
-                "--headless",
-                "--disable-gpu",
-                "--disable-web-security",
-                "--hide-scrollbars",
-                "--force-device-scale-factor=1",
-                "--window-size=" + window_size,
-                "--virtual-time-budget=5000",
-                "--run-all-compositor-stages-before-draw",
-                "--screenshot=" + output_png_path,
-                "file://" + html_file_path
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = cached_capture(
+                html_file_path, output_png_path,
+                window_size=window_size,
+                virtual_time_budget=5000,  # 완료 신호가 없는 HTML용
+                cache=self.render_cache
+            )
             
-            if result.returncode == 0 and os.path.exists(output_png_path):
+            if result["success"]:
+                source = "캐시 사용" if result["cached"] else "캡처"
+                print(f"  {source} 소요 시간: {result['elapsed']:.2f}s")
                 return True
             else:
-                print(f"Chrome 스크린샷 실패: {result.stderr}")
+                print(f"Chrome 스크린샷 실패: {result['error']}")
                 return False
                 
-        except subprocess.TimeoutExpired:
-            print("Chrome 스크린샷 타임아웃")
-            return False
         except Exception as e:
             print(f"HTML to PNG 변환 실패: {e}")
             return False
@@ -1277,8 +1252,11 @@ class HTMLChartGenerator:
         return results
     
     def cleanup(self):
-        """정리 작업"""
-        pass  # subprocess 방식에서는 특별한 정리 작업이 필요하지 않음
+        """정리 작업 - 캡처 풀의 Chrome 종료"""
+        if self.render_cache is not None:
+            self.render_cache.log_stats()
+        get_shared_pool().log_latency_report()
+        close_shared_pool()
 
 if __name__ == "__main__":
     generator = HTMLChartGenerator()
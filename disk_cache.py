@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+디스크 캐시 공용 도우미
+렌더 캐시, 섹션 조각 캐시, 파싱 캐시(그리고 추적 기록, 스타일 템플릿 저장)가 같은 방식으로 파일을 쓰고 정리
+- 캐시 위치: 모두 한 상위 디렉토리 아래 (DOCX_CACHE_DIR, 없으면 사용자 캐시 폴더의 md_to_docx)
+  서비스/GUI/배치 워커를 어느 디렉토리에서 실행해도 그 자리에 캐시 폴더를 만들지 않음
+- 항목 위치: 캐시 디렉토리/<키 앞 2글자>/<키><확장자>
+- 쓰기: 임시 파일(<이름>.<pid>.<스레드>.tmp)에 쓴 뒤 os.replace로 교체
+  (배치 워커가 동시에 같은 항목을 써도 반쯤 쓴 파일을 읽지 않음)
+- 정리: 용량 한도를 넘으면 수정 시각이 가장 오래된 항목부터 삭제 (읽을 때 os.utime으로 시각 갱신 → LRU)
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Tuple, Union
+
+
+def cache_root() -> Path:
+    """캐시 디렉토리들의 기본 상위 디렉토리"""
+    root = os.environ.get("DOCX_CACHE_DIR")
+    if root:
+        return Path(root)
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "md_to_docx"
+
+
+def default_cache_dir(name: str, env_var: str) -> Path:
+    """캐시별 환경변수(env_var)로 지정한 위치, 없으면 cache_root() 아래 name"""
+    return Path(os.environ.get(env_var) or cache_root() / name)
+
+
+def entry_path(cache_dir: Path, key: str, suffix: str) -> Path:
+    """키에 해당하는 항목 경로 (한 디렉토리에 파일이 너무 많아지지 않도록 키 앞 2글자로 나눔)"""
+    return cache_dir / key[:2] / f"{key}{suffix}"
+
+
+@contextmanager
+def atomic_path(path: Union[str, Path]) -> Iterator[Path]:
+    """임시 경로를 넘겨주고 블록이 끝나면 path로 교체 (예외가 나면 임시 파일 삭제)
+
+    with atomic_path(entry) as temp_path:
+        shutil.copyfile(png_file, temp_path)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write(path: Union[str, Path], data: Union[bytes, str]):
+    """바이트(또는 UTF-8 문자열)를 임시 파일에 쓴 뒤 교체"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    with atomic_path(path) as temp_path:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+
+
+def evict_lru(cache_dir: Path, max_bytes: int, suffixes: Tuple[str, ...]) -> int:
+    """캐시 항목 합계가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제, 삭제한 수 반환
+
+    suffixes에 든 확장자의 항목만 대상 (쓰는 중인 임시 파일은 건드리지 않음)
+    여러 스레드에서 부를 수 있으면 호출한 쪽에서 잠금
+    """
+    entries = []
+    total = 0
+    for entry in cache_dir.glob("*/*"):
+        if entry.suffix not in suffixes:
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry))
+        total += stat.st_size
+
+    removed = 0
+    if total <= max_bytes:
+        return removed
+
+    for _, size, entry in sorted(entries):
+        try:
+            entry.unlink()
+        except OSError:
+            continue
+        removed += 1
+        total -= size
+        if total <= max_bytes:
+            break
+    return removed
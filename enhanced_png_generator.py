@@ -4,15 +4,14 @@
 실용적 HTML 분석과 동적 크기 감지를 결합한 최적화된 이미지 생성
 """
 
-import subprocess
 import json
 import os
 from pathlib import Path
-import time
+from capture_engine import capture_html_to_png
+from capture_scheduler import CaptureScheduler
 
 class EnhancedPNGGenerator:
     def __init__(self):
-        self.chrome_path = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
         self.output_dir = Path("images")
         self.output_dir.mkdir(exist_ok=True)
         
@@ -30,16 +29,41 @@ class EnhancedPNGGenerator:
             print(f"크기 설정 파일 {config_file}이 없습니다. 기본값 사용.")
             return {}
     
+    def _get_size_info(self, chart_name):
+        """차트별 크기 정보 (설정이 없으면 기본값)"""
+        return self.sizing_config.get(chart_name, {
+            "width": 1200,
+            "height": 800,
+            "method": "default"
+        })
+    
+    def _build_result(self, capture, chart_name):
+        """캡처 결과를 기존 결과 형식으로 변환"""
+        size_info = self._get_size_info(chart_name)
+        width = size_info["width"]
+        height = size_info["height"]
+        
+        if capture["success"]:
+            file_size = os.path.getsize(capture["png"])
+            return {
+                "success": True,
+                "file": capture["png"],
+                "size": f"{width}x{height}",
+                "file_size": file_size,
+                "method": size_info.get("method", "default"),
+                "elapsed": round(capture["elapsed"], 3)
+            }
+        return {
+            "success": False,
+            "error": capture["error"] or "PNG 파일이 생성되지 않음"
+        }
+    
     def generate_optimized_png(self, html_file, png_file, chart_name):
         """최적화된 PNG 생성"""
         print(f"\n=== {chart_name} PNG 생성 시작 ===")
         
         # 크기 정보 가져오기
-        size_info = self.sizing_config.get(chart_name, {
-            "width": 1200,
-            "height": 800,
-            "method": "default"
-        })
+        size_info = self._get_size_info(chart_name)
         
         width = size_info["width"]
         height = size_info["height"]
@@ -49,57 +73,16 @@ class EnhancedPNGGenerator:
         print(f"출력 파일: {png_file}")
         print(f"크기: {width}x{height} (방법: {method})")
         
-        # Chrome 명령어 구성
-        cmd = [
-            self.chrome_path,
-            "--headless",
-            "--disable-gpu",
-            "--disable-web-security",
-            "--hide-scrollbars", 
-            "--force-device-scale-factor=1",
-            f"--window-size={width},{height}",
-            f"--screenshot={png_file}",
-            f"file://{Path(html_file).absolute()}"
-        ]
-        
         try:
-            # Chrome 실행
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            capture = capture_html_to_png(html_file, png_file, window_size=(width, height))
+            result = self._build_result(capture, chart_name)
             
-            # 결과 확인
-            if result.returncode == 0 and os.path.exists(png_file):
-                file_size = os.path.getsize(png_file)
-                print(f"✅ 성공! 파일 크기: {file_size:,} bytes")
-                
-                # 상세 정보 반환
-                return {
-                    "success": True,
-                    "file": png_file,
-                    "size": f"{width}x{height}",
-                    "file_size": file_size,
-                    "method": method
-                }
+            if result["success"]:
+                print(f"✅ 성공! 파일 크기: {result['file_size']:,} bytes")
             else:
-                print(f"❌ 실패! Chrome 종료 코드: {result.returncode}")
-                if result.stderr:
-                    print(f"오류: {result.stderr}")
-                    
-                return {
-                    "success": False,
-                    "error": f"Chrome 실행 실패 (코드: {result.returncode})"
-                }
+                print(f"❌ 실패! {result['error']}")
+            return result
                 
-        except subprocess.TimeoutExpired:
-            print("❌ 타임아웃! Chrome 실행 시간 초과")
-            return {
-                "success": False, 
-                "error": "실행 시간 초과"
-            }
         except Exception as e:
             print(f"❌ 오류! {e}")
             return {
@@ -138,28 +121,31 @@ class EnhancedPNGGenerator:
         successful = 0
         failed = 0
         
-        # 각 파일별 PNG 생성
+        # 모든 PNG를 병렬 캡처 작업으로 등록
+        scheduler = CaptureScheduler(manifest_path="enhanced_capture_manifest.json")
         for html_file in html_files:
             mapping = chart_mappings[html_file]
             chart_name = mapping["chart_name"]
-            png_file = mapping["png_file"]
             
             # 조직도 건너뛰기
             if chart_name == "organization_chart":
                 print(f"\n건너뛰기: {chart_name} (워드 표로 대체)")
                 continue
             
-            # PNG 생성 실행
-            result = self.generate_optimized_png(html_file, png_file, chart_name)
+            size_info = self._get_size_info(chart_name)
+            scheduler.add(html_file, mapping["png_file"],
+                          window_size=(size_info["width"], size_info["height"]),
+                          name=chart_name)
+        
+        for capture in scheduler.run():
+            chart_name = capture["name"]
+            result = self._build_result(capture, chart_name)
             results[chart_name] = result
             
             if result["success"]:
                 successful += 1
             else:
                 failed += 1
-            
-            # 잠시 대기 (시스템 부하 방지)
-            time.sleep(0.5)
         
         # 결과 요약
         print(f"\n=== 생성 결과 요약 ===")
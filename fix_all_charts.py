@@ -6,6 +6,8 @@ Chart.js 의존성을 제거하고 완전한 정적 HTML 차트로 변환
 
 import os
 from pathlib import Path
+from capture_scheduler import CaptureScheduler
+from render_cache import get_default_cache
 
 class ChartFixer:
     def __init__(self):
@@ -602,6 +604,23 @@ class ChartFixer:
             else:
                 print(f"❌ {chart_file} 파일이 없습니다.")
     
+    def render_pngs(self):
+        """수정된 HTML 차트들을 PNG로 렌더링 (내용이 바뀌지 않은 차트는 렌더 캐시에서 복사)"""
+        cache = get_default_cache()
+        scheduler = CaptureScheduler(cache=cache, manifest_path=str(self.output_dir / "fixed_capture_manifest.json"))
+        
+        for chart_name, size in self.size_config.items():
+            html_file = self.output_dir / f"{chart_name}.html"
+            if html_file.exists():
+                scheduler.add(html_file, self.output_dir / f"{chart_name}.png",
+                              (size["width"], size["height"]), name=chart_name)
+        
+        results = scheduler.run()
+        failed = [r["name"] for r in results if not r["success"]]
+        if failed:
+            print(f"❌ PNG 렌더링 실패: {', '.join(failed)}")
+        return results
+    
     def generate_all_charts(self):
         """모든 차트 생성/수정"""
         print("=== 모든 차트 수정/재생성 시작 ===\n")
@@ -613,6 +632,9 @@ class ChartFixer:
         # 기존 순수 HTML 차트들의 크기 수정
         self.fix_existing_charts_sizes()
         
+        # 수정된 차트 PNG 렌더링
+        self.render_pngs()
+        
         print(f"\n=== 모든 차트 수정 완료 ===")
         print("📊 이제 모든 차트가 순수 HTML/CSS 기반이며 적절한 크기로 설정되었습니다.")
         
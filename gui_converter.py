@@ -5,11 +5,28 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
 import sys
+import queue
 import subprocess
 import threading
 import platform
 from pathlib import Path
 from auto_unique_chart_generator import AutoUniqueChartGenerator
+from complete_capture import capture_charts, find_chart_sources
+from md_tokenizer import iter_image_refs
+
+# 파일별 진행 단계 → (상태 표시, 진행률 %)
+FILE_STAGES = {
+    "waiting": ("대기", 0),
+    "capture": ("차트 캡처 중", 20),
+    "ready": ("변환 대기", 40),
+    "convert": ("변환 중", 60),
+    "charts": ("레거시 차트 생성 중", 85),
+    "done": ("완료", 100),
+    "failed": ("실패", 100),
+    "cancelled": ("취소됨", 0),
+}
+LOG_PUMP_INTERVAL = 100  # 작업 스레드가 남긴 로그/상태를 화면에 반영하는 주기 (ms)
+CAPTURE_AHEAD = 2  # 변환을 기다리며 미리 캡처해 둘 최대 파일 수
 
 class MDToDOCXConverter:
     def __init__(self):
@@ -27,10 +44,18 @@ class MDToDOCXConverter:
         self.chrome_path = self._find_chrome()
         
         # 변수 초기화
-        self.selected_md_file = tk.StringVar()
+        self.md_files = {}  # 목록 항목 ID → MD 파일 경로
+        self.file_status = {}  # 목록 항목 ID → 진행 단계
         self.selected_html_files = []  # HTML 파일 리스트
         
+        # 작업 스레드는 위젯을 직접 건드리지 않고 이 큐에 남기고, 메인 스레드가 after()로 꺼내 반영
+        self.ui_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.running = False
+        self.batch_items = []  # 현재 변환 중인 목록 항목 ID
+        
         self.setup_ui()
+        self.root.after(LOG_PUMP_INTERVAL, self._pump_ui_queue)
         
     def _get_chrome_paths(self):
         """운영체제별 Chrome 경로 목록"""
@@ -72,16 +97,31 @@ class MDToDOCXConverter:
         file_frame = ttk.LabelFrame(main_frame, text="파일 선택", padding="10")
         file_frame.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 15))
         
-        ttk.Label(file_frame, text="Markdown 파일:").grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Label(file_frame, text="Markdown 파일들 (여러 개를 한 번에 추가 가능):").grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
         
         md_frame = ttk.Frame(file_frame)
         md_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
         
-        self.md_entry = ttk.Entry(md_frame, textvariable=self.selected_md_file, width=50)
-        self.md_entry.grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 10))
+        self.md_tree = ttk.Treeview(md_frame, columns=("status", "progress"), height=5, selectmode="extended")
+        self.md_tree.heading("#0", text="파일")
+        self.md_tree.heading("status", text="상태")
+        self.md_tree.heading("progress", text="진행률")
+        self.md_tree.column("#0", width=320)
+        self.md_tree.column("status", width=130, anchor=tk.CENTER)
+        self.md_tree.column("progress", width=70, anchor=tk.CENTER)
+        md_scrollbar = ttk.Scrollbar(md_frame, orient="vertical", command=self.md_tree.yview)
+        self.md_tree.configure(yscrollcommand=md_scrollbar.set)
+        
+        self.md_tree.grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 5))
+        md_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        
+        md_button_frame = ttk.Frame(md_frame)
+        md_button_frame.grid(row=0, column=2, sticky=tk.N, padx=(5, 0))
         
-        ttk.Button(md_frame, text="찾아보기", 
-                  command=self.browse_md_file).grid(row=0, column=1)
+        ttk.Button(md_button_frame, text="파일 추가", 
+                  command=self.browse_md_file).pack(fill=tk.X, pady=(0, 5))
+        ttk.Button(md_button_frame, text="선택 제거", 
+                  command=self.remove_selected_md).pack(fill=tk.X)
         
         md_frame.columnconfigure(0, weight=1)
         
@@ -124,6 +164,12 @@ class MDToDOCXConverter:
         self.status_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         
+        self.progress_bar = ttk.Progressbar(status_frame, mode="determinate", maximum=100)
+        self.progress_bar.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
+        
+        self.progress_label = ttk.Label(status_frame, text="", foreground='gray')
+        self.progress_label.grid(row=1, column=1, sticky=tk.E, pady=(10, 0), padx=(5, 0))
+        
         status_frame.columnconfigure(0, weight=1)
         status_frame.rowconfigure(0, weight=1)
         
@@ -136,6 +182,10 @@ class MDToDOCXConverter:
                                      style='Accent.TButton' if hasattr(ttk.Style(), 'theme_names') else None)
         self.convert_btn.pack(side=tk.LEFT, padx=(0, 10))
         
+        self.cancel_btn = ttk.Button(button_frame, text="취소", state='disabled',
+                                    command=self.cancel_conversion)
+        self.cancel_btn.pack(side=tk.LEFT, padx=(0, 10))
+        
         ttk.Button(button_frame, text="로그 지우기", 
                   command=self.clear_log).pack(side=tk.LEFT, padx=(0, 10))
         
@@ -156,19 +206,63 @@ class MDToDOCXConverter:
             self.log_message("⚠️ Chrome 브라우저를 찾을 수 없습니다. 차트 생성이 제한될 수 있습니다.")
         
     def browse_md_file(self):
-        """Markdown 파일 선택"""
-        file_path = filedialog.askopenfilename(
+        """Markdown 파일들 선택 (여러 개 선택 가능)"""
+        files = filedialog.askopenfilenames(
             title="Markdown 파일 선택",
             filetypes=[
                 ("Markdown files", "*.md"),
                 ("All files", "*.*")
             ]
         )
-        if file_path:
-            self.selected_md_file.set(file_path)
-            
-            
-            self.log_message(f"선택된 파일: {file_path}")
+        self.add_md_files(files)
+    
+    def add_md_files(self, files):
+        """변환 목록에 MD 파일 추가 (이미 있는 파일은 무시)"""
+        added = 0
+        for file_path in files:
+            file_path = os.path.abspath(file_path)
+            if file_path in self.md_files.values():
+                continue
+            item = self.md_tree.insert("", tk.END, text=os.path.basename(file_path))
+            self.md_files[item] = file_path
+            self._set_file_stage(item, "waiting")
+            added += 1
+        if added:
+            self.log_message(f"MD 파일 {added}개 추가됨 (전체 {len(self.md_files)}개)")
+    
+    def remove_selected_md(self):
+        """선택된 MD 파일들을 목록에서 제거 (변환 중에는 제거 불가)"""
+        if self.running:
+            messagebox.showinfo("알림", "변환 중에는 목록을 바꿀 수 없습니다.")
+            return
+        for item in self.md_tree.selection():
+            self.md_tree.delete(item)
+            self.md_files.pop(item, None)
+            self.file_status.pop(item, None)
+    
+    def _set_file_stage(self, item, stage):
+        """목록 항목의 상태/진행률 표시 (메인 스레드 전용)"""
+        label, percent = FILE_STAGES[stage]
+        self.file_status[item] = stage
+        if self.md_tree.exists(item):
+            self.md_tree.item(item, values=(label, f"{percent}%"))
+        self._update_total_progress()
+    
+    def _set_file_detail(self, item, text):
+        """진행률은 그대로 두고 상태 칸 글자만 바꿈 (메인 스레드 전용)"""
+        if self.md_tree.exists(item) and self.file_status.get(item) == "convert":
+            self.md_tree.item(item, values=(text, f"{FILE_STAGES['convert'][1]}%"))
+    
+    def _update_total_progress(self):
+        """전체 진행률 막대 갱신"""
+        if not self.running:
+            return
+        items = self.batch_items
+        finished = sum(1 for item in items if self.file_status.get(item) in ("done", "failed", "cancelled"))
+        percent = sum(100 if self.file_status.get(item) == "cancelled" else FILE_STAGES[self.file_status.get(item, "waiting")][1]
+                      for item in items)
+        self.progress_bar["value"] = percent / max(1, len(items))
+        self.progress_label.config(text=f"{finished}/{len(items)}")
     
     def browse_html_files(self):
         """HTML 파일들 선택"""
@@ -221,10 +315,49 @@ class MDToDOCXConverter:
         self.html_count_label.config(text=f"선택된 파일: {count}개")
     
     def log_message(self, message):
-        """로그 메시지 추가"""
-        self.status_text.insert(tk.END, f"{message}\n")
-        self.status_text.see(tk.END)
-        self.root.update_idletasks()
+        """로그 메시지 추가 (어느 스레드에서 불러도 안전 - 화면 반영은 메인 스레드가 담당)"""
+        self.ui_queue.put(("log", message))
+    
+    def _post_stage(self, item, stage):
+        """작업 스레드에서 파일 진행 단계 변경 요청"""
+        self.ui_queue.put(("stage", item, stage))
+    
+    def _converter_progress(self, item):
+        """변환기 진행 알림 → 목록 상태 칸에 지금 하는 일 표시, 경고는 로그에 출력"""
+        counts = {"image": 0, "table": 0}
+        
+        def on_progress(stage, **detail):
+            if stage in counts:
+                counts[stage] += 1
+                self.ui_queue.put(("detail", item, f"변환 중 (이미지 {counts['image']}, 표 {counts['table']})"))
+            elif stage == "save":
+                self.ui_queue.put(("detail", item, "저장 중"))
+            elif stage == "warning":
+                self.log_message(f"⚠️ {os.path.basename(self.md_files.get(item, ''))}: {detail.get('message')}")
+        return on_progress
+    
+    def _pump_ui_queue(self):
+        """작업 스레드가 남긴 로그/상태 변경을 모아서 화면에 반영 (after()로 주기 실행)"""
+        lines = []
+        try:
+            while True:
+                message = self.ui_queue.get_nowait()
+                kind = message[0]
+                if kind == "log":
+                    lines.append(f"{message[1]}\n")
+                elif kind == "stage":
+                    self._set_file_stage(message[1], message[2])
+                elif kind == "detail":
+                    self._set_file_detail(message[1], message[2])
+                elif kind == "finished":
+                    self._finish_conversion(message[1])
+        except queue.Empty:
+            pass
+        
+        if lines:
+            self.status_text.insert(tk.END, "".join(lines))
+            self.status_text.see(tk.END)
+        self.root.after(LOG_PUMP_INTERVAL, self._pump_ui_queue)
     
     def clear_log(self):
         """로그 지우기"""
@@ -232,12 +365,13 @@ class MDToDOCXConverter:
     
     def validate_inputs(self):
         """입력값 검증"""
-        if not self.selected_md_file.get():
-            messagebox.showerror("오류", "Markdown 파일을 선택해주세요.")
+        if not self.md_files:
+            messagebox.showerror("오류", "Markdown 파일을 추가해주세요.")
             return False
         
-        if not os.path.exists(self.selected_md_file.get()):
-            messagebox.showerror("오류", "선택된 Markdown 파일이 존재하지 않습니다.")
+        missing = [path for path in self.md_files.values() if not os.path.exists(path)]
+        if missing:
+            messagebox.showerror("오류", "존재하지 않는 Markdown 파일이 있습니다:\n" + "\n".join(missing))
             return False
         
         
@@ -314,36 +448,47 @@ class MDToDOCXConverter:
             self.log_message(f"⚠️ 차트 생성 시스템 오류: {str(e)} - 기본 차트 생성으로 대체")
             self.generate_charts()
     
-    def capture_html_files(self):
+    def capture_html_files(self, html_files=None):
         """검증된 html_to_png_converter.py 사용하여 HTML 파일들을 PNG로 변환"""
-        if not self.selected_html_files:
+        html_files = self.selected_html_files if html_files is None else html_files
+        if not html_files:
             self.log_message("선택된 HTML 파일이 없습니다.")
             return
         
-        self.log_message(f"html_to_png_converter로 HTML 파일 {len(self.selected_html_files)}개를 PNG로 변환합니다...")
+        self.log_message(f"html_to_png_converter로 HTML 파일 {len(html_files)}개를 PNG로 변환합니다...")
         
         try:
-            # 선택된 HTML 파일들이 있는 경우에만 변환
-            if not self.selected_html_files:
-                self.log_message("ℹ️ 선택된 HTML 파일이 없어 변환을 건너뜁니다.")
-                return
                 
             # html_to_png_converter 임포트 및 실행
             from html_to_png_converter import HTMLToPNGConverter
             
             converter = HTMLToPNGConverter()
-            converted_count = converter.convert_selected_files(self.selected_html_files)
+            converted_count = converter.convert_selected_files(html_files)
             
             self.log_message(f"✅ {converted_count}개 HTML 파일 변환 완료!")
             
         except Exception as e:
             self.log_message(f"⚠️ HTML 변환 오류: {str(e)}")
     
-    def auto_generate_and_capture_charts(self):
+    def capture_md_charts(self, md_file):
+        """MD 파일이 참조하는 차트 중 PNG가 없거나 HTML보다 오래된 것만 다시 캡처"""
+        md_dir = os.path.dirname(os.path.abspath(md_file))
+        with open(md_file, 'r', encoding='utf-8') as f:
+            image_paths = [os.path.join(md_dir, path) for _, path in iter_image_refs(f)]
+        
+        charts = find_chart_sources(image_paths)
+        if not charts:
+            return
+        
+        self.log_message(f"📸 {os.path.basename(md_file)}: 차트 {len(charts)}개 캡처")
+        for result in capture_charts(charts):
+            if not result["success"]:
+                self.log_message(f"⚠️ {os.path.basename(result['html'])} 캡처 실패: {result['error']}")
+    
+    def auto_generate_and_capture_charts(self, md_file):
         """프로젝트별 고유 차트 자동 생성 (레거시 지원)"""
         try:
-            # 1. 선택된 MD 파일로 고유 차트 생성
-            md_file = self.selected_md_file.get()
+            # 1. 변환한 MD 파일로 고유 차트 생성
             self.log_message(f"📋 {os.path.basename(md_file)}에 대한 고유 차트를 생성합니다...")
             
             # 2. 고유 차트 생성기 실행
@@ -401,82 +546,127 @@ class MDToDOCXConverter:
             
         return True
 
-    def run_conversion(self):
-        """실제 변환 작업 실행"""
+    def start_conversion(self):
+        """목록의 파일들 변환 시작 (캡처 스레드와 변환 스레드가 파이프라인으로 동시에 진행)"""
+        if self.running or not self.validate_inputs():
+            return
+        
+        # 라이브러리 확인 (메시지 박스를 띄우므로 메인 스레드에서)
+        if not self.check_dependencies():
+            return
+        
+        # 이미 완료된 파일은 건너뛰고 나머지(대기/실패/취소)만 다시 변환
+        self.batch_items = [item for item in self.md_tree.get_children() if self.file_status.get(item) != "done"]
+        if not self.batch_items:
+            messagebox.showinfo("알림", "목록의 파일이 모두 변환되었습니다.")
+            return
+        
+        self.running = True
+        self.cancel_event.clear()
+        for item in self.batch_items:
+            self._set_file_stage(item, "waiting")
+        
+        # 버튼 비활성화
+        self.convert_btn.configure(state='disabled', text='변환 중...')
+        self.cancel_btn.configure(state='normal')
+        self.log_message(f"🎯 {len(self.batch_items)}개 파일 변환 시작")
+        
+        jobs = [(item, self.md_files[item]) for item in self.batch_items]
+        html_files = list(self.selected_html_files)
+        handoff = queue.Queue(maxsize=CAPTURE_AHEAD)
+        threading.Thread(target=self._capture_worker, args=(jobs, html_files, handoff), daemon=True).start()
+        # 레거시 차트 자동 생성은 기존처럼 HTML 파일을 선택하지 않은 경우에만
+        threading.Thread(target=self._convert_worker, args=(handoff, not html_files), daemon=True).start()
+    
+    def cancel_conversion(self):
+        """변환 취소 - 진행 중인 파일은 끝까지 처리하고 남은 파일은 건너뜀"""
+        if self.running and not self.cancel_event.is_set():
+            self.cancel_event.set()
+            self.cancel_btn.configure(state='disabled')
+            self.log_message("⏹️ 취소 요청 - 진행 중인 파일이 끝나면 멈춥니다.")
+    
+    def _capture_worker(self, jobs, html_files, handoff):
+        """1단계 (작업 스레드): 차트 캡처 - 캡처가 끝난 파일부터 변환 스레드로 넘김"""
         try:
-            # 라이브러리 확인
-            if not self.check_dependencies():
-                return
-                
             # HTML 파일들 캡처 (선택사항)
-            if self.selected_html_files:
-                self.capture_html_files()
+            if html_files and not self.cancel_event.is_set():
+                self.capture_html_files(html_files)
             
+            for item, md_file in jobs:
+                if self.cancel_event.is_set():
+                    break
+                self._post_stage(item, "capture")
+                try:
+                    self.capture_md_charts(md_file)
+                except Exception as e:
+                    self.log_message(f"⚠️ {os.path.basename(md_file)} 차트 캡처 오류: {str(e)}")
+                self._post_stage(item, "ready")
+                handoff.put((item, md_file))
+        finally:
+            handoff.put(None)
+    
+    def _convert_worker(self, handoff, legacy_charts):
+        """2단계 (작업 스레드): MD → DOCX 변환 - 캡처 스레드가 다음 파일을 캡처하는 동안 진행"""
+        results = {}  # 목록 항목 ID → 생성된 파일 경로 (실패하면 None)
+        try:
             # MD 파일 그대로 처리하는 범용 변환기 사용
             from universal_md_converter import UniversalMDConverter
-            converter = UniversalMDConverter()
-            
-            # MD 파일 변환 (MD 파일과 같은 위치에 자동 저장)
-            generated_path = converter.convert(self.selected_md_file.get())
-            
-            # 생성된 파일 경로 디버깅
-            self.log_message(f"🔍 변환 결과 경로: {generated_path}")
-            if generated_path:
-                parent_dir = os.path.dirname(generated_path)
-                self.log_message(f"🔍 상위 디렉토리: {parent_dir}")
-                self.log_message(f"🔍 디렉토리 존재 여부: {os.path.exists(parent_dir)}")
-                if not os.path.exists(parent_dir):
-                    self.log_message(f"🔧 디렉토리 생성 시도: {parent_dir}")
-                    try:
-                        os.makedirs(parent_dir, exist_ok=True)
-                        self.log_message(f"✅ 디렉토리 생성 완료")
-                    except Exception as dir_e:
-                        self.log_message(f"❌ 디렉토리 생성 실패: {dir_e}")
             
-            if generated_path and os.path.exists(generated_path):
-                success = True
+            while True:
+                job = handoff.get()
+                if job is None:
+                    break
+                item, md_file = job
+                if self.cancel_event.is_set():
+                    continue
+                
+                self._post_stage(item, "convert")
+                try:
+                    # MD 파일 변환 (MD 파일과 같은 위치에 자동 저장)
+                    generated_path = UniversalMDConverter(progress=self._converter_progress(item)).convert(md_file)
+                    if not generated_path or not os.path.exists(generated_path):
+                        raise RuntimeError(f"파일이 생성되지 않았습니다 (예상 경로: {generated_path})")
+                except Exception as e:
+                    results[item] = None
+                    self.log_message(f"❌ {os.path.basename(md_file)} 변환 실패: {str(e)}")
+                    self._post_stage(item, "failed")
+                    continue
+                
+                results[item] = generated_path
                 self.log_message(f"✅ 변환 완료: {generated_path}")
-                print(f"✅ MD 파일 구조 그대로 변환 완료: {generated_path}")
-            else:
-                success = False
-                self.log_message(f"❌ 변환 실패: 파일이 생성되지 않았습니다")
-                if generated_path:
-                    self.log_message(f"   예상 경로: {generated_path}")
-                    self.log_message(f"   파일 존재 여부: {os.path.exists(generated_path)}")
-                print(f"❌ 변환 실패: 파일이 생성되지 않았습니다")
-            
-            if success:
-                self.log_message("✅ 문서 변환이 완료되었습니다!")
-                messagebox.showinfo("완료", f"변환이 완료되었습니다!\n\n출력 파일: {generated_path}")
-            else:
-                self.log_message("❌ 문서 변환 중 오류가 발생했습니다.")
-                messagebox.showerror("오류", "변환 중 오류가 발생했습니다.")
-            
-            # 레거시 차트 자동 생성 (HTML 파일이 없는 경우에만)
-            if not self.selected_html_files:
-                self.log_message("💡 레거시 차트 시스템으로 차트를 생성합니다...")
-                self.auto_generate_and_capture_charts()
                 
+                if legacy_charts and not self.cancel_event.is_set():
+                    self._post_stage(item, "charts")
+                    self.log_message("💡 레거시 차트 시스템으로 차트를 생성합니다...")
+                    self.auto_generate_and_capture_charts(md_file)
+                self._post_stage(item, "done")
         except Exception as e:
-            error_msg = f"변환 중 예외가 발생했습니다: {str(e)}"
-            self.log_message(f"❌ {error_msg}")
-            messagebox.showerror("오류", error_msg)
-        
+            self.log_message(f"❌ 변환 중 예외가 발생했습니다: {str(e)}")
         finally:
-            # 버튼 활성화
-            self.convert_btn.configure(state='normal', text='변환 시작')
+            self.ui_queue.put(("finished", results))
     
-    def start_conversion(self):
-        """변환 시작 (별도 스레드에서 실행)"""
-        if not self.validate_inputs():
-            return
-        
-        # 버튼 비활성화
-        self.convert_btn.configure(state='disabled', text='변환 중...')
-        
-        # 별도 스레드에서 변환 실행
-        thread = threading.Thread(target=self.run_conversion, daemon=True)
-        thread.start()
+    def _finish_conversion(self, results):
+        """모든 작업이 끝난 뒤 결과 정리 (메인 스레드)"""
+        for item in self.batch_items:
+            if item not in results and self.file_status.get(item) != "done":
+                self._set_file_stage(item, "cancelled")
+        
+        succeeded = [path for path in results.values() if path]
+        failed = len(results) - len(succeeded)
+        cancelled = len(self.batch_items) - len(results)
+        
+        self.running = False
+        self.convert_btn.configure(state='normal', text='변환 시작')
+        self.cancel_btn.configure(state='disabled')
+        
+        summary = f"성공 {len(succeeded)}개, 실패 {failed}개, 취소 {cancelled}개"
+        self.log_message(f"🎉 변환 종료: {summary}")
+        if succeeded and not failed and not cancelled:
+            messagebox.showinfo("완료", "변환이 완료되었습니다!\n\n출력 파일:\n" + "\n".join(succeeded))
+        elif succeeded:
+            messagebox.showwarning("완료", f"일부 파일만 변환되었습니다.\n\n{summary}")
+        elif failed:
+            messagebox.showerror("오류", f"변환 중 오류가 발생했습니다.\n\n{summary}")
     
     def run(self):
         """GUI 실행"""
@@ -498,4 +688,6 @@ if __name__ == "__main__":
             pass
     
     app = MDToDOCXConverter()
+    # 명령줄로 넘긴 MD 파일들은 목록에 미리 추가
+    app.add_md_files([path for path in sys.argv[1:] if path.lower().endswith('.md')])
     app.run()
\ No newline at end of file
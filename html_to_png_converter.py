@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 """
-capture-website-cli를 사용하여 HTML 파일들을 PNG로 일괄 변환
-전용 도구를 사용하므로 안정적이고 간단함
+HTML 파일들을 PNG로 일괄 변환
+capture_engine의 워밍된 헤드리스 Chrome 풀을 재사용하고 capture_scheduler로 병렬 처리
 """
 
 import os
 import glob
-import subprocess
-import time
+from capture_engine import capture_html_to_png
+from capture_scheduler import CaptureScheduler
 
 class HTMLToPNGConverter:
     def __init__(self, output_dir=None):
@@ -19,7 +19,7 @@ class HTMLToPNGConverter:
         print(f"📁 이미지 저장 디렉토리: {self.output_dir}")
         
     def convert_html_to_png(self, html_file_path: str) -> str:
-        """HTML 파일을 PNG로 변환 (Chrome 사용)"""
+        """HTML 파일을 PNG로 변환 (워밍된 Chrome 캡처 풀 사용)"""
         try:
             filename = os.path.basename(html_file_path).replace('.html', '.png')
             output_path = os.path.join(self.output_dir, filename)
@@ -30,57 +30,17 @@ class HTMLToPNGConverter:
             if os.path.exists(output_path):
                 os.remove(output_path)
             
-            # Chrome 경로 찾기 (macOS용)
-            chrome_paths = [
-                "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-                "/usr/bin/google-chrome",
-                "/usr/bin/google-chrome-stable"
-            ]
+            result = capture_html_to_png(html_file_path, output_path, window_size=(900, 600))
             
-            chrome_path = None
-            for path in chrome_paths:
-                if os.path.exists(path):
-                    chrome_path = path
-                    print(f"🔍 Chrome 발견: {chrome_path}")
-                    break
-            
-            if not chrome_path:
-                print("❌ Chrome을 찾을 수 없습니다")
-                print("   시도한 경로들:")
-                for path in chrome_paths:
-                    print(f"   - {path}: {'존재함' if os.path.exists(path) else '없음'}")
-                return None
-            
-            # 절대 경로로 변환
-            abs_html_path = os.path.abspath(html_file_path)
-            file_url = f"file://{abs_html_path}"
-            
-            # Chrome 헤드리스 모드로 스크린샷
-            cmd = [
-                chrome_path,
-                "--headless",
-                "--disable-gpu",
-                "--hide-scrollbars",
-                "--force-device-scale-factor=1",
-                "--window-size=900,600",
-                f"--screenshot={output_path}",
-                file_url
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            if os.path.exists(output_path):
-                print(f"✅ 변환 완료: {filename}")
+            if result["success"]:
+                print(f"✅ 변환 완료: {filename} ({result['elapsed']:.2f}s)")
                 return output_path
             else:
                 print(f"❌ 변환 실패: {filename}")
-                if result.stderr:
-                    print(f"   오류: {result.stderr.strip()}")
+                if result["error"]:
+                    print(f"   오류: {result['error']}")
                 return None
                 
-        except subprocess.TimeoutExpired:
-            print(f"❌ 시간 초과: {os.path.basename(html_file_path)}")
-            return None
         except Exception as e:
             print(f"❌ 오류 발생 {os.path.basename(html_file_path)}: {e}")
             return None
@@ -94,22 +54,25 @@ class HTMLToPNGConverter:
             
         print(f"🎯 변환할 HTML 파일: {len(html_files)}개")
         
+        # 모든 파일을 한 번에 병렬 캡처 (CPU 수만큼의 Chrome 워커)
+        scheduler = CaptureScheduler(
+            manifest_path=os.path.join(self.output_dir, "capture_manifest.json")
+        )
+        for html_file in html_files:
+            filename = os.path.basename(html_file).replace('.html', '.png')
+            scheduler.add(html_file, os.path.join(self.output_dir, filename), window_size=(900, 600))
+        results = scheduler.run()
+        
         converted_count = 0
         failed_files = []
         
-        for i, html_file in enumerate(html_files, 1):
-            print(f"\n[{i}/{len(html_files)}]")
-            
-            result = self.convert_html_to_png(html_file)
-            if result:
+        for html_file, result in zip(html_files, results):
+            if result["success"]:
                 converted_count += 1
                 # PNG 파일을 HTML 파일과 같은 디렉토리의 images 폴더로 복사
-                self.copy_png_to_source_directory(result, html_file)
+                self.copy_png_to_source_directory(result["png"], html_file)
             else:
                 failed_files.append(os.path.basename(html_file))
-            
-            # 각 파일 변환 후 잠시 대기
-            time.sleep(0.5)
         
         print(f"\n🎉 HTML 차트 변환 완료!")
         print(f"✅ 성공: {converted_count}개")
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+DOCX 삽입용 이미지 전처리
+캡처 이미지는 화면 배율 그대로라 문서에 표시되는 너비(5~6인치)에 비해 픽셀이 훨씬 많은 경우가 많다
+표시 너비 × 인쇄 DPI에 맞게 줄이고(선택적으로 팔레트 양자화), 같은 내용의 이미지는
+원본 해시로 한 번만 처리해서 같은 바이트를 넘김 → python-docx가 미디어 파트 1개를 공유
+문서 조립 전에 이미지 목록을 넘기면 스레드 풀에서 미리 읽고 처리해 두고, 조립 중에는 결과만 붙인다
+Pillow가 없거나 읽을 수 없는 이미지는 원본 파일을 그대로 사용
+디코딩/축소/인코딩 비용이 커서 기본은 끔 (DOCX_IMAGE_PREPROCESS=1로 사용)
+켜면 처리 결과를 디스크(공용 캐시 디렉토리/images)에 보관해서 다음 실행부터는 다시 처리하지 않음
+"""
+
+import hashlib
+import io
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple, Union
+
+from conversion_log import get_logger
+from disk_cache import atomic_write, default_cache_dir, entry_path, evict_lru
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow 없이도 변환은 동작 (전처리만 생략)
+    Image = None
+
+
+logger = get_logger("images")
+
+DEFAULT_PRINT_DPI = 200
+MAX_CACHE_BYTES = 64 * 1024 * 1024  # 여러 문서를 변환하는 동안 유지할 처리 결과 최대 크기
+JPEG_QUALITY = 85
+PNG_COMPRESS_LEVEL = 1  # zlib 최고 압축(optimize)은 느리고 크기 차이는 몇 %뿐
+MIN_SAVING = 0.15  # 다시 인코딩한 결과가 원본보다 15% 이상 작을 때만 사용
+STORE_MAX_BYTES = 200 * 1024 * 1024
+# python-docx가 크기 정보를 읽을 수 있는 형식만 다시 인코딩
+REENCODE_FORMATS = ("PNG", "JPEG")
+
+
+def report_missing_images(missing: List[str]):
+    """찾을 수 없는 이미지 파일을 한 번에 출력"""
+    if not missing:
+        return
+    logger.warning("⚠️ 이미지 파일 %d개를 찾을 수 없습니다:\n%s", len(missing),
+                   "\n".join(f"   - {image_path}" for image_path in missing))
+
+
+def preprocess_enabled() -> bool:
+    """환경변수 DOCX_IMAGE_PREPROCESS=1이면 전처리 사용"""
+    return Image is not None and os.environ.get("DOCX_IMAGE_PREPROCESS", "0") == "1"
+
+
+class ProcessedImageStore:
+    """이미지 처리 결과 디스크 저장소 (get_blob/put_blob, 파일 수정 시각으로 LRU 관리)"""
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = STORE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir("images", "DOCX_IMAGE_CACHE_DIR")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def get_blob(self, key: str):
+        """저장된 바이트 (없거나 다른 프로세스가 정리 중에 지웠으면 None)"""
+        entry = entry_path(self.cache_dir, key, ".bin")
+        try:
+            with open(entry, 'rb') as f:
+                data = f.read()
+            os.utime(entry)  # 최근 사용 시각 갱신 (LRU)
+        except OSError:
+            return None
+        return data
+
+    def put_blob(self, key: str, data: bytes):
+        try:
+            atomic_write(entry_path(self.cache_dir, key, ".bin"), data)
+        except OSError as e:  # 읽기 전용 위치 등 - 이번 실행의 메모리 캐시만 사용
+            logger.debug("이미지 처리 결과 저장 실패: %s", e)
+            return
+        with self._lock:
+            evict_lru(self.cache_dir, self.max_bytes, (".bin",))
+
+
+class ImagePreprocessor:
+    """표시 너비에 맞춰 이미지를 줄이고 같은 이미지는 한 번만 처리"""
+
+    def __init__(self, dpi: int = None, quantize: bool = None, enabled: bool = None, store=None):
+        self.dpi = dpi or int(os.environ.get("DOCX_IMAGE_DPI", DEFAULT_PRINT_DPI))
+        if quantize is None:
+            quantize = os.environ.get("DOCX_IMAGE_QUANTIZE", "0") == "1"
+        self.quantize = quantize
+        self.enabled = preprocess_enabled() if enabled is None else enabled and Image is not None
+        # 처리 결과를 프로세스 밖에도 보관할 저장소 (get_blob/put_blob, 예: 증분 빌드의 SectionCache)
+        # 지정하지 않으면 전처리를 켠 경우 모든 모드에서 기본 디스크 저장소 사용
+        if store is None and self.enabled:
+            store = ProcessedImageStore()
+        self.store = store
+        # (원본 해시, 표시 너비) → 처리된 바이트
+        self._cache: Dict[Tuple[str, float], bytes] = {}
+        self._cache_bytes = 0
+        # (절대 경로, 표시 너비) → 미리 읽기 작업
+        self._prefetched: Dict[Tuple[str, float], Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"images": 0, "resized": 0, "reused": 0, "bytes_in": 0, "bytes_out": 0}
+
+    def prefetch(self, images: Iterable[Tuple[str, float]], workers: int = None) -> List[str]:
+        """(경로, 표시 너비) 목록을 스레드 풀에서 미리 읽고 전처리 시작, 없는 파일 경로 목록 반환
+
+        작업이 끝나기를 기다리지 않고 바로 돌아오며, prepare()가 해당 결과를 기다려서 사용
+        """
+        pending = {}
+        missing = []
+        for image_path, width_inches in images:
+            key = self._prefetch_key(image_path, width_inches)
+            if key in self._prefetched or key in pending:
+                continue
+            if not os.path.exists(image_path):
+                if image_path not in missing:
+                    missing.append(image_path)
+                continue
+            pending[key] = image_path
+
+        if pending:
+            workers = workers or int(os.environ.get("DOCX_IMAGE_WORKERS", 0)) or min(len(pending), os.cpu_count() or 2)
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-prefetch")
+            for key, image_path in pending.items():
+                self._prefetched[key] = executor.submit(self.load, image_path, key[1])
+            executor.shutdown(wait=False)  # 제출한 작업은 계속 실행됨
+        return missing
+
+    def clear_prefetched(self):
+        """문서 1개의 미리 읽기 결과 정리 (내용 해시로 찾는 처리 결과 캐시는 다음 문서에서도 사용)"""
+        self._prefetched = {}
+
+    def prepare(self, image_path: str, width_inches: float) -> Union[str, io.BytesIO]:
+        """add_picture에 넘길 이미지 (미리 읽었거나 전처리하면 BytesIO, 아니면 원본 경로)
+
+        BytesIO에는 파일 이름이 없으므로 그림 이름(pic:cNvPr name)은 호출한 쪽에서 원본 파일 이름으로 지정
+        (md_engine.add_picture_paragraph 참고)
+        """
+        future = self._prefetched.get(self._prefetch_key(image_path, width_inches))
+        if future is not None and future.exception() is None:
+            return io.BytesIO(future.result())
+        if not self.enabled:
+            return image_path
+        return io.BytesIO(self.load(image_path, width_inches))
+
+    @staticmethod
+    def _prefetch_key(image_path: str, width_inches: float) -> Tuple[str, float]:
+        return os.path.abspath(image_path), float(width_inches)
+
+    def load(self, image_path: str, width_inches: float) -> bytes:
+        """이미지 파일을 읽어 전처리된 바이트 반환 (같은 내용은 한 번만 처리, 전처리를 안 하면 원본)"""
+        with open(image_path, 'rb') as f:
+            data = f.read()
+        if not self.enabled:
+            return data
+        key = (hashlib.sha1(data).hexdigest(), float(width_inches))
+
+        with self._lock:
+            self.stats["images"] += 1
+            processed = self._cache.get(key)
+            if processed is not None:
+                self.stats["reused"] += 1
+                return processed
+
+        processed = self._load_stored(key, data)
+        if processed is None:
+            processed = self._process(data, width_inches)
+            if self.store is not None:
+                # 원본을 그대로 쓰는 경우는 빈 값으로 표시 (원본을 중복 저장하지 않음)
+                self.store.put_blob(self._store_key(key), b'' if processed is data else processed)
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = processed
+                self._cache_bytes += len(processed)
+                self._trim_cache()
+            processed = self._cache[key]
+            self.stats["bytes_in"] += len(data)
+            self.stats["bytes_out"] += len(processed)
+            if processed is not data:
+                self.stats["resized"] += 1
+        return processed
+
+    def _store_key(self, key: Tuple[str, float]) -> str:
+        return f"{key[0]}-{key[1]:g}-{self.dpi}-{int(self.quantize)}"
+
+    def _load_stored(self, key: Tuple[str, float], data: bytes):
+        """저장소에 있는 처리 결과 (빈 값이면 원본 그대로, 없으면 None)"""
+        if self.store is None:
+            return None
+        stored = self.store.get_blob(self._store_key(key))
+        if stored is None:
+            return None
+        return stored or data
+
+    def _trim_cache(self):
+        """캐시가 최대 크기를 넘으면 오래된 항목부터 제거 (방금 넣은 항목은 유지)"""
+        while self._cache_bytes > MAX_CACHE_BYTES and len(self._cache) > 1:
+            oldest = next(iter(self._cache))
+            self._cache_bytes -= len(self._cache.pop(oldest))
+
+    def _process(self, data: bytes, width_inches: float) -> bytes:
+        """표시 너비 × DPI보다 큰 이미지만 줄여서 다시 인코딩 (MIN_SAVING 이상 작아지지 않으면 원본 유지)"""
+        try:
+            image = Image.open(io.BytesIO(data))
+            image_format = image.format
+            if image_format not in REENCODE_FORMATS:
+                return data
+
+            target_width = round(width_inches * self.dpi)
+            if image.width <= target_width and not (self.quantize and image_format == "PNG"):
+                return data
+
+            image = self._to_resizable(image)
+            if image.width > target_width:
+                target_height = max(1, round(image.height * target_width / image.width))
+                image = image.resize((target_width, target_height), Image.LANCZOS)
+
+            output = io.BytesIO()
+            if image_format == "JPEG":
+                image.convert("RGB").save(output, "JPEG", quality=JPEG_QUALITY, dpi=(self.dpi, self.dpi))
+            else:
+                if self.quantize and image.mode in ("RGB", "RGBA"):
+                    method = Image.Quantize.FASTOCTREE if image.mode == "RGBA" else Image.Quantize.MEDIANCUT
+                    image = image.quantize(colors=256, method=method)
+                image.save(output, "PNG", compress_level=PNG_COMPRESS_LEVEL, dpi=(self.dpi, self.dpi))
+        except Exception as e:
+            logger.warning("⚠️ 이미지 전처리 실패, 원본 사용: %s", e)
+            return data
+
+        processed = output.getvalue()
+        return processed if len(processed) <= len(data) * (1 - MIN_SAVING) else data
+
+    @staticmethod
+    def _to_resizable(image):
+        """팔레트/흑백 이미지는 보간 축소가 되도록 RGB(A)로 변환"""
+        if image.mode == "P":
+            return image.convert("RGBA" if "transparency" in image.info else "RGB")
+        if image.mode in ("1", "CMYK"):
+            return image.convert("RGB")
+        return image
+
+    def summary(self) -> str:
+        """처리 통계 한 줄 요약"""
+        stats = self.stats
+        return (f"이미지 {stats['images']}개 (축소 {stats['resized']}, 재사용 {stats['reused']}), "
+                f"{stats['bytes_in'] / 1024:.0f}KB → {stats['bytes_out'] / 1024:.0f}KB")
@@ -5,10 +5,10 @@
 
 import os
 import json
-import subprocess
-import time
 from pathlib import Path
 from adaptive_chart_system import AdaptiveCanvasCalculator
+from capture_engine import capture_html_to_png
+from capture_scheduler import CaptureScheduler
 
 class IntelligentPNGGenerator:
     """지능형 PNG 생성기"""
@@ -40,23 +40,28 @@ class IntelligentPNGGenerator:
         success_count = 0
         total_charts = 0
         
+        # 모든 차트를 병렬 캡처 작업으로 등록
+        scheduler = CaptureScheduler(manifest_path=str(charts_dir / "adaptive_capture_manifest.json"))
         for chart_name, size_info in self.sizing_config.items():
             html_file = charts_dir / f"{chart_name}.html"
             png_file = charts_dir / f"{chart_name}.png"
             
             if html_file.exists():
                 total_charts += 1
-                success = self._generate_single_png(
-                    html_file, png_file, 
-                    size_info['width'], size_info['height'],
-                    chart_name, size_info
-                )
-                
-                if success:
-                    success_count += 1
+                scheduler.add(html_file, png_file,
+                              window_size=(size_info['width'], size_info['height']),
+                              name=chart_name)
             else:
                 print(f"⚠️  {html_file} 파일이 존재하지 않습니다")
         
+        for result in scheduler.run():
+            chart_name = result["name"]
+            if result["success"]:
+                success_count += 1
+                self._print_chart_result(chart_name, self.sizing_config[chart_name])
+            else:
+                print(f"❌ {chart_name} 변환 실패: {result['error']}")
+        
         print("\n" + "=" * 80)
         print(f"🎯 PNG 생성 완료: {success_count}/{total_charts} 성공")
         self._print_generation_summary()
@@ -64,38 +69,27 @@ class IntelligentPNGGenerator:
     def _generate_single_png(self, html_file, png_file, width, height, chart_name, size_info):
         """개별 PNG 파일 생성"""
         
-        try:
-            # Chrome 헤드리스로 스크린샷 캡처
-            cmd = [
-                "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-                "--headless",
-                "--disable-gpu",
-                "--disable-web-security",
-                "--hide-scrollbars", 
-                "--force-device-scale-factor=1",
-                f"--window-size={width},{height}",
-                f"--screenshot={png_file}",
-                os.path.abspath(html_file)
-            ]
-            
-            subprocess.run(cmd, check=True, capture_output=True)
-            
-            # 성공 메시지 출력
-            complexity_emoji = self._get_complexity_emoji(size_info['complexity_score'])
-            size_category = self._get_size_category(width, height)
-            
-            print(f"✅ {complexity_emoji} {chart_name.upper()}")
-            print(f"   크기: {width}x{height} ({size_category})")  
-            print(f"   복잡도: {size_info['complexity_score']:.1f}/100")
-            print(f"   타입: {size_info['chart_type']}")
-            print(f"   최적화: {size_info['scaling_factor']:.2f}x 스케일링")
-            
+        result = capture_html_to_png(html_file, png_file, window_size=(width, height))
+        
+        if result["success"]:
+            self._print_chart_result(chart_name, size_info)
             return True
-            
-        except subprocess.CalledProcessError as e:
-            print(f"❌ {chart_name} 변환 실패: {e}")
+        else:
+            print(f"❌ {chart_name} 변환 실패: {result['error']}")
             return False
     
+    def _print_chart_result(self, chart_name, size_info):
+        """차트 생성 성공 메시지 출력"""
+        width, height = size_info['width'], size_info['height']
+        complexity_emoji = self._get_complexity_emoji(size_info['complexity_score'])
+        size_category = self._get_size_category(width, height)
+        
+        print(f"✅ {complexity_emoji} {chart_name.upper()}")
+        print(f"   크기: {width}x{height} ({size_category})")  
+        print(f"   복잡도: {size_info['complexity_score']:.1f}/100")
+        print(f"   타입: {size_info['chart_type']}")
+        print(f"   최적화: {size_info['scaling_factor']:.2f}x 스케일링")
+    
     def _get_complexity_emoji(self, score):
         """복잡도 점수에 따른 이모지 반환"""
         if score >= 70:
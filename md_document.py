@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+마크다운 문서 모델 (중간 표현) + 파싱 결과 캐시
+md_tokenizer로 분류한 라인을 한 번만 파싱해서 __slots__ 노드 목록으로 보관하고
+DOCX 생성(DocxConverter), 표 차트 추출(AutoChartGenerator, 표 노드의 행/셀),
+차트 배치(ImagePlacementProcessor, 제목/페이지 구분자 노드로 섹션 구분)가 같은 파싱 결과를 사용
+- 노드: 제목(번호 포함), 글머리(□ ○ - •), 표, 이미지, 캡션, 주석 정의, 목차 항목, 일반 단락 ...
+- 각 노드는 원본 라인 번호와 토큰을 함께 들고 있고, DOCX 생성은 문서의 토큰 목록(tokens)을 그대로 사용
+- 캐시: 원문 + 파서 버전 해시를 키로 marshal 바이너리를 디스크(공용 캐시 디렉토리/parse)와 메모리에 보관
+  원문 전체를 읽어 두므로 기본은 사용 안 함 (라인 스트리밍) - PARSE_CACHE=1이거나 증분/감시 모드일 때만 사용
+  (PARSE_CACHE=0이면 항상 끔), PARSE_CACHE_DIR로 위치 지정 (쓰기/정리는 disk_cache 공용 도우미)
+"""
+
+import hashlib
+import marshal
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from conversion_log import get_logger
+from disk_cache import atomic_write, default_cache_dir, entry_path, evict_lru
+from md_engine import table_cells
+from md_tokenizer import FOOTNOTE_PATTERN, PAGE_MARKER_PREFIX, Token, TokenKind, tokenize
+from section_cache import source_signature
+
+
+logger = get_logger("parse_cache")
+
+CACHE_NAME = "parse"
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024  # 100MB
+MEMORY_ENTRIES = 8  # 프로세스 안에서 바로 재사용할 최근 문서 수
+FORMAT_VERSION = 1
+
+HEADING_NUMBER_PATTERN = re.compile(r'(\d+(?:\.\d+)*)\.?\s')
+SEPARATOR_ROW_PATTERN = re.compile(r'^[\|\-\s:]*$')
+
+
+class Node:
+    """문서 노드 - 원본 라인 번호(0부터)와 분류된 토큰"""
+
+    __slots__ = ("line", "token")
+    fields = ()  # 하위 클래스의 추가 필드 (생성자 인자 순서)
+
+    def __init__(self, line: int, token: Token, *values):
+        self.line = line
+        self.token = token
+        for name, value in zip(self.fields, values):
+            setattr(self, name, value)
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.fields)
+        return f"{type(self).__name__}(line={self.line}, {values})"
+
+
+class Skip(Node):
+    """출력 없는 라인 (빈 줄, 구분선, 편집 안내)"""
+
+    __slots__ = ()
+
+
+class PageMarker(Node):
+    """### Page N 페이지 구분자"""
+
+    __slots__ = fields = ("page",)
+
+
+class Heading(Node):
+    """제목 - # ## ###, 1. / 1.1 / 1.1.1 계층 번호, Ⅰ 로마숫자 대제목, 1) 소제목
+
+    number는 제목 앞의 번호 ('1.2', 'Ⅱ', '3)' - 없으면 None)
+    """
+
+    __slots__ = fields = ("level", "number", "text")
+
+
+class Paragraph(Node):
+    """일반 단락 (footnotes: 본문에 나온 ^번호^ 주석 참조 번호)"""
+
+    __slots__ = fields = ("text", "footnotes")
+
+
+class Bullet(Node):
+    """글머리 항목 - 레벨은 □ 1, ○ 2, - 3, • 4 (①②③ 특수 번호는 레벨 0)"""
+
+    __slots__ = fields = ("level", "symbol", "text")
+
+
+class Table(Node):
+    """표 - 구분선을 뺀 행별 셀 목록, 표 위/아래의 <표 N> 캡션 설명 (token은 첫 행, row_tokens는 모든 행)"""
+
+    __slots__ = fields = ("rows", "caption", "row_tokens")
+
+
+class Image(Node):
+    """![alt](path) 이미지"""
+
+    __slots__ = fields = ("alt", "path")
+
+
+class Caption(Node):
+    """<그림 N> / <표 N> 캡션 (label: 그림/표, text: 설명)"""
+
+    __slots__ = fields = ("label", "text")
+
+
+class Footnote(Node):
+    """^번호^[설명] 주석 정의 줄 (【 주석 】 블록 제목은 number가 None)"""
+
+    __slots__ = fields = ("number", "text")
+
+
+class TocEntry(Node):
+    """목차 항목 (제목 ....... 쪽)"""
+
+    __slots__ = fields = ("title", "page", "indented")
+
+
+# 직렬화할 때 토큰 종류를 1바이트 코드로 저장
+TOKEN_KINDS = (
+    TokenKind.BLANK, TokenKind.PAGE_MARKER, TokenKind.EDIT_NOTE, TokenKind.RULE, TokenKind.IMAGE,
+    TokenKind.TABLE_ROW, TokenKind.HEADING, TokenKind.TOC_ENTRY, TokenKind.NUMBERED, TokenKind.CAPTION,
+    TokenKind.ROMAN_HEADING, TokenKind.SUBHEADING, TokenKind.BULLET, TokenKind.CIRCLED,
+    TokenKind.FOOTNOTE_DEF, TokenKind.FOOTNOTE_BLOCK, TokenKind.TEXT,
+)
+_KIND_CODES = {kind: code for code, kind in enumerate(TOKEN_KINDS)}
+
+
+class MarkdownDocument:
+    """파싱된 문서 - 라인마다 토큰 1개, 노드 목록은 처음 사용할 때 토큰에서 생성 (표는 연속된 표 행 전체가 노드 1개)
+
+    DOCX 생성처럼 토큰만 필요한 경우에는 캐시에서 읽은 토큰을 바로 사용하고 노드는 만들지 않는다
+    """
+
+    __slots__ = ("source_hash", "tokens", "_nodes")
+
+    def __init__(self, source_hash: str, tokens: List[Token]):
+        self.source_hash = source_hash
+        self.tokens = tokens
+        self._nodes = None
+
+    @property
+    def nodes(self) -> List[Node]:
+        if self._nodes is None:
+            self._nodes = build_nodes(self.tokens)
+        return self._nodes
+
+    def lines(self) -> List[str]:
+        """원본 라인 목록"""
+        return [token.raw for token in self.tokens]
+
+    def select(self, *node_types) -> List[Node]:
+        """종류가 맞는 노드 목록 (예: document.select(Table))"""
+        return [node for node in self.nodes if isinstance(node, node_types)]
+
+    @property
+    def title(self) -> Optional[str]:
+        """첫 번째 # 제목"""
+        for token in self.tokens:
+            if token.kind == TokenKind.HEADING and token.level == 1:
+                return token.text
+        return None
+
+    def to_bytes(self) -> bytes:
+        """marshal 바이너리로 직렬화
+
+        원문은 문자열 1개, 종류/레벨/주석 여부는 토큰마다 1바이트씩,
+        원본 라인에서 다시 만들 수 없는 값(앞뒤 공백 제거와 다른 텍스트, 캡션, 정규식 그룹)만 위치별로 따로 저장
+        (작은 객체 수만 개 대신 큰 객체 몇 개라 읽는 시간이 짧다)
+        """
+        tokens = self.tokens
+        extras = {}
+        for index, token in enumerate(tokens):
+            if token.table_caption is not None or token.groups or token.text != token.raw.strip():
+                extras[index] = (token.text, token.table_caption, token.groups)
+        return marshal.dumps((
+            FORMAT_VERSION,
+            self.source_hash,
+            '\n'.join(token.raw for token in tokens),
+            bytes(_KIND_CODES[token.kind] for token in tokens),
+            bytes(token.level for token in tokens),
+            bytes(token.has_footnote for token in tokens),
+            extras,
+        ))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "MarkdownDocument":
+        version, digest, source, kinds, levels, footnotes, extras = marshal.loads(data)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 파싱 캐시 형식: {version}")
+        make = tuple.__new__
+        token_kinds = TOKEN_KINDS
+        tokens = [
+            make(Token, (token_kinds[kind], raw.strip(), raw, level, footnote == 1, None, ()))
+            for raw, kind, level, footnote in zip(source.split('\n'), kinds, levels, footnotes)
+        ]
+        if len(tokens) != len(kinds):
+            raise ValueError("파싱 캐시 라인 수 불일치")
+        for index, (text, table_caption, groups) in extras.items():
+            token = tokens[index]
+            tokens[index] = make(Token, (token.kind, text, token.raw, token.level, token.has_footnote,
+                                         table_caption, groups))
+        return cls(digest, tokens)
+
+
+def source_hash(md_content: str) -> str:
+    return hashlib.sha256(md_content.encode('utf-8')).hexdigest()
+
+
+def _heading_number(text: str) -> Optional[str]:
+    match = HEADING_NUMBER_PATTERN.match(text)
+    return match.group(1) if match else None
+
+
+def _node_for(line: int, token: Token) -> Node:
+    """표 행을 제외한 토큰 1개 → 노드"""
+    kind = token.kind
+    text = token.text
+    if kind in TokenKind.SKIPPED:
+        if kind == TokenKind.PAGE_MARKER:
+            return PageMarker(line, token, text[len(PAGE_MARKER_PREFIX):].strip())
+        return Skip(line, token)
+    if kind in (TokenKind.HEADING, TokenKind.NUMBERED):
+        return Heading(line, token, token.level, _heading_number(text), text)
+    if kind == TokenKind.ROMAN_HEADING:
+        return Heading(line, token, 1, text.split(None, 1)[0].rstrip('.'), text)
+    if kind == TokenKind.SUBHEADING:
+        return Heading(line, token, 3, text.split(None, 1)[0], text)
+    if kind == TokenKind.BULLET:
+        return Bullet(line, token, token.level, text[0], text[1:].strip())
+    if kind == TokenKind.CIRCLED:
+        return Bullet(line, token, 0, text[0], text[1:].strip())
+    if kind == TokenKind.IMAGE:
+        alt, path = token.groups
+        return Image(line, token, alt, path)
+    if kind == TokenKind.CAPTION:
+        label, caption = token.groups if token.groups else (None, text)
+        return Caption(line, token, label, caption)
+    if kind == TokenKind.TOC_ENTRY:
+        title, page, indented = token.groups if token.groups else (text, None, False)
+        return TocEntry(line, token, title, page, indented)
+    if kind == TokenKind.FOOTNOTE_DEF:
+        number, definition = token.groups
+        return Footnote(line, token, number, definition)
+    if kind == TokenKind.FOOTNOTE_BLOCK:
+        return Footnote(line, token, None, text)
+    footnotes = tuple(number for number, _ in FOOTNOTE_PATTERN.findall(text)) if token.has_footnote else ()
+    return Paragraph(line, token, text, footnotes)
+
+
+def build_nodes(tokens: List[Token]) -> List[Node]:
+    """토큰 목록 → 노드 목록 (연속된 표 행은 표 노드 1개)"""
+    nodes: List[Node] = []
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        if token.kind != TokenKind.TABLE_ROW:
+            nodes.append(_node_for(index, token))
+            index += 1
+            continue
+
+        end = index
+        while end < len(tokens) and tokens[end].kind == TokenKind.TABLE_ROW:
+            end += 1
+        row_tokens = tokens[index:end]
+        rows = [table_cells(row.text) for row in row_tokens if not SEPARATOR_ROW_PATTERN.match(row.text)]
+        nodes.append(Table(index, token, rows, _find_table_caption(tokens, index, end), row_tokens))
+        index = end
+    return nodes
+
+
+def parse_lines(lines: Iterable[str], digest: str = "") -> MarkdownDocument:
+    """라인 목록을 파싱해서 문서 모델 생성"""
+    return MarkdownDocument(digest, list(tokenize(lines)))
+
+
+def _find_table_caption(tokens: List[Token], start: int, end: int) -> Optional[str]:
+    """표 바로 위 라인 또는 표 아래 최대 3줄(빈 줄 건너뜀, 다른 라인이 나오면 중단)의 <표 N> 캡션 설명"""
+    if start > 0 and tokens[start - 1].table_caption is not None:
+        return tokens[start - 1].table_caption
+    for candidate in tokens[end:end + 3]:
+        if candidate.kind == TokenKind.BLANK:
+            continue
+        return candidate.table_caption
+    return None
+
+
+def parse_markdown(md_content: str) -> MarkdownDocument:
+    """마크다운 문자열 파싱 (캐시 사용 안 함)"""
+    return parse_lines(md_content.split('\n'), source_hash(md_content))
+
+
+def parser_signature() -> str:
+    """파싱 결과에 영향을 주는 모듈 소스 + marshal/파이썬 버전 (바뀌면 예전 캐시는 무효)"""
+    modules = source_signature(("md_tokenizer", "md_engine", __name__))
+    return f"{modules}-{marshal.version}-{sys.version_info[0]}.{sys.version_info[1]}"
+
+
+class ParseCache:
+    """원문 해시 키 기반 파싱 결과 캐시 (메모리 LRU + 디스크, 디스크는 파일 수정 시각으로 LRU 관리)"""
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 memory_entries: int = MEMORY_ENTRIES):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir(CACHE_NAME, "PARSE_CACHE_DIR")
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def make_key(self, md_content: str) -> str:
+        digest = hashlib.sha256(parser_signature().encode('utf-8'))
+        digest.update(md_content.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return entry_path(self.cache_dir, key, ".bin")
+
+    def get(self, key: str) -> Optional[MarkdownDocument]:
+        """캐시된 문서 (없거나 읽을 수 없으면 None)"""
+        with self._lock:
+            document = self._memory.get(key)
+            if document is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return document
+
+        entry = self._entry_path(key)
+        try:
+            with open(entry, 'rb') as f:
+                document = MarkdownDocument.from_bytes(f.read())
+            os.utime(entry)  # 최근 사용 시각 갱신 (LRU)
+        except (OSError, ValueError, EOFError, TypeError, IndexError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        self._remember(key, document)
+        return document
+
+    def put(self, key: str, document: MarkdownDocument):
+        self._remember(key, document)
+        try:
+            atomic_write(self._entry_path(key), document.to_bytes())
+        except OSError as e:  # 읽기 전용 위치 등 - 메모리 캐시만 사용
+            logger.debug("파싱 캐시 저장 실패: %s", e)
+            return
+        self.evict()
+
+    def _remember(self, key: str, document: MarkdownDocument):
+        with self._lock:
+            self._memory[key] = document
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def load(self, md_content: str) -> MarkdownDocument:
+        """캐시에 있으면 그대로, 없으면 파싱해서 저장"""
+        key = self.make_key(md_content)
+        document = self.get(key)
+        if document is None:
+            document = parse_markdown(md_content)
+            self.put(key, document)
+        return document
+
+    def evict(self):
+        """용량 한도를 넘으면 가장 오래 사용하지 않은 항목부터 삭제"""
+        with self._lock:
+            evict_lru(self.cache_dir, self.max_bytes, (".bin",))
+
+    def log_stats(self):
+        total = self.hits + self.misses
+        if total:
+            logger.info("💾 파싱 캐시: 재사용 %d/%d개", self.hits, total)
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_parse_cache(default: bool = False) -> Optional[ParseCache]:
+    """프로세스 기본 파싱 캐시 (사용하지 않으면 None)
+
+    환경변수 PARSE_CACHE=1이면 사용, 0이면 사용 안 함, 지정하지 않으면 default (증분/감시 모드는 True)
+    """
+    global _default_cache
+    setting = os.environ.get("PARSE_CACHE")
+    if setting == "0" or (setting is None and not default):
+        return None
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = ParseCache()
+    return _default_cache
+
+
+def load_markdown(md_content: str) -> MarkdownDocument:
+    """기본 캐시를 거쳐 마크다운 문자열 파싱 (캐시를 끈 경우 바로 파싱)"""
+    cache = get_parse_cache()
+    return cache.load(md_content) if cache is not None else parse_markdown(md_content)
+
+
+def load_markdown_file(md_file_path: str) -> MarkdownDocument:
+    with open(md_file_path, 'r', encoding='utf-8') as f:
+        return load_markdown(f.read())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+공용 마크다운 → DOCX 변환 코어
+DocxConverter, SimpleDocxConverter, UniversalMDConverter가 같은 라인 스트림 처리 루프와 생성 도우미를 사용
+- 분류: 변환 프로필의 tokenize()가 라인을 md_tokenizer의 토큰 종류(TokenKind)로 분류
+- 처리: MarkdownEngine이 직전 토큰 + 작은 lookahead만 들고 표 행을 모으고, 종류별 처리 함수를 표에서 찾아 호출
+- 생성: 스타일 ID 캐시, 표 셀 분리, 이미지 단락 같은 공용 도우미
+변환기마다 다른 부분(분류 규칙, 스타일, 표 위/아래 캡션 처리)은 ConversionProfile을 상속한 변환기 클래스가 정하므로
+기존 세 변환기의 결과 문서는 그대로이고, 빠른 경로(토큰 분류, 표 일괄 생성, 이미지 미리 읽기)는 함께 사용한다
+"""
+
+import os
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from docx.enum.style import WD_STYLE_TYPE
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Inches
+
+from md_tokenizer import Lookahead, Token, TokenKind, tokenize
+from tracing import span
+
+
+def table_cells(line: str) -> List[str]:
+    """| a | b | 형태 라인의 셀 텍스트 (양 끝 | 바깥은 버림, 빈 셀 유지)"""
+    return [cell.strip() for cell in line.split('|')[1:-1]]
+
+
+def add_picture_paragraph(document, preprocessor, image_path: str, width: float):
+    """가운데 정렬 단락에 전처리한 이미지 추가 후 InlineShape 반환
+
+    추가에 실패하면 예외를 그대로 올린다 (빈 단락은 남으므로 대체 텍스트는 호출한 쪽에서 처리)
+    """
+    paragraph = document.add_paragraph()
+    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = paragraph.add_run()
+    with span("image", path=os.path.basename(image_path)):
+        picture = run.add_picture(preprocessor.prepare(image_path, width), width=Inches(width))
+    # 전처리 결과(BytesIO)를 넘기면 python-docx가 그림 이름을 image.png로 붙이므로 원본 파일 이름으로 되돌림
+    picture._inline.graphic.graphicData.pic.nvPicPr.cNvPr.name = os.path.basename(image_path)
+    return picture
+
+
+class ConversionProfile(ABC):
+    """변환기별 규칙 - 변환기 클래스가 상속해서 분류 규칙과 토큰 종류별 처리 함수를 정함
+
+    기본값은 DocxConverter 규칙 (md_tokenizer 분류, 빈 줄/구분선/이미지는 표를 끝내지 않음)
+    처리 함수는 handler(token)이고, 다음 토큰을 함께 처리했으면 건너뛸 토큰 수를 반환
+    handle_text와 end_table은 반드시 정의해야 함 (빠뜨리면 변환 도중이 아니라 변환기를 만들 때 TypeError)
+    """
+
+    # 표 행 수집과 상관없이 바로 처리하는 종류 (표 중간에 나와도 표가 끝나지 않음)
+    passthrough_kinds = TokenKind.SKIPPED | {TokenKind.IMAGE}
+    # 표를 끝낸 라인을 이어서 처리할지 (False면 그 라인은 출력하지 않음)
+    reprocess_table_end = True
+
+    def tokenize(self, lines: Iterable[str]) -> Iterator[Token]:
+        return tokenize(lines)
+
+    def token_handlers(self) -> Dict[str, Callable[[Token], Optional[int]]]:
+        """토큰 종류 → 처리 함수 (없는 종류는 handle_text로 처리, 건너뛰는 종류는 출력 없음)"""
+        return {}
+
+    @abstractmethod
+    def handle_text(self, token: Token) -> Optional[int]:
+        """처리 함수가 없는 종류 (일반 텍스트)"""
+
+    def start_table(self, token: Token, engine: "MarkdownEngine"):
+        """표 첫 행 - engine.prev_token으로 표 위 캡션 확인"""
+
+    @abstractmethod
+    def end_table(self, rows: List[Token], engine: "MarkdownEngine") -> int:
+        """모은 표 행으로 표 생성 (engine.find_table_caption()으로 표 아래 캡션 확인), 건너뛸 토큰 수 반환"""
+
+    def _apply_style(self, paragraph, style_name: str):
+        """단락 스타일 지정 - python-docx는 지정할 때마다 전체 스타일을 검색하므로 스타일 ID를 캐시
+
+        self.document와 문서마다 새로 만드는 self._style_ids(dict)를 사용
+        """
+        style_id = self._style_ids.get(style_name)
+        if style_id is None:
+            style_id = self.document.part.get_style_id(style_name, WD_STYLE_TYPE.PARAGRAPH)
+            self._style_ids[style_name] = style_id
+        paragraph._p.style = style_id
+
+
+class MarkdownEngine:
+    """토큰 스트림 처리 루프 (직전 토큰과 앞쪽 몇 개 토큰만 참조)"""
+
+    TABLE_CAPTION_LOOKAHEAD = 3  # 표 아래 캡션을 찾을 최대 토큰 수
+
+    def __init__(self, profile: ConversionProfile):
+        self.profile = profile
+        self.handlers = {kind: None for kind in TokenKind.SKIPPED}
+        self.handlers.update(profile.token_handlers())
+        self.stream = Lookahead(())
+        self.prev_token = None  # 처리 중인 토큰의 직전 토큰
+
+    def peek(self, offset: int = 1) -> Optional[Token]:
+        return self.stream.peek(offset)
+
+    def find_table_caption(self, limit: int = TABLE_CAPTION_LOOKAHEAD) -> Tuple[int, Optional[Token]]:
+        """다음 limit개 토큰에서 <표 N> 캡션 찾기 - 빈 줄은 건너뛰고 다른 라인이 나오면 중단 (위치, 토큰)"""
+        for offset in range(1, limit + 1):
+            candidate = self.stream.peek(offset)
+            if candidate is None:
+                break
+            if candidate.kind == TokenKind.BLANK:
+                continue
+            if candidate.table_caption is not None:
+                return offset, candidate
+            break
+        return 0, None
+
+    def dispatch(self, token: Token) -> int:
+        handler = self.handlers.get(token.kind, self.profile.handle_text)
+        if handler is None:
+            return 0
+        return handler(token) or 0
+
+    def run_lines(self, lines: Iterable[str]):
+        self.run(self.profile.tokenize(lines))
+
+    def run(self, tokens: Iterable[Token]):
+        """토큰 스트림 처리 - 연속된 표 행을 모아 표로 만들고 나머지는 종류별 처리 함수로"""
+        profile = self.profile
+        passthrough = profile.passthrough_kinds
+        stream = self.stream = Lookahead(tokens)
+        table: List[Token] = []
+        previous = None
+
+        for token in stream:
+            self.prev_token, previous = previous, token
+            kind = token.kind
+
+            if kind in passthrough:
+                skip = self.dispatch(token)
+            elif kind == TokenKind.TABLE_ROW:
+                if not table:
+                    profile.start_table(token, self)
+                table.append(token)
+                skip = 0
+            elif table:
+                # 표 끝 - 표를 만들고 현재 라인은 프로필 규칙에 따라 이어서 처리
+                skip = profile.end_table(table, self)
+                table = []
+                if profile.reprocess_table_end:
+                    skip = self.dispatch(token) or skip
+            else:
+                skip = self.dispatch(token)
+
+            if skip:
+                previous = stream.skip(skip)
+
+        # 마지막에 표가 있으면 처리
+        if table:
+            profile.end_table(table, self)
+
+    def run_first(self, tokens: Iterable[Token], prev_token: Optional[Token] = None) -> int:
+        """첫 토큰 하나만 처리하고 소비한 토큰 수 반환 (라인 리스트 인덱스 API용)"""
+        self.stream = Lookahead(tokens)
+        token = next(self.stream, None)
+        if token is None:
+            return 0
+        self.prev_token = prev_token
+        skip = self.dispatch(token)
+        if skip:
+            self.stream.skip(skip)
+        return self.stream.consumed
@@ -7,31 +7,65 @@ MD to DOCX Converter
 import re
 import os
 import sys
-from typing import Dict, List, Tuple, Optional
+import hashlib
+import json
+import io
+import threading
+import zipfile
+from copy import deepcopy
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Tuple, Optional
 from pathlib import Path
 
 # 마크다운 처리를 위한 모듈들
 # import markdown
 from bs4 import BeautifulSoup
+import docx
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.dml import MSO_THEME_COLOR_INDEX
 from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_BREAK
 from docx.enum.style import WD_STYLE_TYPE
+from docx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from docx.opc.packuri import PackURI
+from docx.opc.part import PartFactory, XmlPart
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
 from docx.oxml.shared import OxmlElement, qn
+from docx.text.run import Run
+from lxml import etree
+from conversion_log import ProgressEmitter, configure_logging, get_logger
+from disk_cache import atomic_path, default_cache_dir
+from image_pipeline import ImagePreprocessor, report_missing_images
+from md_document import MarkdownDocument, get_parse_cache
+from md_engine import ConversionProfile, MarkdownEngine, add_picture_paragraph
+from md_tokenizer import (FOOTNOTE_DEFINITION_PATTERN, FOOTNOTE_PATTERN, HIERARCHICAL_PATTERN, IMAGE_PATTERN,
+                          PAGE_MARKER_PREFIX, Token, TokenKind, has_footnote, iter_lines, split_sections, tokenize)
+from section_cache import SectionCache, file_stamp, incremental_enabled, source_signature
+from tracing import flush_trace, get_tracer, span
+from table_builder import TableBuilder
+
+logger = get_logger("converter")
+
+
+def _korean_rfonts():
+    """한글/영문 폰트가 지정된 rFonts 원본 요소"""
+    rFonts = OxmlElement('w:rFonts')
+    rFonts.set(qn('w:eastAsia'), '맑은 고딕')  # 한글용
+    rFonts.set(qn('w:ascii'), 'Arial')      # 영문용
+    rFonts.set(qn('w:hAnsi'), 'Arial')     # 서구 문자용
+    rFonts.set(qn('w:cs'), '맑은 고딕')     # 복합 스크립트용
+    return rFonts
+
+
+KOREAN_RFONTS = _korean_rfonts()
 
 
 def set_korean_font(run):
-    """한글과 영문을 모두 지원하는 폰트 설정"""
-    try:
-        # 한글 폰트 설정 (윈도우 호환)
-        run._element.rPr.rFonts.set(qn('w:eastAsia'), '맑은 고딕')  # 한글용
-        run._element.rPr.rFonts.set(qn('w:ascii'), 'Arial')      # 영문용  
-        run._element.rPr.rFonts.set(qn('w:hAnsi'), 'Arial')     # 서구 문자용
-        run._element.rPr.rFonts.set(qn('w:cs'), '맑은 고딕')     # 복합 스크립트용
-    except:
-        # 폴백: 기본 폰트만 설정
-        run.font.name = 'Arial'
+    """한글과 영문을 모두 지원하는 폰트 설정 (미리 만든 rFonts를 복사해서 교체)"""
+    rPr = run._element.get_or_add_rPr()
+    rPr._remove_rFonts()
+    rPr._insert_rFonts(deepcopy(KOREAN_RFONTS))
 
 def set_korean_font_for_style(font_obj):
     """스타일 폰트 객체에 한글/영문 폰트 설정"""
@@ -58,37 +92,393 @@ def set_korean_font_for_style(font_obj):
         # 폴백: 윈도우 기본 한글 폰트
         font_obj.name = 'Malgun Gothic'
 
-class FootnoteManager:
-    """워드 주석(footnote) 관리 클래스"""
+class RunFormatter:
+    """런 서식 적용 레이어
+    
+    단락 스타일(및 표 스타일, 문서 기본값)에서 이미 상속되는 속성은 런에 기록하지 않고,
+    달라지는 속성 조합마다 rPr 요소를 한 번만 만들어 두었다가 복사해서 붙인다
+    (런마다 rFonts/sz를 반복 기록하지 않으므로 document.xml이 작아지고 저장도 빨라짐)
+    """
+    
+    OFF_VALUES = ('0', 'false', 'off')
     
     def __init__(self, document: Document):
         self.document = document
+        self._inherited = {}   # (단락 스타일 ID, 표 스타일 ID) → 상속되는 런 속성
+        self._templates = {}   # 달라지는 속성 조합 → rPr 원본 요소
+    
+    def add_run(self, paragraph, text: str, size=None, bold: bool = None, italic: bool = None,
+                superscript: bool = None, font: str = 'Arial'):
+        """단락에 런을 추가하고 서식 적용 (단락 스타일은 먼저 지정해 두어야 함)"""
+        run = paragraph.add_run(text)
+        self.apply(run, paragraph, size=size, bold=bold, italic=italic, superscript=superscript, font=font)
+        return run
+    
+    def apply(self, run, paragraph, size=None, bold: bool = None, italic: bool = None,
+              superscript: bool = None, font: str = 'Arial'):
+        """런에 서식 적용 - 상속값과 다른 속성만 기록"""
+        inherited = self._inherited_props(paragraph)
+        wanted = (('font', font), ('size', size), ('bold', bold), ('italic', italic), ('superscript', superscript))
+        diff = tuple((name, value) for name, value in wanted
+                     if value is not None and inherited.get(name) != value)
+        if not diff:
+            return
+        
+        if run._r.rPr is not None:  # 이미 서식이 있는 런은 개별 속성으로 적용
+            self._set_props(run.font, diff)
+            return
+        
+        template = self._templates.get(diff)
+        if template is None:
+            scratch = Run(OxmlElement('w:r'), None)
+            self._set_props(scratch.font, diff)
+            template = scratch._r.rPr
+            self._templates[diff] = template
+        run._r.insert(0, deepcopy(template))
+    
+    def _set_props(self, font, diff):
+        for name, value in diff:
+            if name == 'font':
+                font.name = value
+            elif name == 'size':
+                font.size = value
+            elif name == 'bold':
+                font.bold = value
+            elif name == 'italic':
+                font.italic = value
+            else:
+                font.superscript = value
+    
+    def _inherited_props(self, paragraph) -> dict:
+        """단락 스타일 → 표 스타일 → 문서 기본값 순으로 상속되는 런 속성"""
+        p = paragraph._p
+        pPr = p.pPr
+        style_id = pPr.style if pPr is not None else None
+        table_style_id = None
+        tc = p.getparent()
+        if tc is not None and tc.tag == qn('w:tc'):
+            table_style_id = self._table_style_id(tc)
+        
+        key = (style_id, table_style_id)
+        props = self._inherited.get(key)
+        if props is None:
+            props = self._resolve(style_id, table_style_id)
+            self._inherited[key] = props
+        return props
+    
+    def _table_style_id(self, tc):
+        values = tc.xpath('../../w:tblPr/w:tblStyle/@w:val')  # tc → tr → tbl
+        return values[0] if values else None
+    
+    def _style_chain(self, styles_element, style_id, style_type):
+        """스타일과 basedOn 상위 스타일의 rPr 목록"""
+        if style_id is None and style_type == 'paragraph':
+            found = styles_element.xpath('./w:style[@w:type="paragraph" and @w:default="1"]')
+        elif style_id is None:
+            return []
+        else:
+            found = styles_element.xpath(f'./w:style[@w:styleId="{style_id}"]')
+        
+        chain = []
+        visited = set()
+        while found and len(visited) < 20:
+            style = found[0]
+            visited.add(style.get(qn('w:styleId')))
+            chain.extend(style.xpath('./w:rPr'))
+            based_on = style.xpath('./w:basedOn/@w:val')
+            if not based_on or based_on[0] in visited:
+                break
+            found = styles_element.xpath(f'./w:style[@w:styleId="{based_on[0]}"]')
+        return chain
+    
+    def _resolve(self, style_id, table_style_id) -> dict:
+        styles_element = self.document.styles.element
+        chain = (self._style_chain(styles_element, style_id, 'paragraph')
+                 + self._style_chain(styles_element, table_style_id, 'table')
+                 + styles_element.xpath('./w:docDefaults/w:rPrDefault/w:rPr'))
+        
+        props = {'bold': False, 'italic': False, 'superscript': False}
+        resolved = set()
+        for rPr in chain:
+            for child in rPr:
+                tag = child.tag
+                if tag == qn('w:rFonts') and 'font' not in resolved:
+                    if child.get(qn('w:asciiTheme')) is not None:
+                        props['font'] = None  # 테마 글꼴이면 알 수 없으므로 항상 기록
+                        resolved.add('font')
+                    elif child.get(qn('w:ascii')) is not None:
+                        props['font'] = child.get(qn('w:ascii'))
+                        resolved.add('font')
+                elif tag == qn('w:sz') and 'size' not in resolved:
+                    props['size'] = Pt(int(child.get(qn('w:val'))) / 2)
+                    resolved.add('size')
+                elif tag in (qn('w:b'), qn('w:i')):
+                    name = 'bold' if tag == qn('w:b') else 'italic'
+                    if name not in resolved:
+                        props[name] = child.get(qn('w:val'), 'true').lower() not in self.OFF_VALUES
+                        resolved.add(name)
+                elif tag == qn('w:vertAlign') and 'superscript' not in resolved:
+                    props['superscript'] = child.get(qn('w:val')) == 'superscript'
+                    resolved.add('superscript')
+        return props
+
+
+class FootnoteIndex:
+    """마크다운 주석 번호 → 주석 내용 색인 (본문 처리 전에 라인을 한 번 훑으며 채움)
+    
+    【 중요 주석 】 블록의 ^n^[설명] 정의 줄이 가장 우선이고,
+    없으면 참조 자리의 [설명], 그것도 없으면 같은 번호가 처음 쓰인 곳의 [설명]을 사용
+    """
+    
+    def __init__(self):
+        self.definitions = {}  # 번호 → 정의 줄의 설명
+        self.inline = {}       # 번호 → 본문 참조에 처음 붙은 설명
+        self.references = {}   # 번호 → 본문 참조마다 붙은 설명 목록 (설명이 없으면 None)
+    
+    def scan_line(self, line: str):
+        """(앞뒤 공백을 제거한) 라인 1개의 주석 참조/정의 등록"""
+        if '^' not in line:
+            return
+        definition = FOOTNOTE_DEFINITION_PATTERN.match(line)
+        if definition:
+            self.definitions.setdefault(*definition.groups())
+            return
+        for match in FOOTNOTE_PATTERN.finditer(line):
+            number, text = match.groups()
+            self.references.setdefault(number, []).append(text or None)
+            if text:
+                self.inline.setdefault(number, text)
+    
+    def is_repeated(self, number: str, text: str) -> bool:
+        """같은 번호를 같은 내용(text_for 결과)으로 본문에서 두 번 이상 참조하는지 (두 번 이상이면 첫 각주에 책갈피)"""
+        return sum(1 for inline_text in self.references.get(number, ())
+                   if self.text_for(number, inline_text) == text) > 1
+    
+    def text_for(self, number: str, inline_text: str = None) -> str:
+        """주석 번호의 내용"""
+        return self.definitions.get(number) or inline_text or self.inline.get(number) or f"참조 {number}"
+
+
+BOOKMARK_VARIANT_STRIDE = 100000  # 같은 번호의 다른 내용 책갈피 ID 간격 (주석 번호와 겹치지 않도록)
+
+# 각주 파트 원본 - 구분선 각주(-1, 0)만 들어 있음
+FOOTNOTES_XML = (
+    f'<w:footnotes {nsdecls("w")}>'
+    '<w:footnote w:type="separator" w:id="-1"><w:p><w:pPr><w:spacing w:after="0" w:line="240" w:lineRule="auto"/>'
+    '</w:pPr><w:r><w:separator/></w:r></w:p></w:footnote>'
+    '<w:footnote w:type="continuationSeparator" w:id="0"><w:p><w:pPr><w:spacing w:after="0" w:line="240" '
+    'w:lineRule="auto"/></w:pPr><w:r><w:continuationSeparator/></w:r></w:p></w:footnote>'
+    '</w:footnotes>'
+)
+
+# 템플릿에 이미 있는 각주 파트도 XML로 읽어서 이어 쓸 수 있도록 등록
+PartFactory.part_type_for.setdefault(CT.WML_FOOTNOTES, XmlPart)
+
+
+class FootnoteManager:
+    """워드 주석(footnote) 관리 클래스
+    
+    기본은 footnotes.xml 파트에 실제 워드 각주를 쓰고 본문에는 w:footnoteReference 런만 넣는다
+    (번호는 워드가 매기며, 각주 요소와 참조 런은 원본을 한 번 만들어 두고 복사)
+    같은 주석 번호는 각주를 한 번만 만들고, 두 번째 참조부터는 첫 각주를 가리키는 NOTEREF 상호 참조 필드를 넣는다
+    (번호가 같아도 참조 자리의 [설명]이 달라 내용이 다르면 각주를 새로 만든다 - 내용이 같은 참조끼리만 공유)
+    워드는 각주를 처음 나온 순서대로 1, 2, 3 ... 번호를 매기므로 마크다운 번호가 건너뛰거나 순서가 다르면 번호가 바뀐다
+    환경변수 DOCX_NATIVE_FOOTNOTES=0이면 예전처럼 상첨자 번호 + 문서 끝 "주석" 섹션
+    """
+    
+    def __init__(self, document: Document, run_formatter: RunFormatter = None, native: bool = None):
+        self.document = document
+        self.run_formatter = run_formatter or RunFormatter(document)
+        if native is None:
+            native = os.environ.get("DOCX_NATIVE_FOOTNOTES", "1") != "0"
+        self.native = native
+        self.index = FootnoteIndex()
         self.footnote_counter = 0
-        self.footnotes = {}  # 주석 번호 -> 주석 내용 매핑
+        self.footnotes = {}  # 주석 번호 -> 주석 내용 매핑 (주석 섹션용)
         self.has_footnote_section_in_md = False  # MD에 주석 섹션이 있는지 추적
+        self._footnotes_element = None  # w:footnotes (첫 각주를 추가할 때 생성)
+        self._next_id = 1
+        self._footnote_template = None
+        self._reference_template = None
+        self._reference_style = None
+        self.note_count = 0      # 지금까지 쓴 워드 각주 수 (워드 각주 번호 = 쓴 순서)
+        self.note_ordinals = {}  # (주석 번호, 내용) → (그 내용으로 처음 쓴 각주의 순번, 번호 안의 변형 순서)
+        self.note_variants = {}  # 주석 번호 → 지금까지 쓴 서로 다른 내용 수
+    
+    def add_text(self, paragraph, text: str, size=None, bold: bool = None):
+        """^n^ / ^n^[설명] 참조가 섞인 텍스트를 런과 주석 참조로 나눠서 추가"""
+        position = 0
+        for match in FOOTNOTE_PATTERN.finditer(text):
+            before_text = text[position:match.start()]
+            if before_text:
+                self.run_formatter.add_run(paragraph, before_text, size=size, bold=bold)
+            self.add_reference(paragraph, match.group(1), match.group(2))
+            position = match.end()
+        
+        remaining_text = text[position:]
+        if remaining_text:
+            self.run_formatter.add_run(paragraph, remaining_text, size=size, bold=bold)
+    
+    def add_reference(self, paragraph, number: str, inline_text: str = None):
+        """^n^ 참조 1개 추가 (워드 각주 참조 또는 상첨자 번호)"""
+        if self.native:
+            text = self.index.text_for(number, inline_text)
+            note = self.note_ordinals.get((number, text))
+            if note is not None:
+                return self._add_note_cross_reference(paragraph, number, *note)
+            footnote_id = self._add_native_footnote(paragraph, text)
+            variant = self.note_variants.get(number, 0) + 1
+            self.note_variants[number] = variant
+            self.note_ordinals[(number, text)] = (self.note_count, variant)
+            if self.index.is_repeated(number, text):
+                self._bookmark_reference(paragraph._p[-1], number, variant)
+            return footnote_id
+        
+        # 주석 참조 추가 (상첨자) - 내용은 문서 끝 주석 섹션에 추가
+        self.run_formatter.add_run(paragraph, number, size=Pt(8), superscript=True)
+        self.footnotes[int(number)] = inline_text or f"참조 {number}"
+        self.footnote_counter = max(self.footnote_counter, int(number))
+        return int(number)
     
     def add_footnote(self, paragraph, text_before_footnote: str, footnote_content: str):
-        """실제 워드 주석 추가"""
-        self.footnote_counter += 1
-        
+        """주석 전 텍스트와 함께 주석 추가 (주석 섹션 방식에서는 순서대로 번호 부여)"""
         # 주석 전 텍스트 추가
-        run1 = paragraph.add_run(text_before_footnote)
-        run1.font.name = 'Arial'
-        run1.font.size = Pt(11)
+        if text_before_footnote:
+            self.run_formatter.add_run(paragraph, text_before_footnote, size=Pt(11))
         
-        # 주석 참조 추가 (상첨자로)
-        footnote_ref = paragraph.add_run(str(self.footnote_counter))
-        footnote_ref.font.superscript = True
-        footnote_ref.font.size = Pt(8)
-        footnote_ref.font.name = 'Arial'
+        if self.native:
+            return self._add_native_footnote(paragraph, footnote_content)
         
+        self.footnote_counter += 1
+        # 주석 참조 추가 (상첨자로)
+        self.run_formatter.add_run(paragraph, str(self.footnote_counter), size=Pt(8), superscript=True)
         # 주석 내용 저장 (나중에 문서 끝에 추가)
         self.footnotes[self.footnote_counter] = footnote_content
-        
         return self.footnote_counter
     
+    def _add_native_footnote(self, paragraph, content: str) -> int:
+        """footnotes.xml에 각주를 추가하고 단락 끝에 참조 런 추가"""
+        footnotes = self._footnotes_element
+        if footnotes is None:
+            footnotes = self._load_footnotes()
+        footnote_id = str(self._next_id)
+        self._next_id += 1
+        self.note_count += 1
+        
+        footnote = deepcopy(self._footnote_template)
+        footnote.set(qn('w:id'), footnote_id)
+        footnote.find(f".//{qn('w:t')}").text = f" {content}"
+        footnotes.append(footnote)
+        
+        reference = deepcopy(self._reference_template)
+        reference[-1].set(qn('w:id'), footnote_id)
+        paragraph._p.append(reference)
+        return int(footnote_id)
+    
+    @staticmethod
+    def _bookmark(number: str, variant: int) -> Tuple[int, str]:
+        """첫 각주 참조 책갈피의 (ID, 이름) - 번호의 첫 내용은 ID가 주석 번호, 다른 내용은 변형 순서를 붙여 구분"""
+        if variant == 1:
+            return int(number), f"_RefFootnote{number}"
+        return int(number) + (variant - 1) * BOOKMARK_VARIANT_STRIDE, f"_RefFootnote{number}_{variant}"
+    
+    def _bookmark_reference(self, reference, number: str, variant: int):
+        """다시 참조할 주석의 첫 각주 참조 런을 책갈피로 감싸기"""
+        bookmark_id, name = self._bookmark(number, variant)
+        reference.addprevious(parse_xml(
+            f'<w:bookmarkStart {nsdecls("w")} w:id="{bookmark_id}" w:name="{name}"/>'
+        ))
+        reference.addnext(parse_xml(f'<w:bookmarkEnd {nsdecls("w")} w:id="{bookmark_id}"/>'))
+    
+    def _add_note_cross_reference(self, paragraph, number: str, ordinal: int, variant: int) -> int:
+        """이미 각주를 쓴 번호 - 첫 각주 번호를 각주 참조 서식으로 보여 주는 NOTEREF 필드 런 추가
+        
+        필드 결과에는 첫 각주의 순번을 미리 넣어 두므로 필드를 업데이트하지 않아도 번호가 맞다
+        """
+        if self._footnotes_element is None:
+            self._load_footnotes()
+        rPr = f'<w:rPr><w:rStyle w:val="{self._reference_style}"/></w:rPr>'
+        instruction = f' NOTEREF {self._bookmark(number, variant)[1]} \\f \\h '  # \f: 각주 참조 서식, \h: 하이퍼링크
+        field = parse_xml(
+            f'<w:p {nsdecls("w")}>'
+            f'<w:r>{rPr}<w:fldChar w:fldCharType="begin"/></w:r>'
+            f'<w:r>{rPr}<w:instrText xml:space="preserve">{instruction}</w:instrText></w:r>'
+            f'<w:r>{rPr}<w:fldChar w:fldCharType="separate"/></w:r>'
+            f'<w:r>{rPr}<w:t>{ordinal}</w:t></w:r>'
+            f'<w:r>{rPr}<w:fldChar w:fldCharType="end"/></w:r>'
+            '</w:p>'
+        )
+        paragraph._p.extend(list(field))
+        return ordinal
+    
+    def notes_since(self, note_count: int) -> dict:
+        """note_count개 이후에 쓴 각주 (섹션 조각 캐시용) - 추가된 각주 수와 (번호, 내용)별 상대 순번, 변형 순서"""
+        return {
+            "added": self.note_count - note_count,
+            "numbers": [[number, text, ordinal - note_count, variant]
+                        for (number, text), (ordinal, variant) in self.note_ordinals.items()
+                        if ordinal > note_count],
+        }
+    
+    def restore_notes(self, notes: dict):
+        """캐시에서 붙인 섹션의 각주를 순번 기록에 반영"""
+        for number, text, offset, variant in notes["numbers"]:
+            self.note_ordinals[(number, text)] = (self.note_count + offset, variant)
+            self.note_variants[number] = max(self.note_variants.get(number, 0), variant)
+        self.note_count += notes["added"]
+    
+    def export_footnotes(self, elements) -> Dict[str, str]:
+        """본문 요소들이 참조하는 각주를 {각주 ID: 각주 XML}로 반환 (섹션 조각 캐시용)"""
+        ids = {reference.get(qn('w:id')) for element in elements
+               for reference in element.iter(qn('w:footnoteReference'))}
+        if not ids or self._footnotes_element is None:
+            return {}
+        return {footnote.get(qn('w:id')): etree.tostring(footnote, encoding='unicode')
+                for footnote in self._footnotes_element.findall(qn('w:footnote'))
+                if footnote.get(qn('w:id')) in ids}
+    
+    def adopt_references(self, element, footnotes: Dict[str, str]):
+        """캐시에서 가져온 본문 요소의 각주 참조를 이 문서의 새 각주로 다시 연결"""
+        for reference in element.iter(qn('w:footnoteReference')):
+            footnotes_element = self._footnotes_element
+            if footnotes_element is None:
+                footnotes_element = self._load_footnotes()
+            footnote = parse_xml(footnotes[reference.get(qn('w:id'))])
+            footnote_id = str(self._next_id)
+            self._next_id += 1
+            footnote.set(qn('w:id'), footnote_id)
+            footnotes_element.append(footnote)
+            reference.set(qn('w:id'), footnote_id)
+    
+    def _load_footnotes(self):
+        """문서의 각주 파트를 찾거나 새로 만들고 각주/참조 원본 요소 준비"""
+        document_part = self.document.part
+        part = next((rel.target_part for rel in document_part.rels.values()
+                     if rel.reltype == RT.FOOTNOTES and not rel.is_external), None)
+        if part is None:
+            part = XmlPart(PackURI('/word/footnotes.xml'), CT.WML_FOOTNOTES, parse_xml(FOOTNOTES_XML),
+                           document_part.package)
+            document_part.relate_to(part, RT.FOOTNOTES)
+        
+        self._footnotes_element = part.element
+        existing_ids = [int(footnote.get(qn('w:id'))) for footnote in part.element.findall(qn('w:footnote'))]
+        self._next_id = max(existing_ids + [0]) + 1
+        
+        text_style = document_part.get_style_id('footnote text', WD_STYLE_TYPE.PARAGRAPH)
+        reference_style = document_part.get_style_id('footnote reference', WD_STYLE_TYPE.CHARACTER)
+        self._reference_style = reference_style
+        self._footnote_template = parse_xml(
+            f'<w:footnote {nsdecls("w")}><w:p><w:pPr><w:pStyle w:val="{text_style}"/></w:pPr>'
+            f'<w:r><w:rPr><w:rStyle w:val="{reference_style}"/></w:rPr><w:footnoteRef/></w:r>'
+            '<w:r><w:t xml:space="preserve"></w:t></w:r></w:p></w:footnote>'
+        )
+        self._reference_template = parse_xml(
+            f'<w:r {nsdecls("w")}><w:rPr><w:rStyle w:val="{reference_style}"/></w:rPr><w:footnoteReference/></w:r>'
+        )
+        return self._footnotes_element
+    
     def add_footnotes_section(self):
-        """문서 끝에 주석 섹션 추가"""
+        """문서 끝에 주석 섹션 추가 (워드 각주를 쓰면 각주가 이미 들어가 있으므로 생략)"""
         if not self.footnotes:
             return
         
@@ -102,27 +492,22 @@ class FootnoteManager:
         # 각 주석 추가
         for num, content in sorted(self.footnotes.items()):
             footnote_para = self.document.add_paragraph()
+            footnote_para.style = 'CustomReference'
             
             # 주석 번호 (상첨자)
-            num_run = footnote_para.add_run(str(num))
-            num_run.font.superscript = True
-            num_run.font.size = Pt(8)
-            num_run.font.name = 'Arial'
+            self.run_formatter.add_run(footnote_para, str(num), size=Pt(8), superscript=True)
             
             # 주석 내용
-            content_run = footnote_para.add_run(f" {content}")
-            content_run.font.name = 'Arial'
-            content_run.font.size = Pt(9)
-            
-            footnote_para.style = 'CustomReference'
+            self.run_formatter.add_run(footnote_para, f" {content}", size=Pt(9))
 
 
 class DocumentStyler:
     """DOCX 문서 스타일링을 담당하는 클래스"""
     
-    def __init__(self, document: Document):
+    def __init__(self, document: Document, setup: bool = True):
         self.document = document
-        self.setup_styles()
+        if setup:  # 스타일 템플릿에서 만든 문서는 이미 스타일이 들어 있음
+            self.setup_styles()
     
     def setup_styles(self):
         """문서 스타일 설정 - 참고 PDF의 전문적인 한국 정부 문서 양식 적용"""
@@ -416,7 +801,23 @@ class DocumentStyler:
             ref_style.paragraph_format.left_indent = Inches(0.3)
             ref_style.paragraph_format.space_after = Pt(3)
             ref_style.paragraph_format.line_spacing = 1.2
-    
+
+        # 각주 본문 / 각주 번호 스타일 (워드 기본 스타일 이름과 ID 사용)
+        if 'footnote text' not in styles:
+            footnote_text_style = styles.add_style('footnote text', WD_STYLE_TYPE.PARAGRAPH, builtin=True)
+            footnote_text_style.style_id = 'FootnoteText'
+            footnote_text_style.base_style = styles['Normal']
+            footnote_text_font = footnote_text_style.font
+            footnote_text_font.name = 'Arial'
+            footnote_text_font.size = Pt(9)
+            footnote_text_style.paragraph_format.space_after = Pt(0)
+            footnote_text_style.paragraph_format.line_spacing = 1.0
+
+        if 'footnote reference' not in styles:
+            footnote_ref_style = styles.add_style('footnote reference', WD_STYLE_TYPE.CHARACTER, builtin=True)
+            footnote_ref_style.style_id = 'FootnoteReference'
+            footnote_ref_style.font.superscript = True
+
     def create_cover_page(self, title: str, subtitle: str = None, date: str = None, organization: str = None):
         """표지 페이지 생성"""
         # 빈 공간 추가 (상단 여백)
@@ -485,67 +886,184 @@ class MarkdownParser:
         return md_content.strip().split('\n')
 
 
-class DocxConverter:
-    """HTML을 DOCX로 변환하는 메인 클래스"""
+STYLE_TEMPLATE_CACHE = "style_template"  # 기본 위치: 공용 캐시 디렉토리/style_template (DOCX_TEMPLATE_DIR로 지정 가능)
+TEMPLATE_CONTENT_TYPE = b'application/vnd.openxmlformats-officedocument.wordprocessingml.template.main+xml'
+DOCUMENT_CONTENT_TYPE = b'application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml'
+
+_template_lock = threading.Lock()
+_template_bytes = {}  # 템플릿 키 → 기본 문서 .docx 바이트 (프로세스 내 재사용)
+
+
+def set_document_default_font(document: Document):
+    """문서 전체 기본 폰트 설정 (윈도우 한글 호환)"""
+    try:
+        # 문서의 기본 스타일 가져오기
+        styles = document.styles
+        default_style = styles['Normal']
+        
+        # 한글/영문 폰트 설정
+        font = default_style.font
+        font.name = 'Malgun Gothic'  # 기본 폰트
+        
+        # XML 레벨에서 세부 폰트 설정 (python-docx 요소의 xpath는 w: 네임스페이스를 이미 알고 있음)
+        style_element = default_style._element
+        font_elements = style_element.xpath('.//w:rFonts')
+        
+        if font_elements:
+            rFonts = font_elements[0]
+        else:
+            # rFonts 요소 새로 생성
+            rPr = style_element.find(qn('w:rPr'))
+            if rPr is None:
+                rPr = OxmlElement('w:rPr')
+                style_element.insert(0, rPr)
+            rFonts = OxmlElement('w:rFonts')
+            rPr.insert(0, rFonts)
+        
+        # 각 문자 체계별 폰트 설정
+        rFonts.set(qn('w:ascii'), 'Arial')         # 영문
+        rFonts.set(qn('w:eastAsia'), 'Malgun Gothic')  # 한글/중문/일문
+        rFonts.set(qn('w:hAnsi'), 'Arial')        # 서구 문자
+        rFonts.set(qn('w:cs'), 'Malgun Gothic')       # 복합 스크립트
+        
+    except Exception as e:
+        logger.warning("기본 폰트 설정 중 오류: %s", e)
+
+
+def build_base_document() -> Document:
+    """빈 문서에 사용자 정의 스타일, 기본 폰트, 페이지 여백 적용"""
+    document = Document()
+    DocumentStyler(document)
+    
+    # 문서 기본 폰트 설정 (윈도우 호환)
+    set_document_default_font(document)
+    
+    # 페이지 여백 설정 - 참고 문서에 맞춰 조정
+    for section in document.sections:
+        section.top_margin = Inches(1.2)
+        section.bottom_margin = Inches(1)
+        section.left_margin = Inches(1.2)
+        section.right_margin = Inches(1)
+    return document
+
+
+@lru_cache(maxsize=None)
+def style_template_key() -> str:
+    """스타일 템플릿 캐시 키 - 이 모듈 소스와 python-docx 버전이 바뀌면 다시 생성"""
+    digest = hashlib.sha256(docx.__version__.encode('utf-8'))
+    try:
+        with open(__file__, 'rb') as f:
+            digest.update(f.read())
+    except OSError:  # 소스 파일 없이 패키징된 경우
+        pass
+    return digest.hexdigest()[:16]
+
+
+def get_style_template(template_dir: str = None) -> str:
+    """현재 스타일러로 만든 기본 템플릿 .docx 경로 (없으면 한 번 생성해서 저장)"""
+    template_dir = Path(template_dir) if template_dir else default_cache_dir(STYLE_TEMPLATE_CACHE, "DOCX_TEMPLATE_DIR")
+    template_file = template_dir / f"base_{style_template_key()}.docx"
+    if not template_file.exists():
+        # 배치 워커들이 동시에 만들 수 있으므로 임시 파일에 저장 후 교체
+        with atomic_path(template_file) as temp_file:
+            build_base_document().save(str(temp_file))
+    return str(template_file)
+
+
+def read_template_bytes(template_path: str) -> bytes:
+    """템플릿 파일 읽기 (.dotx는 python-docx가 열 수 있도록 본문 content type을 문서용으로 변경)"""
+    with open(template_path, 'rb') as f:
+        data = f.read()
+    if not template_path.lower().endswith(('.dotx', '.dotm')):
+        return data
+    
+    source = zipfile.ZipFile(io.BytesIO(data))
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as target:
+        for item in source.infolist():
+            content = source.read(item.filename)
+            if item.filename == '[Content_Types].xml':
+                content = content.replace(TEMPLATE_CONTENT_TYPE, DOCUMENT_CONTENT_TYPE)
+            target.writestr(item, content)
+    return output.getvalue()
+
+
+def create_base_document(template_path: str = None) -> Document:
+    """변환을 시작할 기본 문서 생성
+    
+    template_path를 주면 그 .docx/.dotx에서 시작하고 빠진 사용자 정의 스타일만 추가
+    지정하지 않으면 캐시된 기본 템플릿을 그대로 읽어서 스타일 구성 과정을 건너뜀
+    (환경변수 DOCX_STYLE_TEMPLATE=0이면 매번 새로 구성)
+    """
+    if template_path:
+        document = Document(io.BytesIO(read_template_bytes(template_path)))
+        DocumentStyler(document)
+        return document
+    
+    if os.environ.get("DOCX_STYLE_TEMPLATE", "1") == "0":
+        return build_base_document()
+    
+    key = style_template_key()
+    with _template_lock:
+        data = _template_bytes.get(key)
+        if data is None:
+            data = read_template_bytes(get_style_template())
+            _template_bytes[key] = data
+    return Document(io.BytesIO(data))
+
+
+class DocxConverter(ConversionProfile):
+    """HTML을 DOCX로 변환하는 메인 클래스
     
-    def __init__(self):
-        self.document = Document()
-        self.styler = DocumentStyler(self.document)
+    인스턴스 하나로 여러 문서를 변환할 수 있다 - 변환할 때마다 reset()으로 문서별 상태만 새로 만들고
+    스타일 템플릿(모듈 캐시)과 이미지 처리 결과 캐시는 계속 사용
+    본문은 공용 변환 코어(md_engine)가 md_tokenizer 분류 결과를 이 클래스의 토큰 종류별 처리 함수로 넘겨서 만든다
+    """
+    
+    IMAGE_WIDTH = 6  # 이미지 표시 너비 (인치)
+    
+    def __init__(self, template_path: str = None, incremental: bool = None):
+        self.template_path = template_path
+        # 상대 이미지 경로의 기준 디렉토리 (None이면 변환기 위치, 변환 서비스는 작업의 업로드 디렉토리로 지정)
+        self.image_dir = None
         self.parser = MarkdownParser()
-        self.footnote_manager = FootnoteManager(self.document)
+        # 증분 빌드: 바뀌지 않은 섹션은 캐시된 OOXML 조각을 그대로 붙임 (환경변수 DOCX_INCREMENTAL=1)
+        self.incremental = incremental_enabled() if incremental is None else incremental
+        self.section_cache = SectionCache() if self.incremental else None
+        self.image_preprocessor = ImagePreprocessor(store=self.section_cache)
+        # 파싱 캐시: 같은 원문은 저장된 토큰으로 바로 조립 (증분 빌드나 PARSE_CACHE=1일 때만, 아니면 라인 스트리밍)
+        self.parse_cache = get_parse_cache(default=self.incremental)
+        # 진행 알림 구독 (GUI/변환 서비스) - callback(stage, **detail)
+        self.progress = ProgressEmitter()
+        self.engine = MarkdownEngine(self)
+        self.reset()
+    
+    def reset(self, template_path: str = None):
+        """새 문서로 시작 - 번호/캡션/주석/이미지 미리 읽기 같은 문서별 상태 초기화
+        
+        template_path를 주면 이후 문서는 그 템플릿에서 시작
+        """
+        if template_path is not None:
+            self.template_path = template_path
+        
+        # 스타일/기본 폰트/여백이 미리 설정된 기본 문서에서 시작
+        self.document = create_base_document(self.template_path)
+        self.styler = DocumentStyler(self.document, setup=False)
+        self.run_formatter = RunFormatter(self.document)
+        self.table_builder = TableBuilder(self.document)
+        self.footnote_manager = FootnoteManager(self.document, self.run_formatter)
+        self.image_preprocessor.clear_prefetched()
         self.headings = []  # 목차 생성용 헤딩 수집
         self.section_numbers = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0}  # 섹션 번호 관리
         self.figure_counter = 0  # 그림 번호
         self.in_footnote_section = False  # 주석 섹션 내부 여부
         self.table_counter = 0   # 표 번호
         self.processed_captions = set()  # 이미 처리된 캡션 추적
-        
-        # 문서 기본 폰트 설정 (윈도우 호환)
-        self._set_document_default_font()
-        
-        # 페이지 여백 설정 - 참고 문서에 맞춰 조정
-        sections = self.document.sections
-        for section in sections:
-            section.top_margin = Inches(1.2)
-            section.bottom_margin = Inches(1)
-            section.left_margin = Inches(1.2)
-            section.right_margin = Inches(1)
-
-    def _set_document_default_font(self):
-        """문서 전체 기본 폰트 설정 (윈도우 한글 호환)"""
-        try:
-            # 문서의 기본 스타일 가져오기
-            styles = self.document.styles
-            default_style = styles['Normal']
-            
-            # 한글/영문 폰트 설정
-            font = default_style.font
-            font.name = 'Malgun Gothic'  # 기본 폰트
-            
-            # XML 레벨에서 세부 폰트 설정
-            style_element = default_style._element
-            font_elements = style_element.xpath('.//w:rFonts', 
-                namespaces={'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'})
-            
-            if font_elements:
-                rFonts = font_elements[0]
-            else:
-                # rFonts 요소 새로 생성
-                rPr = style_element.find(qn('w:rPr'))
-                if rPr is None:
-                    rPr = OxmlElement('w:rPr')
-                    style_element.insert(0, rPr)
-                rFonts = OxmlElement('w:rFonts')
-                rPr.insert(0, rFonts)
-            
-            # 각 문자 체계별 폰트 설정
-            rFonts.set(qn('w:ascii'), 'Arial')         # 영문
-            rFonts.set(qn('w:eastAsia'), 'Malgun Gothic')  # 한글/중문/일문
-            rFonts.set(qn('w:hAnsi'), 'Arial')        # 서구 문자
-            rFonts.set(qn('w:cs'), 'Malgun Gothic')       # 복합 스크립트
-            
-        except Exception as e:
-            print(f"기본 폰트 설정 중 오류: {e}")
+        self.last_bullet_level = None  # 마지막 글머리 기호 레벨 (이어지는 본문 들여쓰기 결정용)
+        self._style_ids = {}  # 스타일 이름 → 스타일 ID 캐시
+        self.missing_images = set()  # 미리 읽기 단계에서 이미 보고한 없는 이미지
+        self._image_sources = {}  # 이미지 관계 ID → 원본 경로 (섹션 조각 캐시용)
+        self._used = False  # 이 문서로 이미 변환했는지 (다음 변환 전에 reset)
 
     def add_caption(self, caption_text: str, caption_type: str = "Figure"):
         """Word의 실제 캡션 기능을 사용하여 캡션 추가"""
@@ -561,7 +1079,7 @@ class DocxConverter:
         
         # 캡션 단락 생성
         caption_para = self.document.add_paragraph()
-        caption_para.style = 'CustomCaption'
+        self._apply_style(caption_para, 'CustomCaption')
         
         # 캡션 텍스트 구성
         full_caption = f"<{label} {caption_num}> {caption_text}"
@@ -585,7 +1103,7 @@ class DocxConverter:
     def _add_paragraph_with_formatting(self, text: str):
         """마크다운 포매팅이 포함된 단락 추가"""
         para = self.document.add_paragraph()
-        para.style = 'CustomBody'
+        self._apply_style(para, 'CustomBody')
         
         self._add_formatted_text_to_paragraph(para, text, Pt(11))
     
@@ -633,49 +1151,52 @@ class DocxConverter:
             # 포매팅 이전 텍스트 추가
             before_text = text[current_pos:start]
             if before_text:
-                run = paragraph.add_run(before_text)
-                run.font.name = 'Arial'
-                run.font.size = font_size
+                self.run_formatter.add_run(paragraph, before_text, size=font_size)
             
             # 포매팅된 텍스트 추가
-            formatted_run = paragraph.add_run(content)
-            formatted_run.font.name = 'Arial'
-            formatted_run.font.size = font_size
-            
-            if fmt_type == 'bold':
-                formatted_run.font.bold = True
-            elif fmt_type == 'italic':
-                formatted_run.font.italic = True
+            self.run_formatter.add_run(paragraph, content, size=font_size,
+                                       bold=True if fmt_type == 'bold' else None,
+                                       italic=True if fmt_type == 'italic' else None)
             
             current_pos = end
         
         # 남은 텍스트 추가
         remaining_text = text[current_pos:]
         if remaining_text:
-            run = paragraph.add_run(remaining_text)
-            run.font.name = 'Arial'
-            run.font.size = font_size
+            self.run_formatter.add_run(paragraph, remaining_text, size=font_size)
+    
+    def convert_markdown_to_docx(self, md_file_path: str, output_path: str = None,
+                                 progress: Callable[..., None] = None) -> str:
+        """마크다운 파일을 DOCX로 변환 - 원본 텍스트 직접 처리
+        
+        progress를 주면 이 변환 동안만 진행 알림 구독 (ProgressEmitter 참고)
+        """
+        self._start_document()
+        
+        with self.progress.subscribed(progress), span("convert", file=os.path.basename(md_file_path)):
+            # 문서 제목을 찾고, 이미지 참조를 모아 본문 조립 전에 미리 읽기 시작
+            self.progress.emit('read', file=md_file_path)
+            if self.parse_cache is not None:
+                with span("read"):
+                    with open(md_file_path, 'r', encoding='utf-8') as f:
+                        document = self._load_document(f.read())
+                    lines = document.lines()
+                    title, image_paths = self._scan_markdown(lines)
+                self._build_document(title, image_paths, lines, document)
+            else:
+                with span("read"), open(md_file_path, 'r', encoding='utf-8') as f:
+                    title, image_paths = self._scan_markdown(iter_lines(f))
+                
+                # 원본 마크다운을 라인 단위로 스트리밍 처리
+                with open(md_file_path, 'r', encoding='utf-8') as f:
+                    self._build_document(title, image_paths, iter_lines(f))
+            
+            output_path = self._save_to_path(md_file_path, output_path)
+        flush_trace()
+        return output_path
     
-    def convert_markdown_to_docx(self, md_file_path: str, output_path: str = None) -> str:
-        """마크다운 파일을 DOCX로 변환 - 원본 텍스트 직접 처리"""
-        
-        # 파일 읽기
-        with open(md_file_path, 'r', encoding='utf-8') as f:
-            md_content = f.read()
-        
-        # 문서 제목 추출 및 추가
-        title = self._extract_title(md_content)
-        if title:
-            title_para = self.document.add_paragraph(title)
-            title_para.style = 'CustomTitle'
-            self.document.add_paragraph()  # 빈 줄 추가
-        
-        # 원본 마크다운 직접 처리
-        self._process_markdown_directly(md_content)
-        
-        # 주석 섹션 추가
-        self.footnote_manager.add_footnotes_section()
-        
+    def _save_to_path(self, md_file_path: str, output_path: Optional[str]) -> str:
+        """출력 경로를 정하고 (기본: output/<MD 이름>.docx) 문서 저장"""
         # 출력 파일 경로 결정
         if output_path is None:
             base_name = Path(md_file_path).stem
@@ -689,18 +1210,110 @@ class DocxConverter:
             output_dir.mkdir(parents=True, exist_ok=True)
         
         # 파일 저장
-        self.document.save(output_path)
+        self.progress.emit('save', path=output_path)
+        with span("save"):
+            self.document.save(output_path)
         return output_path
     
+    def convert_markdown_text(self, md_content: str, progress: Callable[..., None] = None) -> bytes:
+        """마크다운 문자열을 변환해서 .docx 파일 내용(바이트)으로 반환 (웹 폼처럼 파일 없이 쓰는 경우)
+        
+        progress를 주면 이 변환 동안만 진행 알림 구독 (ProgressEmitter 참고)
+        """
+        self._start_document()
+        with self.progress.subscribed(progress), span("convert"):
+            self.progress.emit('read')
+            with span("read"):
+                document = self._load_document(md_content) if self.parse_cache is not None else None
+                lines = document.lines() if document is not None else md_content.split('\n')
+                title, image_paths = self._scan_markdown(lines)
+            self._build_document(title, image_paths, lines, document)
+            
+            self.progress.emit('save')
+            output = io.BytesIO()
+            with span("save"):
+                self.document.save(output)
+        flush_trace()
+        return output.getvalue()
+    
+    def _start_document(self):
+        """이미 변환에 사용한 문서면 새 문서로 초기화"""
+        if self._used:
+            self.reset()
+        self._used = True
+    
+    def _load_document(self, md_content: str) -> MarkdownDocument:
+        """원문의 파싱 결과 (같은 원문을 전에 파싱했으면 파싱 캐시에서 읽음)"""
+        with span("parse", chars=len(md_content)):
+            return self.parse_cache.load(md_content)
+    
+    def _build_document(self, title: Optional[str], image_paths: List[str], lines: Iterable[str],
+                        document: MarkdownDocument = None):
+        """제목, 본문, 주석 섹션을 차례로 추가 (document를 주면 본문은 그 파싱 결과의 토큰으로 조립)"""
+        self.progress.emit('assemble', images=len(image_paths))
+        self._prefetch_images(image_paths)
+        if title:
+            title_para = self.document.add_paragraph(title)
+            self._apply_style(title_para, 'CustomTitle')
+            self.document.add_paragraph()  # 빈 줄 추가
+        
+        if self.section_cache is not None:
+            self._process_sections(lines)
+        elif get_tracer().enabled:
+            self._process_pages(lines)
+        elif document is not None:
+            self._process_tokens(document.tokens)
+        else:
+            self._process_lines(lines)
+        
+        # 주석 섹션 추가 (주석 섹션 방식일 때만)
+        self.progress.emit('footnotes', count=len(self.footnote_manager.footnotes))
+        with span("footnotes", count=len(self.footnote_manager.footnotes)):
+            self.footnote_manager.add_footnotes_section()
+    
     def _extract_title(self, md_content: str) -> Optional[str]:
         """마크다운에서 제목 추출"""
-        lines = md_content.split('\n')
+        return self._extract_title_from_lines(md_content.split('\n'))
+    
+    def _extract_title_from_lines(self, lines: Iterable[str]) -> Optional[str]:
+        """라인 스트림에서 첫 번째 # 제목 추출"""
         for line in lines:
             line = line.strip()
             if line.startswith('# '):
                 return line[2:].strip()
         return None
     
+    def _scan_markdown(self, lines: Iterable[str]) -> Tuple[Optional[str], List[str]]:
+        """라인 스트림을 한 번 훑어서 첫 번째 # 제목과 이미지 경로 목록 추출 (주석 참조/정의는 색인에 등록)"""
+        title = None
+        image_paths = []
+        footnote_index = self.footnote_manager.index
+        for line in lines:
+            line = line.strip()
+            footnote_index.scan_line(line)
+            if title is None and line.startswith('# '):
+                title = line[2:].strip()
+            elif line.startswith('!'):
+                match = IMAGE_PATTERN.match(line)
+                if match:
+                    image_paths.append(self.resolve_image_path(match.group(2)))
+        return title, image_paths
+    
+    def _prefetch_images(self, image_paths: Iterable[str]):
+        """이미지를 백그라운드 스레드에서 미리 읽고 전처리 (없는 파일은 한 번에 보고)"""
+        missing = self.image_preprocessor.prefetch((path, self.IMAGE_WIDTH) for path in image_paths)
+        report_missing_images(missing)
+        for image_path in missing:
+            self.progress.emit('warning', message=f"이미지 파일 없음: {image_path}")
+        self.missing_images.update(missing)
+    
+    def resolve_image_path(self, image_path: str) -> str:
+        """상대 경로를 이미지 기준 디렉토리(image_dir, 없으면 변환기 위치) 기준 절대 경로로 변환"""
+        if not os.path.isabs(image_path):
+            base_dir = self.image_dir or os.path.dirname(os.path.abspath(__file__))
+            image_path = os.path.join(base_dir, image_path)
+        return image_path
+    
     def _extract_subtitle(self, md_content: str) -> Optional[str]:
         """마크다운에서 부제목 추출 (두 번째 H1 또는 첫 번째 H2)"""
         lines = md_content.split('\n')
@@ -759,18 +1372,18 @@ class DocxConverter:
         """마크다운을 페이지별로 분할"""
         pages = []
         current_page = {"number": None, "title": "", "content": "", "type": "normal"}
+        content_lines = []  # 현재 페이지 라인 (문자열 += 반복 대신 마지막에 한 번 join)
         
-        lines = md_content.split('\n')
-        i = 0
-        
-        while i < len(lines):
-            line = lines[i].strip()
+        for line in md_content.split('\n'):
+            line = line.strip()
             
             # 페이지 구분자 감지
             if line.startswith('### Page '):
                 # 이전 페이지 저장
+                current_page["content"] = ''.join(content_lines)
                 if current_page["content"].strip():
                     pages.append(current_page.copy())
+                content_lines = []
                 
                 # 새 페이지 시작
                 page_info = line[9:].strip()  # "### Page " 제거
@@ -794,11 +1407,10 @@ class DocxConverter:
                     "type": page_type
                 }
             else:
-                current_page["content"] += line + '\n'
-            
-            i += 1
+                content_lines.append(line + '\n')
         
         # 마지막 페이지 저장
+        current_page["content"] = ''.join(content_lines)
         if current_page["content"].strip():
             pages.append(current_page)
         
@@ -874,7 +1486,7 @@ class DocxConverter:
         """요약문 페이지 처리"""
         # 페이지 제목
         title_para = self.document.add_paragraph(page_title)
-        title_para.style = 'CustomTitle'
+        self._apply_style(title_para, 'CustomTitle')
         
         # HTML로 파싱하여 처리
         soup = self.parser.parse(content)
@@ -883,7 +1495,7 @@ class DocxConverter:
     def _process_toc_page(self, content: str):
         """목차 페이지 처리"""
         title_para = self.document.add_paragraph("목  차")
-        title_para.style = 'TOCHeading'
+        self._apply_style(title_para, 'TOCHeading')
         
         lines = content.strip().split('\n')
         for line in lines:
@@ -893,12 +1505,12 @@ class DocxConverter:
             
             # 로마숫자나 번호가 있는 목차 항목 처리
             toc_para = self.document.add_paragraph(line)
-            toc_para.style = 'TOCEntry'
+            self._apply_style(toc_para, 'TOCEntry')
     
     def _process_list_page(self, content: str, page_title: str):
         """표·그림 목록 페이지 처리"""
         title_para = self.document.add_paragraph(page_title)
-        title_para.style = 'TOCHeading'
+        self._apply_style(title_para, 'TOCHeading')
         
         lines = content.strip().split('\n')
         for line in lines:
@@ -907,14 +1519,14 @@ class DocxConverter:
                 continue
             
             list_para = self.document.add_paragraph(line)
-            list_para.style = 'TOCEntry'
+            self._apply_style(list_para, 'TOCEntry')
     
     def _process_normal_page(self, content: str, page_title: str):
         """일반 페이지 처리"""
         # 페이지 제목이 있으면 추가
         if page_title and page_title not in ['개요']:
             title_para = self.document.add_paragraph(page_title)
-            title_para.style = 'CustomHeading1'
+            self._apply_style(title_para, 'CustomHeading1')
         
         # 내용을 섹션별로 분리 (--- 구분자 기준)
         sections = content.split('---')
@@ -945,11 +1557,11 @@ class DocxConverter:
             
             if line == '계산근거 및 주해':
                 footnote_para = self.document.add_paragraph(line)
-                footnote_para.style = 'CustomHeading3'
+                self._apply_style(footnote_para, 'CustomHeading3')
                 footnote_para.paragraph_format.space_before = Pt(12)
             else:
                 footnote_para = self.document.add_paragraph(line)
-                footnote_para.style = 'CustomBody'
+                self._apply_style(footnote_para, 'CustomBody')
                 footnote_para.paragraph_format.left_indent = Inches(0.3)
     
     def _process_reference_section(self, content: str):
@@ -962,11 +1574,11 @@ class DocxConverter:
             
             if line == '참조·링크':
                 ref_para = self.document.add_paragraph(line)
-                ref_para.style = 'CustomHeading3'
+                self._apply_style(ref_para, 'CustomHeading3')
                 ref_para.paragraph_format.space_before = Pt(12)
             else:
                 ref_para = self.document.add_paragraph(line)
-                ref_para.style = 'CustomBody'
+                self._apply_style(ref_para, 'CustomBody')
                 ref_para.paragraph_format.left_indent = Inches(0.3)
     
     def _convert_elements(self, soup: BeautifulSoup):
@@ -1045,7 +1657,7 @@ class DocxConverter:
         
         style = style_map.get(level, 'CustomHeading3')
         para = self.document.add_paragraph(numbered_title)
-        para.style = style
+        self._apply_style(para, style)
     
     def _has_existing_numbering(self, text: str) -> bool:
         """텍스트에 이미 번호가 있는지 확인"""
@@ -1061,7 +1673,7 @@ class DocxConverter:
         text = element.get_text().strip()
         if text:
             para = self.document.add_paragraph(text)
-            para.style = 'CustomBody'
+            self._apply_style(para, 'CustomBody')
     
     def _add_list(self, element):
         """리스트 요소 추가"""
@@ -1069,7 +1681,7 @@ class DocxConverter:
             text = li.get_text().strip()
             if text:
                 para = self.document.add_paragraph(f"• {text}")
-                para.style = 'CustomListLevel4'
+                self._apply_style(para, 'CustomListLevel4')
     
     def _add_table(self, element):
         """테이블 요소 추가 - 참고 문서 스타일 적용"""
@@ -1099,8 +1711,7 @@ class DocxConverter:
                     for paragraph in cell_obj.paragraphs:
                         # 폰트 설정
                         for run in paragraph.runs:
-                            run.font.name = 'Arial'
-                            run.font.size = Pt(10)
+                            self.run_formatter.apply(run, paragraph, size=Pt(10))
                             
                             # 헤더 행 스타일링
                             if i == 0:
@@ -1157,7 +1768,7 @@ class DocxConverter:
             style = 'CustomHeading3'
         
         para = self.document.add_paragraph(final_title)
-        para.style = style
+        self._apply_style(para, style)
     
     def _add_intelligent_paragraph(self, element):
         """지능적 단락 추가 - 불필요한 줄바꿈 방지"""
@@ -1183,111 +1794,42 @@ class DocxConverter:
         # 로마숫자로 시작하는 대제목 (Ⅰ, Ⅱ, Ⅲ...)
         if re.match(r'^[ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩⅪⅫⅩⅢⅩⅣⅩⅤⅩⅥⅩⅦⅩⅧⅩⅨⅩⅩ]+\s+', text):
             para = self.document.add_paragraph(text)
-            para.style = 'CustomHeading1'
+            self._apply_style(para, 'CustomHeading1')
         # 숫자로 시작하는 중제목 (1. 2. 3.) - 주석 섹션에서는 일반 본문으로 처리
         elif re.match(r'^\d+\.\s+', text) and not self.in_footnote_section:
             para = self.document.add_paragraph(text)
-            para.style = 'CustomHeading2'
+            self._apply_style(para, 'CustomHeading2')
         # 괄호 숫자로 시작하는 소제목 (1) 2) 3))
         elif re.match(r'^\d+\)\s+', text):
             para = self.document.add_paragraph(text)
-            para.style = 'CustomHeading3'
+            self._apply_style(para, 'CustomHeading3')
         # 불릿 포인트
         elif text.startswith('•'):
             para = self.document.add_paragraph(text)
-            para.style = 'CustomList'
+            self._apply_style(para, 'CustomList')
         # 특수 번호 (①, ②, ③)
         elif re.match(r'^[①②③④⑤⑥⑦⑧⑨⑩]', text):
             para = self.document.add_paragraph(text)
-            para.style = 'CustomList'
+            self._apply_style(para, 'CustomList')
         # 일반 본문
         else:
             para = self.document.add_paragraph(text)
-            para.style = 'CustomBody'
+            self._apply_style(para, 'CustomBody')
     
     def _add_bullet_paragraph_with_footnotes(self, text: str, style_name: str):
         """bullet point에서 주석이 포함된 단락 추가"""
         para = self.document.add_paragraph()
+        self._apply_style(para, style_name)  # 런 서식이 스타일과 다른 속성만 기록하도록 먼저 지정
         
-        # 주석 패턴 찾기 (^숫자^[내용] 또는 ^숫자^ 형태)
-        footnote_pattern = r'\^(\d+)\^(\[([^\]]*)\])?'
-        
-        current_pos = 0
-        for match in re.finditer(footnote_pattern, text):
-            # 주석 전 텍스트 추가
-            before_text = text[current_pos:match.start()]
-            if before_text:
-                run = para.add_run(before_text)
-                run.font.name = 'Arial'
-                run.font.size = Pt(11)
-            
-            # 주석 번호와 내용 추출
-            footnote_num = match.group(1)
-            footnote_content = match.group(3) if match.group(3) else f"참조 {footnote_num}"
-            
-            # 주석 참조 추가 (상첨자)
-            footnote_ref = para.add_run(footnote_num)
-            footnote_ref.font.superscript = True
-            footnote_ref.font.size = Pt(8)
-            footnote_ref.font.name = 'Arial'
-            
-            # 주석 내용 저장
-            self.footnote_manager.footnotes[int(footnote_num)] = footnote_content
-            if int(footnote_num) > self.footnote_manager.footnote_counter:
-                self.footnote_manager.footnote_counter = int(footnote_num)
-            
-            current_pos = match.end()
-        
-        # 남은 텍스트 추가
-        remaining_text = text[current_pos:]
-        if remaining_text:
-            run = para.add_run(remaining_text)
-            run.font.name = 'Arial'
-            run.font.size = Pt(11)
-        
-        # 스타일 설정
-        para.style = style_name
+        self.footnote_manager.add_text(para, text, size=Pt(11))
     
     def _has_footnote_pattern(self, text: str) -> bool:
         """주석 패턴이 있는지 확인 (^숫자^[내용] 또는 ^숫자^ 형태)"""
-        return bool(re.search(r'\^\d+\^(\[.*?\])?', text))
+        return has_footnote(text)
     
     def _process_cell_footnotes(self, paragraph, text: str):
         """테이블 셀 내 주석 처리"""
-        footnote_pattern = r'\^(\d+)\^(\[([^\]]*)\])?'
-        
-        current_pos = 0
-        for match in re.finditer(footnote_pattern, text):
-            # 주석 전 텍스트 추가
-            before_text = text[current_pos:match.start()]
-            if before_text:
-                run = paragraph.add_run(before_text)
-                run.font.name = 'Arial'
-                run.font.size = Pt(10)
-            
-            # 주석 번호와 내용 추출
-            footnote_num = match.group(1)
-            footnote_content = match.group(3) if match.group(3) else f"참조 {footnote_num}"
-            
-            # 주석 참조 추가 (상첨자)
-            footnote_ref = paragraph.add_run(footnote_num)
-            footnote_ref.font.superscript = True
-            footnote_ref.font.size = Pt(8)
-            footnote_ref.font.name = 'Arial'
-            
-            # 주석 내용 저장
-            self.footnote_manager.footnotes[int(footnote_num)] = footnote_content
-            if int(footnote_num) > self.footnote_manager.footnote_counter:
-                self.footnote_manager.footnote_counter = int(footnote_num)
-            
-            current_pos = match.end()
-        
-        # 남은 텍스트 추가
-        remaining_text = text[current_pos:]
-        if remaining_text:
-            run = paragraph.add_run(remaining_text)
-            run.font.name = 'Arial'
-            run.font.size = Pt(10)
+        self.footnote_manager.add_text(paragraph, text, size=Pt(10))
 
     def _process_cell_text_with_bold(self, paragraph, text: str, is_header: bool):
         """테이블 셀 내 Bold 마크다운 구문 처리"""
@@ -1298,152 +1840,59 @@ class DocxConverter:
             # Bold 전 텍스트 추가
             before_text = text[current_pos:match.start()]
             if before_text:
-                run = paragraph.add_run(before_text)
-                run.font.name = 'Arial'
-                run.font.size = Pt(10)
-                if is_header:
-                    run.font.bold = True
+                self.run_formatter.add_run(paragraph, before_text, size=Pt(10), bold=True if is_header else None)
             
             # Bold 텍스트 추가
             bold_text = match.group(1)
             if bold_text:
-                run = paragraph.add_run(bold_text)
-                run.font.name = 'Arial'
-                run.font.size = Pt(10)
-                run.font.bold = True
+                self.run_formatter.add_run(paragraph, bold_text, size=Pt(10), bold=True)
             
             current_pos = match.end()
         
         # 남은 텍스트 추가
         remaining_text = text[current_pos:]
         if remaining_text:
-            run = paragraph.add_run(remaining_text)
-            run.font.name = 'Arial'
-            run.font.size = Pt(10)
-            if is_header:
-                run.font.bold = True
+            self.run_formatter.add_run(paragraph, remaining_text, size=Pt(10), bold=True if is_header else None)
 
     def _add_paragraph_with_footnotes(self, text: str):
         """주석이 포함된 단락 추가"""
         para = self.document.add_paragraph()
         
-        # 주석 패턴 찾기 (^숫자^[내용] 또는 ^숫자^ 형태)
-        footnote_pattern = r'\^(\d+)\^(\[([^\]]*)\])?'
-        
-        current_pos = 0
-        for match in re.finditer(footnote_pattern, text):
-            # 주석 전 텍스트 추가
-            before_text = text[current_pos:match.start()]
-            if before_text:
-                run = para.add_run(before_text)
-                run.font.name = 'Arial'
-                run.font.size = Pt(11)
-            
-            # 주석 번호와 내용 추출
-            footnote_num = match.group(1)
-            footnote_content = match.group(3) if match.group(3) else f"참조 {footnote_num}"
-            
-            # 주석 참조 추가 (상첨자)
-            footnote_ref = para.add_run(footnote_num)
-            footnote_ref.font.superscript = True
-            footnote_ref.font.size = Pt(8)
-            footnote_ref.font.name = 'Arial'
-            
-            # 주석 내용 저장
-            self.footnote_manager.footnotes[int(footnote_num)] = footnote_content
-            if int(footnote_num) > self.footnote_manager.footnote_counter:
-                self.footnote_manager.footnote_counter = int(footnote_num)
-            
-            current_pos = match.end()
-        
-        # 남은 텍스트 추가
-        remaining_text = text[current_pos:]
-        if remaining_text:
-            run = para.add_run(remaining_text)
-            run.font.name = 'Arial'
-            run.font.size = Pt(11)
-        
         # 스타일 설정
         if self._is_hierarchical_content(text):
-            para.style = 'CustomHeading2'
+            self._apply_style(para, 'CustomHeading2')
         elif text.startswith(('□', '○', '-', '•')):
             if text.startswith('□'):
-                para.style = 'CustomListLevel1'
+                self._apply_style(para, 'CustomListLevel1')
             elif text.startswith('○'):
-                para.style = 'CustomListLevel2'
+                self._apply_style(para, 'CustomListLevel2')
             elif text.startswith('-'):
-                para.style = 'CustomListLevel3'
+                self._apply_style(para, 'CustomListLevel3')
             elif text.startswith('•'):
-                para.style = 'CustomListLevel4'
+                self._apply_style(para, 'CustomListLevel4')
         else:
-            para.style = 'CustomBody'
+            self._apply_style(para, 'CustomBody')
+        
+        self.footnote_manager.add_text(para, text, size=Pt(11))
     
     def _add_hierarchical_paragraph_with_footnotes(self, text: str, style_name: str):
         """계층적 콘텐츠에서 주석이 포함된 단락 추가"""
         para = self.document.add_paragraph()
+        self._apply_style(para, style_name)
+        
+        # 스타일별 런 크기/굵기
+        if style_name == 'CustomHeading1':
+            size, bold = Pt(14), True
+        elif style_name == 'CustomHeading2':
+            size, bold = Pt(13), True
+        elif style_name == 'CustomHeading3':
+            size, bold = Pt(12), True
+        elif style_name == 'CustomReference':
+            size, bold = Pt(10), None
+        else:
+            size, bold = Pt(11), None
         
-        # 주석 패턴 찾기 (^숫자^[내용] 또는 ^숫자^ 형태)
-        footnote_pattern = r'\^(\d+)\^(\[([^\]]*)\])?'
-        
-        current_pos = 0
-        for match in re.finditer(footnote_pattern, text):
-            # 주석 전 텍스트 추가
-            before_text = text[current_pos:match.start()]
-            if before_text:
-                run = para.add_run(before_text)
-                run.font.name = 'Arial'
-                if style_name == 'CustomHeading1':
-                    run.font.size = Pt(14)
-                    run.font.bold = True
-                elif style_name == 'CustomHeading2':
-                    run.font.size = Pt(13)
-                    run.font.bold = True
-                elif style_name == 'CustomHeading3':
-                    run.font.size = Pt(12)
-                    run.font.bold = True
-                elif style_name == 'CustomReference':
-                    run.font.size = Pt(10)
-                else:
-                    run.font.size = Pt(11)
-            
-            # 주석 번호와 내용 추출
-            footnote_num = match.group(1)
-            footnote_content = match.group(3) if match.group(3) else f"참조 {footnote_num}"
-            
-            # 주석 참조 추가 (상첨자)
-            footnote_ref = para.add_run(footnote_num)
-            footnote_ref.font.superscript = True
-            footnote_ref.font.size = Pt(8)
-            footnote_ref.font.name = 'Arial'
-            
-            # 주석 내용 저장
-            self.footnote_manager.footnotes[int(footnote_num)] = footnote_content
-            if int(footnote_num) > self.footnote_manager.footnote_counter:
-                self.footnote_manager.footnote_counter = int(footnote_num)
-            
-            current_pos = match.end()
-        
-        # 남은 텍스트 추가
-        remaining_text = text[current_pos:]
-        if remaining_text:
-            run = para.add_run(remaining_text)
-            run.font.name = 'Arial'
-            if style_name == 'CustomHeading1':
-                run.font.size = Pt(14)
-                run.font.bold = True
-            elif style_name == 'CustomHeading2':
-                run.font.size = Pt(13)
-                run.font.bold = True
-            elif style_name == 'CustomHeading3':
-                run.font.size = Pt(12)
-                run.font.bold = True
-            elif style_name == 'CustomReference':
-                run.font.size = Pt(10)
-            else:
-                run.font.size = Pt(11)
-        
-        # 스타일 설정
-        para.style = style_name
+        self.footnote_manager.add_text(para, text, size=size, bold=bold)
     
     def _add_intelligent_list(self, element):
         """지능적 리스트 추가"""
@@ -1454,215 +1903,298 @@ class DocxConverter:
                 if not text.startswith('•'):
                     text = f"• {text}"
                 para = self.document.add_paragraph(text)
-                para.style = 'CustomListLevel4'
+                self._apply_style(para, 'CustomListLevel4')
     
     def _add_intelligent_table(self, element):
         """지능적 테이블 추가 - 기존 테이블 로직 재사용하되 개선"""
         self._add_table(element)
     
     def _process_markdown_directly(self, md_content: str):
-        """원본 마크다운을 직접 라인별로 처리"""
+        """원본 마크다운 문자열 처리 (라인 스트림 처리로 위임)"""
         lines = md_content.split('\n')
-        i = 0
-        current_table = []
-        in_table = False
-        last_bullet_level = None  # 마지막 글머리 기호 레벨 추적
-        
-        while i < len(lines):
-            original_line = lines[i] 
-            line = lines[i].strip()
-            
-            # 빈 줄 건너뛰기
-            if not line:
-                i += 1
-                continue
-            
-            # 페이지 마커 건너뛰기
-            if line.startswith('### Page '):
-                i += 1
-                continue
-                
-            # 편집 안내 건너뛰기
-            if line.startswith('**※') or line.startswith('(※'):
-                i += 1
-                continue
-                
-            # 구분선 건너뛰기
-            if line == '---':
-                i += 1
-                continue
-            
-            # 이미지 처리
-            if self._is_image_line(line):
-                self._add_image(line)
-                i += 1
-                continue
-            
-            # 테이블 처리
-            if '|' in line and not in_table:
-                # 테이블 시작 전에 이전 라인이 표 캡션인지 확인
-                table_caption_before = None
-                if i > 0:
-                    prev_line = lines[i - 1].strip()
-                    if re.match(r'^<표\s*\d+>\s*.*', prev_line, re.IGNORECASE):
-                        table_caption_before = prev_line
-                        print(f"DEBUG: 테이블 위 캡션 발견: {table_caption_before}")
-                        
-                        # 캡션이 아직 처리되지 않았으면 처리
-                        if table_caption_before not in self.processed_captions:
-                            match = re.match(r'^<표\s*\d+>\s*(.*)', table_caption_before, re.IGNORECASE)
-                            if match:
-                                caption_text = match.group(1).strip()
-                                self.add_caption(caption_text, "Table")
-                                self.processed_captions.add(table_caption_before)
-                                print(f"DEBUG: 테이블 위 캡션 처리함: {table_caption_before}")
-                        else:
-                            print(f"DEBUG: 테이블 위 캡션 이미 처리됨: {table_caption_before}")
-                
-                # 테이블 시작
-                in_table = True
-                current_table = [line]
-                i += 1
-                continue
-            elif in_table:
-                if '|' in line:
-                    current_table.append(line)
-                    i += 1
-                    continue
-                else:
-                    # 테이블 끝 - 다음 최대 3줄에서 표 캡션 찾기
-                    table_caption = None
-                    caption_line_index = None
-                    
-                    for j in range(1, 4):  # 최대 3줄까지 확인
-                        if i + j < len(lines):
-                            check_line = lines[i + j].strip()
-                            if not check_line:  # 빈 라인은 건너뛰기
-                                continue
-                            if re.match(r'^<표\s*\d+>\s*.*', check_line, re.IGNORECASE):
-                                table_caption = check_line
-                                caption_line_index = i + j
-                                print(f"DEBUG: 테이블 캡션 발견: {table_caption}")
-                                break
-                            else:
-                                # 다른 텍스트가 나오면 캡션 찾기 중단
-                                break
-                    
-                    # 표 캡션이 있으면 먼저 추가
-                    if table_caption:
-                        match = re.match(r'^<표\s*\d+>\s*(.*)', table_caption, re.IGNORECASE)
-                        if match:
-                            caption_text = match.group(1).strip()
-                            self.add_caption(caption_text, "Table")
-                            self.processed_captions.add(table_caption)  # 처리된 캡션 기록
-                            print(f"DEBUG: 표 캡션 처리함: {table_caption}")
-                            
-                            # 캡션 라인을 건너뛰도록 인덱스 조정
-                            if caption_line_index:
-                                # 캡션 라인까지 건너뛰기 위해 i 설정
-                                i = caption_line_index
-                    
-                    # 테이블 생성
-                    self._create_table_from_lines(current_table)
-                    current_table = []
-                    in_table = False
-                    # 현재 라인은 다시 처리
-                    
-            # 헤딩 처리 (# ## ###)
-            if line.startswith('#'):
-                self._process_heading_line(line)
-            # 목차 항목 처리 (점선과 페이지 번호가 있는 경우) - 우선 처리
-            elif self._is_toc_entry(original_line):
-                self._add_toc_entry(original_line)
-            # 계층적 번호 체계 처리
-            elif self._is_hierarchical_content(line):
-                self._add_hierarchical_content(line)
-                last_bullet_level = self._get_hierarchical_level(line)
-            # 로마숫자로 시작하는 대제목 (Ⅰ, Ⅱ, Ⅲ...)
-            elif re.match(r'^[ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩⅪⅫⅩⅢⅩⅣⅩⅤⅩⅥⅩⅦⅩⅧⅩⅨⅩⅩ]+\s+', line):
-                para = self.document.add_paragraph(line)
-                para.style = 'CustomHeading1'
-            # 숫자로 시작하는 중제목 (1. 2. 3.) - 계층적 번호 체계가 우선 처리되므로 이 부분은 삭제
-            # 괄호 숫자로 시작하는 소제목 (1) 2) 3))
-            elif re.match(r'^\d+\)\s+', line):
-                para = self.document.add_paragraph(line)
-                para.style = 'CustomHeading3'
-            # 불릿 포인트 처리
-            elif line.startswith('□'):
-                if '^' in line and self._has_footnote_pattern(line):
-                    self._add_bullet_paragraph_with_footnotes(line, 'CustomListLevel1')
-                else:
-                    para = self.document.add_paragraph(line)
-                    para.style = 'CustomListLevel1'
-                last_bullet_level = 1
-            elif line.startswith('○'):
-                if '^' in line and self._has_footnote_pattern(line):
-                    self._add_bullet_paragraph_with_footnotes(line, 'CustomListLevel2')
-                else:
-                    para = self.document.add_paragraph(line)
-                    para.style = 'CustomListLevel2'  
-                last_bullet_level = 2
-            elif line.startswith('-'):
-                if '^' in line and self._has_footnote_pattern(line):
-                    self._add_bullet_paragraph_with_footnotes(line, 'CustomListLevel3')
-                else:
-                    para = self.document.add_paragraph(line)
-                    para.style = 'CustomListLevel3'
-                last_bullet_level = 3
-            elif line.startswith('•'):
-                if '^' in line and self._has_footnote_pattern(line):
-                    self._add_bullet_paragraph_with_footnotes(line, 'CustomListLevel4')
-                else:
-                    para = self.document.add_paragraph(line)
-                    para.style = 'CustomListLevel4'
-                last_bullet_level = 4
-            # 특수 번호 (①②③)
-            elif re.match(r'^[①②③④⑤⑥⑦⑧⑨⑩]', line):
-                # 상위 컨텍스트에 따른 적절한 스타일 결정
-                numbered_style = self._get_numbered_style_for_context(last_bullet_level)
-                para = self.document.add_paragraph(line)
-                para.style = numbered_style
-            # 일반 텍스트
-            else:
-                # LaTeX 수식 처리
-                if '\\[' in line and '\\]' in line:
-                    line = self._convert_latex_formula(line)
-                
-                # 주석이 포함된 텍스트 처리
-                if '^' in line and self._has_footnote_pattern(line):
-                    # 컨텍스트에 따른 들여쓰기 스타일 적용 (대시 없이)
-                    indented_style = self._get_indented_style_for_context(last_bullet_level)
-                    self._add_paragraph_with_footnotes_and_style(line, indented_style)
-                else:
-                    # 일반 텍스트는 컨텍스트에 따른 들여쓰기만 적용 (대시 없이)
-                    indented_style = self._get_indented_style_for_context(last_bullet_level)
-                    # 마크다운 포매팅이 있는지 확인하고 처리
-                    if '**' in line or '*' in line:
-                        self._add_paragraph_with_formatting_and_style(line, indented_style)
-                    else:
-                        para = self.document.add_paragraph(line)
-                        para.style = indented_style
-            
-            i += 1
+        _, image_paths = self._scan_markdown(lines)
+        self._prefetch_images(image_paths)
+        self._process_lines(lines)
+    
+    def _process_lines(self, lines: Iterable[str], last_bullet_level: Optional[int] = None) -> Optional[int]:
+        """라인 스트림을 토큰으로 분류한 뒤 토큰 종류별로 처리
+        
+        표 캡션 확인에 필요한 앞쪽 3개 토큰과 직전 토큰만 들고 있으므로
+        파일 전체를 메모리에 올리지 않아도 된다
+        last_bullet_level은 이어서 처리할 때 넘겨받는 마지막 글머리 기호 레벨 (처리 후 값을 반환)
+        """
+        return self._process_tokens(tokenize(lines), last_bullet_level)
+    
+    def _process_pages(self, lines: Iterable[str]):
+        """추적 모드 - 페이지(### Page, #/## 제목) 단위로 나눠 토큰화/처리 구간을 따로 기록
+        
+        섹션마다 이어서 처리하는 것은 증분 빌드와 같은 방식이라 결과 문서는 같다
+        """
+        last_bullet_level = None
+        for index, section in enumerate(split_sections(lines), 1):
+            with span("page", index=index, lines=len(section)):
+                with span("tokenize"):
+                    tokens = list(tokenize(section))
+                last_bullet_level = self._process_tokens(tokens, last_bullet_level)
+    
+    def _process_tokens(self, tokens: Iterable[Token], last_bullet_level: Optional[int] = None) -> Optional[int]:
+        """토큰 스트림을 공용 변환 코어로 처리하고 마지막 글머리 기호 레벨 반환"""
+        self.last_bullet_level = last_bullet_level
+        self.engine.run(tokens)
+        return self.last_bullet_level
+    
+    def token_handlers(self) -> dict:
+        """토큰 종류별 처리 함수 (일반 텍스트는 handle_text)"""
+        return {
+            TokenKind.PAGE_MARKER: self._handle_page_marker,
+            TokenKind.IMAGE: self._add_image,
+            TokenKind.HEADING: self._process_heading_line,
+            TokenKind.TOC_ENTRY: self._add_toc_entry,
+            TokenKind.NUMBERED: self._handle_numbered,
+            TokenKind.CAPTION: self._handle_numbered,
+            TokenKind.ROMAN_HEADING: self._handle_roman_heading,
+            TokenKind.SUBHEADING: self._handle_subheading,
+            TokenKind.BULLET: self._handle_bullet,
+            TokenKind.CIRCLED: self._handle_circled,
+            TokenKind.FOOTNOTE_DEF: self._handle_footnote_definition,
+            TokenKind.FOOTNOTE_BLOCK: self._handle_footnote_definition,
+        }
+    
+    def start_table(self, token: Token, engine: MarkdownEngine):
+        """테이블 시작 전에 이전 라인이 표 캡션인지 확인"""
+        prev_token = engine.prev_token
+        if prev_token is not None and prev_token.table_caption is not None:
+            self._add_table_caption_once(prev_token, "테이블 위 캡션")
+    
+    def end_table(self, rows: List[Token], engine: MarkdownEngine) -> int:
+        """테이블 끝 - 다음 최대 3줄에서 표 캡션을 찾아 표 위에 넣고 테이블 생성 (캡션 라인까지 건너뛰기)"""
+        skip, caption = engine.find_table_caption()
+        if caption is not None:
+            logger.debug("테이블 캡션 발견: %s", caption.text)
+            self.add_caption(caption.table_caption, "Table")
+            self.processed_captions.add(caption.text)  # 처리된 캡션 기록
+            logger.debug("표 캡션 처리함: %s", caption.text)
+        self._create_table_from_lines([row.text for row in rows])
+        return skip
+    
+    def _handle_page_marker(self, token: Token):
+        self.progress.emit('page', page=token.text[len(PAGE_MARKER_PREFIX):].strip())
+    
+    def _handle_numbered(self, token: Token):
+        """계층적 번호 체계 처리 (1. / 1.1 / 1.1.1 / 그림·표 캡션)"""
+        self._add_hierarchical_content(token)
+        self.last_bullet_level = token.level
+    
+    def _handle_roman_heading(self, token: Token):
+        """로마숫자로 시작하는 대제목 (Ⅰ, Ⅱ, Ⅲ...)"""
+        para = self.document.add_paragraph(token.text)
+        self._apply_style(para, 'CustomHeading1')
+    
+    def _handle_subheading(self, token: Token):
+        """괄호 숫자로 시작하는 소제목 (1) 2) 3))"""
+        para = self.document.add_paragraph(token.text)
+        self._apply_style(para, 'CustomHeading3')
+    
+    def _handle_bullet(self, token: Token):
+        """불릿 포인트 처리 (□ ○ - •)"""
+        style_name = f'CustomListLevel{token.level}'
+        if token.has_footnote:
+            self._add_bullet_paragraph_with_footnotes(token.text, style_name)
+        else:
+            para = self.document.add_paragraph(token.text)
+            self._apply_style(para, style_name)
+        self.last_bullet_level = token.level
+    
+    def _handle_circled(self, token: Token):
+        """특수 번호 (①②③) - 상위 컨텍스트에 따른 적절한 스타일 결정"""
+        numbered_style = self._get_numbered_style_for_context(self.last_bullet_level)
+        para = self.document.add_paragraph(token.text)
+        self._apply_style(para, numbered_style)
+    
+    def _handle_footnote_definition(self, token: Token):
+        """주석 정의 줄은 워드 각주 내용으로 들어가므로 본문에서 생략 (각주를 쓰지 않으면 일반 텍스트)"""
+        if not self.footnote_manager.native:
+            self.handle_text(token)
+    
+    def handle_text(self, token: Token):
+        """일반 텍스트"""
+        line = token.text
+        # LaTeX 수식 처리
+        if '\\[' in line and '\\]' in line:
+            line = self._convert_latex_formula(line)
+        
+        # 컨텍스트에 따른 들여쓰기 스타일 적용 (대시 없이)
+        indented_style = self._get_indented_style_for_context(self.last_bullet_level)
         
-        # 마지막에 테이블이 있으면 처리
-        if current_table:
-            self._create_table_from_lines(current_table)
+        # 주석이 포함된 텍스트 처리
+        if has_footnote(line):
+            self._add_paragraph_with_footnotes_and_style(line, indented_style)
+        # 마크다운 포매팅이 있는지 확인하고 처리
+        elif '*' in line:
+            self._add_paragraph_with_formatting_and_style(line, indented_style)
+        else:
+            para = self.document.add_paragraph(line)
+            self._apply_style(para, indented_style)
+    
+    def _process_sections(self, lines: Iterable[str]):
+        """증분 빌드 - 섹션마다 캐시 키를 계산해서 바뀌지 않은 섹션은 조각을 붙이고 나머지만 변환"""
+        cache = self.section_cache
+        cache.hits = cache.misses = 0  # 통계는 문서마다 따로
+        signature = self._build_signature()
+        last_bullet_level = None
+        
+        for index, section in enumerate(split_sections(lines), 1):
+            with span("page", index=index, lines=len(section)) as page_span:
+                last_bullet_level = self._process_cached_section(section, signature, last_bullet_level, page_span)
+        
+        cache.evict()
+        cache.log_stats()
+    
+    def _process_cached_section(self, section: List[str], signature: str, last_bullet_level: Optional[int],
+                                page_span) -> Optional[int]:
+        """섹션 1개 - 캐시에 있으면 조각을 붙이고, 없으면 변환해서 조각을 저장"""
+        cache = self.section_cache
+        body = self.document.element.body
+        state = self._section_state(last_bullet_level)
+        key = cache.make_key(signature, section, state, self._section_dependencies(section))
+        entry = cache.get(key)
+        page_span.set(cached=entry is not None)
+        if entry is not None:
+            if section and section[0].strip().startswith(PAGE_MARKER_PREFIX):
+                self.progress.emit('page', page=section[0].strip()[len(PAGE_MARKER_PREFIX):].strip(), cached=True)
+            self._stitch_section(entry)
+            self.footnote_manager.restore_notes(entry["notes"])
+            return self._restore_section_state(entry["state"])
+        
+        note_count = self.footnote_manager.note_count
+        before = self._body_content_count(body)
+        last_bullet_level = self._process_lines(section, last_bullet_level)
+        elements = body[before:self._body_content_count(body)]
+        images = {}
+        for element in elements:
+            for blip in element.iter(qn('a:blip')):
+                rId = blip.get(qn('r:embed'))
+                images[rId] = self._image_sources[rId]
+        cache.put(key, {
+            "state": self._section_state(last_bullet_level),
+            "elements": [etree.tostring(element, encoding='unicode') for element in elements],
+            "images": images,
+            "footnotes": self.footnote_manager.export_footnotes(elements),
+            "notes": self.footnote_manager.notes_since(note_count),
+        })
+        return last_bullet_level
+    
+    @staticmethod
+    def _body_content_count(body) -> int:
+        """본문 끝의 구역 속성(w:sectPr)을 뺀 본문 요소 수"""
+        return len(body) - (1 if body.sectPr is not None else 0)
+    
+    def _build_signature(self) -> str:
+        """조각 내용에 영향을 주는 변환기 코드/템플릿/설정 서명"""
+        preprocessor = self.image_preprocessor
+        return json.dumps([
+            source_signature(('md_to_docx_converter', 'md_tokenizer', 'table_builder', 'image_pipeline')),
+            docx.__version__,
+            file_stamp(os.path.abspath(self.template_path)) if self.template_path else None,
+            self.footnote_manager.native,
+            [preprocessor.enabled, preprocessor.dpi, preprocessor.quantize, self.IMAGE_WIDTH],
+        ])
+    
+    def _section_state(self, last_bullet_level: Optional[int]) -> dict:
+        """섹션 처리 결과에 영향을 주는 변환 상태 (번호, 캡션, 글머리 기호 레벨, 주석 섹션용 주석)"""
+        footnote_manager = self.footnote_manager
+        return {
+            "section_numbers": [self.section_numbers[level] for level in range(1, 7)],
+            "figure_counter": self.figure_counter,
+            "table_counter": self.table_counter,
+            "processed_captions": sorted(self.processed_captions),
+            "in_footnote_section": self.in_footnote_section,
+            "last_bullet_level": last_bullet_level,
+            "footnote_counter": footnote_manager.footnote_counter,
+            "footnotes": sorted(footnote_manager.footnotes.items()),
+            "has_footnote_section_in_md": footnote_manager.has_footnote_section_in_md,
+        }
     
-    def _process_heading_line(self, line: str):
-        """헤딩 라인 처리"""
-        if line.startswith('###'):
-            text = line[3:].strip()
-            para = self.document.add_paragraph(text)
-            para.style = 'CustomHeading3'
-        elif line.startswith('##'):
-            text = line[2:].strip()
-            para = self.document.add_paragraph(text)
-            para.style = 'CustomHeading2'
-        elif line.startswith('#'):
-            text = line[1:].strip()
-            para = self.document.add_paragraph(text)
-            para.style = 'CustomHeading1'
+    def _restore_section_state(self, state: dict) -> Optional[int]:
+        """캐시된 섹션을 나갈 때의 상태로 맞추고 마지막 글머리 기호 레벨 반환"""
+        footnote_manager = self.footnote_manager
+        self.section_numbers = {level: number for level, number in enumerate(state["section_numbers"], 1)}
+        self.figure_counter = state["figure_counter"]
+        self.table_counter = state["table_counter"]
+        self.processed_captions = set(state["processed_captions"])
+        self.in_footnote_section = state["in_footnote_section"]
+        footnote_manager.footnote_counter = state["footnote_counter"]
+        footnote_manager.footnotes = {number: content for number, content in state["footnotes"]}
+        footnote_manager.has_footnote_section_in_md = state["has_footnote_section_in_md"]
+        return state["last_bullet_level"]
+    
+    def _section_dependencies(self, section: List[str]) -> dict:
+        """섹션이 참조하는 이미지 파일 상태와 각주 내용 (다른 섹션의 주석 정의가 바뀌어도 다시 변환)
+        
+        다시 참조하는 주석 번호는 책갈피/NOTEREF 필드와 그 결과 순번이 앞 섹션에 따라 달라지므로 함께 포함
+        """
+        images = []
+        footnotes = []
+        repeated = []
+        footnote_manager = self.footnote_manager
+        footnote_index = footnote_manager.index
+        for raw in section:
+            line = raw.strip()
+            if line.startswith('!'):
+                match = IMAGE_PATTERN.match(line)
+                if match:
+                    images.append(file_stamp(self.resolve_image_path(match.group(2))))
+            if '^' in line:
+                for number, inline_text in FOOTNOTE_PATTERN.findall(line):
+                    text = footnote_index.text_for(number, inline_text)
+                    footnotes.append(text)
+                    if footnote_index.is_repeated(number, text):
+                        # 처음 쓰는 내용이면 책갈피 이름이 앞에서 쓴 같은 번호의 다른 내용 수에 따라 달라짐
+                        repeated.append([number, footnote_manager.note_ordinals.get((number, text)),
+                                         footnote_manager.note_variants.get(number, 0)])
+        dependencies = {"images": images, "footnotes": footnotes}
+        if repeated and footnote_manager.native:
+            # 섹션 안에서 처음 쓰고 다시 참조하면 필드 결과가 앞 섹션까지의 각주 수에 따라 달라짐
+            first_here = any(note is None for _, note, _ in repeated)
+            dependencies["repeated_footnotes"] = repeated
+            dependencies["note_count"] = footnote_manager.note_count if first_here else None
+        return dependencies
+    
+    def _stitch_section(self, entry: dict):
+        """캐시된 섹션 조각을 본문에 붙이고 이미지 관계/그림 ID/각주 ID를 이 문서에 맞게 다시 연결"""
+        body = self.document.element.body
+        part = self.document.part
+        shape_id = part.next_id
+        for xml in entry["elements"]:
+            element = parse_xml(xml)
+            for blip in element.iter(qn('a:blip')):
+                image_path = entry["images"][blip.get(qn('r:embed'))]
+                rId, _ = part.get_or_add_image(self.image_preprocessor.prepare(image_path, self.IMAGE_WIDTH))
+                self._image_sources[rId] = image_path
+                blip.set(qn('r:embed'), rId)
+            for doc_pr in element.iter(qn('wp:docPr')):
+                doc_pr.set('id', str(shape_id))
+                shape_id += 1
+            self.footnote_manager.adopt_references(element, entry["footnotes"])
+            if body.sectPr is not None:
+                body.sectPr.addprevious(element)
+            else:
+                body.append(element)
+    
+    def _add_table_caption_once(self, token: Token, label: str):
+        """<표 N> 캡션을 아직 처리하지 않았으면 표 캡션으로 추가"""
+        logger.debug("%s 발견: %s", label, token.text)
+        if token.text in self.processed_captions:
+            logger.debug("%s 이미 처리됨: %s", label, token.text)
+            return
+        self.add_caption(token.table_caption, "Table")
+        self.processed_captions.add(token.text)
+        logger.debug("%s 처리함: %s", label, token.text)
+    
+    def _process_heading_line(self, token: Token):
+        """헤딩 토큰 처리 (# ## ###)"""
+        para = self.document.add_paragraph(token.text)
+        self._apply_style(para, f'CustomHeading{token.level}')
     
     def _should_add_dash_bullet(self, line: str) -> bool:
         """일반 텍스트에 대시 글머리를 자동 추가할지 판단"""
@@ -1706,19 +2238,6 @@ class DocxConverter:
             
         return False
     
-    def _get_hierarchical_level(self, line: str) -> int:
-        """계층적 번호 체계의 레벨 반환"""
-        # 1. 형태 = 레벨 1 (□과 동등)
-        if re.match(r'^\d+\.\s+', line):
-            return 1
-        # 1.1 형태 = 레벨 2 (○과 동등) 
-        if re.match(r'^\d+\.\d+\s+', line):
-            return 2
-        # 1.1.1 형태 = 레벨 3 (-와 동등)
-        if re.match(r'^\d+\.\d+\.\d+\s+', line):
-            return 3
-        return 1
-    
     def _get_dash_style_for_context(self, last_bullet_level) -> str:
         """상위 컨텍스트에 따른 대시(-) 스타일 결정"""
         if last_bullet_level is None:
@@ -1773,127 +2292,68 @@ class DocxConverter:
     def _add_paragraph_with_formatting_and_style(self, text: str, style_name: str):
         """마크다운 포매팅이 포함된 단락을 특정 스타일로 추가"""
         para = self.document.add_paragraph()
-        para.style = style_name
+        self._apply_style(para, style_name)
         self._add_formatted_text_to_paragraph(para, text, Pt(11))
     
     def _add_paragraph_with_footnotes_and_style(self, text: str, style_name: str):
         """주석이 포함된 텍스트를 특정 스타일로 추가"""
         para = self.document.add_paragraph()
-        para.style = style_name
-        
-        # 주석 패턴 찾기 (^숫자^[내용] 또는 ^숫자^ 형태)
-        footnote_pattern = r'\^(\d+)\^(\[([^\]]*)\])?'
-        
-        current_pos = 0
-        for match in re.finditer(footnote_pattern, text):
-            # 주석 전 텍스트 추가
-            before_text = text[current_pos:match.start()]
-            if before_text:
-                run = para.add_run(before_text)
-                run.font.name = 'Arial'
-                run.font.size = Pt(11)
-            
-            # 주석 번호와 내용 추출
-            footnote_num = match.group(1)
-            footnote_content = match.group(3) if match.group(3) else f"참조 {footnote_num}"
-            
-            # 주석 추가
-            self.footnote_manager.add_footnote(para, "", footnote_content)
-            
-            current_pos = match.end()
+        self._apply_style(para, style_name)
         
-        # 나머지 텍스트 추가
-        remaining_text = text[current_pos:]
-        if remaining_text:
-            run = para.add_run(remaining_text)
-            run.font.name = 'Arial'
-            run.font.size = Pt(11)
-        
-        para.style = style_name
+        self.footnote_manager.add_text(para, text, size=Pt(11))
     
     def _is_hierarchical_content(self, line: str) -> bool:
-        """계층적 번호 체계 콘텐츠인지 확인 - 숫자 기반 계층만 처리"""
-        # 1. 형태의 번호 (1단계 - 가장 상위)
-        if re.match(r'^\d+\.\s+', line):
-            return True
-        # 1.1 형태의 번호 (2단계)
-        if re.match(r'^\d+\.\d+\s+', line):
-            return True
-        # 1.1.1 형태의 번호 (3단계)
-        if re.match(r'^\d+\.\d+\.\d+\s+', line):
-            return True
-        # 그림/표 캡션 패턴
-        if re.match(r'^[\<\[]*\s*(그림|표|figure|table)\s*[\>\]]*\s*\d+', line, re.IGNORECASE):
-            return True
-        return False
-    
-    def _add_hierarchical_content(self, line: str):
-        """계층적 번호 체계 콘텐츠 추가"""
-        # 주석이 포함된 경우 특별 처리
-        if '^' in line and self._has_footnote_pattern(line):
-            # 1.1.1 형태 - 2단계 헤딩과 동일 (가장 구체적인 패턴부터 확인)
-            if re.match(r'^\d+\.\d+\.\d+\s+', line):
-                self._add_hierarchical_paragraph_with_footnotes(line, 'CustomHeading2')
-            # 1.1 형태 - 2단계 헤딩
-            elif re.match(r'^\d+\.\d+\s+', line):
-                self._add_hierarchical_paragraph_with_footnotes(line, 'CustomHeading2')
-            # 1. 형태 - 최상위 헤딩이지만 참고문헌 항목일 수 있음
-            elif re.match(r'^\d+\.\s+', line):
-                if self._is_reference_item(line):
-                    self._add_hierarchical_paragraph_with_footnotes(line, 'CustomReference')
-                else:
-                    self._add_hierarchical_paragraph_with_footnotes(line, 'CustomHeading1')
+        """계층적 번호 체계 콘텐츠인지 확인 - 숫자 기반 계층 또는 그림/표 캡션"""
+        return HIERARCHICAL_PATTERN.match(line) is not None
+    
+    def _add_hierarchical_content(self, token: Token):
+        """계층적 번호 체계 콘텐츠 추가 (NUMBERED / CAPTION 토큰)"""
+        line = token.text
+        
+        if token.kind == TokenKind.NUMBERED:
+            # 1.1.1 / 1.1 형태 - 2단계 헤딩, 1. 형태 - 최상위 헤딩이지만 참고문헌 항목일 수 있음
+            if token.level >= 2:
+                style_name = 'CustomHeading2'
+            elif self._is_reference_item(line):
+                style_name = 'CustomReference'
             else:
-                self._add_paragraph_with_footnotes(line)
-            return
-        
-        # 일반 처리 (주석 없는 경우)
-        # 1.1.1 형태 - 2단계 헤딩과 동일 (가장 구체적인 패턴부터 확인)
-        if re.match(r'^\d+\.\d+\.\d+\s+', line):
-            para = self.document.add_paragraph(line)
-            para.style = 'CustomHeading2'
-        # 1.1 형태 - 2단계 헤딩
-        elif re.match(r'^\d+\.\d+\s+', line):
-            para = self.document.add_paragraph(line)
-            para.style = 'CustomHeading2'
-        # 1. 형태 - 최상위 헤딩이지만 참고문헌 항목일 수 있음
-        elif re.match(r'^\d+\.\s+', line):
-            # 참고문헌 항목인지 확인 (저자명, 연도, 제목 등이 포함된 경우)
-            if self._is_reference_item(line):
-                para = self.document.add_paragraph(line)
-                para.style = 'CustomReference'
+                style_name = 'CustomHeading1'
+            
+            # 주석이 포함된 경우 특별 처리
+            if token.has_footnote:
+                self._add_hierarchical_paragraph_with_footnotes(line, style_name)
             else:
                 para = self.document.add_paragraph(line)
-                para.style = 'CustomHeading1'
+                self._apply_style(para, style_name)
+            return
+        
+        # 그림/표 캡션 - 주석이 포함된 경우 일반 주석 단락으로 처리
+        if token.has_footnote:
+            self._add_paragraph_with_footnotes(line)
+            return
+        
         # 그림/표 캡션 - Word 실제 캡션 기능 사용
-        elif re.match(r'^[\<\[]*\s*(그림|표|figure|table)\s*[\>\]]*\s*\d+', line, re.IGNORECASE):
-            # 이미 처리된 캡션인지 확인
-            if line in self.processed_captions:
-                print(f"DEBUG: 이미 처리된 캡션 건너뛰기: {line}")
-                pass  # 이미 처리된 캡션은 건너뛰기
-            else:
-                # 캡션 텍스트에서 실제 설명 부분 추출
-                match = re.match(r'^<(그림|표|figure|table)\s*\d+>\s*(.*)', line, re.IGNORECASE)
-                if match:
-                    caption_type = match.group(1)
-                    caption_text = match.group(2).strip()
-                    
-                    if caption_type.lower() in ['그림', 'figure']:
-                        self.add_caption(caption_text, "Figure")
-                        self.processed_captions.add(line)
-                        print(f"DEBUG: 그림 캡션 처리함: {line}")
-                    elif caption_type.lower() in ['표', 'table']:
-                        # 표 캡션은 테이블과 함께 처리되어야 하므로 여기서는 일반적으로 건너뛰기
-                        # 단, 테이블 없이 단독으로 나타나는 경우만 처리
-                        print(f"DEBUG: 표 캡션 발견했지만 테이블 처리에서 담당: {line}")
-                else:
-                    # 패턴이 복잡하면 기존 방식 사용
-                    para = self.document.add_paragraph(line)
-                    para.style = 'CustomCaption'
+        if line in self.processed_captions:
+            logger.debug("이미 처리된 캡션 건너뛰기: %s", line)
+            return
+        
+        # 캡션 텍스트에서 실제 설명 부분 추출
+        if token.groups:
+            caption_type, caption_text = token.groups
+            caption_text = caption_text.strip()
+            
+            if caption_type.lower() in ['그림', 'figure']:
+                self.add_caption(caption_text, "Figure")
+                self.processed_captions.add(line)
+                logger.debug("그림 캡션 처리함: %s", line)
+            elif caption_type.lower() in ['표', 'table']:
+                # 표 캡션은 테이블과 함께 처리되어야 하므로 여기서는 일반적으로 건너뛰기
+                # 단, 테이블 없이 단독으로 나타나는 경우만 처리
+                logger.debug("표 캡션 발견했지만 테이블 처리에서 담당: %s", line)
         else:
-            # 기본 처리
+            # 패턴이 복잡하면 기존 방식 사용
             para = self.document.add_paragraph(line)
-            para.style = 'CustomBody'
+            self._apply_style(para, 'CustomCaption')
     
     def _is_reference_item(self, line: str) -> bool:
         """참고문헌 항목인지 확인"""
@@ -1922,37 +2382,26 @@ class DocxConverter:
         if cols == 0:
             return
             
-        # 테이블 생성
-        table = self.document.add_table(rows=len(clean_lines), cols=cols)
-        table.style = 'Table Grid'
-        
-        # 데이터 채우기
-        for i, line in enumerate(clean_lines):
-            cells = [cell.strip() for cell in line.split('|') if cell.strip()]
-            for j, cell_text in enumerate(cells):
-                if j < cols:
-                    cell_obj = table.cell(i, j)
-                    
-                    # 셀 내용 클리어하고 새로 작성
-                    cell_obj.text = ""
-                    paragraph = cell_obj.paragraphs[0]
-                    
-                    # 상첨자 처리가 필요한 텍스트인지 확인
-                    if self._has_footnote_pattern(cell_text):
-                        self._process_cell_footnotes(paragraph, cell_text)
-                    else:
-                        # 마크다운 Bold 구문 처리
-                        self._process_cell_text_with_bold(paragraph, cell_text, i == 0)
-                    
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER if i == 0 else WD_ALIGN_PARAGRAPH.LEFT
-                    
-                    # 헤더 배경색
-                    if i == 0:
-                        self._set_cell_background(cell_obj, "f2f2f2")
+        # 테이블 생성 (w:tbl을 한 번에 만들고 셀을 순서대로 채움, 헤더 배경색 포함)
+        rows = [[cell.strip() for cell in line.split('|') if cell.strip()] for line in clean_lines]
+        self.progress.emit('table', rows=len(rows), cols=cols)
+        with span("table", rows=len(rows), cols=cols):
+            self.table_builder.add_table(rows, cols, self._fill_table_cell, header_fill="f2f2f2")
         
         # 테이블 후 간격
         self.document.add_paragraph()
     
+    def _fill_table_cell(self, paragraph, cell_text: str, row_index: int):
+        """표 셀 첫 단락 채우기"""
+        # 상첨자 처리가 필요한 텍스트인지 확인
+        if self._has_footnote_pattern(cell_text):
+            self._process_cell_footnotes(paragraph, cell_text)
+        else:
+            # 마크다운 Bold 구문 처리
+            self._process_cell_text_with_bold(paragraph, cell_text, row_index == 0)
+        
+        paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER if row_index == 0 else WD_ALIGN_PARAGRAPH.LEFT
+    
     def _convert_latex_formula(self, text: str) -> str:
         """LaTeX 수식을 워드에서 읽기 쉬운 형태로 변환"""
         
@@ -1995,69 +2444,41 @@ class DocxConverter:
         converted = re.sub(formula_pattern, replace_formula, text)
         return converted
     
-    def _is_toc_entry(self, line: str) -> bool:
-        """목차 항목인지 확인 (점선과 숫자가 있는 경우)"""
-        # 점선과 마지막에 숫자가 있는 패턴
-        return bool(re.search(r'[…\.]{3,}.*?\d+\s*$', line))
-    
-    def _add_toc_entry(self, line: str):
+    def _add_toc_entry(self, token: Token):
         """목차 항목 추가"""
-        # 점선 패턴 찾기
-        match = re.match(r'^(.+?)\s+[…\.]{3,}.*?(\d+)\s*$', line)
-        if match:
-            title = match.group(1).strip()
-            page_num = match.group(2).strip()
-            
-            # 들여쓰기 레벨 결정 (유니코드 공백 포함)
-            if line.startswith(' ') or line.startswith('\u2003') or line.startswith('\t'):
-                # 들여쓰기가 있으면 중제목
-                style = 'TOCEntry2'
-            else:
-                # 들여쓰기 없으면 대제목
-                style = 'TOCEntry1'
-            
-            # 목차 항목 생성 (탭으로 구분)
-            para = self.document.add_paragraph()
-            para.style = style
-            para.add_run(title)
-            para.add_run('\t')  # 탭 문자로 점선 리더 활성화
-            para.add_run(page_num)
-    
-    def _is_image_line(self, line: str) -> bool:
-        """이미지 마크다운 라인인지 확인 ![alt](path)"""
-        return bool(re.match(r'!\[.*?\]\(.*?\)', line))
-    
-    def _add_image(self, line: str):
-        """이미지 추가 처리"""
-        # 마크다운 이미지 패턴 매칭 ![alt](path)
-        match = re.match(r'!\[(.*?)\]\((.*?)\)', line)
-        if not match:
+        if not token.groups:
             return
-            
-        alt_text = match.group(1)
-        image_path = match.group(2)
+        title, page_num, indented = token.groups
         
-        # 상대 경로를 절대 경로로 변환
-        if not os.path.isabs(image_path):
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            image_path = os.path.join(current_dir, image_path)
+        # 들여쓰기 레벨 결정 (유니코드 공백 포함) - 들여쓰기가 있으면 중제목, 없으면 대제목
+        style = 'TOCEntry2' if indented else 'TOCEntry1'
         
-        # 이미지 파일 존재 확인
+        # 목차 항목 생성 (탭으로 구분)
+        para = self.document.add_paragraph()
+        self._apply_style(para, style)
+        para.add_run(title)
+        para.add_run('\t')  # 탭 문자로 점선 리더 활성화
+        para.add_run(page_num)
+    
+    def _add_image(self, token: Token):
+        """이미지 추가 처리 (IMAGE 토큰: ![alt](path))"""
+        alt_text, image_path = token.groups
+        image_path = self.resolve_image_path(image_path)
+        
+        # 이미지 파일 존재 확인 (미리 읽기 단계에서 보고한 파일은 다시 출력하지 않음)
         if not os.path.exists(image_path):
-            print(f"경고: 이미지 파일을 찾을 수 없습니다: {image_path}")
+            if image_path not in self.missing_images:
+                logger.warning("경고: 이미지 파일을 찾을 수 없습니다: %s", image_path)
             # 이미지가 없으면 캡션만 추가
             if alt_text:
                 self._add_figure_caption(alt_text)
             return
         
         try:
-            # 이미지를 문서에 추가
-            paragraph = self.document.add_paragraph()
-            paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            
-            # 이미지 크기 조정 (최대 너비 6인치)
-            run = paragraph.add_run()
-            run.add_picture(image_path, width=Inches(6))
+            # 이미지를 문서에 추가 (최대 너비 6인치)
+            inline_shape = add_picture_paragraph(self.document, self.image_preprocessor, image_path, self.IMAGE_WIDTH)
+            self._image_sources[inline_shape._inline.graphic.graphicData.pic.blipFill.blip.embed] = image_path
+            self.progress.emit('image', path=image_path)
             
             # 캡션 추가 (있는 경우) - Word 실제 캡션 기능 사용
             if alt_text:
@@ -2067,29 +2488,66 @@ class DocxConverter:
             self.document.add_paragraph()
             
         except Exception as e:
-            print(f"이미지 삽입 중 오류 발생: {e}")
+            logger.warning("이미지 삽입 중 오류 발생: %s", e)
             # 오류 시 캡션만 추가
             para = self.document.add_paragraph(alt_text)
-            para.style = 'CustomCaption'
+            self._apply_style(para, 'CustomCaption')
 
 
 def main():
     """메인 함수"""
     if len(sys.argv) < 2:
-        print("사용법: python md_to_docx_converter.py <input_file.md> [output_file.docx]")
+        print("사용법: python md_to_docx_converter.py <input_file.md> [output_file.docx] [--incremental] [--trace 추적.json] [--quiet|--verbose]")
+        print("       python md_to_docx_converter.py --watch <input_file.md> [output_file.docx] [--open]")
+        print("       python md_to_docx_converter.py --batch <디렉토리|glob 패턴> [...] [-o 출력폴더] [-j 워커수]")
         sys.exit(1)
     
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
+    # --trace 경로: 구간별 소요 시간 기록 저장 (DOCX_TRACE와 같음)
+    # --quiet: 경고만 출력 (DOCX_QUIET=1과 같음), --verbose: 캡션/표마다 상세 기록까지 출력 (DOCX_LOG_LEVEL=DEBUG와 같음)
+    if '--trace' in sys.argv[:-1]:
+        index = sys.argv.index('--trace')
+        os.environ["DOCX_TRACE"] = sys.argv[index + 1]
+        del sys.argv[index:index + 2]
+    if '--quiet' in sys.argv:
+        os.environ["DOCX_QUIET"] = "1"
+        sys.argv.remove('--quiet')
+    if '--verbose' in sys.argv:
+        os.environ["DOCX_LOG_LEVEL"] = "DEBUG"
+        sys.argv.remove('--verbose')
+    configure_logging()
+    
+    # MD/이미지/차트 HTML이 바뀔 때마다 다시 변환 (감시 모드)
+    if '--watch' in sys.argv:
+        from watch_converter import main as watch_main
+        watch_main([arg for arg in sys.argv[1:] if arg not in ('--watch', '--incremental')])
+        return
+    
+    # 여러 파일 일괄 변환 (디렉토리를 주거나 --batch 지정)
+    if sys.argv[1] == '--batch' or os.path.isdir(sys.argv[1]):
+        from batch_converter import main as batch_main
+        batch_main([arg for arg in sys.argv[1:] if arg != '--batch'])
+        return
+    
+    # --incremental: 바뀐 섹션만 다시 변환 (DOCX_INCREMENTAL=1과 같음)
+    args = [arg for arg in sys.argv[1:] if arg != '--incremental']
+    incremental = True if len(args) < len(sys.argv) - 1 else None
+    if not args:
+        print("사용법: python md_to_docx_converter.py <input_file.md> [output_file.docx] [--incremental] [--trace 추적.json] [--quiet|--verbose]")
+        sys.exit(1)
+    input_file = args[0]
+    output_file = args[1] if len(args) > 1 else None
     
     if not os.path.exists(input_file):
         print(f"입력 파일을 찾을 수 없습니다: {input_file}")
         sys.exit(1)
     
     try:
-        converter = DocxConverter()
+        converter = DocxConverter(incremental=incremental)
         output_path = converter.convert_markdown_to_docx(input_file, output_file)
         print(f"변환 완료: {output_path}")
+        if get_tracer().enabled:
+            get_tracer().print_summary()
+            print(f"추적 기록 저장: {os.environ['DOCX_TRACE']}")
     except Exception as e:
         import traceback
         print(f"변환 중 오류 발생: {e}")
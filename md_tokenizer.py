@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+마크다운 라인 토크나이저
+각 라인을 미리 컴파일한 패턴으로 한 번만 분류해서 종류가 정해진 토큰 스트림을 생성
+(DocxConverter는 토큰의 종류만 보고 DOCX 요소를 만든다)
+파일 전체를 읽지 않고 라인 이터레이터 + 작은 lookahead 버퍼로 처리할 수 있다
+"""
+
+import re
+from collections import deque
+from typing import IO, Iterable, Iterator, List, NamedTuple, Optional
+
+
+class TokenKind:
+    """토큰 종류"""
+    BLANK = "blank"                  # 빈 줄
+    PAGE_MARKER = "page_marker"      # ### Page N
+    EDIT_NOTE = "edit_note"          # **※ / (※ 편집 안내
+    RULE = "rule"                    # ---
+    IMAGE = "image"                  # ![alt](path)
+    TABLE_ROW = "table_row"          # | 가 포함된 줄
+    HEADING = "heading"              # # ## ###
+    TOC_ENTRY = "toc_entry"          # 제목 ....... 12
+    NUMBERED = "numbered"            # 1. / 1.1 / 1.1.1 계층 번호
+    CAPTION = "caption"              # <그림 1> / <표 1> 캡션
+    ROMAN_HEADING = "roman_heading"  # Ⅰ Ⅱ Ⅲ 대제목
+    SUBHEADING = "subheading"        # 1) 2) 소제목
+    BULLET = "bullet"                # □ ○ - • 글머리
+    CIRCLED = "circled"              # ①②③ 특수 번호
+    FOOTNOTE_DEF = "footnote_def"    # ^1^[설명] 만 있는 주석 정의 줄
+    FOOTNOTE_BLOCK = "footnote_block"  # 【 중요 주석 】 주석 정의 블록 제목
+    TEXT = "text"                    # 일반 텍스트
+
+    # 출력 없이 건너뛰는 종류
+    SKIPPED = frozenset({BLANK, PAGE_MARKER, EDIT_NOTE, RULE})
+    # 워드 각주를 쓰면 본문 대신 각주 내용이 되는 종류
+    FOOTNOTE_DEFINITIONS = frozenset({FOOTNOTE_DEF, FOOTNOTE_BLOCK})
+
+
+class Token(NamedTuple):
+    """분류된 마크다운 라인 1개"""
+    kind: str
+    text: str                            # 앞뒤 공백을 제거한 라인
+    raw: str                             # 원본 라인 (목차 들여쓰기 판단용)
+    level: int = 0                       # 헤딩/계층 번호/글머리 레벨
+    has_footnote: bool = False           # ^숫자^ 주석 포함 여부
+    table_caption: Optional[str] = None  # <표 N> 형태면 캡션 설명 부분
+    groups: tuple = ()                   # 이미지 (alt, path) / 목차 (제목, 쪽, 들여쓰기) / 캡션 (종류, 설명) / 주석 정의 (번호, 설명)
+
+
+ROMAN_NUMERALS = 'ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩⅪⅫⅩⅢⅩⅣⅩⅤⅩⅥⅩⅦⅩⅧⅩⅨⅩⅩ'
+CIRCLED_NUMBERS = '①②③④⑤⑥⑦⑧⑨⑩'
+BULLET_LEVELS = {'□': 1, '○': 2, '-': 3, '•': 4}
+
+# 헤딩/목차/이미지/표를 제외한 라인 분류용 결합 패턴 (앞선 대안이 우선)
+BLOCK_PATTERN = re.compile(rf'''
+      (?P<numbered3>\d+\.\d+\.\d+\s)
+    | (?P<numbered2>\d+\.\d+\s)
+    | (?P<numbered1>\d+\.\s)
+    | (?P<caption>[<\[]*\s*(?:그림|표|(?i:figure|table))\s*[>\]]*\s*\d)
+    | (?P<roman>[{ROMAN_NUMERALS}]+\s)
+    | (?P<subheading>\d+\)\s)
+    | (?P<bullet>[□○\-•])
+    | (?P<circled>[{CIRCLED_NUMBERS}])
+''', re.VERBOSE)
+
+HIERARCHICAL_PATTERN = re.compile(
+    r'\d+\.\d+\.\d+\s|\d+\.\d+\s|\d+\.\s|[<\[]*\s*(?:그림|표|(?i:figure|table))\s*[>\]]*\s*\d'
+)
+NUMBERED_LEVEL_PATTERN = re.compile(r'(?P<l3>\d+\.\d+\.\d+\s)|(?P<l2>\d+\.\d+\s)|(?P<l1>\d+\.\s)')
+TOC_SEARCH_PATTERN = re.compile(r'[…\.]{3,}.*?\d+\s*$')
+TOC_ENTRY_PATTERN = re.compile(r'^(.+?)\s+[…\.]{3,}.*?(\d+)\s*$')
+IMAGE_PATTERN = re.compile(r'!\[(.*?)\]\((.*?)\)')
+CAPTION_PATTERN = re.compile(r'^<(그림|표|figure|table)\s*\d+>\s*(.*)', re.IGNORECASE)
+TABLE_CAPTION_PATTERN = re.compile(r'^<표\s*\d+>\s*(.*)', re.IGNORECASE)
+FOOTNOTE_MARK_PATTERN = re.compile(r'\^\d+\^')
+FOOTNOTE_PATTERN = re.compile(r'\^(\d+)\^(?:\[([^\]]*)\])?')  # ^번호^ 또는 ^번호^[설명]
+FOOTNOTE_DEFINITION_PATTERN = re.compile(r'\^(\d+)\^\[([^\]]*)\]$')
+FOOTNOTE_BLOCK_PATTERN = re.compile(r'【\s*(?:중요\s*)?주석\s*】$')
+PAGE_MARKER_PREFIX = '### Page '
+SECTION_HEADING_PREFIXES = ('# ', '## ')
+
+
+def is_toc_line(line: str) -> bool:
+    """점선과 마지막 숫자가 있는 목차 라인인지 확인"""
+    # 점 3개 연속이 없으면 정규식까지 갈 필요 없음
+    if '...' not in line and '…' not in line:
+        return False
+    return TOC_SEARCH_PATTERN.search(line) is not None
+
+
+def has_footnote(line: str) -> bool:
+    """^숫자^ 주석 표시가 있는지 확인"""
+    return '^' in line and FOOTNOTE_MARK_PATTERN.search(line) is not None
+
+
+def numbered_level(line: str) -> int:
+    """1. / 1.1 / 1.1.1 계층 번호의 레벨 (번호가 아니면 1)"""
+    match = NUMBERED_LEVEL_PATTERN.match(line)
+    if not match:
+        return 1
+    return 3 if match.group('l3') else 2 if match.group('l2') else 1
+
+
+def classify_line(raw: str) -> Token:
+    """라인 1개를 분류해서 토큰 생성"""
+    line = raw.strip()
+    if not line:
+        return Token(TokenKind.BLANK, line, raw)
+
+    first = line[0]
+    table_caption = None
+    if first == '<':
+        caption_match = TABLE_CAPTION_PATTERN.match(line)
+        if caption_match:
+            table_caption = caption_match.group(1).strip()
+
+    if line.startswith(PAGE_MARKER_PREFIX):
+        return Token(TokenKind.PAGE_MARKER, line, raw)
+    if line.startswith('**※') or line.startswith('(※'):
+        return Token(TokenKind.EDIT_NOTE, line, raw)
+    if line == '---':
+        return Token(TokenKind.RULE, line, raw)
+
+    if first == '!':
+        image_match = IMAGE_PATTERN.match(line)
+        if image_match:
+            return Token(TokenKind.IMAGE, line, raw, groups=image_match.groups())
+
+    if first == '^':
+        definition_match = FOOTNOTE_DEFINITION_PATTERN.match(line)
+        if definition_match:
+            return Token(TokenKind.FOOTNOTE_DEF, line, raw, has_footnote=True, groups=definition_match.groups())
+    elif first == '【' and FOOTNOTE_BLOCK_PATTERN.match(line):
+        return Token(TokenKind.FOOTNOTE_BLOCK, line, raw)
+
+    footnote = has_footnote(line)
+
+    if '|' in line:
+        return Token(TokenKind.TABLE_ROW, line, raw, has_footnote=footnote, table_caption=table_caption)
+
+    if first == '#':
+        level = 3 if line.startswith('###') else 2 if line.startswith('##') else 1
+        return Token(TokenKind.HEADING, line[level:].strip(), raw, level=level)
+
+    if is_toc_line(raw):
+        toc_match = TOC_ENTRY_PATTERN.match(raw)
+        groups = ()
+        if toc_match:
+            indented = raw.startswith((' ', '\u2003', '\t'))
+            groups = (toc_match.group(1).strip(), toc_match.group(2).strip(), indented)
+        return Token(TokenKind.TOC_ENTRY, line, raw, table_caption=table_caption, groups=groups)
+
+    match = BLOCK_PATTERN.match(line)
+    if match is None:
+        return Token(TokenKind.TEXT, line, raw, has_footnote=footnote, table_caption=table_caption)
+
+    group = match.lastgroup
+    if group.startswith('numbered'):
+        return Token(TokenKind.NUMBERED, line, raw, level=int(group[-1]), has_footnote=footnote)
+    if group == 'caption':
+        caption_match = CAPTION_PATTERN.match(line)
+        groups = caption_match.groups() if caption_match else ()
+        return Token(TokenKind.CAPTION, line, raw, level=1, has_footnote=footnote,
+                     table_caption=table_caption, groups=groups)
+    if group == 'roman':
+        return Token(TokenKind.ROMAN_HEADING, line, raw, has_footnote=footnote)
+    if group == 'subheading':
+        return Token(TokenKind.SUBHEADING, line, raw, has_footnote=footnote)
+    if group == 'bullet':
+        return Token(TokenKind.BULLET, line, raw, level=BULLET_LEVELS[first], has_footnote=footnote)
+    return Token(TokenKind.CIRCLED, line, raw, has_footnote=footnote)
+
+
+def tokenize(lines: Iterable[str]) -> Iterator[Token]:
+    """라인 이터러블을 토큰 스트림으로 변환"""
+    for raw in lines:
+        yield classify_line(raw)
+
+
+def tokenize_text(md_content: str) -> Iterator[Token]:
+    """마크다운 전체 문자열을 토큰 스트림으로 변환"""
+    return tokenize(md_content.split('\n'))
+
+
+def split_sections(lines: Iterable[str]) -> List[List[str]]:
+    """라인을 페이지 구분자(### Page)와 #/## 제목 앞에서 나눈 섹션 목록 (증분 빌드 단위)"""
+    sections = [[]]
+    for raw in lines:
+        line = raw.strip()
+        if sections[-1] and (line.startswith(PAGE_MARKER_PREFIX) or line.startswith(SECTION_HEADING_PREFIXES)):
+            sections.append([])
+        sections[-1].append(raw)
+    return [section for section in sections if section]
+
+
+def iter_image_refs(lines: Iterable[str]) -> Iterator[tuple]:
+    """라인 스트림에서 ![alt](path) 이미지 참조를 (alt, path)로 생성 (이미지 미리 읽기용)"""
+    for raw in lines:
+        line = raw.strip()
+        if line.startswith('!'):
+            match = IMAGE_PATTERN.match(line)
+            if match:
+                yield match.groups()
+
+
+def iter_lines(f: IO[str]) -> Iterator[str]:
+    """파일 객체에서 줄바꿈을 뗀 라인을 하나씩 생성 (read().split('\\n')과 같은 결과)"""
+    ends_with_newline = True  # 빈 파일도 split처럼 빈 라인 1개
+    for line in f:
+        ends_with_newline = line.endswith('\n')
+        yield line[:-1] if ends_with_newline else line
+    if ends_with_newline:
+        yield ''
+
+
+class Lookahead:
+    """이터레이터를 감싸 앞쪽 몇 개 항목만 버퍼에 두고 미리 볼 수 있게 하는 스트림"""
+
+    def __init__(self, iterable: Iterable):
+        self._source = iter(iterable)
+        self._buffer = deque()
+        self.consumed = 0  # 지금까지 꺼낸 항목 수
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._buffer:
+            item = self._buffer.popleft()
+        else:
+            item = next(self._source)
+        self.consumed += 1
+        return item
+
+    def peek(self, offset: int = 1):
+        """offset번째 다음 항목 (꺼내지 않음, 끝을 넘으면 None)"""
+        while len(self._buffer) < offset:
+            try:
+                self._buffer.append(next(self._source))
+            except StopIteration:
+                return None
+        return self._buffer[offset - 1]
+
+    def skip(self, count: int):
+        """다음 count개 항목을 건너뛰고 마지막으로 건너뛴 항목 반환"""
+        item = None
+        for _ in range(count):
+            item = next(self, None)
+        return item
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+차트 PNG 렌더링 캐시
+HTML 내용 + 창 크기 + 배율 + Chrome 버전의 해시를 키로 PNG를 디스크에 보관
+변경되지 않은 차트는 해시 계산과 파일 복사만으로 처리 (LRU/용량 기반 정리)
+"""
+
+import hashlib
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+from capture_engine import DEFAULT_WINDOW_SIZE, capture_html_to_png, find_chrome, parse_window_size
+from conversion_log import get_logger
+from disk_cache import atomic_write, atomic_path, default_cache_dir, entry_path, evict_lru
+
+
+logger = get_logger("render_cache")
+
+CACHE_NAME = "render"  # 기본 위치: 공용 캐시 디렉토리/render (RENDER_CACHE_DIR로 지정 가능)
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024  # 500MB
+
+_version_lock = threading.Lock()
+_version_memo = {}
+
+
+def detect_chrome_version(chrome_path, cache_dir=None):
+    """Chrome 버전 문자열 (실행 파일이 바뀌지 않았으면 저장된 값 재사용)"""
+    if not chrome_path or not os.path.exists(chrome_path):
+        return "no-chrome"
+
+    stat = os.stat(chrome_path)
+    stamp = f"{chrome_path}|{stat.st_mtime_ns}|{stat.st_size}"
+
+    with _version_lock:
+        if stamp in _version_memo:
+            return _version_memo[stamp]
+
+        versions_file = Path(cache_dir or default_cache_dir(CACHE_NAME, "RENDER_CACHE_DIR")) / "chrome_versions.json"
+        known = {}
+        if versions_file.exists():
+            try:
+                with open(versions_file, 'r', encoding='utf-8') as f:
+                    known = json.load(f)
+            except (OSError, ValueError):
+                known = {}
+
+        version = known.get(stamp)
+        if version is None:
+            version = _query_chrome_version(chrome_path) or stamp
+            known[stamp] = version
+            atomic_write(versions_file, json.dumps(known, indent=2, ensure_ascii=False))
+
+        _version_memo[stamp] = version
+        return version
+
+
+def _query_chrome_version(chrome_path):
+    """Chrome에 직접 버전 문의 (Windows는 설치 폴더의 버전 디렉토리 이름 사용)"""
+    if platform.system() == "Windows":
+        app_dir = os.path.dirname(chrome_path)
+        versions = [d for d in os.listdir(app_dir) if re.match(r'^\d+\.\d+\.\d+\.\d+$', d)]
+        if versions:
+            return max(versions, key=lambda v: tuple(int(p) for p in v.split('.')))
+        return None
+
+    try:
+        result = subprocess.run([chrome_path, "--version"], capture_output=True, text=True, timeout=10)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+
+class RenderCache:
+    """해시 키 기반 PNG 캐시 (파일 수정 시각으로 LRU 관리)"""
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir(CACHE_NAME, "RENDER_CACHE_DIR")
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._chrome_version = None
+
+    @property
+    def chrome_version(self) -> str:
+        if self._chrome_version is None:
+            self._chrome_version = detect_chrome_version(find_chrome(), self.cache_dir)
+        return self._chrome_version
+
+    def key_for(self, html_file, window_size=DEFAULT_WINDOW_SIZE, scale=1, virtual_time_budget=None,
+                fit_selector=None, margin=0) -> str:
+        """현재 설치된 Chrome 기준 캡처 작업의 캐시 키"""
+        return self.make_key(html_file, window_size, scale, self.chrome_version,
+                             virtual_time_budget=virtual_time_budget, fit_selector=fit_selector, margin=margin)
+
+    def make_key(self, html_file, window_size, scale=1, chrome_version="", **options) -> str:
+        """HTML 내용과 캡처 조건으로 캐시 키 생성"""
+        width, height = parse_window_size(window_size)
+        digest = hashlib.sha256()
+        with open(html_file, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        digest.update(f"|{width}x{height}|{scale}|{chrome_version}".encode('utf-8'))
+        for name in sorted(options):
+            digest.update(f"|{name}={options[name]}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return entry_path(self.cache_dir, key, ".png")
+
+    def get(self, key: str, png_file) -> bool:
+        """캐시에 있으면 png_file로 복사하고 True 반환"""
+        entry = self._entry_path(key)
+        if not entry.exists():
+            with self._lock:
+                self.misses += 1
+            return False
+
+        Path(png_file).parent.mkdir(parents=True, exist_ok=True)
+        try:
+            shutil.copyfile(entry, png_file)
+            os.utime(entry)  # 최근 사용 시각 갱신 (LRU)
+        except OSError:  # 다른 작업자의 evict가 그 사이에 지운 경우 - 미스로 처리
+            with self._lock:
+                self.misses += 1
+            return False
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def put(self, key: str, png_file):
+        """렌더링된 PNG를 캐시에 저장한 뒤 용량 초과분 정리"""
+        if not os.path.exists(png_file):
+            return
+        with atomic_path(self._entry_path(key)) as temp_entry:
+            shutil.copyfile(png_file, temp_entry)
+        self.evict()
+
+    def evict(self):
+        """용량 한도를 넘으면 가장 오래 사용하지 않은 항목부터 삭제"""
+        with self._lock:
+            evict_lru(self.cache_dir, self.max_bytes, (".png",))
+
+    def clear(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def log_stats(self):
+        total = self.hits + self.misses
+        if total:
+            logger.info("💾 렌더 캐시: 적중 %d/%d개 (재렌더링 %d개)", self.hits, total, self.misses)
+
+
+def cached_capture(html_file, png_file, window_size=DEFAULT_WINDOW_SIZE, scale=1,
+                   virtual_time_budget=None, timeout=30, cache: RenderCache = None,
+                   fit_selector=None, margin=0) -> dict:
+    """캐시에 있으면 복사만 하고, 없으면 캡처 후 캐시에 저장"""
+    if cache is None:
+        return capture_html_to_png(html_file, png_file, window_size, scale, virtual_time_budget, timeout,
+                                   fit_selector, margin)
+
+    started = time.perf_counter()
+    key = cache.key_for(html_file, window_size, scale, virtual_time_budget, fit_selector, margin)
+    if cache.get(key, png_file):
+        return {
+            "html": str(html_file),
+            "png": str(png_file),
+            "success": True,
+            "elapsed": time.perf_counter() - started,
+            "error": None,
+            "size": None,
+            "cached": True,
+        }
+
+    result = capture_html_to_png(html_file, png_file, window_size, scale, virtual_time_budget, timeout,
+                                 fit_selector, margin)
+    if result["success"]:
+        cache.put(key, png_file)
+    result["cached"] = False
+    return result
+
+
+def get_default_cache():
+    """기본 렌더 캐시 (환경변수 RENDER_CACHE=0이면 사용 안 함)"""
+    if os.environ.get("RENDER_CACHE", "1") == "0":
+        return None
+    return RenderCache()
+
+
+if __name__ == "__main__":
+    import sys
+
+    cache = RenderCache()
+    if len(sys.argv) > 1 and sys.argv[1] == "clear":
+        cache.clear()
+        print(f"🧹 렌더 캐시 삭제: {cache.cache_dir}")
+    else:
+        files = list(cache.cache_dir.glob("*/*.png"))
+        size = sum(f.stat().st_size for f in files)
+        print(f"💾 렌더 캐시: {cache.cache_dir} ({len(files)}개, {size / 1024 / 1024:.1f}MB)")
+        print("사용법: python render_cache.py [clear]")
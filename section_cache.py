@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+DOCX 섹션 조각 캐시 (증분 빌드)
+마크다운을 페이지 구분자(### Page)와 #/## 제목 단위 섹션으로 나눠 변환할 때,
+섹션 내용 + 섹션에 들어갈 때의 변환 상태 + 참조하는 이미지/각주 + 변환기 버전의 해시를 키로
+만들어진 본문 OOXML 조각과 섹션을 나갈 때의 상태를 디스크에 보관
+바뀌지 않은 섹션은 다시 변환하지 않고 조각만 붙인다 (LRU/용량 기반 정리)
+이미지 전처리 결과도 같은 디렉토리에 보관해서 다음 실행에서 다시 줄이지 않음
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+
+from conversion_log import get_logger
+from disk_cache import atomic_write, default_cache_dir, entry_path, evict_lru
+
+
+logger = get_logger("section_cache")
+
+CACHE_NAME = "sections"  # 기본 위치: 공용 캐시 디렉토리/sections (SECTION_CACHE_DIR로 지정 가능)
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024  # 200MB
+
+
+def incremental_enabled() -> bool:
+    """환경변수 DOCX_INCREMENTAL=1이면 증분 빌드 사용"""
+    return os.environ.get("DOCX_INCREMENTAL", "0") == "1"
+
+
+@lru_cache(maxsize=None)
+def source_signature(module_names: tuple) -> str:
+    """변환 결과에 영향을 주는 모듈 소스의 해시 (코드가 바뀌면 예전 조각은 모두 무효)"""
+    digest = hashlib.sha256()
+    for name in module_names:
+        module_file = getattr(sys.modules.get(name), "__file__", None)
+        if not module_file:
+            continue
+        try:
+            with open(module_file, 'rb') as f:
+                digest.update(f.read())
+        except OSError:  # 소스 파일 없이 패키징된 경우
+            digest.update(name.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def file_stamp(path: str) -> list:
+    """파일 변경 확인용 [경로, 수정 시각, 크기] (없으면 [경로, None, None])"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return [path, None, None]
+    return [path, stat.st_mtime_ns, stat.st_size]
+
+
+class SectionCache:
+    """해시 키 기반 섹션 조각 캐시 (파일 수정 시각으로 LRU 관리)"""
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir(CACHE_NAME, "SECTION_CACHE_DIR")
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def make_key(self, signature: str, lines: Iterable[str], state: dict, dependencies: dict) -> str:
+        """섹션 원문 + 들어갈 때 상태 + 의존 파일/각주 + 변환기 서명으로 캐시 키 생성"""
+        digest = hashlib.sha256(signature.encode('utf-8'))
+        digest.update(json.dumps(state, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        digest.update(json.dumps(dependencies, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        for line in lines:
+            digest.update(line.encode('utf-8'))
+            digest.update(b'\n')
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return entry_path(self.cache_dir, key, ".json")
+
+    def get(self, key: str) -> Optional[dict]:
+        """캐시된 조각 항목 (없거나 읽을 수 없으면 None)"""
+        entry = self._entry_path(key)
+        try:
+            with open(entry, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            os.utime(entry)  # 최근 사용 시각 갱신 (LRU)
+        except (OSError, ValueError):  # 없거나 다른 작업자의 evict가 그 사이에 지운 경우
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: dict):
+        """조각 항목 저장 (용량 정리는 문서 1개를 다 만든 뒤 evict()로 한 번에)"""
+        atomic_write(self._entry_path(key), json.dumps(data, ensure_ascii=False))
+
+    def get_blob(self, key: str) -> Optional[bytes]:
+        """바이트 항목 (이미지 처리 결과 등, 없으면 None)"""
+        entry = entry_path(self.cache_dir, key, ".bin")
+        try:
+            with open(entry, 'rb') as f:
+                data = f.read()
+            os.utime(entry)
+        except OSError:
+            return None
+        return data
+
+    def put_blob(self, key: str, data: bytes):
+        atomic_write(entry_path(self.cache_dir, key, ".bin"), data)
+
+    def evict(self):
+        """용량 한도를 넘으면 가장 오래 사용하지 않은 항목부터 삭제"""
+        with self._lock:
+            evict_lru(self.cache_dir, self.max_bytes, (".json", ".bin"))
+
+    def log_stats(self):
+        total = self.hits + self.misses
+        if total:
+            logger.info("💾 섹션 캐시: 재사용 %d/%d개 (다시 변환 %d개)", self.hits, total, self.misses)
@@ -6,7 +6,7 @@
 import re
 import os
 import sys
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 from pathlib import Path
 
 from docx import Document
@@ -14,17 +14,51 @@ from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_BREAK, WD_TAB_ALIGNMENT, WD_TAB_LEADER
 from docx.enum.style import WD_STYLE_TYPE
 from docx.oxml.shared import OxmlElement, qn
+from image_pipeline import ImagePreprocessor, report_missing_images
+from md_engine import ConversionProfile, MarkdownEngine, add_picture_paragraph, table_cells
+from md_tokenizer import (BULLET_LEVELS, IMAGE_PATTERN, ROMAN_NUMERALS, CIRCLED_NUMBERS, TABLE_CAPTION_PATTERN, Token,
+                          TokenKind, has_footnote, iter_image_refs, iter_lines)
+from table_builder import TableBuilder, add_text_run, run_properties
+from tracing import span
 
 
-class SimpleDocxConverter:
-    """간단한 DOCX 변환기"""
+# 라인 분류 패턴 (이 변환기의 원래 규칙)
+TOC_PATTERN = re.compile(r'^(　*)([\d\.]+\s+.*?)\s*[…\.]*\s*(\d*)\s*$')
+TOC_ADVANCED_PATTERN = re.compile(r'^(　*\d+[\.\d]*\s+.*?)\s*[…\.]{2,}\s*\d+\s*$')
+HIERARCHICAL_LEVEL_PATTERNS = (
+    (1, re.compile(r'^\d+\.\s+')),         # 1. 형태의 번호 (1단계)
+    (2, re.compile(r'^\d+\.\d+\s+')),      # 1.1 형태의 번호 (2단계)
+    (3, re.compile(r'^\d+\.\d+\.\d+\s+')),  # 1.1.1 형태의 번호 (3단계)
+)
+ROMAN_HEADING_PATTERN = re.compile(rf'^[{ROMAN_NUMERALS}]+\s+')
+SUBHEADING_PATTERN = re.compile(r'^\d+\)\s+')
+CIRCLED_PATTERN = re.compile(rf'^[{CIRCLED_NUMBERS}]')
+CAPTION_LINE_PATTERN = re.compile(r'^<(표|그림)\s*\d+>\s*(.*)')
+
+
+class SimpleDocxConverter(ConversionProfile):
+    """간단한 DOCX 변환기 - 공용 변환 코어(md_engine)에 이 변환기의 라인 분류 규칙과 스타일을 적용"""
+    
+    # 빈 줄, 구분선, 이미지는 표를 끝내지 않고, 표를 끝낸 라인은 출력하지 않음 (원래 동작)
+    passthrough_kinds = frozenset({TokenKind.BLANK, TokenKind.RULE, TokenKind.IMAGE})
+    reprocess_table_end = False
+    
+    HEADING_STYLES = {1: 'CustomTitle', 2: 'CustomHeading2', 3: 'CustomHeading3'}
+    # 표 셀 런 서식 (모든 셀이 같은 rPr을 복사해서 사용)
+    HEADER_RPR = run_properties(bold=True, name='Malgun Gothic', size=Pt(10))
+    CELL_RPR = run_properties(name='Malgun Gothic', size=Pt(10))
     
     def __init__(self):
         self.document = Document()
+        self.image_preprocessor = ImagePreprocessor()
+        self.table_builder = TableBuilder(self.document)
+        self.engine = MarkdownEngine(self)
+        self._style_ids = {}  # 스타일 이름 → 스타일 ID 캐시
         self.setup_styles()
         self.figure_counter = 0
         self.table_counter = 0
         self.processed_captions = set()
+        self._table_caption = None  # 표 위에서 찾은 캡션 (표 아래 캡션이 없을 때 사용)
     
     def setup_styles(self):
         """문서 스타일 설정 - 전문적인 한국 정부 문서 양식"""
@@ -223,18 +257,18 @@ class SimpleDocxConverter:
     def add_title(self, title: str):
         """제목 추가"""
         para = self.document.add_paragraph()
-        para.style = 'CustomTitle'
+        self._apply_style(para, 'CustomTitle')
         para.add_run(title)
     
     def add_heading(self, text: str, level: int):
         """헤딩 추가"""
         para = self.document.add_paragraph()
         if level == 1:
-            para.style = 'CustomHeading1'
+            self._apply_style(para, 'CustomHeading1')
         elif level == 2:
-            para.style = 'CustomHeading2'
+            self._apply_style(para, 'CustomHeading2')
         else:
-            para.style = 'CustomHeading3'
+            self._apply_style(para, 'CustomHeading3')
         para.add_run(text)
     
     def add_paragraph(self, text: str):
@@ -262,7 +296,7 @@ class SimpleDocxConverter:
         # 일반 텍스트 처리
         if text.strip():
             para = self.document.add_paragraph()
-            para.style = 'CustomBody'
+            self._apply_style(para, 'CustomBody')
             
             # 볼드/이탤릭 처리
             self.process_inline_formatting(text, para)
@@ -274,7 +308,7 @@ class SimpleDocxConverter:
     def _add_paragraph_with_footnotes(self, text: str, style: str = 'CustomBody'):
         """주석이 포함된 단락 추가"""
         para = self.document.add_paragraph()
-        para.style = style
+        self._apply_style(para, style)
         
         # 주석 패턴 분할: ^숫자^[내용] 또는 ^숫자^ 형태
         footnote_pattern = r'\^(\d+)\^(\[([^\]]*)\])?'
@@ -338,7 +372,7 @@ class SimpleDocxConverter:
             label = "표"
         
         caption_para = self.document.add_paragraph()
-        caption_para.style = 'CustomCaption'
+        self._apply_style(caption_para, 'CustomCaption')
         full_caption = f"<{label} {caption_num}> {caption_text}"
         caption_para.add_run(full_caption)
     
@@ -346,51 +380,29 @@ class SimpleDocxConverter:
         """이미지 추가"""
         if os.path.exists(image_path):
             try:
-                para = self.document.add_paragraph()
-                para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                run = para.runs[0] if para.runs else para.add_run()
-                run.add_picture(image_path, width=Inches(5))
+                add_picture_paragraph(self.document, self.image_preprocessor, image_path, 5)
             except Exception as e:
                 # 이미지 추가 실패시 텍스트로 대체
                 para = self.document.add_paragraph()
-                para.style = 'CustomBody'
+                self._apply_style(para, 'CustomBody')
                 para.add_run(f"[이미지: {alt_text}]")
     
     def add_table(self, headers: List[str], rows: List[List[str]], caption_text: str = None):
-        """테이블 추가 - 캡션 통합 지원"""
+        """테이블 추가 - 캡션 통합 지원 (w:tbl을 한 번에 만들고 셀을 순서대로 채움)"""
         if not headers or not rows:
             return
         
-        table = self.document.add_table(rows=1 + len(rows), cols=len(headers))
-        table.style = 'Table Grid'
-        
-        # 헤더 설정
-        for i, header in enumerate(headers):
-            cell = table.cell(0, i)
-            cell.text = header
-            # 헤더 스타일
-            for paragraph in cell.paragraphs:
-                for run in paragraph.runs:
-                    run.font.bold = True
-                    run.font.name = 'Malgun Gothic'
-                    run.font.size = Pt(10)
-        
-        # 데이터 행 설정
-        for row_idx, row_data in enumerate(rows):
-            for col_idx, cell_data in enumerate(row_data):
-                if col_idx < len(headers):
-                    cell = table.cell(row_idx + 1, col_idx)
-                    cell.text = str(cell_data)
-                    # 셀 스타일
-                    for paragraph in cell.paragraphs:
-                        for run in paragraph.runs:
-                            run.font.name = 'Malgun Gothic'
-                            run.font.size = Pt(10)
+        with span("table", rows=1 + len(rows), cols=len(headers)):
+            self.table_builder.add_table([headers] + rows, len(headers), self._fill_table_cell)
         
         # 테이블 생성 후 캡션 추가 (아래쪽에)
         if caption_text:
             self.add_caption(caption_text, "표")
     
+    def _fill_table_cell(self, paragraph, cell_text: str, row_index: int):
+        """표 셀 채우기 - 헤더는 볼드, 모두 맑은 고딕 10pt"""
+        add_text_run(paragraph, str(cell_text), self.HEADER_RPR if row_index == 0 else self.CELL_RPR)
+    
     def parse_table_from_lines(self, table_lines):
         """마크다운 테이블 라인들을 파싱하여 테이블 추가"""
         if len(table_lines) < 2:
@@ -398,13 +410,13 @@ class SimpleDocxConverter:
         
         # 헤더 파싱
         header_line = table_lines[0].strip()
-        headers = [cell.strip() for cell in header_line.split('|')[1:-1]]
+        headers = table_cells(header_line)
         
         # 데이터 행 파싱
         rows = []
         for line in table_lines[2:]:  # 헤더와 구분선 다음부터
             if line.strip():
-                cells = [cell.strip() for cell in line.strip().split('|')[1:-1]]
+                cells = table_cells(line.strip())
                 rows.append(cells)
         
         if rows:
@@ -414,7 +426,7 @@ class SimpleDocxConverter:
         """리스트 추가"""
         for item in items:
             para = self.document.add_paragraph()
-            para.style = 'CustomList'
+            self._apply_style(para, 'CustomList')
             
             if ordered:
                 # 번호가 있는 리스트는 그대로
@@ -451,11 +463,11 @@ class SimpleDocxConverter:
             
             # 레벨별 스타일 적용
             if level == 1:
-                para.style = 'TOCEntry1'
+                self._apply_style(para, 'TOCEntry1')
             elif level == 2:
-                para.style = 'TOCEntry2'
+                self._apply_style(para, 'TOCEntry2')
             else:
-                para.style = 'TOCEntry3'
+                self._apply_style(para, 'TOCEntry3')
             
             # 콘텐츠 추가 (제목 부분)
             title_text = content.strip()
@@ -474,184 +486,141 @@ class SimpleDocxConverter:
         return False
     
     def convert_markdown(self, md_content: str):
-        """원본 마크다운을 직접 라인별로 처리 - 원래 로직 기반"""
+        """원본 마크다운 문자열 처리 (라인 스트림 처리로 위임)"""
         lines = md_content.split('\n')
-        i = 0
-        current_table = []
-        in_table = False
-        current_table_caption = None
-        
-        while i < len(lines):
-            original_line = lines[i] 
-            line = lines[i].strip()
-            
-            # 빈 줄 건너뛰기
-            if not line:
-                i += 1
-                continue
-            
-            # 구분선 건너뛰기
-            if line == '---':
-                i += 1
-                continue
-            
-            # 이미지 처리
-            if self._is_image_line(line):
-                self._add_image(line)
-                i += 1
+        self.prefetch_images(lines)
+        self.convert_lines(lines)
+    
+    def convert_file(self, md_file: str):
+        """마크다운 파일을 전체를 읽지 않고 라인 단위로 처리"""
+        with open(md_file, 'r', encoding='utf-8') as f:
+            self.prefetch_images(iter_lines(f))
+        with open(md_file, 'r', encoding='utf-8') as f:
+            self.convert_lines(iter_lines(f))
+    
+    def prefetch_images(self, lines: Iterable[str]):
+        """이미지 참조를 모아 본문 처리 전에 백그라운드에서 미리 읽기 (없는 파일은 한 번에 보고)"""
+        images = ((image_path, 5) for _, image_path in iter_image_refs(lines))
+        report_missing_images(self.image_preprocessor.prefetch(images))
+    
+    def convert_lines(self, lines: Iterable[str]):
+        """원본 마크다운을 직접 라인별로 처리 - 공용 변환 코어 사용 (직전 라인과 앞쪽 3줄만 참조)"""
+        self.engine.run_lines(lines)
+    
+    def tokenize(self, lines: Iterable[str]) -> Iterator[Token]:
+        """이 변환기의 라인 분류 규칙 (원래 조건 순서 그대로, 목차 항목이 계층 번호보다 우선)"""
+        for raw in lines:
+            line = raw.strip()
+            if not line:  # 빈 줄
+                yield Token(TokenKind.BLANK, line, raw)
                 continue
             
-            # 테이블 처리
-            if '|' in line and not in_table:
-                # 테이블 시작 전에 이전 라인이 표 캡션인지 확인
-                table_caption_before = None
-                table_caption_before_text = None
-                if i > 0:
-                    prev_line = lines[i - 1].strip()
-                    if re.match(r'^<표\s*\d+>\s*.*', prev_line, re.IGNORECASE):
-                        table_caption_before = prev_line
-                        
-                        # 캡션이 아직 처리되지 않았으면 텍스트 추출
-                        if table_caption_before not in self.processed_captions:
-                            match = re.match(r'^<표\s*\d+>\s*(.*)', table_caption_before, re.IGNORECASE)
-                            if match:
-                                table_caption_before_text = match.group(1).strip()
-                                self.processed_captions.add(table_caption_before)
-                
-                # 테이블 시작
-                in_table = True
-                current_table = [line]
-                current_table_caption = table_caption_before_text  # 이전에 발견된 캡션 저장
-                i += 1
-                continue
-            elif in_table:
-                if '|' in line:
-                    current_table.append(line)
-                    i += 1
-                    continue
-                else:
-                    # 테이블 끝 - 다음 최대 3줄에서 표 캡션 찾기
-                    table_caption = None
-                    caption_line_index = None
-                    
-                    for j in range(1, 4):  # 최대 3줄까지 확인
-                        if i + j < len(lines):
-                            check_line = lines[i + j].strip()
-                            if not check_line:  # 빈 라인은 건너뛰기
-                                continue
-                            if re.match(r'^<표\s*\d+>\s*.*', check_line, re.IGNORECASE):
-                                table_caption = check_line
-                                caption_line_index = i + j
-                                break
-                            else:
-                                # 다른 텍스트가 나오면 캡션 찾기 중단
-                                break
-                    
-                    # 테이블 캡션 텍스트 추출
-                    caption_text = None
-                    if table_caption:
-                        match = re.match(r'^<표\s*\d+>\s*(.*)', table_caption, re.IGNORECASE)
-                        if match:
-                            caption_text = match.group(1).strip()
-                            self.processed_captions.add(table_caption)
-                            
-                            # 캡션 라인을 건너뛰도록 인덱스 조정
-                            if caption_line_index:
-                                i = caption_line_index
-                    
-                    # 최종 캡션 결정 - 테이블 후에 찾은 캡션이 우선, 없으면 이전 캡션 사용
-                    final_caption = caption_text if caption_text else current_table_caption
-                    
-                    # 테이블 생성 (캡션과 함께)
-                    self._create_table_from_lines(current_table, final_caption)
-                    current_table = []
-                    current_table_caption = None
-                    in_table = False
-                    
-            # 헤딩 처리 (# ## ###)
-            elif line.startswith('#'):
-                self._process_heading_line(line)
-            # 목차 항목 처리 (점선과 페이지 번호가 있는 경우) - 우선 처리
-            elif self._is_toc_entry(original_line):
-                self._add_toc_entry(original_line)
-            # 계층적 번호 체계 처리
-            elif self._is_hierarchical_content(line):
-                self._add_hierarchical_content(line)
-            # 로마숫자로 시작하는 대제목 (Ⅰ, Ⅱ, Ⅲ...)
-            elif re.match(r'^[ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩⅪⅫⅩⅢⅩⅣⅩⅤⅩⅥⅩⅦⅩⅧⅩⅨⅩⅩ]+\s+', line):
-                para = self.document.add_paragraph(line)
-                para.style = 'CustomHeading1'
-            # 괄호 숫자로 시작하는 소제목 (1) 2) 3))
-            elif re.match(r'^\d+\)\s+', line):
-                para = self.document.add_paragraph(line)
-                para.style = 'CustomHeading3'
-            # 불릿 포인트 처리
-            elif line.startswith('□'):
-                para = self.document.add_paragraph(line)
-                para.style = 'CustomListLevel1'
-            elif line.startswith('○'):
-                para = self.document.add_paragraph(line)
-                para.style = 'CustomListLevel2'  
-            elif line.startswith('-') and not line.startswith('---'):
-                para = self.document.add_paragraph(line)
-                para.style = 'CustomListLevel3'
-            elif line.startswith('•'):
-                para = self.document.add_paragraph(line)
-                para.style = 'CustomListLevel4'
-            # 특수 번호 (①②③)
-            elif re.match(r'^[①②③④⑤⑥⑦⑧⑨⑩]', line):
-                para = self.document.add_paragraph(line)
-                para.style = 'CustomList'
-            # 캡션 처리
-            elif re.match(r'^<(표|그림)\s*\d+>\s*.*', line):
-                caption_match = re.match(r'^<(표|그림)\s*\d+>\s*(.*)', line)
+            # <표 N> 캡션이면 설명 부분 (표 위/아래 캡션 확인용)
+            table_caption = None
+            if line.startswith('<'):
+                caption_match = TABLE_CAPTION_PATTERN.match(line)
                 if caption_match:
-                    caption_type, caption_text = caption_match.groups()
-                    full_caption = f"<{caption_type} {self.figure_counter+1 if caption_type == '그림' else self.table_counter+1}> {caption_text}"
-                    
-                    if full_caption not in self.processed_captions:
-                        self.processed_captions.add(full_caption)
-                        self.add_caption(caption_text, caption_type)
-            # 일반 텍스트
-            else:
-                # 상첨자가 있는 텍스트는 특별 처리
-                if self._has_footnote_pattern(line):
-                    self._add_paragraph_with_footnotes(line, 'CustomBody')
-                else:
-                    para = self.document.add_paragraph(line)
-                    para.style = 'CustomBody'
+                    table_caption = caption_match.group(1).strip()
+            footnote = has_footnote(line)
             
-            i += 1
-        
-        # 마지막에 테이블이 있으면 처리
-        if current_table:
-            self._create_table_from_lines(current_table, current_table_caption)
+            if line == '---':  # 구분선
+                kind, level, groups = TokenKind.RULE, 0, ()
+            elif self._is_image_line(line):  # 이미지
+                kind, level, groups = TokenKind.IMAGE, 0, IMAGE_PATTERN.match(line).groups()
+            elif '|' in line:  # 테이블
+                kind, level, groups = TokenKind.TABLE_ROW, 0, ()
+            elif line.startswith('#'):  # 헤딩 (# ## ###)
+                level = 3 if line.startswith('###') else 2 if line.startswith('##') else 1
+                yield Token(TokenKind.HEADING, line[level:].strip(), raw, level=level)
+                continue
+            elif self._is_toc_entry(raw):  # 목차 항목 (점선과 페이지 번호)
+                kind, level, groups = TokenKind.TOC_ENTRY, 0, ()
+            elif self._is_hierarchical_content(line):  # 계층적 번호 체계
+                kind, level, groups = TokenKind.NUMBERED, self._hierarchical_level(line), ()
+            elif ROMAN_HEADING_PATTERN.match(line):  # 로마숫자로 시작하는 대제목 (Ⅰ, Ⅱ, Ⅲ...)
+                kind, level, groups = TokenKind.ROMAN_HEADING, 0, ()
+            elif SUBHEADING_PATTERN.match(line):  # 괄호 숫자로 시작하는 소제목 (1) 2) 3))
+                kind, level, groups = TokenKind.SUBHEADING, 0, ()
+            elif line[0] in BULLET_LEVELS and not line.startswith('---'):  # 불릿 포인트 (□ ○ - •)
+                kind, level, groups = TokenKind.BULLET, BULLET_LEVELS[line[0]], ()
+            elif CIRCLED_PATTERN.match(line):  # 특수 번호 (①②③)
+                kind, level, groups = TokenKind.CIRCLED, 0, ()
+            elif CAPTION_LINE_PATTERN.match(line):  # 캡션
+                kind, level, groups = TokenKind.CAPTION, 0, CAPTION_LINE_PATTERN.match(line).groups()
+            else:  # 일반 텍스트
+                kind, level, groups = TokenKind.TEXT, 0, ()
+            yield Token(kind, line, raw, level=level, has_footnote=footnote, table_caption=table_caption, groups=groups)
+    
+    def token_handlers(self) -> dict:
+        return {
+            TokenKind.IMAGE: self._add_image,
+            TokenKind.HEADING: self._process_heading_line,
+            TokenKind.TOC_ENTRY: self._add_toc_entry,
+            TokenKind.NUMBERED: self._add_hierarchical_content,
+            TokenKind.ROMAN_HEADING: lambda token: self._add_styled_line(token, 'CustomHeading1'),
+            TokenKind.SUBHEADING: lambda token: self._add_styled_line(token, 'CustomHeading3'),
+            TokenKind.BULLET: lambda token: self._add_styled_line(token, f'CustomListLevel{token.level}'),
+            TokenKind.CIRCLED: lambda token: self._add_styled_line(token, 'CustomList'),
+            TokenKind.CAPTION: self._add_caption_line,
+        }
+    
+    def handle_text(self, token: Token):
+        """일반 텍스트 - 상첨자가 있는 텍스트는 특별 처리"""
+        if token.has_footnote:
+            self._add_paragraph_with_footnotes(token.text, 'CustomBody')
+        else:
+            self._add_styled_line(token, 'CustomBody')
+    
+    def start_table(self, token: Token, engine: MarkdownEngine):
+        """테이블 시작 전에 이전 라인이 표 캡션인지 확인 (아직 처리되지 않은 캡션이면 표 캡션으로 사용)"""
+        self._table_caption = None
+        prev_token = engine.prev_token
+        if prev_token is not None and prev_token.table_caption is not None:
+            if prev_token.text not in self.processed_captions:
+                self._table_caption = prev_token.table_caption
+                self.processed_captions.add(prev_token.text)
+    
+    def end_table(self, rows: List[Token], engine: MarkdownEngine) -> int:
+        """테이블 끝 - 다음 최대 3줄에서 표 캡션 찾기 (테이블 후에 찾은 캡션이 우선, 없으면 이전 캡션 사용)
+        
+        표를 끝낸 라인은 출력하지 않고, 캡션을 찾았으면 캡션 라인까지 건너뛴다
+        """
+        skip, caption = engine.find_table_caption()
+        caption_text = None
+        if caption is not None:
+            caption_text = caption.table_caption
+            self.processed_captions.add(caption.text)
+        
+        # 테이블 생성 (캡션과 함께)
+        self._create_table_from_lines([row.text for row in rows], caption_text or self._table_caption)
+        return skip
+    
+    def _add_styled_line(self, token: Token, style_name: str):
+        para = self.document.add_paragraph(token.text)
+        self._apply_style(para, style_name)
+    
+    def _add_caption_line(self, token: Token):
+        """<그림 N> / <표 N> 캡션 라인 - 번호를 다시 매겨서 같은 캡션은 한 번만 추가"""
+        caption_type, caption_text = token.groups
+        full_caption = f"<{caption_type} {self.figure_counter+1 if caption_type == '그림' else self.table_counter+1}> {caption_text}"
+        
+        if full_caption not in self.processed_captions:
+            self.processed_captions.add(full_caption)
+            self.add_caption(caption_text, caption_type)
     
     def _is_image_line(self, line: str) -> bool:
         """이미지 라인인지 확인"""
-        return re.match(r'!\[.*?\]\(.*?\)', line) is not None
+        return IMAGE_PATTERN.match(line) is not None
     
-    def _add_image(self, line: str):
+    def _add_image(self, token: Token):
         """이미지 추가"""
-        match = re.match(r'!\[(.*?)\]\((.*?)\)', line)
-        if match:
-            alt_text, image_path = match.groups()
-            self.add_image(image_path, alt_text)
+        alt_text, image_path = token.groups
+        self.add_image(image_path, alt_text)
     
-    def _process_heading_line(self, line: str):
-        """헤딩 라인 처리"""
-        if line.startswith('###'):
-            text = line[3:].strip()
-            para = self.document.add_paragraph(text)
-            para.style = 'CustomHeading3'
-        elif line.startswith('##'):
-            text = line[2:].strip()
-            para = self.document.add_paragraph(text)
-            para.style = 'CustomHeading2'
-        elif line.startswith('#'):
-            text = line[1:].strip()
-            para = self.document.add_paragraph(text)
-            para.style = 'CustomTitle'
+    def _process_heading_line(self, token: Token):
+        """헤딩 라인 처리 (### → CustomHeading3, ## → CustomHeading2, # → CustomTitle)"""
+        para = self.document.add_paragraph(token.text)
+        self._apply_style(para, self.HEADING_STYLES[token.level])
     
     def _is_toc_entry(self, line: str) -> bool:
         """목차 항목인지 확인 - 향상된 패턴 매칭"""
@@ -659,55 +628,37 @@ class SimpleDocxConverter:
         # 1. "1. 제목......5" 형태
         # 2. "　1.1 소제목…3" 형태  
         # 3. "1.1.1 세부제목 ... 10" 형태
-        toc_pattern = r'^(　*)([\d\.]+\s+.*?)\s*[…\.]*\s*(\d*)\s*$'
-        
         # 추가 패턴: 번호 + 제목 + 점선/생략표 + 페이지번호
-        advanced_pattern = r'^(　*\d+[\.\d]*\s+.*?)\s*[…\.]{2,}\s*\d+\s*$'
-        
-        return (re.match(toc_pattern, line) is not None or 
-                re.match(advanced_pattern, line) is not None)
+        return TOC_PATTERN.match(line) is not None or TOC_ADVANCED_PATTERN.match(line) is not None
     
-    def _add_toc_entry(self, line: str):
+    def _add_toc_entry(self, token: Token):
         """목차 항목 추가"""
-        self.process_toc_line(line)
+        self.process_toc_line(token.raw)
     
     def _is_hierarchical_content(self, line: str) -> bool:
         """계층적 번호 체계 콘텐츠인지 확인"""
-        # 1. 형태의 번호 (1단계)
-        if re.match(r'^\d+\.\s+', line):
-            return True
-        # 1.1 형태의 번호 (2단계)
-        if re.match(r'^\d+\.\d+\s+', line):
-            return True
-        # 1.1.1 형태의 번호 (3단계)
-        if re.match(r'^\d+\.\d+\.\d+\s+', line):
-            return True
-        return False
+        return self._hierarchical_level(line) > 0
+    
+    def _hierarchical_level(self, line: str) -> int:
+        """1. / 1.1 / 1.1.1 형태 번호의 단계 (번호가 아니면 0)"""
+        for level, pattern in HIERARCHICAL_LEVEL_PATTERNS:
+            if pattern.match(line):
+                return level
+        return 0
     
-    def _add_hierarchical_content(self, line: str):
+    def _add_hierarchical_content(self, token: Token):
         """계층적 번호 체계 콘텐츠 추가 - 상첨자 지원"""
+        style_name = f'CustomHeading{token.level}'
         # 상첨자가 있는 경우 특별 처리
-        if self._has_footnote_pattern(line):
-            if re.match(r'^\d+\.\s+', line):
-                self._add_paragraph_with_footnotes(line, 'CustomHeading1')
-            elif re.match(r'^\d+\.\d+\s+', line):
-                self._add_paragraph_with_footnotes(line, 'CustomHeading2')
-            elif re.match(r'^\d+\.\d+\.\d+\s+', line):
-                self._add_paragraph_with_footnotes(line, 'CustomHeading3')
+        if token.has_footnote:
+            self._add_paragraph_with_footnotes(token.text, style_name)
         else:
-            para = self.document.add_paragraph(line)
-            
-            if re.match(r'^\d+\.\s+', line):
-                para.style = 'CustomHeading1'
-            elif re.match(r'^\d+\.\d+\s+', line):
-                para.style = 'CustomHeading2'
-            elif re.match(r'^\d+\.\d+\.\d+\s+', line):
-                para.style = 'CustomHeading3'
+            self._add_styled_line(token, style_name)
     
     def _add_toc_heading(self, title: str = "목   차"):
         """목차 제목 추가"""
         para = self.document.add_paragraph()
-        para.style = 'TOCHeading'
+        self._apply_style(para, 'TOCHeading')
         para.add_run(title)
         return para
     
@@ -721,7 +672,7 @@ class SimpleDocxConverter:
     def _add_cover_title(self, title: str):
         """표지 제목 추가"""
         para = self.document.add_paragraph()
-        para.style = 'CoverTitle'
+        self._apply_style(para, 'CoverTitle')
         para.add_run(title)
         return para
     
@@ -732,13 +683,13 @@ class SimpleDocxConverter:
         
         # 헤더 파싱
         header_line = table_lines[0].strip()
-        headers = [cell.strip() for cell in header_line.split('|')[1:-1]]
+        headers = table_cells(header_line)
         
         # 데이터 행 파싱 (구분선 건너뛰기)
         rows = []
         for line in table_lines[2:]:  # 헤더와 구분선 다음부터
             if line.strip() and '|' in line:
-                cells = [cell.strip() for cell in line.strip().split('|')[1:-1]]
+                cells = table_cells(line.strip())
                 rows.append(cells)
         
         if rows:
@@ -764,10 +715,7 @@ def main():
     try:
         converter = SimpleDocxConverter()
         
-        with open(input_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        converter.convert_markdown(content)
+        converter.convert_file(input_file)
         converter.save(output_file)
         
         print(f"변환 완료: {output_file}")
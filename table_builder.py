@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+DOCX 표 일괄 생성기
+python-docx의 table.cell(i, j) / table.rows[i].cells는 호출할 때마다 전체 셀 격자를 다시 만들고,
+add_row()는 행마다 표 너비를 다시 계산하므로 큰 표에서는 (행×열)²에 가까운 비용이 든다
+w:tbl 골격을 한 번에 만든 뒤 행/셀 요소를 순서대로 한 번만 돌면서 내용을 채운다
+"""
+
+from copy import deepcopy
+from typing import Callable, List, Optional
+
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml.shared import OxmlElement, qn
+from docx.table import Table, _Cell
+from docx.text.paragraph import Paragraph
+from docx.text.run import Run
+
+
+def run_properties(**font_props):
+    """런 서식 원본(rPr) 생성 - python-docx Font 속성 이름 사용 (name, size, bold ...)"""
+    scratch = Run(OxmlElement('w:r'), None)
+    for name, value in font_props.items():
+        setattr(scratch.font, name, value)
+    return scratch._r.rPr
+
+
+def add_text_run(paragraph: Paragraph, text: str, rPr=None):
+    """단락에 텍스트 런 추가 (rPr 원본이 있으면 복사해서 붙임)"""
+    run = paragraph.add_run(text)
+    if rPr is not None:
+        run._r.insert(0, deepcopy(rPr))
+    return run
+
+
+class TableBuilder:
+    """파싱된 행 목록으로 w:tbl 전체를 한 번에 생성"""
+
+    def __init__(self, document, style_name: str = 'Table Grid'):
+        self.document = document
+        self.style_name = style_name
+        self._style_id = None
+        self._shading = {}  # 배경색 → w:shd 원본 (모든 머리글 셀이 공유)
+
+    @property
+    def style_id(self):
+        if self._style_id is None and self.style_name:
+            self._style_id = self.document.part.get_style_id(self.style_name, WD_STYLE_TYPE.TABLE)
+        return self._style_id
+
+    def add_table(self, rows: List[List[str]], cols: int,
+                  fill_cell: Callable[[Paragraph, str, int], None],
+                  header_fill: Optional[str] = None) -> Table:
+        """행별 셀 텍스트 목록으로 표 생성
+
+        fill_cell(paragraph, text, row_index)가 각 셀의 첫 단락을 채우고,
+        header_fill을 주면 첫 행의 채워진 셀에 배경색 적용 (열 수를 넘는 셀은 무시)
+        """
+        table = self.document.add_table(rows=len(rows), cols=cols)
+        table._tbl.tblStyle_val = self.style_id
+        shading = self._shading_for(header_fill) if header_fill else None
+
+        for row_index, (tr, cells) in enumerate(zip(table._tbl.tr_lst, rows)):
+            for tc, text in zip(tr.tc_lst, cells[:cols]):
+                paragraph = Paragraph(tc.p_lst[0], _Cell(tc, table))
+                fill_cell(paragraph, text, row_index)
+                if row_index == 0 and shading is not None:
+                    tc.get_or_add_tcPr().append(deepcopy(shading))
+        return table
+
+    def _shading_for(self, fill: str):
+        shading = self._shading.get(fill)
+        if shading is None:
+            shading = OxmlElement('w:shd')
+            shading.set(qn('w:fill'), fill)
+            self._shading[fill] = shading
+        return shading
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+변환 서비스 요청 처리 테스트
+너무 긴 요청 줄/헤더, 너무 많은 헤더는 연결을 끊지 않고 400/431로 응답하는지,
+업로드 디렉토리 밖을 가리키는 이미지 참조는 거절하고 함께 올린 이미지는 문서에 들어가는지 확인
+"""
+
+import asyncio
+import io
+import os
+import tempfile
+import zipfile
+
+# 스타일 템플릿 등 캐시는 임시 디렉토리에 (사용자 캐시 폴더를 건드리지 않도록)
+os.environ.setdefault("DOCX_CACHE_DIR", tempfile.mkdtemp(prefix="md_to_docx_test_"))
+
+from conversion_service import ConversionServer, ConversionService, MAX_HEADER_LINES
+
+STREAM_LIMIT = 2 ** 16  # asyncio.start_server 기본 StreamReader 한도
+TEST_IMAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "budget_pie.png")
+
+
+class FakeWriter:
+    """응답 바이트를 모아 두는 StreamWriter 대역"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.closed = False
+
+    def write(self, data: bytes):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+async def send(raw: bytes, service: ConversionService = None) -> bytes:
+    """요청 바이트를 서버 핸들러에 넣고 응답 바이트 반환"""
+    reader = asyncio.StreamReader(limit=STREAM_LIMIT)
+    reader.feed_data(raw)
+    reader.feed_eof()
+    writer = FakeWriter()
+    await ConversionServer(service).handle(reader, writer)
+    assert writer.closed
+    return bytes(writer.data)
+
+
+def request(raw: bytes) -> bytes:
+    return asyncio.run(send(raw))
+
+
+def status_of(response: bytes) -> int:
+    return int(response.split(b' ', 2)[1])
+
+
+def post(path: str, body: bytes, content_type: str = "text/markdown") -> bytes:
+    return (f"POST {path} HTTP/1.1\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode('latin-1') + body
+
+
+def test_oversized_request_line():
+    response = request(b"GET /" + b"a" * (STREAM_LIMIT + 10) + b" HTTP/1.1\r\n\r\n")
+    assert status_of(response) == 400
+
+
+def test_oversized_header():
+    response = request(b"GET /health HTTP/1.1\r\nX-Big: " + b"a" * (STREAM_LIMIT + 10) + b"\r\n\r\n")
+    assert status_of(response) == 431
+
+
+def test_too_many_headers():
+    headers = b"".join(b"X-Header-%d: 1\r\n" % index for index in range(MAX_HEADER_LINES + 1))
+    response = request(b"GET /health HTTP/1.1\r\n" + headers + b"\r\n")
+    assert status_of(response) == 431
+
+
+def test_image_outside_upload_dir_is_rejected():
+    for image_path in (TEST_IMAGE, "../budget_pie.png", "images/../../budget_pie.png"):
+        response = request(post("/convert", f"# 제목\n\n![차트]({image_path})\n".encode('utf-8')))
+        assert status_of(response) == 400, image_path
+
+
+def test_uploaded_image_is_embedded():
+    """multipart로 함께 올린 이미지는 업로드 디렉토리에서 찾아서 문서에 넣고, 작업이 끝나면 디렉토리 삭제"""
+    with open(TEST_IMAGE, 'rb') as f:
+        image = f.read()
+    boundary = "test-boundary"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"doc.md\"\r\n\r\n"
+        "# 제목\n\n![차트](images/chart.png)\n\r\n"
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"image\"; filename=\"images/chart.png\"\r\n"
+        "Content-Type: image/png\r\n\r\n"
+    ).encode('utf-8') + image + f"\r\n--{boundary}--\r\n".encode('latin-1')
+
+    async def run():
+        service = ConversionService(workers=1, capture_charts=False)
+        await service.start()
+        try:
+            response = await send(post("/convert", body, f"multipart/form-data; boundary={boundary}"), service)
+            return response, list(service.jobs.values())
+        finally:
+            await service.close()
+
+    response, jobs = asyncio.run(run())
+    assert status_of(response) == 200
+    docx = zipfile.ZipFile(io.BytesIO(response.split(b'\r\n\r\n', 1)[1]))
+    assert [name for name in docx.namelist() if name.startswith('word/media/')]
+    assert not os.path.exists(jobs[0].upload_dir)
+
+
+if __name__ == "__main__":
+    test_oversized_request_line()
+    test_oversized_header()
+    test_too_many_headers()
+    test_image_outside_upload_dir_is_rejected()
+    test_uploaded_image_is_embedded()
+    print("✅ 변환 서비스 테스트 통과")
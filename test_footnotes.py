@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+워드 각주 변환 테스트
+같은 주석 번호를 다시 참조할 때 내용이 같으면 첫 각주를 가리키는 NOTEREF 필드,
+참조 자리의 [설명]이 다르면 각주를 새로 만드는지 확인
+"""
+
+import io
+import os
+import re
+import tempfile
+import zipfile
+
+# 스타일 템플릿 등 캐시는 임시 디렉토리에 (사용자 캐시 폴더를 건드리지 않도록)
+os.environ.setdefault("DOCX_CACHE_DIR", tempfile.mkdtemp(prefix="md_to_docx_test_"))
+
+from md_to_docx_converter import DocxConverter
+
+
+def convert(md_content: str):
+    """마크다운 → (document.xml, footnotes.xml) 문자열"""
+    data = DocxConverter(incremental=False).convert_markdown_text(md_content)
+    with zipfile.ZipFile(io.BytesIO(data)) as docx_file:
+        return (docx_file.read('word/document.xml').decode('utf-8'),
+                docx_file.read('word/footnotes.xml').decode('utf-8'))
+
+
+def footnote_texts(footnotes_xml: str):
+    """구분선 각주를 뺀 각주 본문 목록"""
+    notes = re.findall(r'<w:footnote (?:(?!w:type)[^>])*>(.*?)</w:footnote>', footnotes_xml)
+    return [''.join(re.findall(r'<w:t[^>]*>([^<]*)</w:t>', note)).strip() for note in notes]
+
+
+def test_repeated_number_with_different_inline_text():
+    """번호가 같아도 설명이 다르면 두 내용 모두 각주로 들어감"""
+    document_xml, footnotes_xml = convert(
+        "# 제목\n\n"
+        "첫 인용^1^[국방부, 2023] 입니다.\n\n"
+        "다른 인용^1^[과학기술정보통신부, 2024] 입니다.\n"
+    )
+    assert footnote_texts(footnotes_xml) == ["국방부, 2023", "과학기술정보통신부, 2024"]
+    assert 'NOTEREF' not in document_xml
+
+
+def test_repeated_number_with_same_text_uses_noteref():
+    """내용이 같은 참조는 각주 1개 + 첫 각주 책갈피를 가리키는 NOTEREF, 다른 내용은 따로 책갈피"""
+    document_xml, footnotes_xml = convert(
+        "# 제목\n\n"
+        "인용^1^[가 문헌] 다른 인용^1^[나 문헌]\n\n"
+        "## 다음\n\n"
+        "다시^1^[가 문헌] 또^1^[나 문헌]\n"
+    )
+    assert footnote_texts(footnotes_xml) == ["가 문헌", "나 문헌"]
+    assert re.findall(r'w:name="(_RefFootnote[^"]*)"', document_xml) == ["_RefFootnote1", "_RefFootnote1_2"]
+    assert re.findall(r'NOTEREF (\S+)', document_xml) == ["_RefFootnote1", "_RefFootnote1_2"]
+
+
+def test_definition_wins_over_inline_text():
+    """【 주석 】 블록의 정의가 있으면 참조마다 설명이 달라도 정의 내용 각주 1개를 공유"""
+    document_xml, footnotes_xml = convert(
+        "# 제목\n\n"
+        "인용^2^[가] 다시^2^[나]\n\n"
+        "【 주석 】\n"
+        "^2^[정의된 내용]\n"
+    )
+    assert footnote_texts(footnotes_xml) == ["정의된 내용"]
+    assert document_xml.count('NOTEREF') == 1
+
+
+if __name__ == "__main__":
+    test_repeated_number_with_different_inline_text()
+    test_repeated_number_with_same_text_uses_noteref()
+    test_definition_wins_over_inline_text()
+    print("✅ 각주 테스트 통과")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+변환 과정 추적 (이름 붙은 구간별 소요 시간)
+읽기, 토큰화, 페이지별 처리, 표 생성, 이미지 삽입, 주석, 저장, 차트 캡처를 구간(span)으로 기록
+환경변수 DOCX_TRACE=경로를 주면 변환이 끝날 때마다 기록을 파일로 저장
+(기본은 Chrome trace 형식 - chrome://tracing 이나 Perfetto에서 열기, DOCX_TRACE_FORMAT=json이면 구간 목록 + 합계)
+추적을 켜지 않으면 span()은 아무것도 하지 않는 공용 객체를 돌려주므로 부담이 거의 없다
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from conversion_log import get_logger
+from disk_cache import atomic_path
+
+logger = get_logger("tracing")
+
+MAX_SPANS = 200_000  # 오래 떠 있는 서비스에서도 메모리가 계속 늘지 않도록 최근 구간만 보관
+TRACE_FORMATS = ("chrome", "json")
+
+
+def trace_path():
+    """추적 결과를 저장할 경로 (환경변수 DOCX_TRACE, 없으면 None)"""
+    return os.environ.get("DOCX_TRACE") or None
+
+
+class Span:
+    """with 블록 하나의 구간 기록 (set()으로 블록 안에서 알게 된 정보를 덧붙일 수 있음)"""
+
+    __slots__ = ("tracer", "name", "args", "started")
+
+    def __init__(self, tracer, name: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.started = None
+
+    def set(self, **args):
+        self.args.update(args)
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.record(self.name, self.started, time.perf_counter(), self.args)
+        return False
+
+
+class _NullSpan:
+    """추적을 끈 경우의 구간 (아무것도 기록하지 않음)"""
+
+    __slots__ = ()
+
+    def set(self, **args):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """스레드 안전한 구간 기록기"""
+
+    def __init__(self, enabled: bool = True, max_spans: int = MAX_SPANS):
+        self.enabled = enabled
+        self.spans = deque(maxlen=max_spans)
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self._thread_names = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str, /, **args):
+        """with 블록으로 쓰는 구간 (추적을 끈 경우 공용 빈 구간)"""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, args)
+
+    def record(self, name: str, started: float, ended: float, args: dict = None):
+        thread = threading.current_thread()
+        with self._lock:
+            self._thread_names[thread.ident] = thread.name
+            self.spans.append((name, started, ended, thread.ident, args or {}))
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+
+    def summary(self) -> dict:
+        """구간 이름별 횟수, 합계/최대 시간(초) - 합계가 큰 순서"""
+        totals = {}
+        with self._lock:
+            spans = list(self.spans)
+        for name, started, ended, _, _ in spans:
+            elapsed = ended - started
+            entry = totals.setdefault(name, {"count": 0, "seconds": 0.0, "max": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += elapsed
+            entry["max"] = max(entry["max"], elapsed)
+        ordered = sorted(totals.items(), key=lambda item: item[1]["seconds"], reverse=True)
+        return {name: {"count": entry["count"], "seconds": round(entry["seconds"], 4), "max": round(entry["max"], 4)}
+                for name, entry in ordered}
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary:
+            return
+        print("⏱️ 구간별 소요 시간")
+        for name, entry in summary.items():
+            print(f"   {name:<12} {entry['seconds']:>8.3f}s  ({entry['count']}회, 최대 {entry['max']:.3f}s)")
+
+    def to_chrome_trace(self) -> dict:
+        """Chrome trace 형식 (완료 이벤트 "X", 시간 단위 µs)"""
+        with self._lock:
+            spans = list(self.spans)
+            thread_names = dict(self._thread_names)
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": ident, "args": {"name": name}}
+            for ident, name in thread_names.items()
+        ]
+        for name, started, ended, ident, args in spans:
+            events.append({
+                "name": name,
+                "cat": "docx",
+                "ph": "X",
+                "ts": round((started - self.origin) * 1_000_000, 1),
+                "dur": round((ended - started) * 1_000_000, 1),
+                "pid": self.pid,
+                "tid": ident,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_json(self) -> dict:
+        """구간 목록(시작 시각은 추적 시작 기준 초) + 이름별 합계"""
+        with self._lock:
+            spans = list(self.spans)
+            thread_names = dict(self._thread_names)
+        return {
+            "spans": [
+                {"name": name, "start": round(started - self.origin, 6), "seconds": round(ended - started, 6),
+                 "thread": thread_names.get(ident, str(ident)), "args": args}
+                for name, started, ended, ident, args in spans
+            ],
+            "summary": self.summary(),
+        }
+
+    def export(self, path: str, trace_format: str = None):
+        """기록을 파일로 저장 (trace_format: chrome 또는 json, 기본은 환경변수 DOCX_TRACE_FORMAT)"""
+        trace_format = trace_format or os.environ.get("DOCX_TRACE_FORMAT", "chrome")
+        if trace_format not in TRACE_FORMATS:
+            raise ValueError(f"지원하지 않는 추적 형식: {trace_format} ({', '.join(TRACE_FORMATS)})")
+        data = self.to_chrome_trace() if trace_format == "chrome" else self.to_json()
+        with atomic_path(path) as temp_path, open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+
+_default_tracer = None
+_default_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """프로세스 기본 추적기 (DOCX_TRACE가 있을 때만 기록)"""
+    global _default_tracer
+    if _default_tracer is None:
+        with _default_lock:
+            if _default_tracer is None:
+                _default_tracer = Tracer(enabled=trace_path() is not None)
+    return _default_tracer
+
+
+def span(name: str, /, **args):
+    """기본 추적기의 구간 - with span("save"): ..."""
+    return get_tracer().span(name, **args)
+
+
+def flush_trace():
+    """DOCX_TRACE를 지정했으면 지금까지의 기록을 저장"""
+    path = trace_path()
+    tracer = get_tracer()
+    if path is None or not tracer.enabled:
+        return
+    try:
+        tracer.export(path)
+    except (OSError, ValueError) as e:
+        logger.warning("⚠️ 추적 기록 저장 실패: %s", e)
@@ -5,16 +5,46 @@ Universal MD to DOCX Converter
 """
 
 import os
-import re
-from typing import List, Optional
+from itertools import islice, takewhile
+from typing import Iterable, Iterator, List
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.style import WD_STYLE_TYPE
+from conversion_log import ProgressEmitter, get_logger
+from image_pipeline import ImagePreprocessor, report_missing_images
+from md_engine import ConversionProfile, MarkdownEngine, add_picture_paragraph, table_cells
+from md_tokenizer import IMAGE_PATTERN, Token, TokenKind, iter_lines
+from table_builder import TableBuilder, add_text_run, run_properties
+from tracing import flush_trace, span
 
-class UniversalMDConverter:
-    def __init__(self):
+logger = get_logger("universal")
+
+class UniversalMDConverter(ConversionProfile):
+    """범용 변환 프로필 - 공용 변환 코어(md_engine)에 이 변환기의 라인 분류 규칙과 Arial 서식을 적용"""
+    
+    # 빈 줄, 구분선, 이미지도 표를 끝냄
+    passthrough_kinds = frozenset()
+    
+    # 런 서식 (같은 종류의 런은 같은 rPr을 복사해서 사용)
+    TITLE_RPR = run_properties(bold=True, name='Arial', size=Pt(20))
+    HEADING4_RPR = run_properties(bold=True, name='Arial', size=Pt(12))
+    CAPTION_RPR = run_properties(bold=True, name='Arial', size=Pt(10))
+    BODY_RPR = run_properties(name='Arial', size=Pt(11))
+    TABLE_TEXT_RPR = run_properties(name='Arial', size=Pt(10))
+    TABLE_BOLD_RPR = run_properties(bold=True, name='Arial', size=Pt(10))
+    
+    def __init__(self, progress=None):
         self.document = Document()
+        # 진행 알림 구독 (GUI) - callback(stage, **detail)
+        self.progress = ProgressEmitter()
+        if progress is not None:
+            self.progress.subscribe(progress)
+        self.table_builder = TableBuilder(self.document)
+        self.engine = MarkdownEngine(self)
+        self._style_ids = {}  # 스타일 이름 → 스타일 ID 캐시
+        self.image_preprocessor = ImagePreprocessor()
+        self.missing_images = []  # 미리 읽기 단계에서 이미 보고한 없는 이미지
         self.setup_styles()
         
     def setup_styles(self):
@@ -42,272 +72,248 @@ class UniversalMDConverter:
             
     def convert(self, md_file: str) -> str:
         """메인 변환 함수"""
-        print(f"🔄 변환 시작: {md_file}")
+        logger.info("🔄 변환 시작: %s", md_file)
+        self.progress.emit('read', file=md_file)
         
         # MD 파일의 디렉토리 저장 (이미지 경로 처리용)
         self.md_file_dir = os.path.dirname(os.path.abspath(md_file))
         
-        with open(md_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        lines = content.split('\n')
-        
-        # MD 파일의 첫 번째 # 제목 찾기
+        # MD 파일의 첫 번째 # 제목 찾기 + 이미지 참조 수집
         main_title = None
-        for line in lines:
-            line_stripped = line.strip()
-            if line_stripped.startswith('# '):
-                main_title = line_stripped[2:].strip()
-                break
+        image_paths = []
+        with span("read", file=os.path.basename(md_file)), open(md_file, 'r', encoding='utf-8') as f:
+            for line in iter_lines(f):
+                line_stripped = line.strip()
+                if main_title is None and line_stripped.startswith('# '):
+                    main_title = line_stripped[2:].strip()
+                elif line_stripped.startswith('!['):
+                    match = IMAGE_PATTERN.match(line_stripped)
+                    if match:
+                        image_paths.append(self._resolve_image_path(match.group(2)))
+        
+        # 이미지는 본문을 만드는 동안 백그라운드에서 미리 읽고 전처리
+        self.missing_images = self.image_preprocessor.prefetch((path, 5) for path in image_paths)
+        report_missing_images(self.missing_images)
+        for image_path in self.missing_images:
+            self.progress.emit('warning', message=f"이미지 파일 없음: {image_path}")
+        self.progress.emit('assemble', images=len(image_paths))
         
         # 제목 추가 (MD에서 찾은 제목 또는 기본값)
-        if main_title:
-            title_para = self.document.add_paragraph(main_title)
-        else:
-            title_para = self.document.add_paragraph("문서 제목")
+        title_para = self.document.add_paragraph()
+        add_text_run(title_para, main_title or "문서 제목", self.TITLE_RPR)
         title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        title_run = title_para.runs[0]
-        title_run.font.name = 'Arial'
-        title_run.font.size = Pt(20)
-        title_run.font.bold = True
         
         self.document.add_page_break()
         
-        i = 0
-        while i < len(lines):
-            line = lines[i]  # 원래 라인 (들여쓰기 포함)
-            line_stripped = line.strip()
-            
-            if not line_stripped:  # 빈 줄
-                i += 1
-                continue
-                
-            if line_stripped.startswith('# '):  # H1 제목 (문서 제목이므로 스킵)
-                i += 1
-                continue
-                
-            elif line_stripped.startswith('## '):  # H2 제목  
-                title = line_stripped[3:].strip()
-                if title == '주석':  # 주석 섹션은 따로 처리
-                    i = self.process_footnote_section(lines, i)
-                    continue
-                else:
-                    para = self.document.add_paragraph(title)
-                    para.style = 'CustomHeading1'
-                    
-            elif line_stripped.startswith('### '):  # H3 제목
-                title = line_stripped[4:].strip()
-                para = self.document.add_paragraph(title)
-                para.style = 'CustomHeading2'
-                
-            elif line_stripped.startswith('#### '):  # H4 제목
-                title = line_stripped[5:].strip()
-                para = self.document.add_paragraph(title)
-                run = para.runs[0]
-                run.font.name = 'Arial'
-                run.font.size = Pt(12)
-                run.font.bold = True
-                para.paragraph_format.space_before = Pt(8)
-                para.paragraph_format.space_after = Pt(4)
-                
-            elif line_stripped.startswith('!['):  # 이미지
-                i = self.process_image(lines, i)
-                continue
-                
-            elif line_stripped.startswith('<그림') or line_stripped.startswith('<표'):  # 캡션
-                para = self.document.add_paragraph(line_stripped)
-                para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                run = para.runs[0]
-                run.font.name = 'Arial'
-                run.font.size = Pt(10)
-                run.font.bold = True
-                
-            elif line_stripped.startswith('|') and '|' in line_stripped:  # 테이블
-                i = self.process_table(lines, i)
-                continue
-                
-            elif line_stripped.startswith('□') or line_stripped.startswith('○') or line_stripped.startswith('-') or line_stripped.startswith('•'):  # 불릿 포인트
-                # 들여쓰기 레벨 계산
-                indent_level = self.get_bullet_level(line)
-                self.add_bullet_paragraph(line, indent_level)  # 원래 line 전달 (들여쓰기 포함)
-                
-            elif line_stripped != '---':  # 일반 텍스트 (구분선 제외)
-                if line_stripped:  # 빈 줄이 아닌 경우만
-                    para = self.document.add_paragraph(line)
-                    run = para.runs[0]
-                    run.font.name = 'Arial'
-                    run.font.size = Pt(11)
-                    
-            i += 1
+        # 본문은 파일 전체를 읽지 않고 라인 스트림으로 처리
+        with span("body"), open(md_file, 'r', encoding='utf-8') as f:
+            self.process_lines(iter_lines(f))
             
         # DOCX 저장 - MD 파일과 같은 디렉토리에
         import time
         timestamp = int(time.time())
         output_filename = os.path.basename(md_file).replace('.md', f'_TEST_{timestamp}.docx')
         output_file = os.path.join(self.md_file_dir, output_filename)
-        self.document.save(output_file)
+        self.progress.emit('save', path=output_file)
+        with span("save"):
+            self.document.save(output_file)
+        flush_trace()
         
-        print(f"✅ 변환 완료: {output_file}")
+        if self.image_preprocessor.stats["images"]:
+            logger.info("🖼️  %s", self.image_preprocessor.summary())
+        logger.info("✅ 변환 완료: %s", output_file)
         return output_file
         
-    def process_footnote_section(self, lines: List[str], start_idx: int) -> int:
-        """주석 섹션 처리 - 중복 방지"""
-        print("📝 주석 섹션 처리 중...")
-        
-        # 주석 제목 추가 (한 번만!)
-        self.document.add_page_break()
-        title_para = self.document.add_paragraph("주석")
-        title_para.style = 'CustomHeading1'
+    def process_lines(self, lines: Iterable[str]):
+        """본문 라인 스트림 처리 (공용 변환 코어 - 직전 라인과 다음 라인 하나만 참조)"""
+        self.engine.run_lines(lines)
         
-        i = start_idx + 1  # "## 주석" 다음 라인부터
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            if not line:
-                i += 1
+    def tokenize(self, lines: Iterable[str]) -> Iterator[Token]:
+        """이 변환기의 라인 분류 규칙 (## 주석 다음부터 다음 # 제목 전까지는 주석 내용)"""
+        in_footnotes = False
+        for raw in lines:
+            line = raw.strip()
+            if not line:  # 빈 줄
+                yield Token(TokenKind.BLANK, line, raw)
                 continue
+            if in_footnotes:
+                if not line.startswith('#'):
+                    yield Token(TokenKind.FOOTNOTE_DEF, line, raw)
+                    continue
+                in_footnotes = False  # 다음 섹션 시작
                 
-            if line.startswith('#'):  # 다음 섹션 시작
-                break
+            if line.startswith('# '):  # H1 제목 (문서 제목이므로 스킵)
+                yield Token(TokenKind.HEADING, line[2:].strip(), raw, level=1)
+            elif line.startswith('## '):  # H2 제목
+                title = line[3:].strip()
+                if title == '주석':  # 주석 섹션은 따로 처리
+                    in_footnotes = True
+                    yield Token(TokenKind.FOOTNOTE_BLOCK, line, raw)
+                else:
+                    yield Token(TokenKind.HEADING, title, raw, level=2)
+            elif line.startswith('### '):  # H3 제목
+                yield Token(TokenKind.HEADING, line[4:].strip(), raw, level=3)
+            elif line.startswith('#### '):  # H4 제목
+                yield Token(TokenKind.HEADING, line[5:].strip(), raw, level=4)
+            elif line.startswith('!['):  # 이미지
+                match = IMAGE_PATTERN.match(line)
+                yield Token(TokenKind.IMAGE, line, raw, groups=match.groups() if match else ())
+            elif line.startswith('<그림') or line.startswith('<표'):  # 캡션
+                yield Token(TokenKind.CAPTION, line, raw)
+            elif line.startswith('|'):  # 테이블
+                yield Token(TokenKind.TABLE_ROW, line, raw)
+            elif line.startswith(('□', '○', '-', '•')):  # 불릿 포인트 (들여쓰기로 레벨 계산)
+                yield Token(TokenKind.BULLET, line, raw, level=self.get_bullet_level(raw))
+            elif line != '---':  # 일반 텍스트
+                yield Token(TokenKind.TEXT, line, raw)
+            else:  # 구분선
+                yield Token(TokenKind.RULE, line, raw)
                 
-            # 주석 내용 추가
-            para = self.document.add_paragraph(line)
-            run = para.runs[0]
-            run.font.name = 'Arial'  
-            run.font.size = Pt(11)  # 동일한 크기로 통일
-            
-            i += 1
+    def token_handlers(self) -> dict:
+        return {
+            TokenKind.HEADING: self._add_heading,
+            TokenKind.FOOTNOTE_BLOCK: self._add_footnote_title,
+            TokenKind.FOOTNOTE_DEF: self._add_footnote_text,
+            TokenKind.IMAGE: self._add_image,
+            TokenKind.CAPTION: self._add_caption,
+            TokenKind.BULLET: self._add_bullet,
+        }
+        
+    def _add_bullet(self, token: Token):
+        self.add_bullet_paragraph(token.raw, token.level)  # 원래 라인 전달 (들여쓰기 포함)
+        
+    def handle_text(self, token: Token):
+        """일반 텍스트 - 원래 라인 그대로 (들여쓰기 포함)"""
+        add_text_run(self.document.add_paragraph(), token.raw, self.BODY_RPR)
+        
+    def _add_heading(self, token: Token):
+        """## → CustomHeading1, ### → CustomHeading2, #### → 굵은 12pt (# 는 문서 제목이므로 스킵)"""
+        if token.level == 2:
+            self._apply_style(self.document.add_paragraph(token.text), 'CustomHeading1')
+        elif token.level == 3:
+            self._apply_style(self.document.add_paragraph(token.text), 'CustomHeading2')
+        elif token.level == 4:
+            para = self.document.add_paragraph()
+            add_text_run(para, token.text, self.HEADING4_RPR)
+            para.paragraph_format.space_before = Pt(8)
+            para.paragraph_format.space_after = Pt(4)
             
-        return i
+    def _add_caption(self, token: Token):
+        """캡션 - 가운데 정렬, 굵은 10pt"""
+        para = self.document.add_paragraph()
+        para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        add_text_run(para, token.text, self.CAPTION_RPR)
+        
+    def _add_footnote_title(self, token: Token):
+        """주석 섹션 제목 (새 페이지에서 한 번만)"""
+        logger.debug("📝 주석 섹션 처리 중...")
+        self.document.add_page_break()
+        self._apply_style(self.document.add_paragraph("주석"), 'CustomHeading1')
+        
+    def _add_footnote_text(self, token: Token):
+        """주석 내용 추가 (본문과 동일한 크기)"""
+        add_text_run(self.document.add_paragraph(), token.text, self.BODY_RPR)
+                    
+    def process_footnote_section(self, lines: List[str], start_idx: int) -> int:
+        """주석 섹션 처리 - 중복 방지 (라인 리스트용, 다음에 처리할 인덱스 반환)"""
+        end_idx = start_idx + 1
+        while end_idx < len(lines) and not lines[end_idx].strip().startswith('#'):
+            end_idx += 1
+        self.engine.run_lines(lines[start_idx:end_idx])
+        return end_idx
         
+    def _resolve_image_path(self, image_path: str) -> str:
+        """절대 경로로 변환 - MD 파일의 디렉토리를 기준으로"""
+        if not os.path.isabs(image_path):
+            return os.path.join(self.md_file_dir, image_path)
+        return image_path
+    
     def process_image(self, lines: List[str], start_idx: int) -> int:
-        """이미지 처리 - MD 파일의 캡션 위치를 그대로 존중"""
-        line = lines[start_idx].strip()
+        """이미지 처리 (라인 리스트용, 다음에 처리할 인덱스 반환)"""
+        prev_token = next(self.tokenize(lines[start_idx - 1:start_idx])) if start_idx > 0 else None
+        return start_idx + self.engine.run_first(self.tokenize(lines[start_idx:start_idx + 2]), prev_token)
         
-        # ![alt](path) 형식 파싱
-        match = re.match(r'!\[(.*?)\]\((.*?)\)', line)
-        if match:
-            alt_text = match.group(1)
-            image_path = match.group(2)
-            
-            # 절대 경로로 변환 - MD 파일의 디렉토리를 기준으로
-            if not os.path.isabs(image_path):
-                full_path = os.path.join(self.md_file_dir, image_path)
-            else:
-                full_path = image_path
-                
-            print(f"🖼️  이미지 처리: {image_path} -> {full_path}")
-            
-            # 이전 줄이 캡션인지 확인 (표 캡션이 위에 있는 경우)
-            prev_caption = None
-            if start_idx > 0:
-                prev_line = lines[start_idx - 1].strip()
-                if prev_line.startswith('<표'):
-                    prev_caption = prev_line
-                    print(f"📝 이전 줄 표 캡션 감지: {prev_caption}")
+    def _add_image(self, token: Token) -> int:
+        """이미지 처리 - MD 파일의 캡션 위치를 그대로 존중 (아래 그림 캡션을 함께 처리하면 1 반환)"""
+        if not token.groups:  # ![alt](path) 형식이 아님
+            return 0
+        alt_text, image_path = token.groups
+        full_path = self._resolve_image_path(image_path)
             
-            if os.path.exists(full_path):
-                # 이미지 추가
-                para = self.document.add_paragraph()
-                para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                run = para.add_run()
-                try:
-                    run.add_picture(full_path, width=Inches(5))
-                    print(f"✅ 이미지 추가 성공: {image_path}")
-                except Exception as e:
-                    print(f"❌ 이미지 추가 실패: {e}")
-                    # 실패시 텍스트로 표시
-                    para = self.document.add_paragraph(f"[이미지: {alt_text}]")
-                    para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            else:
-                print(f"⚠️  이미지 파일 없음: {full_path}")
-                # 파일이 없으면 텍스트로 표시
-                para = self.document.add_paragraph(f"[이미지 없음: {alt_text} - {image_path}]")
+        logger.debug("🖼️  이미지 처리: %s -> %s", image_path, full_path)
+        
+        # 이전 줄이 캡션인지 확인 (표 캡션이 위에 있는 경우)
+        prev_token = self.engine.prev_token
+        prev_caption = prev_token is not None and prev_token.raw.strip().startswith('<표')
+        if prev_caption:
+            logger.debug("📝 이전 줄 표 캡션 감지: %s", prev_token.raw.strip())
+        
+        if os.path.exists(full_path):
+            try:
+                add_picture_paragraph(self.document, self.image_preprocessor, full_path, 5)
+                logger.debug("✅ 이미지 추가 성공: %s", image_path)
+                self.progress.emit('image', path=full_path)
+            except Exception as e:
+                logger.warning("❌ 이미지 추가 실패: %s", e)
+                # 실패시 텍스트로 표시
+                para = self.document.add_paragraph(f"[이미지: {alt_text}]")
                 para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            
-            # 다음 줄이 그림 캡션인지 확인 (그림 캡션이 아래에 있는 경우)
-            next_idx = start_idx + 1
-            if next_idx < len(lines) and not prev_caption:  # 이전에 캡션이 없었을 때만
-                next_line = lines[next_idx].strip()
-                if next_line.startswith('<그림'):
-                    # 그림 캡션 추가
-                    caption_para = self.document.add_paragraph(next_line)
-                    caption_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    caption_run = caption_para.runs[0]
-                    caption_run.font.name = 'Arial'
-                    caption_run.font.size = Pt(10)
-                    caption_run.font.bold = True
-                    print(f"📝 그림 캡션 추가: {next_line}")
-                    return next_idx + 1  # 캡션까지 처리했으므로 +2
-                
-        return start_idx + 1
+        else:
+            if full_path not in self.missing_images:  # 미리 읽기 단계에서 보고하지 않은 경우만
+                logger.warning("⚠️  이미지 파일 없음: %s", full_path)
+            # 파일이 없으면 텍스트로 표시
+            para = self.document.add_paragraph(f"[이미지 없음: {alt_text} - {image_path}]")
+            para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        
+        # 다음 줄이 그림 캡션인지 확인 (그림 캡션이 아래에 있는 경우, 이전에 캡션이 없었을 때만)
+        next_token = self.engine.peek()
+        if next_token is not None and not prev_caption and next_token.raw.strip().startswith('<그림'):
+            self._add_caption(next_token)
+            logger.debug("📝 그림 캡션 추가: %s", next_token.text)
+            return 1  # 캡션까지 처리
+        return 0
         
     def process_table(self, lines: List[str], start_idx: int) -> int:
-        """테이블 처리"""
-        table_lines = []
-        i = start_idx
+        """테이블 처리 (라인 리스트용, 다음에 처리할 인덱스 반환)"""
+        table_lines = [lines[start_idx]]
+        table_lines.extend(takewhile(lambda line: line.strip().startswith('|'), islice(lines, start_idx + 1, None)))
+        self.end_table([Token(TokenKind.TABLE_ROW, line.strip(), line) for line in table_lines], self.engine)
+        return start_idx + len(table_lines)
         
-        # 테이블 라인들 수집
-        while i < len(lines) and lines[i].strip().startswith('|'):
-            line = lines[i].strip()
-            if not line.startswith('|---'):  # 구분선 제외
-                table_lines.append(line)
-            i += 1
-            
-        if len(table_lines) < 2:  # 최소 헤더 + 1행
-            return i
+    def end_table(self, rows: List[Token], engine: MarkdownEngine) -> int:
+        """테이블 처리 - | 로 시작하는 연속된 라인 (구분선 제외, 최소 헤더 + 1행)"""
+        table_lines = [row.text for row in rows if not row.text.startswith('|---')]
+        if len(table_lines) < 2:
+            return 0
             
         # 첫 번째 행에서 열 수 계산
-        header_cells = [cell.strip() for cell in table_lines[0].split('|')[1:-1]]
+        header_cells = table_cells(table_lines[0])
         col_count = len(header_cells)
         
         if col_count == 0:
-            return i
+            return 0
             
-        # 테이블 생성
-        table = self.document.add_table(rows=1, cols=col_count)
-        table.style = 'Table Grid'
-        
-        # 헤더 추가
-        header_row = table.rows[0]
-        for j, cell_text in enumerate(header_cells):
-            if j < len(header_row.cells):
-                header_row.cells[j].text = cell_text
-                # 헤더 셀 볼드 처리
-                for run in header_row.cells[j].paragraphs[0].runs:
-                    run.font.bold = True
-                    run.font.name = 'Arial'
-                    run.font.size = Pt(10)
-                
-                # 헤더 셀 배경색 설정 (연한 회색)
-                from docx.oxml.shared import qn
-                from docx.oxml import parse_xml
-                cell = header_row.cells[j]
-                cell_properties = cell._tc.get_or_add_tcPr()
-                shade_element = parse_xml(r'<w:shd {} w:fill="F0F0F0"/>'.format(
-                    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'))
-                cell_properties.append(shade_element)
-                    
-        # 데이터 행들 추가  
+        # 데이터 행 중 열 수가 모자란 행은 제외
+        rows = [header_cells]
         for line in table_lines[1:]:
-            data_cells = [cell.strip() for cell in line.split('|')[1:-1]]
+            data_cells = table_cells(line)
             if len(data_cells) >= col_count:
-                row = table.add_row()
-                for j, cell_text in enumerate(data_cells[:col_count]):
-                    row.cells[j].text = cell_text
-                    # **텍스트** 볼드 처리
-                    if '**' in cell_text:
-                        cell_text_processed = cell_text.replace('**', '')
-                        row.cells[j].text = cell_text_processed
-                        for run in row.cells[j].paragraphs[0].runs:
-                            run.font.bold = True
-                    
-                    # 폰트 설정
-                    for run in row.cells[j].paragraphs[0].runs:
-                        run.font.name = 'Arial'
-                        run.font.size = Pt(10)
-                        
-        return i
+                rows.append(data_cells)
+        
+        # 테이블 생성 (w:tbl을 한 번에 만들고 셀을 순서대로 채움, 헤더 배경색 연한 회색)
+        self.progress.emit('table', rows=len(rows), cols=col_count)
+        with span("table", rows=len(rows), cols=col_count):
+            self.table_builder.add_table(rows, col_count, self._fill_table_cell, header_fill="F0F0F0")
+        return 0
+        
+    def _fill_table_cell(self, paragraph, cell_text: str, row_index: int):
+        """표 셀 채우기 - 헤더와 **텍스트** 셀은 볼드"""
+        if row_index == 0:
+            add_text_run(paragraph, cell_text, self.TABLE_BOLD_RPR)
+        elif '**' in cell_text:
+            add_text_run(paragraph, cell_text.replace('**', ''), self.TABLE_BOLD_RPR)
+        else:
+            add_text_run(paragraph, cell_text, self.TABLE_TEXT_RPR)
         
     def get_bullet_level(self, line: str) -> int:
         """불릿포인트의 들여쓰기 레벨 계산"""
@@ -343,13 +349,7 @@ class UniversalMDConverter:
             para.paragraph_format.left_indent = Inches(0.3)
         
         # MD 파일의 원래 텍스트 그대로 추가 (□, ○, -, • 기호 유지)
-        para.add_run(text)
-        
-        # 폰트 설정
-        if para.runs:
-            run = para.runs[0]
-            run.font.name = 'Arial'
-            run.font.size = Pt(11)
+        add_text_run(para, text, self.BODY_RPR)
 
 
 if __name__ == "__main__":
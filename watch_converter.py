@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+MD → DOCX 감시 모드
+MD 파일과 참조 이미지, 이미지 옆의 차트 HTML을 주기적으로 확인하다가 바뀌면 다시 변환
+저장이 연달아 일어나면 조용해질 때까지 기다렸다가 한 번만 변환하고,
+바뀐 차트만 다시 캡처(렌더 캐시) + 바뀐 섹션만 다시 변환(증분 빌드)하는 가장 빠른 경로 사용
+(파일 감시 라이브러리 없이 수정 시각/크기 비교로 동작)
+"""
+
+import os
+import platform
+import subprocess
+import sys
+import time
+import traceback
+from typing import Dict, List, Optional
+
+from complete_capture import capture_charts, find_chart_sources
+from md_to_docx_converter import DocxConverter
+from md_tokenizer import iter_image_refs
+from section_cache import file_stamp
+
+
+POLL_INTERVAL = 0.5  # 파일 변경 확인 주기 (초)
+DEBOUNCE_SECONDS = 0.8  # 마지막 변경 후 이 시간 동안 조용하면 변환
+
+
+def open_document(path: str):
+    """운영체제 기본 프로그램(Word 등)으로 문서 열기"""
+    system = platform.system()
+    if system == "Windows":
+        os.startfile(path)
+    elif system == "Darwin":
+        subprocess.Popen(["open", path])
+    else:
+        subprocess.Popen(["xdg-open", path])
+
+
+class MarkdownWatcher:
+    """MD 파일과 참조 파일들을 감시하다가 바뀌면 다시 변환"""
+
+    def __init__(self, md_file: str, output_path: str = None, interval: float = POLL_INTERVAL,
+                 debounce: float = DEBOUNCE_SECONDS, open_result: bool = False):
+        self.md_file = os.path.abspath(md_file)
+        self.output_path = output_path
+        self.interval = interval
+        self.debounce = debounce
+        self.open_result = open_result
+        # 변환기는 계속 재사용 (이미지 처리 결과 캐시 + 섹션 조각 캐시)
+        self.converter = DocxConverter(incremental=True)
+        self.watched: List[str] = []
+        self.stamps: Dict[str, list] = {}
+        self.failed_charts: Dict[str, list] = {}  # 캡처에 실패한 차트 HTML → 그때의 파일 상태
+
+    def image_paths(self) -> List[str]:
+        """MD가 참조하는 이미지 경로 (변환기와 같은 기준으로 해석)"""
+        try:
+            with open(self.md_file, 'r', encoding='utf-8') as f:
+                return [self.converter.resolve_image_path(path) for _, path in iter_image_refs(f)]
+        except OSError:
+            return []
+
+    def watched_files(self) -> List[str]:
+        """감시 대상 - MD 파일, 참조 이미지, 이미지와 이름이 같은 차트 HTML"""
+        paths = [self.md_file]
+        for image_path in self.image_paths():
+            paths.append(image_path)
+            if image_path.lower().endswith('.png'):
+                paths.append(os.path.splitext(image_path)[0] + '.html')
+        return list(dict.fromkeys(paths))
+
+    @staticmethod
+    def snapshot(paths: List[str]) -> Dict[str, list]:
+        return {path: file_stamp(path) for path in paths}
+
+    def changed_files(self) -> List[str]:
+        return [path for path, stamp in self.snapshot(self.watched).items() if stamp != self.stamps.get(path)]
+
+    def wait_until_quiet(self):
+        """연속 저장이 끝날 때까지 대기 (마지막 변경 후 debounce초 동안 변화가 없으면 반환)"""
+        stamps = self.snapshot(self.watched)
+        quiet_since = time.monotonic()
+        while time.monotonic() - quiet_since < self.debounce:
+            time.sleep(self.interval)
+            current = self.snapshot(self.watched)
+            if current != stamps:
+                stamps = current
+                quiet_since = time.monotonic()
+
+    def rebuild(self) -> List[str]:
+        """바뀐 차트 캡처 후 증분 변환, 이번 변환에서 새로 만든 PNG 경로 목록 반환"""
+        started = time.perf_counter()
+        if not os.path.exists(self.md_file):
+            print(f"⚠️ MD 파일이 없습니다: {self.md_file}")
+            return []
+
+        captured = []
+        # 캡처에 실패한 차트는 HTML이 다시 바뀔 때까지 재시도하지 않음
+        charts = [(html_file, png_file) for html_file, png_file in find_chart_sources(self.image_paths())
+                  if self.failed_charts.get(html_file) != file_stamp(html_file)]
+        if charts:
+            print(f"📸 바뀐 차트 {len(charts)}개 캡처")
+            for result in capture_charts(charts):
+                if result["success"]:
+                    captured.append(result["png"])
+                    self.failed_charts.pop(result["html"], None)
+                else:
+                    self.failed_charts[result["html"]] = file_stamp(result["html"])
+                    print(f"⚠️ {os.path.basename(result['html'])} 캡처 실패: {result['error']}")
+
+        try:
+            output_path = self.converter.convert_markdown_to_docx(self.md_file, self.output_path)
+        except PermissionError as e:
+            print(f"⚠️ 결과 파일을 저장할 수 없습니다 - Word에서 열려 있다면 닫아 주세요: {e}")
+            return captured
+        except Exception as e:
+            print(f"❌ 변환 실패: {e}")
+            traceback.print_exc()
+            return captured
+
+        print(f"✅ 다시 변환 완료 ({time.perf_counter() - started:.2f}s): {output_path}")
+        if self.open_result:
+            self.open_result = False  # 처음 한 번만 열고, 이후에는 Word에서 다시 불러오기
+            try:
+                open_document(output_path)
+            except OSError as e:
+                print(f"⚠️ 문서를 열 수 없습니다: {e}")
+        return captured
+
+    def build(self):
+        """변환하고 감시 기준 갱신 (변환 중에 일어난 사용자 변경은 다음 확인에서 감지)"""
+        stamps = self.snapshot(self.watched)
+        captured = self.rebuild()
+        self.watched = self.watched_files()  # 참조 이미지가 바뀌었을 수 있음
+        for path in captured:
+            stamps[path] = file_stamp(path)  # 직접 만든 PNG 때문에 다시 변환하지 않도록
+        self.stamps = {path: stamps[path] if path in stamps else file_stamp(path) for path in self.watched}
+
+    def run(self):
+        """감시 시작 (Ctrl+C로 종료)"""
+        self.watched = self.watched_files()
+        print(f"👀 감시 시작: {self.md_file} (파일 {len(self.watched)}개, Ctrl+C로 종료)")
+        self.build()
+        try:
+            while True:
+                time.sleep(self.interval)
+                changed = self.changed_files()
+                if not changed:
+                    continue
+                self.wait_until_quiet()
+                names = ', '.join(os.path.basename(path) for path in changed[:5])
+                print(f"\n🔄 변경 감지: {names}{' ...' if len(changed) > 5 else ''}")
+                self.build()
+        except KeyboardInterrupt:
+            print("\n👋 감시 종료")
+
+
+def main(args=None):
+    """사용법: python watch_converter.py <input.md> [output.docx] [--open]"""
+    args = list(sys.argv[1:] if args is None else args)
+    open_result = '--open' in args
+    args = [arg for arg in args if arg != '--open']
+    if not args or not os.path.exists(args[0]):
+        print("사용법: python watch_converter.py <input.md> [output.docx] [--open]")
+        print("예시: python watch_converter.py 사업계획서.md --open")
+        sys.exit(1)
+
+    output_path: Optional[str] = args[1] if len(args) > 1 else None
+    MarkdownWatcher(args[0], output_path, open_result=open_result).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+변환기/캡처 로그와 진행 알림
+변환기와 캡처 모듈은 print 대신 "md2docx" 로거 아래의 로거로 출력한다
+메시지 인자는 %s로 넘겨서 꺼진 레벨이면 문자열을 만들지 않음
+- DEBUG: 캡션/이미지/표마다 남기는 상세 기록 (기본으로는 출력하지 않음)
+- INFO: 진행 요약, WARNING: 없는 이미지나 캡처 실패 등
+환경변수 DOCX_LOG_LEVEL(DEBUG/INFO/WARNING/ERROR)로 레벨 지정, DOCX_QUIET=1이면 WARNING 이상만 출력
+따로 설정하지 않으면 처음 쓸 때 표준 출력에 메시지만 찍는 핸들러를 붙인다 (기존 출력 모양 유지)
+
+진행 알림은 ProgressEmitter로 구독 - callback(stage, **detail)로 GUI/변환 서비스가 받아서 표시
+"""
+
+import contextlib
+import logging
+import os
+import sys
+import threading
+from typing import Callable, Optional
+
+
+LOGGER_NAME = "md2docx"
+DEFAULT_LEVEL = "INFO"
+
+_configure_lock = threading.Lock()
+
+
+def log_level_from_env() -> int:
+    """환경변수로 정한 로그 레벨 (DOCX_QUIET=1이면 WARNING, 모르는 이름이면 INFO)"""
+    if os.environ.get("DOCX_QUIET", "0") == "1":
+        return logging.WARNING
+    level = logging.getLevelName(os.environ.get("DOCX_LOG_LEVEL", DEFAULT_LEVEL).upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """출력하는 시점의 sys.stdout에 쓰는 핸들러 (redirect_stdout으로 모으는 출력에도 포함되도록)"""
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+    def emit(self, record):
+        if sys.stdout is not None:  # pythonw(창 모드)에는 표준 출력이 없음
+            super().emit(record)
+
+
+def configure_logging(level: Optional[int] = None, handler: logging.Handler = None) -> logging.Logger:
+    """md2docx 로거 설정 - 레벨 지정, 핸들러가 없으면 콘솔 핸들러 추가 (handler를 주면 그 핸들러 추가)"""
+    logger = logging.getLogger(LOGGER_NAME)
+    with _configure_lock:
+        logger.setLevel(log_level_from_env() if level is None else level)
+        if handler is None and not logger.handlers:
+            handler = ConsoleHandler()
+            handler.setFormatter(logging.Formatter("%(message)s"))
+        if handler is not None:
+            logger.addHandler(handler)
+        logger.propagate = False
+    return logger
+
+
+def get_logger(component: str) -> logging.Logger:
+    """구성 요소별 로거 (예: get_logger("converter") → md2docx.converter)"""
+    if not logging.getLogger(LOGGER_NAME).handlers:
+        configure_logging()
+    return logging.getLogger(f"{LOGGER_NAME}.{component}")
+
+
+logger = get_logger("progress")
+
+
+class ProgressEmitter:
+    """진행 알림 구독자 목록 - 구독자 오류는 변환을 멈추지 않고 로그만 남김
+
+    단계(stage)와 세부 정보 예: read(file), assemble(images), page(page), image(path), table(rows, cols),
+    footnotes(count), warning(message), save
+    """
+
+    def __init__(self):
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable) -> Callable:
+        with self._lock:
+            self._callbacks = self._callbacks + [callback]
+        return callback
+
+    def unsubscribe(self, callback: Callable):
+        with self._lock:
+            self._callbacks = [cb for cb in self._callbacks if cb is not callback]
+
+    @contextlib.contextmanager
+    def subscribed(self, callback: Optional[Callable]):
+        """with 블록 동안만 구독 (callback이 None이면 아무것도 하지 않음)"""
+        if callback is None:
+            yield
+            return
+        self.subscribe(callback)
+        try:
+            yield
+        finally:
+            self.unsubscribe(callback)
+
+    def emit(self, stage: str, **detail):
+        for callback in self._callbacks:
+            try:
+                callback(stage, **detail)
+            except Exception:
+                logger.exception("진행 알림 처리 중 오류 (%s)", stage)
@@ -4,13 +4,30 @@ Universal MD to DOCX Converter
 모든 사업계획서와 문서에 범용적으로 사용 가능한 변환기
 """
 
+import io
+import logging
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.style import WD_STYLE_TYPE
+from conversion_log import get_logger
+
+logger = get_logger("universal")
+
+# ^숫자^[설명] 주석 패턴
+FOOTNOTE_PATTERN = re.compile(r'\^(\d+)\^\[([^\]]+)\]')
+# ![alt](path) 이미지 패턴
+IMAGE_PATTERN = re.compile(r'!\[(.*?)\]\((.*?)\)')
+
+
+def read_image_file(path: str) -> bytes:
+    """이미지 파일 내용 읽기 (미리 읽기 스레드에서 실행)"""
+    with open(path, 'rb') as f:
+        return f.read()
 
 class UniversalMDConverter:
     def __init__(self):
@@ -42,15 +59,14 @@ class UniversalMDConverter:
             
     def convert(self, md_file: str) -> str:
         """메인 변환 함수 - Windows 순서: 텍스트 먼저, 이미지는 나중에"""
-        print(f"🔄 변환 시작: {md_file}")
+        logger.info("🔄 변환 시작: %s", md_file)
         
         # MD 파일의 디렉토리 저장 (이미지 경로 처리용)
         self.md_file_dir = os.path.dirname(os.path.abspath(md_file))
-        print(f"🔍 MD 파일 경로 디버깅:")
-        print(f"   원본 경로: {md_file}")
-        print(f"   절대 경로: {os.path.abspath(md_file)}")
-        print(f"   디렉토리: {self.md_file_dir}")
-        print(f"   디렉토리 존재: {os.path.exists(self.md_file_dir)}")
+        # 경로 문제 확인용 상세 기록 (DOCX_LOG_LEVEL=DEBUG일 때만 출력)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔍 MD 파일 경로: 원본 %s, 절대 경로 %s, 디렉토리 %s (존재: %s)", md_file,
+                         os.path.abspath(md_file), self.md_file_dir, os.path.exists(self.md_file_dir))
         
         with open(md_file, 'r', encoding='utf-8') as f:
             content = f.read()
@@ -59,6 +75,11 @@ class UniversalMDConverter:
         
         # 이미지 정보를 저장할 리스트 (나중에 삽입용)
         self.pending_images = []
+        # 본문을 처리하면서 모으는 주석 정의 (번호 → 설명)
+        self.footnotes = {}
+        
+        # 이미지 파일은 본문을 만드는 동안 백그라운드에서 미리 읽어 둠
+        self.prefetch_images(lines)
         
         # MD 파일의 첫 번째 # 제목 찾기
         main_title = None
@@ -89,6 +110,8 @@ class UniversalMDConverter:
             if not line_stripped:  # 빈 줄
                 i += 1
                 continue
+            
+            self.collect_footnotes(line_stripped)
                 
             if line_stripped.startswith('# '):  # H1 제목 (문서 제목이므로 스킵)
                 i += 1
@@ -150,41 +173,66 @@ class UniversalMDConverter:
                     
             i += 1
             
-        # 1단계: 텍스트만으로 DOCX 저장
+        # 2단계: 플레이스홀더를 이미지로 교체 (문서 객체 안에서만 처리)
+        if self.pending_images:
+            logger.info("🖼️  2단계 시작: %s개 이미지 삽입", len(self.pending_images))
+            self.insert_pending_images()
+            logger.info("✅ 2단계 완료: 이미지 삽입")
+        
+        # 3단계: 본문 처리 중 모은 주석으로 주석 섹션 생성
+        self.add_footnotes_from_content()
+        logger.info("✅ 3단계 완료: 주석 섹션 추가")
+        
+        # 모든 내용을 만든 뒤 한 번만 저장 (저장할 때마다 이미지까지 전체를 다시 압축하므로)
         import time
         timestamp = int(time.time())
         output_filename = os.path.basename(md_file).replace('.md', f'_TEST_{timestamp}.docx')
         
-        print(f"🔍 저장 경로 디버깅:")
-        print(f"   MD 파일: {md_file}")
-        print(f"   MD 디렉토리: {self.md_file_dir}")
-        print(f"   출력 파일명: {output_filename}")
-        
         # MD 파일과 같은 디렉토리에 저장
         output_file = os.path.join(self.md_file_dir, output_filename)
-        print(f"   최종 저장 경로: {output_file}")
+        logger.debug("🔍 저장 경로: MD 디렉토리 %s, 출력 파일명 %s → %s", self.md_file_dir, output_filename, output_file)
         
         self.document.save(output_file)
-        print(f"✅ 1단계 완료: 텍스트 DOCX 저장")
-        
-        # 2단계: 이미지들 삽입
-        if self.pending_images:
-            print(f"🖼️  2단계 시작: {len(self.pending_images)}개 이미지 삽입")
-            self.insert_pending_images()
-            self.document.save(output_file)  # 이미지 삽입 후 재저장
-            print(f"✅ 2단계 완료: 이미지 삽입 후 재저장")
-        
-        # 3단계: 주석 섹션 자동 생성
-        self.add_footnotes_from_content()
-        self.document.save(output_file)  # 주석 추가 후 재저장
-        print(f"✅ 3단계 완료: 주석 섹션 추가")
-        
-        print(f"✅ 변환 완료: {output_file}")
+        logger.info("✅ 변환 완료: %s", output_file)
         return output_file
         
+    def resolve_image_path(self, image_path: str) -> str:
+        """절대 경로로 변환 - MD 파일의 디렉토리를 기준으로"""
+        if not os.path.isabs(image_path):
+            return os.path.join(self.md_file_dir, image_path)
+        return image_path
+    
+    def prefetch_images(self, lines: List[str]):
+        """이미지 참조를 먼저 모아서 스레드 풀에서 파일을 읽기 시작, 없는 파일은 한 번에 보고"""
+        self.image_data = {}  # 절대 경로 → 읽기 작업
+        self.missing_images = []
+        paths = []
+        for line in lines:
+            line = line.strip()
+            if line.startswith('!['):
+                match = IMAGE_PATTERN.match(line)
+                if match:
+                    full_path = self.resolve_image_path(match.group(2))
+                    if not os.path.exists(full_path):
+                        if full_path not in self.missing_images:
+                            self.missing_images.append(full_path)
+                    elif full_path not in paths:
+                        paths.append(full_path)
+        
+        if paths:
+            executor = ThreadPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 2))
+            for full_path in paths:
+                self.image_data[full_path] = executor.submit(read_image_file, full_path)
+            executor.shutdown(wait=False)  # 제출한 작업은 계속 실행됨
+            logger.info("🖼️  이미지 %s개 미리 읽기 시작", len(paths))
+        
+        if self.missing_images:
+            logger.warning("⚠️  이미지 파일 %d개를 찾을 수 없음:\n%s", len(self.missing_images),
+                           "\n".join(f"   - {full_path}" for full_path in self.missing_images))
+    
     def process_footnote_section(self, lines: List[str], start_idx: int) -> int:
         """주석 섹션 처리 - 중복 방지"""
-        print("📝 주석 섹션 처리 중...")
+        logger.debug("📝 주석 섹션 처리 중...")
         
         # 주석 제목 추가 (한 번만!)
         self.document.add_page_break()
@@ -201,6 +249,8 @@ class UniversalMDConverter:
                 
             if line.startswith('#'):  # 다음 섹션 시작
                 break
+            
+            self.collect_footnotes(line)
                 
             # 주석 내용 추가
             para = self.document.add_paragraph(line)
@@ -217,7 +267,7 @@ class UniversalMDConverter:
         line = lines[start_idx].strip()
         
         # ![alt](path) 형식 파싱
-        match = re.match(r'!\[(.*?)\]\((.*?)\)', line)
+        match = IMAGE_PATTERN.match(line)
         if match:
             alt_text = match.group(1)
             image_path = match.group(2)
@@ -229,6 +279,7 @@ class UniversalMDConverter:
                 next_line = lines[next_idx].strip()
                 if next_line.startswith('<그림'):
                     next_caption = next_line
+                    self.collect_footnotes(next_caption)
             
             # 플레이스홀더 문단 생성 (나중에 이미지로 교체)
             placeholder_id = f"IMAGE_PLACEHOLDER_{len(self.pending_images)}"
@@ -244,7 +295,7 @@ class UniversalMDConverter:
                 'placeholder_id': placeholder_id
             }
             self.pending_images.append(image_info)
-            print(f"📋 이미지 플레이스홀더 삽입: {image_path} -> {placeholder_id}")
+            logger.debug("📋 이미지 플레이스홀더 삽입: %s -> %s", image_path, placeholder_id)
             
             # 캡션이 다음 줄에 있으면 건너뛰기
             if next_caption:
@@ -269,33 +320,20 @@ class UniversalMDConverter:
         
         return processed
     
-    def add_footnotes_from_content(self):
-        """MD 내용에서 주석을 추출하여 주석 섹션 생성"""
-        # 현재 처리 중인 MD 파일에서 주석 정의 찾기
-        footnotes = {}
-        
-        # 현재 MD 파일 경로 동적 확인
-        md_files = [f for f in os.listdir(self.md_file_dir) if f.endswith('.md')]
-        if not md_files:
-            print("⚠️  MD 파일을 찾을 수 없음")
+    def collect_footnotes(self, line: str):
+        """라인의 ^숫자^[설명] 주석 정의를 모아 둠 (같은 번호는 처음 나온 설명 사용)"""
+        if '^' not in line:
             return
-            
-        md_file_path = os.path.join(self.md_file_dir, md_files[0])  # 첫 번째 MD 파일 사용
-        
-        with open(md_file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        import re
-        # ^숫자^[설명] 패턴 찾기
-        footnote_pattern = r'\^(\d+)\^\[([^\]]+)\]'
-        matches = re.findall(footnote_pattern, content)
-        
-        for number, description in matches:
-            if number not in footnotes:  # 중복 방지
-                footnotes[number] = description
+        for number, description in FOOTNOTE_PATTERN.findall(line):
+            if number not in self.footnotes:  # 중복 방지
+                self.footnotes[number] = description
+    
+    def add_footnotes_from_content(self):
+        """본문 처리 중 모은 주석으로 주석 섹션 생성"""
+        footnotes = self.footnotes
         
         if footnotes:
-            print(f"📝 주석 {len(footnotes)}개 발견, 주석 섹션 생성 중...")
+            logger.debug("📝 주석 %s개 발견, 주석 섹션 생성 중...", len(footnotes))
             
             # 주석 섹션 추가
             self.document.add_page_break()
@@ -314,9 +352,9 @@ class UniversalMDConverter:
                 para.paragraph_format.space_before = Pt(6)
                 para.paragraph_format.space_after = Pt(6)
                 
-            print(f"✅ 주석 섹션 완료: {len(footnotes)}개 주석 추가")
+            logger.info("✅ 주석 섹션 완료: %s개 주석 추가", len(footnotes))
         else:
-            print("📝 주석이 발견되지 않음")
+            logger.debug("📝 주석이 발견되지 않음")
     
     def insert_pending_images(self):
         """플레이스홀더를 실제 이미지로 교체"""
@@ -326,13 +364,9 @@ class UniversalMDConverter:
             placeholder_para = img_info['placeholder_para']
             placeholder_id = img_info['placeholder_id']
             
-            # 절대 경로로 변환
-            if not os.path.isabs(image_path):
-                full_path = os.path.join(self.md_file_dir, image_path)
-            else:
-                full_path = image_path
+            full_path = self.resolve_image_path(image_path)
             
-            print(f"🖼️  플레이스홀더 교체: {placeholder_id} -> {image_path}")
+            logger.debug("🖼️  플레이스홀더 교체: %s -> %s", placeholder_id, image_path)
             
             # 플레이스홀더 문단의 텍스트를 지우고 이미지로 교체
             placeholder_para.clear()
@@ -340,31 +374,31 @@ class UniversalMDConverter:
             if os.path.exists(full_path):
                 try:
                     run = placeholder_para.add_run()
-                    run.add_picture(full_path, width=Inches(5))
+                    prefetched = self.image_data.get(full_path)
+                    image = io.BytesIO(prefetched.result()) if prefetched is not None else full_path
+                    run.add_picture(image, width=Inches(5))
                     placeholder_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    print(f"✅ 이미지 교체 성공: {image_path}")
+                    logger.debug("✅ 이미지 교체 성공: %s", image_path)
                 except Exception as e:
-                    print(f"❌ 이미지 교체 실패: {e}")
+                    logger.warning("❌ 이미지 교체 실패: %s", e)
                     placeholder_para.add_run(f"[이미지 오류: {alt_text}]")
                     placeholder_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
                     
                 # 캡션 처리 (이미지 바로 다음에 추가)
                 if img_info['next_caption']:
                     # 플레이스홀더 다음에 캡션 문단 삽입
-                    p = placeholder_para._element
-                    caption_p = self.document.add_paragraph(img_info['next_caption'])._element
-                    p.addnext(caption_p)
+                    caption_para = self.document.add_paragraph(img_info['next_caption'])
+                    placeholder_para._element.addnext(caption_para._element)
                     
                     # 캡션 스타일 적용
-                    caption_para = self.document.paragraphs[-1]  # 방금 추가된 문단
                     caption_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
                     caption_run = caption_para.runs[0]
                     caption_run.font.name = 'Arial'
                     caption_run.font.size = Pt(10)
                     caption_run.font.bold = True
-                    print(f"📝 캡션 추가: {img_info['next_caption']}")
+                    logger.debug("📝 캡션 추가: %s", img_info['next_caption'])
             else:
-                print(f"⚠️  이미지 파일 없음: {full_path}")
+                # 없는 파일은 미리 읽기 단계에서 한 번에 보고함
                 placeholder_para.add_run(f"[이미지 없음: {alt_text} - {image_path}]")
                 placeholder_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
@@ -384,7 +418,7 @@ class UniversalMDConverter:
             else:
                 full_path = image_path
                 
-            print(f"🖼️  이미지 처리: {image_path} -> {full_path}")
+            logger.debug("🖼️  이미지 처리: %s -> %s", image_path, full_path)
             
             # 이전 줄이 캡션인지 확인 (표 캡션이 위에 있는 경우)
             prev_caption = None
@@ -392,7 +426,7 @@ class UniversalMDConverter:
                 prev_line = lines[start_idx - 1].strip()
                 if prev_line.startswith('<표'):
                     prev_caption = prev_line
-                    print(f"📝 이전 줄 표 캡션 감지: {prev_caption}")
+                    logger.debug("📝 이전 줄 표 캡션 감지: %s", prev_caption)
             
             if os.path.exists(full_path):
                 # 이미지 추가
@@ -401,14 +435,14 @@ class UniversalMDConverter:
                 run = para.add_run()
                 try:
                     run.add_picture(full_path, width=Inches(5))
-                    print(f"✅ 이미지 추가 성공: {image_path}")
+                    logger.debug("✅ 이미지 추가 성공: %s", image_path)
                 except Exception as e:
-                    print(f"❌ 이미지 추가 실패: {e}")
+                    logger.warning("❌ 이미지 추가 실패: %s", e)
                     # 실패시 텍스트로 표시
                     para = self.document.add_paragraph(f"[이미지: {alt_text}]")
                     para.alignment = WD_ALIGN_PARAGRAPH.CENTER
             else:
-                print(f"⚠️  이미지 파일 없음: {full_path}")
+                logger.warning("⚠️  이미지 파일 없음: %s", full_path)
                 # 파일이 없으면 텍스트로 표시
                 para = self.document.add_paragraph(f"[이미지 없음: {alt_text} - {image_path}]")
                 para.alignment = WD_ALIGN_PARAGRAPH.CENTER
@@ -425,7 +459,7 @@ class UniversalMDConverter:
                     caption_run.font.name = 'Arial'
                     caption_run.font.size = Pt(10)
                     caption_run.font.bold = True
-                    print(f"📝 그림 캡션 추가: {next_line}")
+                    logger.debug("📝 그림 캡션 추가: %s", next_line)
                     return next_idx + 1  # 캡션까지 처리했으므로 +2
                 
         return start_idx + 1
@@ -438,6 +472,7 @@ class UniversalMDConverter:
         # 테이블 라인들 수집
         while i < len(lines) and lines[i].strip().startswith('|'):
             line = lines[i].strip()
+            self.collect_footnotes(line)
             if not line.startswith('|---'):  # 구분선 제외
                 table_lines.append(line)
             i += 1